@@ -40,6 +40,150 @@ RATE_CONFIG: Dict[str, Any] = {
 POOL_SIZE = 5
 POOL_TIMEOUT = 20.0
 
+# Shared RPC transport: one keep-alive connection pool and endpoint registry for all RPC pools
+RPC_TRANSPORT_CONFIG: Dict[str, Any] = {
+    'connection_limit': 100,          # Open sockets across all endpoints
+    'connection_limit_per_host': 20,  # Open sockets per endpoint
+    'keepalive_timeout': 60.0,        # Seconds an idle connection is kept for reuse
+    'dns_cache_ttl': 300,             # Seconds resolved endpoint addresses are cached
+    'latency_alpha': 0.3,             # Weight of a new sample in the latency moving average
+    'max_consecutive_failures': 5,    # An endpoint failing this many times in a row...
+    'failure_cooldown': 60.0,         # ...is skipped for this many seconds
+    'rate_limit_cooldown': (30.0, 60.0),  # Seconds (random within range) a rate-limited endpoint is skipped
+}
+
+# Adaptive (AIMD) limit on concurrent requests per RPC endpoint, see app.utils.adaptive_concurrency
+ADAPTIVE_CONCURRENCY_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('ADAPTIVE_CONCURRENCY', 'true').lower() == 'true',
+    'initial_limit': 4,         # Requests in flight per endpoint before anything is learned
+    'min_limit': 1,
+    'max_limit': 20,            # Matches connection_limit_per_host; more would only queue for a socket
+    'increase': 1.0,            # Window growth per window's worth of healthy responses
+    'decrease_factor': 0.5,     # Window multiplier on a 429, -32005 or timeout
+    'latency_tolerance': 3.0,   # Responses slower than this multiple of the unloaded latency stop growth
+    'baseline_alpha': 0.01,     # How fast the unloaded latency estimate drifts up
+    'error_rate_alpha': 0.1,    # Weight of a new outcome in the error rate moving average
+    'max_error_rate': 0.2,      # Error rate above which the window stops growing
+}
+
+# Read-ahead for sequential block analysis, see app.utils.block_prefetch
+BLOCK_PREFETCH_CONFIG: Dict[str, Any] = {
+    'read_ahead': int(os.getenv('BLOCK_READ_AHEAD', '8')),  # Blocks fetched ahead of the one being processed
+    'slots_per_request': 1000,  # Slots listed per getBlocks call
+}
+
+# Skipped/confirmed slot bitmaps consulted before getBlock and getBlocks, see app.utils.slot_map
+SLOT_MAP_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('SLOT_MAP_ENABLED', 'true').lower() == 'true',
+    'slots_per_epoch': 432_000,  # Mainnet epoch length; each epoch's bitmaps take 108 KB
+    'max_epochs': int(os.getenv('SLOT_MAP_MAX_EPOCHS', '4')),  # Least recently used epochs beyond this are dropped
+}
+
+# Persisted endpoint scores: the pool starts from the last ranked endpoint list and verifies it in the background
+RPC_WARM_START_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('RPC_WARM_START', 'true').lower() == 'true',
+    'max_age_seconds': int(os.getenv('RPC_WARM_START_MAX_AGE', str(24 * 3600))),  # Older scores mean a cold start
+    'save_interval': 300.0,    # Seconds between snapshots of the endpoint registry
+    'verify_concurrency': 8,   # Concurrent health checks when verifying a warm-started pool
+}
+
+# Router loading: optional routers are imported on their first request instead of at startup
+ROUTER_CONFIG: Dict[str, Any] = {
+    # Lazily loaded routes are served by a sub-application and left out of /docs
+    'lazy': os.getenv('LAZY_ROUTERS', 'true').lower() == 'true',
+    'optional': (
+        'pump', 'wallet',  # Pump.fun trading and Phantom wallet clients
+        'jupiter', 'dexscreener', 'helius', 'moralis', 'raydium', 'rugcheck', 'shyft',  # Third-party API proxies
+    ),
+    # Routers not served at all, e.g. DISABLED_ROUTERS=moralis,shyft
+    'disabled': frozenset(name.strip() for name in os.getenv('DISABLED_ROUTERS', '').split(',') if name.strip()),
+}
+
+# Block Tail Ingestion Configuration
+BLOCK_TAIL_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('BLOCK_TAIL_ENABLED', 'true').lower() == 'true',
+    'commitment': 'confirmed',
+    'window_sizes': (1, 2, 5, 10, 50, 100),  # Rolling aggregate windows, in blocks
+    'poll_interval': 2.0,    # Seconds between getBlocks polls without a slot subscription
+    'max_range': 20,         # Maximum slots requested per getBlocks call
+    'fetch_concurrency': 4,  # Concurrent getBlock calls per range
+    'fetch_retries': 2,      # Retries for a block before it is counted as missed
+    'backfill_blocks': 10,   # Blocks ingested behind the head on first start
+    'stream_blocks': True,   # Feed transactions to streaming-capable extractors while the block is read
+}
+
+# getBlock request planning from extractor-declared field requirements
+BLOCK_REQUEST_CONFIG: Dict[str, Any] = {
+    # Fetch base64 transactions and decode them locally instead of requesting json
+    'local_decode': os.getenv('BLOCK_LOCAL_DECODE', 'false').lower() == 'true',
+}
+
+# Incremental decoding of large RPC responses
+RPC_STREAM_CONFIG: Dict[str, Any] = {
+    # Responses larger than this are rejected while reading
+    'max_response_bytes': int(os.getenv('RPC_MAX_RESPONSE_BYTES', str(256 * 1024 * 1024))),
+    'chunk_size': 64 * 1024,  # Bytes read from the socket per decode step
+    # Methods whose result array can be decoded element by element: method -> keys leading to the array
+    'array_paths': {
+        'getBlock': ('result', 'transactions'),
+        'getProgramAccounts': ('result',),
+    },
+}
+
+# Process pool that decodes raw block bytes and runs extractors off the event loop
+BLOCK_WORKER_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('BLOCK_WORKERS_ENABLED', 'true').lower() == 'true',
+    # Worker processes; 0 runs extraction inline on the event loop
+    'max_workers': int(os.getenv('BLOCK_WORKERS', str(max(1, (os.cpu_count() or 2) - 1)))),
+    'max_pending_per_worker': 2,  # Blocks queued per worker before submitters wait
+    'start_method': 'spawn',      # Workers never inherit the event loop or open sockets
+    'fetch_concurrency': 8,       # Concurrent raw getBlock calls in SolanaQueryHandler.extract_blocks
+}
+
+# Batch execution of BaseHandler transaction loops
+HANDLER_BATCH_CONFIG: Dict[str, Any] = {
+    # A batch ends, and the handler yields to the event loop, after this many transactions...
+    'max_transactions': int(os.getenv('HANDLER_BATCH_TRANSACTIONS', '256')),
+    # ...or after this much CPU time, whichever comes first
+    'max_batch_ms': float(os.getenv('HANDLER_BATCH_MS', '10')),
+}
+
+# Precompressed variants of responses served by CacheMiddleware
+RESPONSE_CACHE_CONFIG: Dict[str, Any] = {
+    'max_entries': 256,         # Cached endpoint/params combinations kept per process
+    'min_compress_bytes': 1024, # Smaller bodies are only served uncompressed
+    'gzip_level': 6,
+    'brotli_quality': 5,        # Quality 11 takes seconds on a large body; 5 is close in size
+}
+
+# Sampled history of cached endpoint responses (see app/database/history.py)
+HISTORY_CONFIG: Dict[str, Any] = {
+    'sample_interval': float(os.getenv('HISTORY_SAMPLE_SECONDS', '60')),  # At most one point per series per interval
+    'sample_intervals': {},    # Per-table overrides, e.g. {'rpc_nodes_history': 600}
+    'flush_interval': 10.0,    # Seconds between background writes
+    'max_pending': 1000,       # Oldest buffered points are dropped beyond this
+}
+
+# Address-indexed lookups for token/program/collection scoped analytics
+ADDRESS_QUERY_CONFIG: Dict[str, Any] = {
+    'max_addresses': 5,        # More target addresses than this fall back to a block scan
+    'page_size': 1000,         # getSignaturesForAddress page size (RPC maximum)
+    'max_transactions': int(os.getenv('ADDRESS_QUERY_MAX_TRANSACTIONS', '2000')),  # Per address
+    'concurrency': 16,         # Concurrent getTransaction calls
+    'max_retries': 3,
+}
+
+# Local inverted index of address -> slots/signatures built from ingested blocks
+ADDRESS_INDEX_CONFIG: Dict[str, Any] = {
+    'enabled': os.getenv('ADDRESS_INDEX_ENABLED', 'true').lower() == 'true',
+    'retention_seconds': int(os.getenv('ADDRESS_INDEX_RETENTION_SECONDS', '3600')),  # By block time
+    'flush_interval': 10.0,    # Seconds between background writes
+    'max_pending_blocks': 200, # Wakes the background writer early beyond this
+    'prune_interval': 300.0,   # Seconds between retention sweeps
+    # Transactions invoking these programs are not indexed (votes are most of every block)
+    'exclude_programs': ('Vote111111111111111111111111111111111111111',),
+}
+
 class Constants:
     """
     Constants used throughout the application.
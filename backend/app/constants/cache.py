@@ -18,6 +18,21 @@ TOKEN_PRICE_CHART_CACHE_TTL = 900  # 15 minutes (was 5)
 TOKEN_HOLDERS_CACHE_TTL = 3600  # 60 minutes (was 30)
 TOKEN_SOCIAL_METRICS_CACHE_TTL = 1800  # 30 minutes (was 15)
 
+# In-memory cache of raw Pump.fun upstream responses (in seconds), by URL path prefix; the longest prefix wins
+PUMP_UPSTREAM_CACHE_TTLS = {
+    "/coins/latest": 0,  # Polled for the newest token, never cached
+    "/trades/latest": 0,
+    "/coins/king-of-the-hill": 30,
+    "/coins/search": 60,
+    "/coins": 30,  # The newest-coins page (sort=created_timestamp) is fetched uncached by get_latest_coins
+    "/trades": 30,
+    "/candlesticks": 60,
+    "/metas/current": 60,
+    "/sol-price": 30,
+}
+PUMP_UPSTREAM_DEFAULT_TTL = 30
+PUMP_UPSTREAM_CACHE_MAX_ENTRIES = 1024
+
 # Solana API cache TTL constants (in seconds)
 NETWORK_STATUS_CACHE_TTL = 300  # 5 minutes
 PERFORMANCE_METRICS_CACHE_TTL = 180  # 3 minutes
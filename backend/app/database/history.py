@@ -0,0 +1,160 @@
+"""
+Sampled, batched writer for the dashboard history tables.
+
+Cached endpoints report every response they serve, but a history series
+(a history table plus its key columns, e.g. pump tokens for one timeframe
+and sort metric) only takes a point once per sample interval, and only if
+the payload changed since its last point. Points are buffered in memory and
+written in one transaction by ``run()`` in the background, so the request
+path never touches the database.
+"""
+import asyncio
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.config import HISTORY_CONFIG
+from app.database.sqlite import HISTORY_COLUMNS, DatabaseCache, _encode_payload, db_cache
+
+logger = logging.getLogger("app.database.history")
+
+
+class HistoryRecorder:
+    """
+    Samples history points per series and writes them in batches.
+    """
+
+    def __init__(self, db: Optional[DatabaseCache] = None):
+        """
+        Initialize the recorder.
+
+        Args:
+            db: Database holding the history tables; defaults to the shared cache database
+        """
+        self.db = db or db_cache
+        # (table, key) -> (monotonic time of the last sample, digest of the last payload)
+        self._series: Dict[Tuple[str, Tuple], Tuple[float, Optional[bytes]]] = {}
+        self._pending: Deque[Tuple[str, Tuple[Any, ...]]] = deque()
+        self._lock = threading.Lock()
+        self.stats = {
+            "recorded": 0,
+            "throttled": 0,
+            "unchanged": 0,
+            "dropped": 0,
+            "flushes": 0,
+            "rows_written": 0,
+        }
+
+    @staticmethod
+    def _interval(table: str) -> float:
+        return HISTORY_CONFIG['sample_intervals'].get(table, HISTORY_CONFIG['sample_interval'])
+
+    def due(self, table: str, key: Tuple = ()) -> bool:
+        """
+        Check whether a series takes a point now, before building it.
+
+        Args:
+            table: History table
+            key: Values identifying the series within the table
+
+        Returns:
+            True if the series' sample interval has passed
+        """
+        last = self._series.get((table, key))
+        return last is None or time.monotonic() - last[0] >= self._interval(table)
+
+    def record(self, table: str, key: Tuple, values: Tuple[Any, ...], payload: Any) -> bool:
+        """
+        Offer a point to a series.
+
+        Args:
+            table: History table, one of ``HISTORY_COLUMNS``
+            key: Values identifying the series within the table
+            values: The table's ``HISTORY_COLUMNS`` values
+            payload: Response data or its serialized JSON body
+
+        Returns:
+            True if the point was buffered, False if it was sampled out or unchanged
+        """
+        if table not in HISTORY_COLUMNS:
+            raise ValueError(f"Unknown history table: {table}")
+        if not self.due(table, key):
+            self.stats["throttled"] += 1
+            return False
+
+        data = _encode_payload(payload)
+        digest = hashlib.blake2b(data.encode("utf-8"), digest_size=16).digest()
+        now = time.monotonic()
+        with self._lock:
+            last = self._series.get((table, key))
+            self._series[(table, key)] = (now, digest)
+            if last is not None and last[1] == digest:
+                self.stats["unchanged"] += 1
+                return False
+            self._pending.append((table, values + (datetime.now().isoformat(), data)))
+            if len(self._pending) > HISTORY_CONFIG['max_pending']:
+                self._pending.popleft()
+                self.stats["dropped"] += 1
+        self.stats["recorded"] += 1
+        return True
+
+    def flush(self) -> bool:
+        """
+        Write buffered points in one transaction.
+
+        Returns:
+            True if successful, False otherwise (the points stay buffered)
+        """
+        with self._lock:
+            if not self._pending:
+                return True
+            points = list(self._pending)
+            self._pending.clear()
+
+        rows: Dict[str, List[Tuple[Any, ...]]] = {}
+        for table, row in points:
+            rows.setdefault(table, []).append(row)
+        if not self.db.store_history_rows(rows):
+            with self._lock:
+                self._pending.extendleft(reversed(points))
+                while len(self._pending) > HISTORY_CONFIG['max_pending']:
+                    self._pending.popleft()
+                    self.stats["dropped"] += 1
+            return False
+
+        self.stats["flushes"] += 1
+        self.stats["rows_written"] += len(points)
+        return True
+
+    async def run(self) -> None:
+        """Flush buffered points in a worker thread every flush interval until cancelled."""
+        try:
+            while True:
+                await asyncio.sleep(HISTORY_CONFIG['flush_interval'])
+                try:
+                    await asyncio.to_thread(self.flush)
+                except Exception as e:
+                    logger.error(f"Error flushing history: {e}")
+        finally:
+            await asyncio.to_thread(self.flush)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get recorder statistics."""
+        return {**self.stats, "pending": len(self._pending), "series": len(self._series)}
+
+
+_history_recorder: Optional[HistoryRecorder] = None
+
+
+def get_history_recorder() -> HistoryRecorder:
+    """Get or create the shared history recorder."""
+    global _history_recorder
+
+    if _history_recorder is None:
+        _history_recorder = HistoryRecorder()
+
+    return _history_recorder
@@ -1,14 +1,33 @@
 """
 Database middleware for caching API responses.
+
+Cached bodies are served with a content-hash ``ETag``; a matching
+``If-None-Match`` gets an empty 304. Gzip and brotli variants of each body
+are compressed once when it is first served, in a worker thread so large
+bodies do not stall the event loop, and reused on every hit until the cached
+body changes. Responses are also offered to the sampled
+history series in ``app.database.history``.
 """
-import json
+import asyncio
+import gzip
+import hashlib
 import logging
-from typing import Callable, Dict, Any, Optional
+from collections import OrderedDict
+from typing import Callable, Dict, Any, Optional, Tuple
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.types import ASGIApp
 
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is listed in requirements.txt
+    brotli = None
+
+from app.config import RESPONSE_CACHE_CONFIG
+from app.database.history import HistoryRecorder, get_history_recorder
 from app.database.sqlite import db_cache
+from app.utils.serialization import loads
+from app.utils.metrics import record_cache
 
 # Configure logging
 logger = logging.getLogger("app.database.middleware")
@@ -31,12 +50,169 @@ ENDPOINT_TTL = {
     "/soleco/pump_trending/pump/trending": 900  # 15 minutes
 }
 
+# Response headers that describe the original body and must not be copied onto an encoded variant
+_BODY_HEADERS = {"content-length", "content-encoding", "etag", "vary"}
+
+
+def _accepted_encodings(accept_encoding: str) -> Dict[str, float]:
+    """
+    Parse an Accept-Encoding header.
+
+    Args:
+        accept_encoding: Header value, e.g. ``"gzip, deflate, br;q=0.9"``
+
+    Returns:
+        Mapping of lower-case coding to its q-value
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, rest = part.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        rest = rest.strip()
+        if rest.startswith("q="):
+            try:
+                q = float(rest[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip().lower()] = q
+    return accepted
+
+
+class CachedResponse:
+    """
+    A cached JSON body with its ETag and precompressed variants.
+    """
+    __slots__ = ("body", "etag", "gzip", "br")
+
+    def __init__(self, body: bytes):
+        """
+        Compute the ETag and encoded variants of a body.
+
+        Args:
+            body: Serialized JSON body
+        """
+        self.body = body
+        self.etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        self.gzip: Optional[bytes] = None
+        self.br: Optional[bytes] = None
+        if len(body) >= RESPONSE_CACHE_CONFIG['min_compress_bytes']:
+            self.gzip = gzip.compress(body, compresslevel=RESPONSE_CACHE_CONFIG['gzip_level'], mtime=0)
+            if brotli is not None:
+                self.br = brotli.compress(body, quality=RESPONSE_CACHE_CONFIG['brotli_quality'])
+
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """
+        Check an If-None-Match header against this body's ETag (weak comparison).
+
+        Args:
+            if_none_match: Header value, or None if absent
+
+        Returns:
+            True if the client's copy is current
+        """
+        if not if_none_match:
+            return False
+        tag = self.etag[2:]
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate == "*" or candidate.removeprefix("W/") == tag:
+                return True
+        return False
+
+    def variant(self, accept_encoding: str) -> Tuple[bytes, Optional[str]]:
+        """
+        Pick the smallest variant the client accepts.
+
+        Args:
+            accept_encoding: Accept-Encoding header value
+
+        Returns:
+            Tuple of body bytes and Content-Encoding (None for identity)
+        """
+        if accept_encoding and self.gzip is not None:
+            accepted = _accepted_encodings(accept_encoding)
+            wildcard = accepted.get("*", 0.0)
+            if self.br is not None and accepted.get("br", wildcard) > 0:
+                return self.br, "br"
+            if accepted.get("gzip", wildcard) > 0:
+                return self.gzip, "gzip"
+        return self.body, None
+
+
+# History table of each cached endpoint, and the query parameters (with defaults) that select a series in it
+HISTORY_SERIES = {
+    "/soleco/solana/network/status": ("network_status_history", ()),
+    "/soleco/solana/performance/metrics": ("performance_metrics_history", ()),
+    "/soleco/network/rpc-nodes": ("rpc_nodes_history", ()),
+    "/soleco/mints/new/recent": ("mint_analytics_history", (("blocks", 2),)),
+    "/soleco/pump_trending/pump/trending": ("pump_tokens_history", (("timeframe", "24h"), ("sort_metric", "volume"))),
+}
+
 class CacheMiddleware(BaseHTTPMiddleware):
     """
     Middleware for caching API responses.
     """
-    def __init__(self, app: ASGIApp):
+    def __init__(self, app: ASGIApp, history: Optional[HistoryRecorder] = None):
+        """
+        Initialize the middleware.
+
+        Args:
+            app: The wrapped application
+            history: Recorder for history points; defaults to the shared recorder
+        """
         super().__init__(app)
+        self._history = history or get_history_recorder()
+        # (endpoint, params) -> encoded variants of the body last served for it
+        self._responses: "OrderedDict[Tuple[str, Tuple], CachedResponse]" = OrderedDict()
+
+    async def _cached_response(self, key: Tuple[str, Tuple], body: bytes) -> CachedResponse:
+        """
+        Get the encoded variants of a body, compressing it only if it changed since the last request.
+
+        Args:
+            key: Endpoint and query parameters
+            body: Current cached body
+
+        Returns:
+            The cached response for the body
+        """
+        cached = self._responses.get(key)
+        if cached is not None and cached.body == body:
+            self._responses.move_to_end(key)
+            return cached
+        if len(body) >= RESPONSE_CACHE_CONFIG['min_compress_bytes']:
+            cached = await asyncio.to_thread(CachedResponse, body)
+        else:
+            cached = CachedResponse(body)
+        self._responses[key] = cached
+        self._responses.move_to_end(key)
+        while len(self._responses) > RESPONSE_CACHE_CONFIG['max_entries']:
+            self._responses.popitem(last=False)
+        return cached
+
+    @staticmethod
+    def _respond(request: Request, cached: CachedResponse, headers: Dict[str, str], status_code: int = 200) -> Response:
+        """
+        Build a 304 or the encoded variant the client accepts.
+
+        Args:
+            request: The incoming request
+            cached: Cached response to serve
+            headers: Extra response headers
+            status_code: Status code for a full response
+
+        Returns:
+            The response
+        """
+        headers = {**headers, "ETag": cached.etag, "Vary": "Accept-Encoding"}
+        if cached.matches(request.headers.get("if-none-match")):
+            return Response(status_code=304, headers=headers)
+        content, encoding = cached.variant(request.headers.get("accept-encoding", ""))
+        if encoding:
+            headers["Content-Encoding"] = encoding
+        return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
     
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """
@@ -66,94 +242,101 @@ class CacheMiddleware(BaseHTTPMiddleware):
         # Get the query parameters
         params = dict(request.query_params)
         
-        # Try to get the cached response
+        # Try to get the cached response body; it is served as-is without decoding
         ttl = ENDPOINT_TTL.get(endpoint, 300)
-        cached_data = db_cache.get_cached_data(endpoint, params, ttl)
+        cached_body = db_cache.get_cached_body(endpoint, params, ttl)
+        record_cache("database", endpoint, bool(cached_body))
         
-        if cached_data:
+        key = (endpoint, tuple(sorted(params.items())))
+        if cached_body:
             # Return the cached response
             logger.debug(f"Returning cached response for {endpoint}")
             
             # Store historical data if applicable
-            self._store_historical_data(endpoint, cached_data, params)
+            self._store_historical_data(endpoint, None, params, cached_body)
             
-            return Response(
-                content=json.dumps(cached_data),
-                media_type="application/json",
-                headers={"X-Cache": "HIT"}
-            )
+            return self._respond(request, await self._cached_response(key, cached_body), {"X-Cache": "HIT"})
         
         # Get the response from the next middleware
         response = await call_next(request)
         
         # Cache the response if it's successful
         if 200 <= response.status_code < 300 and response.headers.get("content-type", "").startswith("application/json"):
+            # call_next returns a streaming response, so collect the body chunks
+            if hasattr(response, 'body_iterator'):
+                response_body = b"".join([chunk async for chunk in response.body_iterator])
+            else:
+                response_body = response.body
+            
             try:
-                # Check if the response has a body attribute (not a streaming response)
-                if hasattr(response, 'body'):
-                    # Get the response body
-                    response_body = await response.body()
-                    response_data = json.loads(response_body)
-                    
-                    # Cache the response
-                    db_cache.cache_data(endpoint, response_data, params, ttl)
-                    
-                    # Store historical data if applicable
-                    self._store_historical_data(endpoint, response_data, params)
-                    
-                    # Create a new response with the cached header
-                    return Response(
-                        content=response_body,
-                        status_code=response.status_code,
-                        headers={**dict(response.headers), "X-Cache": "MISS"},
-                        media_type=response.media_type
-                    )
-                else:
-                    logger.debug(f"Skipping cache for streaming response: {endpoint}")
+                # Cache the serialized body directly
+                db_cache.cache_body(endpoint, response_body, params, ttl)
+                
+                # Store historical data if applicable
+                self._store_historical_data(endpoint, None, params, response_body)
             except Exception as e:
                 logger.error(f"Error caching response for {endpoint}: {e}")
+            
+            # Create a new response with the cached header
+            headers = {
+                name: value for name, value in response.headers.items()
+                if name.lower() not in _BODY_HEADERS
+            }
+            headers["X-Cache"] = "MISS"
+            return self._respond(request, await self._cached_response(key, response_body), headers, response.status_code)
         
         return response
     
-    def _store_historical_data(self, endpoint: str, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> None:
+    def _store_historical_data(self, endpoint: str, data: Optional[Dict[str, Any]], params: Optional[Dict[str, Any]] = None, body: Optional[bytes] = None) -> None:
         """
-        Store historical data for the given endpoint.
+        Offer the response to the endpoint's history series.
+        
+        The history recorder samples each series at its configured cadence
+        and writes in the background, so most calls return after a dict
+        lookup without decoding the body.
         
         Args:
             endpoint: API endpoint
-            data: Response data
+            data: Response data, decoded from ``body`` when None
             params: Query parameters
+            body: Serialized response body, stored as-is when provided
         """
         try:
+            params = params or {}
+            series = HISTORY_SERIES.get(endpoint)
+            if series is None:
+                return
+            table, key_params = series
+            key = tuple(type(default)(params.get(name, default)) for name, default in key_params)
+            if not self._history.due(table, key):
+                return
+            
+            if data is None and body is not None:
+                data = loads(body)
+                
             if not data or not isinstance(data, dict):
                 logger.debug(f"Skipping historical data storage for {endpoint}: Invalid data format")
                 return
+            
+            payload = body if body is not None else data
                 
             if endpoint == "/soleco/solana/network/status":
-                status = data.get("status", "unknown")
-                db_cache.store_network_status(status, json.dumps(data))
+                values = (data.get("status", "unknown"),)
             
             elif endpoint == "/soleco/mints/new/recent":
-                blocks = int(params.get("blocks", 2))
-                new_mints_count = len(data.get("new_mints", []))
-                pump_tokens_count = len(data.get("pump_tokens", []))
-                db_cache.store_mint_analytics(blocks, new_mints_count, pump_tokens_count, json.dumps(data))
+                values = (key[0], len(data.get("new_mints", [])), len(data.get("pump_tokens", [])))
             
             elif endpoint == "/soleco/pump_trending/pump/trending":
-                timeframe = params.get("timeframe", "24h")
-                sort_metric = params.get("sort_metric", "volume")
-                tokens_count = len(data.get("tokens", []))
-                db_cache.store_pump_tokens(timeframe, sort_metric, tokens_count, json.dumps(data))
+                values = key + (len(data.get("tokens", [])),)
             
             elif endpoint == "/soleco/network/rpc-nodes":
-                total_nodes = data.get("total_nodes", 0)
-                db_cache.store_rpc_nodes(total_nodes, json.dumps(data))
+                values = (data.get("total_nodes", 0),)
             
-            elif endpoint == "/soleco/solana/performance/metrics":
+            else:
                 tps_stats = data.get("tps_statistics", {})
-                max_tps = tps_stats.get("max", 0)
-                avg_tps = tps_stats.get("avg", 0)
-                db_cache.store_performance_metrics(max_tps, avg_tps, json.dumps(data))
+                values = (tps_stats.get("max", 0), tps_stats.get("avg", 0))
+            
+            self._history.record(table, key, values, payload)
         
         except Exception as e:
             logger.error(f"Error storing historical data for {endpoint}: {e}")
@@ -7,12 +7,14 @@ import sqlite3
 import logging
 import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, Iterator, List, Any, Optional, Tuple, Union
 from pathlib import Path
 import asyncio
 import time
 from datetime import timezone
 
+from app.utils.serialization import dumps, loads
+
 # Configure logging
 logger = logging.getLogger("app.database.sqlite")
 
@@ -25,6 +27,70 @@ os.makedirs(os.path.dirname(DB_FILE), exist_ok=True)
 # Thread-local storage for database connections
 thread_local = threading.local()
 
+def _encode_payload(data: Any) -> str:
+    """Encode a history payload, passing through bodies that are already JSON."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        return bytes(data).decode('utf-8')
+    if isinstance(data, str):
+        return data
+    return dumps(data).decode('utf-8')
+
+# Columns of each history table that precede its timestamp and data columns
+HISTORY_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "network_status_history": ("status",),
+    "mint_analytics_history": ("blocks", "new_mints_count", "pump_tokens_count"),
+    "pump_tokens_history": ("timeframe", "sort_metric", "tokens_count"),
+    "rpc_nodes_history": ("total_nodes",),
+    "performance_metrics_history": ("max_tps", "avg_tps"),
+}
+
+# Pump token metrics; a history row is only written when one of them changes
+_TOKEN_METRIC_COLUMNS = (
+    "price", "price_change_1h", "price_change_24h", "price_change_7d",
+    "volume_24h", "market_cap", "virtual_sol_reserves", "virtual_token_reserves",
+)
+# Columns shared by pump_token_performance and pump_token_latest, in row order
+_TOKEN_COLUMNS = ("mint", "name", "symbol") + _TOKEN_METRIC_COLUMNS + ("timestamp", "data")
+
+def _token_performance_row(token_data: Dict[str, Any], timestamp: str) -> Optional[Tuple[Any, ...]]:
+    """
+    Build a pump token performance row in ``_TOKEN_COLUMNS`` order.
+    
+    Args:
+        token_data: Token data from the Pump.fun API
+        timestamp: Ingestion timestamp
+        
+    Returns:
+        The row, or None if the token has no mint address
+    """
+    mint = token_data.get('mint')
+    if not mint:
+        return None
+    
+    # Calculate price if possible
+    price = 0
+    if token_data.get('virtual_sol_reserves') and token_data.get('virtual_token_reserves'):
+        sol_reserves = float(token_data.get('virtual_sol_reserves', 0)) / 1000000000  # Convert lamports to SOL
+        token_reserves = float(token_data.get('virtual_token_reserves', 0)) / 1000000000  # Convert to standard units
+        if token_reserves > 0:
+            price = sol_reserves / token_reserves
+    
+    return (
+        mint,
+        token_data.get('name', ''),
+        token_data.get('symbol', ''),
+        price,
+        float(token_data.get('price_change_1h', 0)),
+        float(token_data.get('price_change_24h', 0)),
+        float(token_data.get('price_change_7d', 0)),
+        float(token_data.get('volume_24h', 0)),
+        float(token_data.get('market_cap', 0)),
+        float(token_data.get('virtual_sol_reserves', 0)) / 1000000000,
+        float(token_data.get('virtual_token_reserves', 0)) / 1000000000,
+        timestamp,
+        _encode_payload(token_data),
+    )
+
 class DatabaseCache:
     """
     SQLite database cache for dashboard data.
@@ -175,6 +241,84 @@ class DatabaseCache:
             )
             ''')
             
+            cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_pump_token_performance_mint_timestamp
+            ON pump_token_performance (mint, timestamp)
+            ''')
+            
+            # Latest state of each pump token, maintained by upsert
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS pump_token_latest (
+                mint TEXT PRIMARY KEY,
+                name TEXT,
+                symbol TEXT,
+                price REAL,
+                price_change_1h REAL,
+                price_change_24h REAL,
+                price_change_7d REAL,
+                volume_24h REAL,
+                market_cap REAL,
+                virtual_sol_reserves REAL,
+                virtual_token_reserves REAL,
+                timestamp TIMESTAMP,
+                data TEXT
+            )
+            ''')
+            
+            # Databases from before the latest-state table start from the newest history row per mint
+            cursor.execute("SELECT EXISTS (SELECT 1 FROM pump_token_latest)")
+            if not cursor.fetchone()[0]:
+                cursor.execute(f'''
+                INSERT OR IGNORE INTO pump_token_latest ({', '.join(_TOKEN_COLUMNS)})
+                SELECT {', '.join('p.' + column for column in _TOKEN_COLUMNS)}
+                FROM pump_token_performance p
+                JOIN (
+                    SELECT mint, MAX(timestamp) AS max_timestamp
+                    FROM pump_token_performance
+                    GROUP BY mint
+                ) latest ON p.mint = latest.mint AND p.timestamp = latest.max_timestamp
+                ''')
+            
+            # First-seen index of mint addresses
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mint_index (
+                mint TEXT PRIMARY KEY,
+                first_seen_slot INTEGER,
+                first_seen_time INTEGER
+            ) WITHOUT ROWID
+            ''')
+            
+            # Address index: signatures of the indexed blocks and per-address posting lists
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS address_index_blocks (
+                slot INTEGER PRIMARY KEY,
+                parent_slot INTEGER,
+                block_time INTEGER,
+                signatures TEXT NOT NULL
+            )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_address_index_blocks_time ON address_index_blocks(block_time)')
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS address_postings (
+                address TEXT NOT NULL,
+                first_slot INTEGER NOT NULL,
+                last_slot INTEGER NOT NULL,
+                entries INTEGER NOT NULL,
+                postings BLOB NOT NULL
+            )
+            ''')
+            cursor.execute('CREATE INDEX IF NOT EXISTS idx_address_postings ON address_postings(address, last_slot)')
+            
+            # Endpoint scores and pool membership for warm starts of the RPC connection pool
+            cursor.execute('''
+            CREATE TABLE IF NOT EXISTS rpc_endpoint_scores (
+                url TEXT PRIMARY KEY,
+                pool_rank INTEGER,
+                stats TEXT NOT NULL,
+                updated_at REAL NOT NULL
+            )
+            ''')
+            
             conn.commit()
             logger.info("Database tables created successfully")
         except sqlite3.Error as e:
@@ -197,6 +341,27 @@ class DatabaseCache:
         Returns:
             Cached data or None if not found or expired
         """
+        body = self.get_cached_body(endpoint, params, max_age_seconds)
+        if body is None:
+            return None
+        try:
+            return loads(body)
+        except Exception as e:
+            logger.error(f"Error decoding cached data for {endpoint}: {e}")
+            return None
+    
+    def get_cached_body(self, endpoint: str, params: Optional[Dict[str, Any]] = None, max_age_seconds: int = 300) -> Optional[bytes]:
+        """
+        Get the raw JSON body cached for the given endpoint and parameters.
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters
+            max_age_seconds: Maximum age of cached data in seconds
+            
+        Returns:
+            Cached JSON bytes or None if not found or expired
+        """
         try:
             conn, cursor = self._get_connection()
             params_str = json.dumps(params) if params else None
@@ -209,14 +374,14 @@ class DatabaseCache:
             row = cursor.fetchone()
             
             if row:
-                data = json.loads(row['data'])
                 timestamp = datetime.fromisoformat(row['timestamp'])
                 now = datetime.now()
                 
                 # Check if the cached data is still valid
                 if (now - timestamp).total_seconds() <= max_age_seconds:
                     logger.debug(f"Cache hit for {endpoint} with params {params}")
-                    return data
+                    data = row['data']
+                    return data if isinstance(data, bytes) else data.encode('utf-8')
                 else:
                     logger.debug(f"Cache expired for {endpoint} with params {params}")
             else:
@@ -237,19 +402,38 @@ class DatabaseCache:
             params: Query parameters
             ttl: Time to live in seconds
             
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            body = dumps(data)
+        except Exception as e:
+            logger.error(f"Error caching data for {endpoint}: {e}")
+            return False
+        return self.cache_body(endpoint, body, params, ttl)
+    
+    def cache_body(self, endpoint: str, body: bytes, params: Optional[Dict[str, Any]] = None, ttl: int = 300) -> bool:
+        """
+        Cache an already serialized JSON body for the given endpoint and parameters.
+        
+        Args:
+            endpoint: API endpoint
+            body: JSON bytes to cache as-is
+            params: Query parameters
+            ttl: Time to live in seconds
+            
         Returns:
             True if successful, False otherwise
         """
         try:
             conn, cursor = self._get_connection()
             params_str = json.dumps(params) if params else None
-            data_str = json.dumps(data)
             timestamp = datetime.now().isoformat()
             
             # Insert or replace the cached data
             cursor.execute(
                 "INSERT OR REPLACE INTO cache (endpoint, data, params, timestamp, ttl) VALUES (?, ?, ?, ?, ?)",
-                (endpoint, data_str, params_str, timestamp, ttl)
+                (endpoint, bytes(body), params_str, timestamp, ttl)
             )
             conn.commit()
             logger.debug(f"Cached data for {endpoint} with params {params}")
@@ -328,7 +512,7 @@ class DatabaseCache:
         """
         try:
             conn, cursor = self._get_connection()
-            data_str = json.dumps(data)
+            data_str = _encode_payload(data)
             timestamp = datetime.now().isoformat()
             
             cursor.execute(
@@ -357,7 +541,7 @@ class DatabaseCache:
         """
         try:
             conn, cursor = self._get_connection()
-            data_str = json.dumps(data)
+            data_str = _encode_payload(data)
             timestamp = datetime.now().isoformat()
             
             cursor.execute(
@@ -386,7 +570,7 @@ class DatabaseCache:
         """
         try:
             conn, cursor = self._get_connection()
-            data_str = json.dumps(data)
+            data_str = _encode_payload(data)
             timestamp = datetime.now().isoformat()
             
             cursor.execute(
@@ -413,7 +597,7 @@ class DatabaseCache:
         """
         try:
             conn, cursor = self._get_connection()
-            data_str = json.dumps(data)
+            data_str = _encode_payload(data)
             timestamp = datetime.now().isoformat()
             
             cursor.execute(
@@ -441,7 +625,7 @@ class DatabaseCache:
         """
         try:
             conn, cursor = self._get_connection()
-            data_str = json.dumps(data)
+            data_str = _encode_payload(data)
             timestamp = datetime.now().isoformat()
             
             cursor.execute(
@@ -455,6 +639,33 @@ class DatabaseCache:
             logger.error(f"Error storing performance metrics: {e}")
             return False
     
+    def store_history_rows(self, rows: Dict[str, List[Tuple[Any, ...]]]) -> bool:
+        """
+        Insert rows into several history tables in one transaction.
+        
+        Args:
+            rows: Mapping of history table to rows; each row holds the table's
+                ``HISTORY_COLUMNS`` values followed by the timestamp and the
+                encoded payload
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            conn, cursor = self._get_connection()
+            with conn:
+                for table, table_rows in rows.items():
+                    columns = HISTORY_COLUMNS[table] + ("timestamp", "data")
+                    cursor.executemany(
+                        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})",
+                        table_rows
+                    )
+            logger.debug(f"Stored {sum(len(table_rows) for table_rows in rows.values())} history rows")
+            return True
+        except Exception as e:
+            logger.error(f"Error storing history rows: {e}")
+            return False
+    
     def store_token_performance(self, token_data: Dict[str, Any]) -> bool:
         """
         Store token performance data in the history table.
@@ -465,55 +676,358 @@ class DatabaseCache:
         Returns:
             True if successful, False otherwise
         """
+        if not token_data.get('mint'):
+            logger.warning("Cannot store token performance: missing mint address")
+            return False
+        return self.store_token_performances([token_data]) == 1
+    
+    def store_token_performances(self, tokens: List[Dict[str, Any]]) -> int:
+        """
+        Ingest a batch of token snapshots in one transaction.
+        
+        Every token's row in ``pump_token_latest`` is upserted; a history
+        row in ``pump_token_performance`` is only added for tokens whose
+        tracked metrics differ from their latest state.
+        
+        Args:
+            tokens: Token data from the Pump.fun API
+            
+        Returns:
+            Number of tokens stored
+        """
         try:
+            timestamp = datetime.now().isoformat()
+            rows: Dict[str, Tuple[Any, ...]] = {}
+            for token_data in tokens:
+                row = _token_performance_row(token_data, timestamp)
+                if row is not None:
+                    rows[row[0]] = row
+            if not rows:
+                return 0
+            
             conn, cursor = self._get_connection()
-            mint = token_data.get('mint')
-            if not mint:
-                logger.warning("Cannot store token performance: missing mint address")
-                return False
+            metrics = slice(3, 3 + len(_TOKEN_METRIC_COLUMNS))
+            columns = ', '.join(_TOKEN_COLUMNS)
+            placeholders = ', '.join('?' * len(_TOKEN_COLUMNS))
+            with conn:
+                # Stay below SQLite's host parameter limit
+                mints = list(rows)
+                latest = {}
+                for i in range(0, len(mints), 500):
+                    chunk = mints[i:i + 500]
+                    cursor.execute(
+                        f"SELECT mint, {', '.join(_TOKEN_METRIC_COLUMNS)} FROM pump_token_latest WHERE mint IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    )
+                    for row in cursor.fetchall():
+                        latest[row[0]] = tuple(row[1:])
                 
-            # Extract relevant fields
-            name = token_data.get('name', '')
-            symbol = token_data.get('symbol', '')
-            
-            # Calculate price if possible
-            price = 0
-            if token_data.get('virtual_sol_reserves') and token_data.get('virtual_token_reserves'):
-                sol_reserves = float(token_data.get('virtual_sol_reserves', 0)) / 1000000000  # Convert lamports to SOL
-                token_reserves = float(token_data.get('virtual_token_reserves', 0)) / 1000000000  # Convert to standard units
-                if token_reserves > 0:
-                    price = sol_reserves / token_reserves
-            
-            # Other metrics
-            price_change_1h = float(token_data.get('price_change_1h', 0))
-            price_change_24h = float(token_data.get('price_change_24h', 0))
-            price_change_7d = float(token_data.get('price_change_7d', 0))
-            volume_24h = float(token_data.get('volume_24h', 0))
-            market_cap = float(token_data.get('market_cap', 0))
-            virtual_sol_reserves = float(token_data.get('virtual_sol_reserves', 0)) / 1000000000
-            virtual_token_reserves = float(token_data.get('virtual_token_reserves', 0)) / 1000000000
-            
-            # Convert to JSON for storage
-            data_str = json.dumps(token_data)
-            timestamp = datetime.now().isoformat()
+                changed = [row for mint, row in rows.items() if latest.get(mint) != row[metrics]]
+                cursor.executemany(
+                    f"INSERT INTO pump_token_performance ({columns}) VALUES ({placeholders})",
+                    changed
+                )
+                cursor.executemany(
+                    f"""
+                    INSERT INTO pump_token_latest ({columns}) VALUES ({placeholders})
+                    ON CONFLICT(mint) DO UPDATE SET
+                    {', '.join(f'{column} = excluded.{column}' for column in _TOKEN_COLUMNS[1:])}
+                    """,
+                    list(rows.values())
+                )
+            logger.debug(f"Stored performance data for {len(rows)} tokens ({len(changed)} changed)")
+            return len(rows)
+        except Exception as e:
+            logger.error(f"Error storing token performance: {e}")
+            return 0
+    
+    def store_first_seen_mints(self, rows: List[Tuple[str, Optional[int], Optional[int]]]) -> bool:
+        """
+        Record the first sighting of mint addresses in one transaction.
+        
+        Mints that are already indexed keep the earliest first-seen slot.
+        
+        Args:
+            rows: (mint, first_seen_slot, first_seen_time) tuples
             
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.executemany(
+                """
+                INSERT INTO mint_index (mint, first_seen_slot, first_seen_time) VALUES (?, ?, ?)
+                ON CONFLICT(mint) DO UPDATE SET
+                    first_seen_slot = excluded.first_seen_slot,
+                    first_seen_time = excluded.first_seen_time
+                WHERE excluded.first_seen_slot < mint_index.first_seen_slot
+                """,
+                rows
+            )
+            conn.commit()
+            logger.debug(f"Indexed {len(rows)} mints")
+            return True
+        except Exception as e:
+            logger.error(f"Error storing first-seen mints: {e}")
+            return False
+    
+    def get_first_seen_mints(self, mints: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get first-seen information for mint addresses.
+        
+        Args:
+            mints: Mint addresses to look up
+            
+        Returns:
+            Mapping of indexed mint address to its first-seen slot and time
+        """
+        try:
+            conn, cursor = self._get_connection()
+            found = {}
+            # Stay below SQLite's host parameter limit
+            for i in range(0, len(mints), 500):
+                chunk = mints[i:i + 500]
+                cursor.execute(
+                    f"SELECT mint, first_seen_slot, first_seen_time FROM mint_index WHERE mint IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    found[row["mint"]] = {
+                        "first_seen_slot": row["first_seen_slot"],
+                        "first_seen_time": row["first_seen_time"]
+                    }
+            return found
+        except Exception as e:
+            logger.error(f"Error getting first-seen mints: {e}")
+            return {}
+    
+    def iter_indexed_mints(self, chunk_size: int = 10000) -> Iterator[Tuple[str, Optional[int]]]:
+        """
+        Iterate over every indexed mint address.
+        
+        Args:
+            chunk_size: Number of rows fetched per round trip
+            
+        Yields:
+            (mint, first_seen_slot) tuples
+        """
+        try:
+            conn, _ = self._get_connection()
+            cursor = conn.execute("SELECT mint, first_seen_slot FROM mint_index")
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield row[0], row[1]
+        except Exception as e:
+            logger.error(f"Error reading mint index: {e}")
+    
+    def count_indexed_mints(self) -> int:
+        """Get the number of indexed mint addresses."""
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("SELECT COUNT(*) FROM mint_index")
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error counting indexed mints: {e}")
+            return 0
+    
+    def store_address_index(
+        self,
+        blocks: List[Tuple[int, Optional[int], Optional[int], str]],
+        postings: List[Tuple[str, int, int, int, bytes]]
+    ) -> bool:
+        """
+        Write indexed blocks and their posting lists in one transaction.
+        
+        Args:
+            blocks: (slot, parent_slot, block_time, newline-joined signatures) tuples
+            postings: (address, first_slot, last_slot, entries, encoded postings) tuples
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.executemany(
+                "INSERT OR REPLACE INTO address_index_blocks (slot, parent_slot, block_time, signatures) VALUES (?, ?, ?, ?)",
+                blocks
+            )
+            cursor.executemany(
+                "INSERT INTO address_postings (address, first_slot, last_slot, entries, postings) VALUES (?, ?, ?, ?, ?)",
+                postings
+            )
+            conn.commit()
+            logger.debug(f"Indexed {len(blocks)} blocks with {len(postings)} posting lists")
+            return True
+        except Exception as e:
+            logger.error(f"Error storing address index: {e}")
+            return False
+    
+    def get_address_postings(
+        self,
+        address: str,
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None
+    ) -> List[Tuple[int, int, bytes]]:
+        """
+        Get the encoded posting lists of an address that overlap a slot range.
+        
+        Args:
+            address: Account, mint or program address
+            start_slot: Oldest slot of interest
+            end_slot: Newest slot of interest
+            
+        Returns:
+            (first_slot, last_slot, encoded postings) tuples, newest first
+        """
+        try:
+            conn, cursor = self._get_connection()
             cursor.execute(
                 """
-                INSERT INTO pump_token_performance 
-                (mint, name, symbol, price, price_change_1h, price_change_24h, price_change_7d, 
-                volume_24h, market_cap, virtual_sol_reserves, virtual_token_reserves, timestamp, data) 
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                SELECT first_slot, last_slot, postings FROM address_postings
+                WHERE address = ? AND last_slot >= ? AND first_slot <= ?
+                ORDER BY last_slot DESC
                 """,
-                (mint, name, symbol, price, price_change_1h, price_change_24h, price_change_7d, 
-                volume_24h, market_cap, virtual_sol_reserves, virtual_token_reserves, timestamp, data_str)
+                (address, start_slot if start_slot is not None else 0, end_slot if end_slot is not None else 2 ** 63 - 1)
+            )
+            return [(row[0], row[1], row[2]) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error getting address postings: {e}")
+            return []
+    
+    def get_address_index_blocks(self, slots: List[int]) -> Dict[int, Tuple[Optional[int], List[str]]]:
+        """
+        Get the block time and signatures of indexed blocks.
+        
+        Args:
+            slots: Slots to look up
+            
+        Returns:
+            Mapping of indexed slot to (block_time, signatures)
+        """
+        try:
+            conn, cursor = self._get_connection()
+            found = {}
+            for i in range(0, len(slots), 500):
+                chunk = slots[i:i + 500]
+                cursor.execute(
+                    f"SELECT slot, block_time, signatures FROM address_index_blocks WHERE slot IN ({','.join('?' * len(chunk))})",
+                    chunk
+                )
+                for row in cursor.fetchall():
+                    found[row["slot"]] = (row["block_time"], row["signatures"].split("\n") if row["signatures"] else [])
+            return found
+        except Exception as e:
+            logger.error(f"Error getting address index blocks: {e}")
+            return {}
+    
+    def get_address_index_first_slot(self, since: int) -> Optional[int]:
+        """
+        Get the oldest indexed slot with a block time at or after a given time.
+        
+        Args:
+            since: Unix time
+            
+        Returns:
+            The slot, or None if no indexed block is that recent
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("SELECT MIN(slot) FROM address_index_blocks WHERE block_time >= ?", (since,))
+            return cursor.fetchone()[0]
+        except Exception as e:
+            logger.error(f"Error finding address index slot: {e}")
+            return None
+    
+    def get_address_index_slots(self) -> List[Tuple[int, Optional[int]]]:
+        """Get (slot, parent_slot) of every indexed block, oldest first."""
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("SELECT slot, parent_slot FROM address_index_blocks ORDER BY slot")
+            return [(row[0], row[1]) for row in cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Error reading address index slots: {e}")
+            return []
+    
+    def prune_address_index(self, cutoff_time: int) -> int:
+        """
+        Drop indexed blocks older than a block time, and the posting lists ending before the oldest kept block.
+        
+        Args:
+            cutoff_time: Unix time; blocks with an earlier block time are dropped
+            
+        Returns:
+            Number of blocks dropped
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("DELETE FROM address_index_blocks WHERE block_time < ?", (cutoff_time,))
+            dropped = cursor.rowcount
+            cursor.execute("SELECT MIN(slot) FROM address_index_blocks")
+            oldest = cursor.fetchone()[0]
+            if oldest is None:
+                cursor.execute("DELETE FROM address_postings")
+            else:
+                cursor.execute("DELETE FROM address_postings WHERE last_slot < ?", (oldest,))
+            conn.commit()
+            return dropped
+        except Exception as e:
+            logger.error(f"Error pruning address index: {e}")
+            return 0
+    
+    def store_rpc_endpoint_scores(self, rows: List[Tuple[str, Optional[int], str, float]]) -> bool:
+        """
+        Replace the stored RPC endpoint scores.
+        
+        Args:
+            rows: (url, pool_rank or None, JSON-encoded stats, updated_at) tuples
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute("DELETE FROM rpc_endpoint_scores")
+            cursor.executemany(
+                "INSERT INTO rpc_endpoint_scores (url, pool_rank, stats, updated_at) VALUES (?, ?, ?, ?)",
+                rows
             )
             conn.commit()
-            logger.debug(f"Stored performance data for token {symbol} ({mint})")
             return True
         except Exception as e:
-            logger.error(f"Error storing token performance: {e}")
+            logger.error(f"Error storing RPC endpoint scores: {e}")
             return False
     
+    def get_rpc_endpoint_scores(self, since: float = 0) -> List[Dict[str, Any]]:
+        """
+        Get the stored RPC endpoint scores.
+        
+        Args:
+            since: Unix time; scores saved earlier are ignored
+            
+        Returns:
+            Dicts with url, pool_rank and stats, pool members first in rank order
+        """
+        try:
+            conn, cursor = self._get_connection()
+            cursor.execute(
+                """
+                SELECT url, pool_rank, stats FROM rpc_endpoint_scores
+                WHERE updated_at >= ? ORDER BY pool_rank IS NULL, pool_rank
+                """,
+                (since,)
+            )
+            return [
+                {"url": row["url"], "pool_rank": row["pool_rank"], "stats": json.loads(row["stats"])}
+                for row in cursor.fetchall()
+            ]
+        except Exception as e:
+            logger.error(f"Error getting RPC endpoint scores: {e}")
+            return []
+    
     def get_network_status_history(self, limit: int = 24, hours: int = 24) -> List[Dict[str, Any]]:
         """
         Get network status history for the past hours.
@@ -539,7 +1053,7 @@ class DatabaseCache:
                 {
                     "status": row["status"],
                     "timestamp": row["timestamp"],
-                    "data": json.loads(row["data"])
+                    "data": loads(row["data"])
                 }
                 for row in rows
             ]
@@ -641,19 +1155,13 @@ class DatabaseCache:
                 
             cutoff = (datetime.now() - timedelta(hours=hours)).isoformat()
             
-            # Get the latest record for each token within the time window
+            # Tokens seen within the time window, from their latest state
             cursor.execute(
                 f"""
-                WITH LatestTokens AS (
-                    SELECT mint, MAX(timestamp) as max_timestamp
-                    FROM pump_token_performance
-                    WHERE timestamp > ?
-                    GROUP BY mint
-                )
-                SELECT p.*
-                FROM pump_token_performance p
-                JOIN LatestTokens lt ON p.mint = lt.mint AND p.timestamp = lt.max_timestamp
-                ORDER BY p.{metric} DESC
+                SELECT *
+                FROM pump_token_latest
+                WHERE timestamp > ?
+                ORDER BY {metric} DESC
                 LIMIT ?
                 """,
                 (cutoff, limit)
@@ -224,6 +224,3 @@ def export_database_stats():
     except Exception as e:
         logger.error(f"Error exporting database stats: {e}")
         return {'error': str(e)}
-
-# Initialize the database when the module is imported
-initialize_database()
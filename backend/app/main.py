@@ -1,67 +1,81 @@
 """
 FastAPI application main module.
 """
+import time
+_import_started = time.perf_counter()
+
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, APIRouter, Query, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from prometheus_client import make_asgi_app
 import asyncio
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.interval import IntervalTrigger
 from datetime import datetime
 import logging
 import os
+from typing import TYPE_CHECKING
 
-from app.routers.soleco import router as soleco_router
-from app.routers.diagnostics import router as diagnostics_router
-from app.routers.pump import router as pumpfun_router
-from app.routers.pump_trending import router as pump_trending_router
-from app.routers.jupiter import router as jupiter_router
-from app.routers.dexscreener import router as dexscreener_router
-from app.routers.helius import router as helius_router
-from app.routers.moralis import router as moralis_router
-from app.routers.raydium import router as raydium_router
-from app.routers.rugcheck import router as rugcheck_router
-from app.routers.shyft import router as shyft_router
-from app.routers.cli import router as cli_router
-from app.routers.wallet import router as wallet_router
-from app.routers.analytics import router as analytics_router
-from app.routers.solana import router as solana_router
-from app.routers.solana_token import router as solana_token_router
+from app.routers.loader import include_router, shutdown_lazy_routers
 
 from app.utils.solana_rpc import get_connection_pool, DEFAULT_RPC_ENDPOINTS
-from app.dependencies.solana import get_query_handler
 from app.utils.logging_config import setup_logging
 from app.database.middleware import CacheMiddleware
-from app.tasks.pump_data_collector import run_data_collection
-from app.scripts.schedule_rpc_pool_update import start_scheduler as start_rpc_pool_scheduler
-from app.utils.solana_query import SolanaQueryHandler
-from app.utils.cache.database_cache import DatabaseCache
+from app.database.history import get_history_recorder
+from app.utils.mint_index import get_mint_index
+from app.utils.block_workers import shutdown_block_workers
+from app.utils.rpc_transport import get_rpc_transport
+from app.utils.endpoint_scores import get_endpoint_score_store
+from app.utils.address_index import get_address_index
+from app.utils.metrics import monitor_event_loop_lag
+from app.utils.serialization import SolecoJSONResponse
+from app.utils.import_profile import record_import
+from app.database.utils import initialize_database
+
+if TYPE_CHECKING:
+    from app.utils.solana_query import SolanaQueryHandler
 
 # Configure logging
 logger = setup_logging('app.main')
 
-# Create a scheduler for background tasks
-scheduler = AsyncIOScheduler()
-
 # Store background tasks
 background_tasks = []
 
-async def _test_connection_pool(pool):
-    async with await pool.acquire() as client:
-        logger.info("Connection pool test successful")
-
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """
     Lifespan context manager for FastAPI app.
     Handles startup and shutdown events.
+    
+    The scheduler, block tail, query handler and Pump.fun client stacks are
+    imported here rather than at module level, so importing the app stays
+    cheap and optional routers really are loaded on first use.
     """
+    from apscheduler.schedulers.asyncio import AsyncIOScheduler
+    from apscheduler.triggers.interval import IntervalTrigger
+    from app.dependencies.solana import get_query_handler
+    from app.tasks.block_tail import start_block_tail, get_block_tail
+    from app.utils.pump_client import get_pump_client
+    
+    # Create a scheduler for background tasks
+    scheduler = AsyncIOScheduler()
+    
     # Startup
     logger.info("Starting up application...")
     
+    # Create the database tables before anything reads them
+    try:
+        await asyncio.to_thread(initialize_database)
+    except Exception as e:
+        logger.error(f"Error initializing database: {str(e)}")
+        logger.exception(e)
+    
+    # Sample event loop lag for the whole lifetime of the app
+    background_tasks.append(asyncio.create_task(monitor_event_loop_lag(), name="event_loop_lag_monitor"))
+    
+    # Write sampled endpoint history in the background; cancelling the task flushes what is left
+    background_tasks.append(asyncio.create_task(get_history_recorder().run(), name="history_writer"))
+    
     try:
-        # Initialize connection pool
+        # Initialize connection pool; a warm start checks endpoint health in the background
         logger.info("Initializing connection pool...")
         pool = await get_connection_pool()
         if not pool._initialized:
@@ -70,6 +84,15 @@ async def lifespan(app: FastAPI):
             logger.info("Connection pool initialized")
         else:
             logger.info("Connection pool already initialized")
+        warm_started = pool._verify_task is not None
+        
+        # Snapshot endpoint scores so the next start can warm-start
+        score_store = get_endpoint_score_store()
+        if score_store is not None:
+            background_tasks.append(asyncio.create_task(
+                score_store.run(lambda: [client.endpoint for client, _ in pool._pool]),
+                name="endpoint_score_writer"
+            ))
             
         # Initialize shared query handler
         logger.info("Initializing shared query handler...")
@@ -77,28 +100,13 @@ async def lifespan(app: FastAPI):
         await query_handler.initialize()
         logger.info("Shared query handler initialized")
         
-        # Test connection
-        logger.info("Testing connection pool...")
-        try:
-            # Use asyncio.wait_for to add a timeout to the connection test
-            await asyncio.wait_for(
-                _test_connection_pool(pool),
-                timeout=10.0  # 10 second timeout for the connection test
-            )
-            logger.info("Connection pool test successful")
-        except asyncio.TimeoutError:
-            logger.warning("Connection pool test timed out after 10 seconds, continuing anyway")
-        except Exception as e:
-            logger.error(f"Connection pool test failed: {str(e)}")
-            logger.exception(e)
-            logger.warning("Continuing startup despite connection pool test failure")
-        
         # Schedule background tasks
         logger.info("Scheduling background tasks...")
         try:
             # Schedule pump data collection
             logger.info("Scheduling pump data collection...")
             async def run_task():
+                from app.tasks.pump_data_collector import run_data_collection
                 await run_data_collection()
                 
             scheduler.add_job(
@@ -136,12 +144,15 @@ async def lifespan(app: FastAPI):
                 # Start the scheduler
                 logger.info("Calling start_rpc_pool_scheduler")
                 try:
+                    from app.scripts.schedule_rpc_pool_update import start_scheduler as start_rpc_pool_scheduler
+                    
                     logger.info("About to call start_rpc_pool_scheduler with parameters: interval_hours=12.0, health_check_interval=1.0, max_test=50, max_endpoints=10")
                     rpc_pool_task = await start_rpc_pool_scheduler(
                         interval_hours=12.0,           # Full update every 12 hours
                         health_check_interval=1.0,     # Health check every 1 hour
                         max_test=50,                   # Test up to 50 endpoints
-                        max_endpoints=10               # Keep top 10 endpoints in the pool
+                        max_endpoints=10,              # Keep top 10 endpoints in the pool
+                        initial_update=not warm_started  # Saved endpoints stand in for discovery
                     )
                     logger.info(f"start_rpc_pool_scheduler returned task: {rpc_pool_task}")
                     
@@ -151,17 +162,6 @@ async def lifespan(app: FastAPI):
                         logger.info("Adding RPC pool task to background_tasks list")
                         background_tasks.append(rpc_pool_task)
                         logger.info("RPC pool update scheduler started successfully")
-                        
-                        # Check if the task is still running after a short delay
-                        logger.info("Waiting 2 seconds to check if task is still running...")
-                        await asyncio.sleep(2)
-                        if rpc_pool_task.done():
-                            if rpc_pool_task.exception():
-                                logger.error(f"RPC pool scheduler task failed: {rpc_pool_task.exception()}")
-                            else:
-                                logger.error("RPC pool scheduler task completed unexpectedly")
-                        else:
-                            logger.info("RPC pool scheduler task is running")
                 except Exception as e:
                     logger.error(f"Error in start_rpc_pool_scheduler: {str(e)}")
                     logger.exception(e)
@@ -196,6 +196,30 @@ async def lifespan(app: FastAPI):
             logger.error(f"Error starting scheduler: {str(e)}")
             logger.exception(e)
         
+        # Load the first-seen mint index before any extractor runs
+        try:
+            await asyncio.to_thread(get_mint_index().load)
+        except Exception as e:
+            logger.error(f"Error loading mint index: {str(e)}")
+            logger.exception(e)
+        
+        # Load the address index's slot coverage and write its postings in the background
+        address_index = get_address_index()
+        if address_index is not None:
+            try:
+                await asyncio.to_thread(address_index.load)
+                background_tasks.append(asyncio.create_task(address_index.run(), name="address_index_writer"))
+            except Exception as e:
+                logger.error(f"Error loading address index: {str(e)}")
+                logger.exception(e)
+        
+        # Start live block tail ingestion
+        try:
+            await start_block_tail()
+        except Exception as e:
+            logger.error(f"Error starting block tail ingestion: {str(e)}")
+            logger.exception(e)
+        
         # Ensure we yield control back to Uvicorn
         logger.info("About to yield control to Uvicorn")
         yield
@@ -213,6 +237,42 @@ async def lifespan(app: FastAPI):
                 except asyncio.CancelledError:
                     pass
         
+        # Stop block tail ingestion
+        try:
+            await get_block_tail().stop()
+        except Exception as e:
+            logger.error(f"Error stopping block tail ingestion: {str(e)}")
+        
+        # Stop the block worker processes
+        try:
+            await asyncio.to_thread(shutdown_block_workers)
+        except Exception as e:
+            logger.error(f"Error stopping block workers: {str(e)}")
+        
+        # Run the shutdown handlers of routers that were loaded on first use
+        try:
+            await shutdown_lazy_routers()
+        except Exception as e:
+            logger.error(f"Error shutting down lazily loaded routers: {str(e)}")
+        
+        # Close the pooled Pump.fun client
+        try:
+            await get_pump_client().close()
+        except Exception as e:
+            logger.error(f"Error closing Pump.fun client: {str(e)}")
+        
+        # Close the shared RPC session
+        try:
+            await get_rpc_transport().close()
+        except Exception as e:
+            logger.error(f"Error closing RPC transport: {str(e)}")
+        
+        # Write out pending mint index sightings
+        try:
+            await asyncio.to_thread(get_mint_index().flush)
+        except Exception as e:
+            logger.error(f"Error flushing mint index: {str(e)}")
+        
         # Shutdown scheduler
         try:
             if scheduler.running:
@@ -222,7 +282,9 @@ async def lifespan(app: FastAPI):
             logger.error(f"Error shutting down scheduler: {str(e)}")
         logger.info("Application shutdown complete")
 
-async def get_solana_query_handler() -> SolanaQueryHandler:
+async def get_solana_query_handler() -> "SolanaQueryHandler":
+    from app.utils.solana_query import SolanaQueryHandler
+    from app.utils.cache.database_cache import DatabaseCache
     cache = DatabaseCache()
     return SolanaQueryHandler(cache)
 
@@ -234,6 +296,7 @@ app = FastAPI(
     """,
     version="0.1.0",
     lifespan=lifespan,
+    default_response_class=SolecoJSONResponse,
     docs_url="/docs",
     redoc_url="/redoc",
     openapi_url="/openapi.json",
@@ -273,23 +336,23 @@ app.mount("/metrics", metrics_app)
 # Create API router with prefix
 api_router = APIRouter(prefix="/api")
 
-# Include Soleco routers first
-api_router.include_router(soleco_router, prefix="/soleco", tags=["Soleco"])  # Main Soleco endpoints
-api_router.include_router(diagnostics_router, prefix="/soleco/diagnostics", tags=["Soleco Diagnostics"])  # Diagnostics endpoints second
-api_router.include_router(pumpfun_router, prefix="/soleco/pumpfun", tags=["PumpFun"])  # PumpFun endpoints third
-api_router.include_router(pump_trending_router, prefix="/soleco/pump_trending", tags=["Pump Analytics"])  # Pump Trending endpoints
-api_router.include_router(cli_router, prefix="/soleco/cli", tags=["CLI"])  # CLI endpoints
-api_router.include_router(wallet_router, prefix="/soleco/wallet", tags=["Wallet"])  # Wallet endpoints moved under /soleco to match frontend expectations
-api_router.include_router(analytics_router, prefix="/soleco/analytics", tags=["Analytics"])  # Analytics endpoints
+# Include Soleco routers first; optional routers are imported on first use (see app/routers/loader.py)
+include_router(api_router, "soleco", prefix="/soleco", tags=["Soleco"])  # Main Soleco endpoints
+include_router(api_router, "diagnostics", prefix="/soleco/diagnostics", tags=["Soleco Diagnostics"])  # Diagnostics endpoints second
+include_router(api_router, "pump", prefix="/soleco/pumpfun", tags=["PumpFun"])  # PumpFun endpoints third
+include_router(api_router, "pump_trending", prefix="/soleco/pump_trending", tags=["Pump Analytics"])  # Pump Trending endpoints
+include_router(api_router, "cli", prefix="/soleco/cli", tags=["CLI"])  # CLI endpoints
+include_router(api_router, "wallet", prefix="/soleco/wallet", tags=["Wallet"])  # Wallet endpoints moved under /soleco to match frontend expectations
+include_router(api_router, "analytics", prefix="/soleco/analytics", tags=["Analytics"])  # Analytics endpoints
 
 # Include external API routers
-api_router.include_router(jupiter_router, prefix="/external/jupiter", tags=["Jupiter"])
-api_router.include_router(dexscreener_router, prefix="/external/dexscreener", tags=["DexScreener"])
-api_router.include_router(helius_router, prefix="/external/helius", tags=["Helius"])
-api_router.include_router(moralis_router, prefix="/external/moralis", tags=["Moralis"])
-api_router.include_router(raydium_router, prefix="/external/raydium", tags=["Raydium"])
-api_router.include_router(rugcheck_router, prefix="/external/rugcheck", tags=["RugCheck"])
-api_router.include_router(shyft_router, prefix="/external/shyft", tags=["Shyft"])
+include_router(api_router, "jupiter", prefix="/external/jupiter", tags=["Jupiter"])
+include_router(api_router, "dexscreener", prefix="/external/dexscreener", tags=["DexScreener"])
+include_router(api_router, "helius", prefix="/external/helius", tags=["Helius"])
+include_router(api_router, "moralis", prefix="/external/moralis", tags=["Moralis"])
+include_router(api_router, "raydium", prefix="/external/raydium", tags=["Raydium"])
+include_router(api_router, "rugcheck", prefix="/external/rugcheck", tags=["RugCheck"])
+include_router(api_router, "shyft", prefix="/external/shyft", tags=["Shyft"])
 
 # Add a simple test endpoint for browser connectivity checks
 @app.get("/api/test-connection", tags=["Diagnostics"])
@@ -309,6 +372,8 @@ async def test_connection():
 async def test_scheduler_endpoint():
     """Test endpoint to manually start the RPC pool scheduler."""
     try:
+        from app.scripts.schedule_rpc_pool_update import start_scheduler as start_rpc_pool_scheduler
+        
         # Configure scheduler logging
         scheduler_logger = logging.getLogger('app.scripts.schedule_rpc_pool_update')
         scheduler_logger.setLevel(logging.DEBUG)
@@ -390,27 +455,27 @@ async def update_rpc_pool_endpoint(max_test: int = 20, max_endpoints: int = 10,
         return {"status": "error", "message": f"Error updating RPC pool: {str(e)}"}
 
 # Include API routers
-app.include_router(soleco_router, prefix="/soleco")
-app.include_router(diagnostics_router, prefix="/diagnostics")
-app.include_router(pumpfun_router, prefix="/pump")
-app.include_router(pump_trending_router, prefix="/pump/trending")
-app.include_router(jupiter_router, prefix="/jupiter")
-app.include_router(dexscreener_router, prefix="/dexscreener")
-app.include_router(helius_router, prefix="/helius")
-app.include_router(moralis_router, prefix="/moralis")
-app.include_router(raydium_router, prefix="/raydium")
-app.include_router(rugcheck_router, prefix="/rugcheck")
-app.include_router(shyft_router, prefix="/shyft")
-app.include_router(cli_router, prefix="/cli")
-app.include_router(wallet_router, prefix="/wallet")
-app.include_router(analytics_router, prefix="/analytics")
-app.include_router(solana_router, prefix="/solana")
-app.include_router(solana_token_router, prefix="/solana/token")
+include_router(app, "soleco", prefix="/soleco")
+include_router(app, "diagnostics", prefix="/diagnostics")
+include_router(app, "pump_trending", prefix="/pump/trending")  # Before /pump, whose lazy mount would match it too
+include_router(app, "pump", prefix="/pump")
+include_router(app, "jupiter", prefix="/jupiter")
+include_router(app, "dexscreener", prefix="/dexscreener")
+include_router(app, "helius", prefix="/helius")
+include_router(app, "moralis", prefix="/moralis")
+include_router(app, "raydium", prefix="/raydium")
+include_router(app, "rugcheck", prefix="/rugcheck")
+include_router(app, "shyft", prefix="/shyft")
+include_router(app, "cli", prefix="/cli")
+include_router(app, "wallet", prefix="/wallet")
+include_router(app, "analytics", prefix="/analytics")
+include_router(app, "solana", prefix="/solana")
+include_router(app, "solana_token", prefix="/solana/token")
 
 @app.get("/api/v1/soleco/solana/token-info")
 async def get_token_info(
     token_address: str = Query(..., description="The token address to get info for"),
-    handler: SolanaQueryHandler = Depends(get_solana_query_handler)
+    handler=Depends(get_solana_query_handler)
 ):
     return await handler.get_token_info(token_address)
 
@@ -420,3 +485,5 @@ async def root():
     Root endpoint.
     """
     return {"message": "Welcome to Soleco API. Visit /docs for API documentation."}
+
+record_import("app.main", time.perf_counter() - _import_started)
@@ -1,25 +1,27 @@
 # This file makes the routers directory a Python package
+#
+# Routers are imported on first access (see loader.py), so importing one
+# router module no longer imports all of the others.
 
-from .soleco import router as soleco_router
-from .diagnostics import router as diagnostics_router
-from .pump import router as pumpfun_router
-from .jupiter import router as jupiter_router
-from .raydium import router as raydium_router
-from .helius import router as helius_router
-from .shyft import router as shyft_router
-from .moralis import router as moralis_router
-from .rugcheck import router as rugcheck_router
-from .dexscreener import router as dexscreener_router
+from .loader import load_router
 
-routers = [
-    soleco_router,  # Soleco router first
-    diagnostics_router,  # Soleco Diagnostics second
-    pumpfun_router,  # PumpFun third
-    jupiter_router,
-    raydium_router,
-    helius_router,
-    shyft_router,
-    moralis_router,
-    rugcheck_router,
-    dexscreener_router
-]
+_ROUTER_ATTRIBUTES = {
+    'soleco_router': 'soleco',  # Soleco router first
+    'diagnostics_router': 'diagnostics',  # Soleco Diagnostics second
+    'pumpfun_router': 'pump',  # PumpFun third
+    'jupiter_router': 'jupiter',
+    'raydium_router': 'raydium',
+    'helius_router': 'helius',
+    'shyft_router': 'shyft',
+    'moralis_router': 'moralis',
+    'rugcheck_router': 'rugcheck',
+    'dexscreener_router': 'dexscreener',
+}
+
+
+def __getattr__(name):
+    if name == 'routers':
+        return [load_router(module) for module in _ROUTER_ATTRIBUTES.values()]
+    if name in _ROUTER_ATTRIBUTES:
+        return load_router(_ROUTER_ATTRIBUTES[name])
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
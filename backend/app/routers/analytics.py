@@ -1,11 +1,14 @@
 """
 Analytics router for historical data.
 """
+import asyncio
 import logging
+import time
 from typing import List, Dict, Any, Optional
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 
 from app.database.sqlite import db_cache
+from app.utils.address_index import get_address_index
 
 # Configure logging
 logger = logging.getLogger("app.routers.analytics")
@@ -116,3 +119,35 @@ async def get_performance_metrics_history(
     """
     logger.info(f"Getting performance metrics history for the past {hours} hours (limit: {limit})")
     return db_cache.get_performance_metrics_history(limit, hours)
+
+@router.get("/address/{address}/activity")
+async def get_address_activity(
+    address: str,
+    minutes: int = Query(60, description="Number of minutes to look back"),
+    limit: int = Query(100, ge=1, le=10000, description="Maximum number of transactions to return")
+) -> Dict[str, Any]:
+    """
+    Get recent transactions touching an account, mint or program from the local address index.
+    
+    Args:
+        address: Account, mint or program address
+        minutes: Number of minutes to look back
+        limit: Maximum number of transactions to return
+        
+    Returns:
+        Dict with the transactions (newest first) and the slot ranges the index covers
+    """
+    address_index = get_address_index()
+    if address_index is None:
+        raise HTTPException(status_code=503, detail="Address index is disabled")
+    
+    logger.info(f"Getting indexed activity for {address} over the past {minutes} minutes (limit: {limit})")
+    since = int(time.time()) - minutes * 60
+    transactions = await asyncio.to_thread(address_index.lookup, address, None, None, since, limit)
+    return {
+        "address": address,
+        "transactions": transactions,
+        "count": len(transactions),
+        "truncated": len(transactions) >= limit,
+        "coverage": address_index.coverage.ranges,
+    }
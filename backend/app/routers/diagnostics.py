@@ -7,7 +7,7 @@ import psutil
 import os
 import sys
 import time
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
@@ -16,6 +16,11 @@ from app.database.utils import export_database_stats, cleanup_database
 from app.utils.comprehensive_solana_diagnostic import run_full_health_check
 from app.utils.solana_import_diagnostic import validate_imports
 from app.dependencies.rate_limiter import create_rate_limiter
+from app.utils.import_profile import get_import_stats, profile_imports
+from app.routers.loader import get_router_status
+from app.utils.rpc_transport import get_rpc_transport
+from app.utils.slot_map import get_slot_map
+from app.config import ADAPTIVE_CONCURRENCY_CONFIG
 
 router = APIRouter(
     prefix="",  # Remove prefix since it's added by main.py
@@ -73,3 +78,60 @@ async def get_database_diagnostics(
         stats['cleanup_result'] = cleanup_result
     
     return stats
+
+@router.get("/import-profile", dependencies=[Depends(create_rate_limiter(times=2, seconds=5))])
+async def get_import_profile(
+    module: Optional[str] = Query(None, description="Also time a fresh import of this module, e.g. app.main"),
+    top: int = Query(25, ge=1, le=500, description="Number of slowest imports to list")
+) -> Dict[str, Any]:
+    """
+    Get import-time diagnostics.
+    
+    Args:
+        module: Module to import in a fresh interpreter with -X importtime
+        top: Number of slowest imports to list for that module
+        
+    Returns:
+        Imports timed in this process, how each router was loaded and,
+        if requested, the slowest imports of the module
+    """
+    report = {**get_import_stats(), "routers": get_router_status()}
+    if module:
+        try:
+            report["profile"] = await profile_imports(module, top=top)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    return report
+
+@router.get("/rpc-concurrency")
+async def get_rpc_concurrency() -> Dict[str, Any]:
+    """
+    Get the adaptive concurrency window of each RPC endpoint.
+    
+    Returns:
+        Current window, requests in flight and queued, and how often the
+        window grew and shrank, by endpoint URL
+    """
+    endpoints = get_rpc_transport().endpoints
+    return {
+        "enabled": ADAPTIVE_CONCURRENCY_CONFIG['enabled'],
+        "endpoints": {
+            url: state.concurrency.to_dict()
+            for url, state in endpoints.items()
+            if state.concurrency is not None
+        }
+    }
+
+@router.get("/slot-map")
+async def get_slot_map_stats() -> Dict[str, Any]:
+    """
+    Get the skipped/confirmed slot map statistics.
+    
+    Returns:
+        Epochs held, memory used and the getBlock and getBlocks requests
+        answered from the map
+    """
+    slot_map = get_slot_map()
+    if slot_map is None:
+        return {"enabled": False}
+    return {"enabled": True, **slot_map.get_stats()}
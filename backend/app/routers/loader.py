@@ -0,0 +1,164 @@
+"""
+On-demand router loading.
+
+main.py used to import every router at module load, and with them the
+Pump.fun, wallet and third-party API client stacks, so every worker start
+paid for routers that few requests use. ``include_router`` imports a router
+when it is included, except for the optional routers listed in
+``ROUTER_CONFIG``: those are mounted as a ``LazyRouterApp``, which imports
+the router on its first request. Lazily mounted routes are served by a
+sub-application and are not listed in the main app's /docs; set
+LAZY_ROUTERS=false to load everything at startup. A mounted app gets no
+lifespan events, so a lazy router's startup handlers run on its first request
+and its shutdown handlers run from the main app's lifespan through
+``shutdown_lazy_routers``.
+"""
+import asyncio
+import importlib
+import inspect
+import logging
+import sys
+import time
+from typing import Any, Dict, Optional, Union
+
+from fastapi import APIRouter, FastAPI
+
+from app.config import ROUTER_CONFIG
+from app.utils.import_profile import record_import
+from app.utils.serialization import SolecoJSONResponse
+
+logger = logging.getLogger(__name__)
+
+_modes: Dict[str, str] = {}
+_lazy_apps: Dict[str, "LazyRouterApp"] = {}
+
+
+def _module_name(name: str) -> str:
+    return f"{__package__}.{name}"
+
+
+def load_router(name: str, lazy: bool = False) -> APIRouter:
+    """
+    Import a router module and return its router.
+
+    Args:
+        name: Module name under app.routers, e.g. "jupiter"
+        lazy: Whether the import was deferred until first use
+
+    Returns:
+        The module's ``router``
+    """
+    imported = _module_name(name) in sys.modules
+    started = time.perf_counter()
+    module = importlib.import_module(_module_name(name))
+    if not imported:
+        record_import(_module_name(name), time.perf_counter() - started, lazy=lazy)
+    return module.router
+
+
+class LazyRouterApp:
+    """
+    ASGI app that imports a router on its first request and serves it from then on.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the app.
+
+        Args:
+            name: Module name under app.routers
+        """
+        self.name = name
+        self._app: Optional[FastAPI] = None
+        self._router: Optional[APIRouter] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def loaded(self) -> bool:
+        return self._app is not None
+
+    async def load(self) -> FastAPI:
+        """
+        Import the router and run its startup handlers, once.
+
+        Returns:
+            The sub-application serving the router
+        """
+        if self._app is not None:
+            return self._app
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if self._app is None:
+                router = load_router(self.name, lazy=True)
+                app = FastAPI(
+                    default_response_class=SolecoJSONResponse,
+                    docs_url=None,
+                    redoc_url=None,
+                    openapi_url=None,
+                )
+                app.include_router(router)
+                # A mounted app gets no lifespan events, so the router's startup handlers run here
+                for handler in router.on_startup:
+                    result = handler()
+                    if inspect.isawaitable(result):
+                        await result
+                logger.info(f"Loaded router {self.name} on first request")
+                self._router = router
+                self._app = app
+        return self._app
+
+    async def shutdown(self) -> None:
+        """Run the router's shutdown handlers if it was loaded."""
+        if self._router is None:
+            return
+        router, self._router, self._app = self._router, None, None
+        for handler in router.on_shutdown:
+            try:
+                result = handler()
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Shutdown handler of router {self.name} failed: {str(e)}")
+
+    async def __call__(self, scope, receive, send) -> None:
+        app = await self.load()
+        await app(scope, receive, send)
+
+
+def include_router(target: Union[FastAPI, APIRouter], name: str, prefix: str, **kwargs: Any) -> None:
+    """
+    Include a router by module name, deferring the import if the router is optional.
+
+    Args:
+        target: App or router to include it in
+        name: Module name under app.routers
+        prefix: Path prefix of the router's routes
+        **kwargs: Passed on to include_router, e.g. tags
+    """
+    if name in ROUTER_CONFIG['disabled']:
+        _modes[name] = "disabled"
+        logger.info(f"Router {name} is disabled")
+        return
+    if ROUTER_CONFIG['lazy'] and name in ROUTER_CONFIG['optional']:
+        _modes[name] = "lazy"
+        # One sub-application serves every prefix the router is mounted under
+        lazy_app = _lazy_apps.setdefault(name, LazyRouterApp(name))
+        target.mount(getattr(target, "prefix", "") + prefix, lazy_app)
+        return
+    _modes[name] = "eager"
+    target.include_router(load_router(name), prefix=prefix, **kwargs)
+
+
+async def shutdown_lazy_routers() -> None:
+    """Run the shutdown handlers of every lazily mounted router that has been loaded."""
+    for lazy_app in _lazy_apps.values():
+        await lazy_app.shutdown()
+
+
+def get_router_status() -> Dict[str, Dict[str, Any]]:
+    """How each included router was loaded, and whether it has been imported yet."""
+    return {
+        name: {"mode": mode, "loaded": _module_name(name) in sys.modules}
+        for name, mode in _modes.items()
+    }
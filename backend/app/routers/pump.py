@@ -1,14 +1,13 @@
 from typing import Optional, List, Dict, Any, Union
 from fastapi import APIRouter, HTTPException, Query, Path
 from fastapi.responses import RedirectResponse
-import httpx
 from pydantic import BaseModel
 import logging
 from datetime import datetime, timedelta
 import asyncio
 import random
-import time
 from app.database.sqlite import DatabaseCache, db_cache
+from app.utils.pump_client import get_pump_client
 from ..constants.cache import (
     MARKET_OVERVIEW_CACHE_TTL,
     SOL_PRICE_CACHE_TTL,
@@ -26,69 +25,8 @@ router = APIRouter(tags=["PumpFun"])
 
 PUMP_API_BASE_URL = "https://frontend-api.pump.fun"
 
-# Request throttling for Pump.fun API
-class RequestThrottler:
-    """
-    Request throttler to limit concurrent requests to the Pump.fun API.
-    This helps prevent rate limiting by ensuring we don't overwhelm the API.
-    """
-    def __init__(self, max_concurrent=3, rate_limit=10, time_window=60):
-        """
-        Initialize the request throttler.
-        
-        Args:
-            max_concurrent: Maximum number of concurrent requests
-            rate_limit: Maximum number of requests in time_window
-            time_window: Time window in seconds for rate limiting
-        """
-        self.semaphore = asyncio.Semaphore(max_concurrent)
-        self.rate_limit = rate_limit
-        self.time_window = time_window
-        self.request_timestamps = []
-        self.lock = asyncio.Lock()
-        
-    async def acquire(self):
-        """
-        Acquire permission to make a request.
-        This will block if we've reached the maximum concurrent requests
-        or if we've exceeded the rate limit.
-        """
-        # First check rate limiting
-        async with self.lock:
-            now = datetime.now().timestamp()
-            # Remove timestamps older than the time window
-            self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < self.time_window]
-            
-            # Check if we've exceeded the rate limit
-            if len(self.request_timestamps) >= self.rate_limit:
-                # Calculate time to wait
-                oldest = min(self.request_timestamps)
-                wait_time = self.time_window - (now - oldest) + 0.1  # Add a small buffer
-                logging.warning(f"Rate limit reached, waiting {wait_time:.2f}s before making request")
-                await asyncio.sleep(wait_time)
-                
-                # Recursively try again after waiting
-                return await self.acquire()
-            
-            # Add current timestamp
-            self.request_timestamps.append(now)
-        
-        # Now acquire the semaphore for concurrent request limiting
-        await self.semaphore.acquire()
-        
-    def release(self):
-        """Release the semaphore."""
-        self.semaphore.release()
-        
-    async def __aenter__(self):
-        await self.acquire()
-        return self
-        
-    async def __aexit__(self, exc_type, exc_val, exc_tb):
-        self.release()
-
-# Create global throttler instance
-pump_throttler = RequestThrottler(max_concurrent=3, rate_limit=10, time_window=60)
+# Shared upstream client (pooled connections, throttling, dedupe and caching)
+pump_client = get_pump_client()
 
 class PumpToken(BaseModel):
     mint: str
@@ -235,147 +173,25 @@ class Candlestick(BaseModel):
     is_5_min: Optional[bool] = False
     is_1_min: Optional[bool] = False
 
-async def validate_token_exists(mint: str) -> bool:
+async def validate_token_exists(mint: str, use_cache: bool = True) -> bool:
     """Validate that a token exists and is accessible."""
-    try:
-        # Try to get the token details
-        async with httpx.AsyncClient() as client:
-            response = await client.get(f"{PUMP_API_BASE_URL}/coins/{mint}", headers={"accept": "*/*"})
-            return response.status_code == 200
-    except:
-        return False
+    # The details response is cached by the client, so a following details call is free
+    return await pump_client.get(f"/coins/{mint}", required=False, use_cache=use_cache) is not None
 
-import random
-
-async def make_http_request(url: str, required: bool = True) -> dict:
+async def make_http_request(url: str, required: bool = True, use_cache: bool = True) -> dict:
     """
-    Make HTTP request to Pump.fun API with rate limiting protection.
+    Make HTTP request to Pump.fun API through the shared client, with rate
+    limiting protection, in-flight deduplication and response caching.
     
     Args:
         url: The URL to request
         required: Whether the request is required (if False, returns None instead of raising an exception)
+        use_cache: Whether a cached upstream response may be returned (False when forcing a refresh)
         
     Returns:
         The JSON response data or None if not required and an error occurred
     """
-    max_retries = 5  
-    base_delay = 2.0  
-    
-    # Extract endpoint from URL for logging
-    endpoint = url.split("/")[-1].split("?")[0]
-    
-    for retry in range(max_retries):
-        try:
-            # Calculate exponential backoff delay if this is a retry
-            delay = base_delay * (2 ** retry) if retry > 0 else 0
-            if retry > 0:
-                logging.info(f"Retry {retry}/{max_retries} for {endpoint} with {delay:.1f}s delay")
-                await asyncio.sleep(delay)
-            
-            logging.info(f"Making request to: {url}")
-            
-            # Add a small random delay between requests to avoid hitting rate limits
-            if retry == 0:
-                jitter = random.uniform(0.1, 0.5)
-                await asyncio.sleep(jitter)
-            
-            async with pump_throttler:
-                async with httpx.AsyncClient(timeout=45.0) as client:  
-                    start_time = time.time()
-                    response = await client.get(
-                        url, 
-                        headers={
-                            "accept": "*/*",
-                            "User-Agent": "Soleco/1.0 (https://github.com/homezloco/soleco)"
-                        }
-                    )
-                    
-                    request_time = time.time() - start_time
-                    logging.info(f"Response status for {endpoint}: {response.status_code} (took {request_time:.2f}s)")
-                    
-                    if response.status_code == 404:
-                        if required:
-                            raise HTTPException(status_code=404, detail="Resource not found")
-                        return None
-                    elif response.status_code == 429:
-                        # Rate limited, use exponential backoff
-                        if retry < max_retries - 1:
-                            # Extract retry-after header if available
-                            retry_after = response.headers.get('retry-after')
-                            if retry_after and retry_after.isdigit():
-                                wait_time = int(retry_after) + random.uniform(0.5, 2.0)  
-                            else:
-                                wait_time = base_delay * (2 ** retry) + random.uniform(1, 3)  
-                                
-                            logging.warning(f"Rate limited on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            logging.error(f"Rate limited after {max_retries} retries on {endpoint}")
-                            if required:
-                                raise HTTPException(
-                                    status_code=429, 
-                                    detail=f"Rate limited by Pump.fun API after {max_retries} retries. Please try again later."
-                                )
-                            return None
-                    elif response.status_code == 500:
-                        if retry < max_retries - 1:
-                            wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
-                            logging.warning(f"Server error (500) on {endpoint}. Retrying in {wait_time:.1f}s")
-                            await asyncio.sleep(wait_time)
-                            continue
-                        elif required:
-                            raise HTTPException(status_code=502, detail="Pump.fun API server error")
-                        return None
-                        
-                    response.raise_for_status()
-                    data = response.json()
-                    return data
-        except httpx.TimeoutException as e:
-            logging.error(f"Timeout error occurred while fetching {endpoint} from Pump.fun: {e}")
-            if retry < max_retries - 1:
-                wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
-                logging.warning(f"Timeout error on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
-                await asyncio.sleep(wait_time)
-                continue
-            if required:
-                raise HTTPException(status_code=504, detail=f"Timeout error fetching data from Pump.fun: {str(e)}")
-            return None
-        except httpx.ConnectError as e:
-            logging.error(f"Connection error occurred while fetching {endpoint} from Pump.fun: {e}")
-            if retry < max_retries - 1:
-                wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
-                logging.warning(f"Connection error on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
-                await asyncio.sleep(wait_time)
-                continue
-            if required:
-                raise HTTPException(status_code=503, detail=f"Connection error fetching data from Pump.fun: {str(e)}")
-            return None
-        except httpx.HTTPError as e:
-            logging.error(f"HTTP error occurred while fetching {endpoint} from Pump.fun: {e}")
-            if retry < max_retries - 1:
-                wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
-                logging.warning(f"HTTP error on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
-                await asyncio.sleep(wait_time)
-                continue
-            if required:
-                raise HTTPException(status_code=502, detail=f"Error fetching data from Pump.fun: {str(e)}")
-            return None
-        except Exception as e:
-            logging.error(f"Unexpected error occurred while fetching {endpoint} from Pump.fun: {e}")
-            if retry < max_retries - 1:
-                wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
-                logging.warning(f"Unexpected error on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
-                await asyncio.sleep(wait_time)
-                continue
-            if required:
-                raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
-            return None
-    
-    # If we get here, all retries failed
-    if required:
-        raise HTTPException(status_code=503, detail=f"Failed to fetch {endpoint} data after {max_retries} retries")
-    return None
+    return await pump_client.get(url, required=required, use_cache=use_cache)
 
 @router.get("/coins/latest", response_model=List[PumpToken])
 async def get_latest_tokens(
@@ -410,10 +226,15 @@ async def get_latest_tokens(
         # If not in cache or forcing refresh, fetch from API
         logging.info(f"Fetching {qty} latest tokens from Pump.fun API")
         
-        # The new approach: query the same endpoint multiple times with a delay
+        # Fetch the newest tokens in one paged request
         all_tokens = []
         seen_mints = set()  # To track unique tokens
+        for token in await pump_client.get_latest_coins(limit=qty):
+            if token['mint'] not in seen_mints:
+                seen_mints.add(token['mint'])
+                all_tokens.append(token)
         
+        # Fall back to polling the single latest token if the paged request came up short
         # Keep querying until we have the requested number of unique tokens
         max_attempts = qty * 3  # Allow for some duplicates by trying up to 3x the requested quantity
         attempt = 0
@@ -595,7 +416,7 @@ async def get_king_of_the_hill(
         
         # If not in cache or forcing refresh, fetch from API
         logging.info("Fetching king of the hill from Pump.fun API")
-        response = await make_http_request(f"{PUMP_API_BASE_URL}/coins/king-of-the-hill")
+        response = await make_http_request(f"{PUMP_API_BASE_URL}/coins/king-of-the-hill", use_cache=not refresh)
         
         # Filter NSFW if needed
         if not include_nsfw and response and response.get("nsfw", False):
@@ -650,7 +471,7 @@ async def get_sol_price(
                 logging.info("Retrieved SOL price from cache")
                 return cached_data
         
-        response = await make_http_request(f"{PUMP_API_BASE_URL}/sol-price")
+        response = await make_http_request(f"{PUMP_API_BASE_URL}/sol-price", use_cache=not refresh)
         # Transform the response to match our model
         if response and "solPrice" in response:
             result = {
@@ -712,7 +533,7 @@ async def get_all_trades(
                 return [PumpTrade.parse_obj(trade) for trade in cached_data]
                 
         logging.info(f"Fetching up to {limit} trades for token {mint}")
-        response = await make_http_request(f"{PUMP_API_BASE_URL}/trades/all/{mint}?limit={limit}")
+        response = await make_http_request(f"{PUMP_API_BASE_URL}/trades/all/{mint}?limit={limit}", use_cache=not refresh)
         
         # Cache the result
         if response:
@@ -763,7 +584,7 @@ async def get_token_details(
                 logging.info(f"Retrieved token details for {mint} from cache")
                 return cached_data
                 
-        response = await make_http_request(f"{PUMP_API_BASE_URL}/coins/{mint}")
+        response = await make_http_request(f"{PUMP_API_BASE_URL}/coins/{mint}", use_cache=not refresh)
         
         # Cache the response
         token = PumpToken.parse_obj(response)
@@ -804,7 +625,7 @@ async def get_token_analytics(
             return cached_data
     
     # First validate the token exists
-    if not await validate_token_exists(mint):
+    if not await validate_token_exists(mint, use_cache=not refresh):
         raise HTTPException(
             status_code=404,
             detail=f"Token with mint address {mint} not found or is not accessible"
@@ -812,10 +633,17 @@ async def get_token_analytics(
     
     try:
         # Fetch all data concurrently, with non-critical data marked as non-required
-        token_data = await make_http_request(f"{PUMP_API_BASE_URL}/coins/{mint}", required=True)
-        trade_count = await make_http_request(f"{PUMP_API_BASE_URL}/trades/count/{mint}", required=False)
-        candlesticks = await make_http_request(f"{PUMP_API_BASE_URL}/candlesticks/{mint}?interval={candlestick_interval}", required=False)
-        sol_price_data = await make_http_request(f"{PUMP_API_BASE_URL}/sol-price", required=False)
+        token_data, trade_count, candlesticks, sol_price_data = await asyncio.gather(
+            # Served from the response validate_token_exists just fetched
+            make_http_request(f"{PUMP_API_BASE_URL}/coins/{mint}", required=True),
+            make_http_request(f"{PUMP_API_BASE_URL}/trades/count/{mint}", required=False, use_cache=not refresh),
+            make_http_request(
+                f"{PUMP_API_BASE_URL}/candlesticks/{mint}?interval={candlestick_interval}",
+                required=False,
+                use_cache=not refresh,
+            ),
+            make_http_request(f"{PUMP_API_BASE_URL}/sol-price", required=False, use_cache=not refresh),
+        )
         
         # Create token model with defaults for missing fields
         token = PumpToken(**token_data)
@@ -870,10 +698,10 @@ async def get_top_tokens(limit: int = 5, refresh: bool = False) -> List[Dict[str
                 logging.info(f"Retrieved {len(cached_data)} top tokens from cache")
                 return cached_data
                 
-        # Get trending keywords
-        trending_metas = await make_http_request(
-            f"{PUMP_API_BASE_URL}/metas/current",
-            required=False
+        # Get trending keywords and a page of the latest tokens to match them against
+        trending_metas, latest_tokens = await asyncio.gather(
+            make_http_request(f"{PUMP_API_BASE_URL}/metas/current", required=False, use_cache=not refresh),
+            pump_client.get_latest_coins(limit=10),
         )
         if not trending_metas:
             return []
@@ -884,20 +712,6 @@ async def get_top_tokens(limit: int = 5, refresh: bool = False) -> List[Dict[str
         
         # For each keyword, try to get matching tokens from the latest ones
         tokens = []
-        latest_tokens = []
-        
-        # Get multiple latest tokens to increase chances of finding matches
-        for i in range(10):  # Try up to 10 latest tokens
-            try:
-                latest = await make_http_request(
-                    f"{PUMP_API_BASE_URL}/coins/latest?qty=1&offset={i}",
-                    required=False
-                )
-                if latest and isinstance(latest, dict) and 'mint' in latest:
-                    latest_tokens.append(latest)
-            except Exception as e:
-                logging.warning(f"Failed to get latest token with offset {i}: {e}")
-                continue
         
         # Try to match keywords with tokens
         for meta in top_keywords:
@@ -942,10 +756,12 @@ async def get_market_overview(
                 return cached_data
         
         # Get data concurrently with proper caching
-        king_of_the_hill = await get_king_of_the_hill(include_nsfw=include_nsfw, refresh=refresh)
-        latest_tokens = await get_latest_tokens(qty=latest_limit, refresh=refresh)
-        sol_price_data = await get_sol_price(refresh=refresh)
-        top_tokens = await get_top_tokens(limit=5, refresh=refresh)
+        king_of_the_hill, latest_tokens, sol_price_data, top_tokens = await asyncio.gather(
+            get_king_of_the_hill(include_nsfw=include_nsfw, refresh=refresh),
+            get_latest_tokens(qty=latest_limit, refresh=refresh),
+            get_sol_price(refresh=refresh),
+            get_top_tokens(limit=5, refresh=refresh),
+        )
         
         # Extract SOL price from response
         sol_price = sol_price_data.get("price", 0) if sol_price_data and isinstance(sol_price_data, dict) else 0
@@ -1031,8 +847,10 @@ async def get_token_history(
                 return cached_data
                 
         # Fetch trade and price data
-        trades = await make_http_request(f"{PUMP_API_BASE_URL}/trades/all/{mint}?limit={trade_limit}")
-        candlesticks = await make_http_request(f"{PUMP_API_BASE_URL}/candlesticks/{mint}?interval=1h")
+        trades, candlesticks = await asyncio.gather(
+            make_http_request(f"{PUMP_API_BASE_URL}/trades/all/{mint}?limit={trade_limit}", use_cache=not refresh),
+            make_http_request(f"{PUMP_API_BASE_URL}/candlesticks/{mint}?interval=1h", use_cache=not refresh),
+        )
         
         # Calculate metrics
         if candlesticks:
@@ -1122,11 +940,8 @@ async def get_top_performers(
         logging.info("Fetching latest tokens from Pump.fun API for top performers")
         latest_tokens = await get_latest_tokens(qty=50, refresh=refresh)
         
-        # Store each token in the database
-        stored_count = 0
-        for token in latest_tokens:
-            if db.store_token_performance(token):
-                stored_count += 1
+        # Store the tokens in the database in one batch
+        stored_count = db.store_token_performances(latest_tokens)
         
         logging.info(f"Stored {stored_count} tokens in the database")
         
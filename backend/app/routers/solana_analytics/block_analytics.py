@@ -6,6 +6,7 @@ from typing import Dict, Any
 from fastapi import APIRouter, Query, Path, HTTPException
 from app.utils.solana_query import SolanaQueryHandler
 from app.utils.handlers.block_extractor import BlockExtractor
+from app.utils.block_requirements import required_fields
 from app.utils.logging_config import setup_logging
 import logging
 
@@ -171,22 +172,30 @@ async def get_block_range(
         # Initialize and get blocks
         await query_handler.initialize()
         logger.info(f"Analyzing blocks from slot {start_slot} to {end_slot}")
-        blocks_data = await query_handler.process_blocks(
-            start_slot=start_slot,
-            end_slot=end_slot
-        )
         
-        if not blocks_data:
-            logger.error("No blocks_data returned from process_blocks")
-            return {"success": False, "error": "Failed to get blocks data"}
-            
-        if not blocks_data.get("success"):
-            error = blocks_data.get("error", "Unknown error")
-            logger.error(f"Error in blocks_data: {error}")
-            return {"success": False, "error": error}
-            
-        blocks_list = blocks_data.get("blocks", [])
-        if not blocks_list:
+        # Each block is extracted while the following ones are being fetched; without
+        # transaction details, only the signatures needed for the counts are downloaded
+        fields = None if include_transactions else required_fields(BlockExtractor)
+        blocks_processed = 0
+        async for slot, block in query_handler.prefetch_blocks(
+            min(start_slot, end_slot), max(start_slot, end_slot), fields=fields
+        ):
+            if isinstance(block, Exception):
+                logger.error(f"Error getting block {slot}: {str(block)}")
+                continue
+            if not block:
+                logger.warning(f"Empty block data for slot {slot}")
+                continue
+                
+            try:
+                logger.debug(f"Processing block with {len(block.get('transactions', []))} transactions")
+                block_extractor.process_block(block)
+                blocks_processed += 1
+            except Exception as e:
+                logger.error(f"Error processing block: {str(e)}")
+                continue
+                
+        if not blocks_processed:
             logger.warning("No blocks found in range")
             return {
                 "success": True,
@@ -195,21 +204,6 @@ async def get_block_range(
                 "blocks_processed": 0
             }
             
-        # Process blocks
-        logger.info(f"Processing {len(blocks_list)} blocks")
-        for block in blocks_list:
-            try:
-                if not block:
-                    logger.warning("Empty block data")
-                    continue
-                    
-                logger.debug(f"Processing block with {len(block.get('transactions', []))} transactions")
-                block_extractor.process_block(block)
-                
-            except Exception as e:
-                logger.error(f"Error processing block: {str(e)}")
-                continue
-                
         # Get results
         try:
             results = block_extractor.get_results()
@@ -219,6 +213,7 @@ async def get_block_range(
                 for block in results["blocks"]:
                     if "transactions" in block:
                         del block["transactions"]
+                    block.pop("signatures", None)
                         
             return {
                 "success": True,
@@ -3,9 +3,10 @@ NFT Analytics Module - Handles analysis of NFT activities on Solana
 """
 from typing import Dict, Any, Optional
 from fastapi import APIRouter, Query, HTTPException
-from ..utils.solana_query import SolanaQueryHandler
-from ..utils.handlers.nft_extractor import NFTExtractor
-from ..utils.logging_config import setup_logging
+from ...utils.solana_query import SolanaQueryHandler
+from ...utils.address_query import AddressQueryPlanner
+from ...utils.handlers.nft_extractor import NFTExtractor
+from ...utils.logging_config import setup_logging
 
 # Configure logging
 logger = setup_logging(__name__)
@@ -246,7 +247,9 @@ async def get_collection_activity(
         # Initialize and get recent blocks
         await query_handler.initialize()
         logger.info(f"Analyzing collection {collection} over {blocks} blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data([collection], blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -334,7 +337,8 @@ async def get_collection_activity(
                 "collection": collection,
                 "nft_operations": collection_ops,
                 "stats": collection_stats,
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
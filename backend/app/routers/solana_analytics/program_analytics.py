@@ -3,9 +3,10 @@ Program Analytics Module - Handles analysis of program activities on Solana
 """
 from typing import Dict, Any, Optional, List
 from fastapi import APIRouter, Query, HTTPException
-from ..utils.solana_query import SolanaQueryHandler
-from ..utils.handlers.program_extractor import ProgramExtractor
-from ..utils.logging_config import setup_logging
+from ...utils.solana_query import SolanaQueryHandler
+from ...utils.address_query import AddressQueryPlanner
+from ...utils.handlers.program_extractor import ProgramExtractor
+from ...utils.logging_config import setup_logging
 
 # Configure logging
 logger = setup_logging(__name__)
@@ -51,7 +52,9 @@ async def get_program_activity(
         # Initialize and get recent blocks
         await query_handler.initialize()
         logger.info(f"Analyzing program activity from {blocks} recent blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(program_ids, blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -134,7 +137,8 @@ async def get_program_activity(
                 "success": True,
                 "program_operations": results["program_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -178,10 +182,16 @@ async def get_program_range(
         # Initialize and get blocks
         await query_handler.initialize()
         logger.info(f"Analyzing program activity from slot {start_slot} to {end_slot}")
-        blocks_data = await query_handler.process_blocks(
-            start_slot=start_slot,
-            end_slot=end_slot
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(
+            program_ids,
+            start_slot=min(start_slot, end_slot),
+            end_slot=max(start_slot, end_slot)
         )
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(
+                start_slot=start_slot,
+                end_slot=end_slot
+            )
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -263,7 +273,8 @@ async def get_program_range(
                 "success": True,
                 "program_operations": results["program_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -302,7 +313,9 @@ async def get_program_details(
         # Initialize and get recent blocks
         await query_handler.initialize()
         logger.info(f"Analyzing program {program_id} over {blocks} blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data([program_id], blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -401,7 +414,8 @@ async def get_program_details(
                         }
                     }
                 },
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
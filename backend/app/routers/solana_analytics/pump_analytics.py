@@ -8,6 +8,7 @@ from fastapi import APIRouter, HTTPException
 from solana.rpc.commitment import Commitment
 
 from app.utils.solana_query import SolanaQueryHandler
+from app.utils.address_query import AddressQueryPlanner
 from app.utils.handlers.pump_response_handler import PumpResponseHandler
 import logging
 
@@ -43,7 +44,9 @@ async def get_pump_activity(
         
         # Initialize and get recent blocks
         logger.info(f"Analyzing pump activity from {blocks} recent blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(token_addresses, blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -137,7 +140,8 @@ async def get_pump_activity(
                 "success": True,
                 "pump_operations": results["pump_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -174,10 +178,16 @@ async def get_pump_range(
         
         # Initialize and get blocks
         logger.info(f"Analyzing pump activity from slot {start_slot} to {end_slot}")
-        blocks_data = await query_handler.process_blocks(
-            start_slot=start_slot,
-            end_slot=end_slot
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(
+            token_addresses,
+            start_slot=min(start_slot, end_slot),
+            end_slot=max(start_slot, end_slot)
         )
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(
+                start_slot=start_slot,
+                end_slot=end_slot
+            )
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -270,7 +280,8 @@ async def get_pump_range(
                 "success": True,
                 "pump_operations": results["pump_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -303,7 +314,9 @@ async def get_pump_details(
         
         # Initialize and get recent blocks
         logger.info(f"Analyzing pump activity for token {token_address} over {blocks} blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data([token_address], blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -409,7 +422,8 @@ async def get_pump_details(
                         ]
                     }
                 },
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
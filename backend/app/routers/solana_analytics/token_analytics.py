@@ -4,9 +4,10 @@ Token Analytics Module - Handles analysis of token activities on Solana
 
 from typing import Dict, Any, Optional, List
 from fastapi import APIRouter, Query, HTTPException
-from ..utils.solana_query import SolanaQueryHandler
-from ..utils.handlers.token_extractor import TokenExtractor
-from ..utils.logging_config import setup_logging
+from ...utils.solana_query import SolanaQueryHandler
+from ...utils.address_query import AddressQueryPlanner
+from ...utils.handlers.token_extractor import TokenExtractor
+from ...utils.logging_config import setup_logging
 
 # Configure logging
 logger = setup_logging(__name__)
@@ -52,7 +53,9 @@ async def get_token_activity(
         # Initialize and get recent blocks
         await query_handler.initialize()
         logger.info(f"Analyzing token activity from {blocks} recent blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(token_addresses, blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -138,7 +141,8 @@ async def get_token_activity(
                 "success": True,
                 "token_operations": results["token_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -182,10 +186,16 @@ async def get_token_range(
         # Initialize and get blocks
         await query_handler.initialize()
         logger.info(f"Analyzing token activity from slot {start_slot} to {end_slot}")
-        blocks_data = await query_handler.process_blocks(
-            start_slot=start_slot,
-            end_slot=end_slot
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data(
+            token_addresses,
+            start_slot=min(start_slot, end_slot),
+            end_slot=max(start_slot, end_slot)
         )
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(
+                start_slot=start_slot,
+                end_slot=end_slot
+            )
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -270,7 +280,8 @@ async def get_token_range(
                 "success": True,
                 "token_operations": results["token_operations"],
                 "stats": results["stats"],
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -309,7 +320,9 @@ async def get_token_details(
         # Initialize and get recent blocks
         await query_handler.initialize()
         logger.info(f"Analyzing token {token_address} over {blocks} blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await AddressQueryPlanner(query_handler).blocks_data([token_address], blocks=blocks)
+        if blocks_data is None:
+            blocks_data = await query_handler.process_blocks(blocks)
         
         if not blocks_data:
             logger.error("No blocks_data returned from process_blocks")
@@ -410,7 +423,8 @@ async def get_token_details(
                         if change['token'] == token_address
                     ]
                 },
-                "blocks_processed": len(blocks_list)
+                "blocks_processed": len(blocks_list),
+                "query_plan": blocks_data.get("query_plan", {"plan": "blocks"})
             }
             
         except Exception as e:
@@ -2,14 +2,16 @@
 Solana New Mints Extractor - Focused on detecting and analyzing newly created mint addresses
 """
 
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 import logging
 import asyncio
 from fastapi import APIRouter, Query, HTTPException, BackgroundTasks
 from ..utils.solana_query import SolanaQueryHandler
-from ..utils.handlers.mint_extractor import MintExtractor
 from ..utils.solana_rpc import get_connection_pool
 from ..utils.solana_connection_pool import mint_analytics_cache
+from ..tasks.block_tail import get_block_tail
+from ..utils.mint_index import get_mint_index
+from ..utils.block_workers import merge_mint_results
 
 # Configure logging
 logging.basicConfig(
@@ -60,6 +62,12 @@ async def get_recent_new_mints(
             logger.info(f"Returning cached mint analytics for {blocks} blocks")
             return cached_result
         
+        # Serve from the live block tail when it already covers the requested blocks
+        tail_result = _result_from_block_tail(blocks)
+        if tail_result:
+            logger.info(f"Returning block tail aggregates for {blocks} blocks")
+            return tail_result
+        
         # If blocks requested is less than or equal to what we've already processed,
         # and we have a result, return it immediately
         if blocks <= _last_blocks_processed and _last_result:
@@ -160,6 +168,143 @@ async def get_recent_new_mints(
             _is_processing = False
         return {"success": False, "error": str(e)}
 
+@router.get("/since")
+async def get_new_mints_since(
+    slot: Optional[int] = Query(
+        default=None,
+        description="Return blocks after this slot; omit to get the most recent blocks",
+        ge=0
+    ),
+    wait: float = Query(
+        default=0,
+        description="Seconds to wait for a block after `slot` when there is none yet",
+        ge=0,
+        le=30
+    ),
+    limit: int = Query(
+        default=20,
+        description="Maximum number of blocks to return",
+        ge=1,
+        le=100
+    )
+) -> Dict[str, Any]:
+    """
+    Get new mints per block from the live block tail, for clients following the chain.
+    
+    Clients pass the last slot they received and only get the blocks after it;
+    with ``wait`` the request is held open until a new block is ingested, so
+    following the chain needs one request per block instead of repeated polls.
+    
+    Args:
+        slot: Last slot the client has seen
+        wait: Seconds to hold the request open when there is no newer block
+        limit: Maximum number of blocks to return
+        
+    Returns:
+        Dict containing the new blocks oldest first, the slot to pass next
+        and whether more blocks are already available after it
+    """
+    try:
+        tail = get_block_tail()
+        if not tail.running:
+            return {"success": False, "error": "Block tail ingestion is not running", "blocks": [], "last_slot": slot}
+        
+        if slot is not None and wait > 0:
+            await tail.wait_for_block(slot, wait)
+        
+        summaries = tail.get_blocks_since(slot, limit + 1)
+        more = slot is not None and len(summaries) > limit
+        summaries = summaries[:limit] if slot is not None else summaries[-limit:]
+        
+        return {
+            "success": True,
+            "blocks": [
+                {
+                    "slot": summary.slot,
+                    "block_time": summary.block_time,
+                    "new_mints": summary.items.get("mints.new_mints", []),
+                    "pump_tokens": summary.items.get("mints.pump_tokens", []),
+                    "mint_operations": summary.totals.get("mints.mint_operations", 0)
+                }
+                for summary in summaries
+            ],
+            "last_slot": summaries[-1].slot if summaries else slot,
+            "head_slot": tail.stats["head_slot"],
+            "more": more
+        }
+    except Exception as e:
+        logger.error(f"Error in get_new_mints_since: {str(e)}")
+        return {"success": False, "error": str(e), "blocks": [], "last_slot": slot}
+
+@router.get("/first-seen")
+async def get_mints_first_seen(
+    mints: List[str] = Query(
+        ...,
+        description="Mint addresses to look up"
+    )
+) -> Dict[str, Any]:
+    """
+    Get the slot and time each mint address was first seen by the extractors.
+    
+    Args:
+        mints: Mint addresses to look up
+        
+    Returns:
+        Dict containing first-seen information for the known mints
+    """
+    try:
+        mint_index = get_mint_index()
+        first_seen = await asyncio.to_thread(mint_index.first_seen, mints)
+        return {
+            "success": True,
+            "first_seen": first_seen,
+            "unknown": [mint for mint in mints if mint not in first_seen],
+            "index": mint_index.get_stats()
+        }
+    except Exception as e:
+        logger.error(f"Error in get_mints_first_seen: {str(e)}")
+        return {"success": False, "error": str(e)}
+
+def _result_from_block_tail(blocks: int) -> Optional[Dict[str, Any]]:
+    """
+    Build the recent mints response from the block tail's rolling aggregates.
+    
+    Args:
+        blocks: Number of recent blocks to cover
+        
+    Returns:
+        Dict in the same shape as _process_blocks, or None if the tail
+        has not ingested enough blocks yet
+    """
+    window = get_block_tail().get_window(blocks)
+    if not window:
+        return None
+        
+    items = window["items"]
+    totals = window["totals"]
+    new_mints = items.get("mints.new_mints", [])
+    pump_tokens = items.get("mints.pump_tokens", [])
+    
+    return {
+        "success": True,
+        "summary": {
+            "total_new_mints": len(new_mints),
+            "total_pump_tokens": len(pump_tokens),
+            "blocks_processed": window["blocks"]
+        },
+        "new_mints": new_mints,
+        "pump_tokens": pump_tokens,
+        "stats": {
+            "total_all_mints": len(items.get("mints.all_mints", [])),
+            "total_new_mints": len(new_mints),
+            "total_pump_tokens": len(pump_tokens),
+            "mint_operations": totals.get("mints.mint_operations", 0),
+            "token_operations": totals.get("mints.token_operations", 0)
+        },
+        "start_slot": window["start_slot"],
+        "end_slot": window["end_slot"]
+    }
+
 async def _process_blocks(blocks: int) -> Dict[str, Any]:
     """
     Process blocks and extract mint information.
@@ -174,15 +319,14 @@ async def _process_blocks(blocks: int) -> Dict[str, Any]:
         # Initialize handlers
         connection_pool = await get_connection_pool()
         query_handler = SolanaQueryHandler(connection_pool)
-        mint_extractor = MintExtractor()
         
-        # Initialize and get recent blocks
+        # Initialize and extract recent blocks in the block worker processes
         await query_handler.initialize()
         logger.info(f"Analyzing blocks from {blocks} recent blocks")
-        blocks_data = await query_handler.process_blocks(blocks)
+        blocks_data = await query_handler.extract_blocks(["mints"], num_blocks=blocks)
         
         if not blocks_data:
-            logger.error("No blocks_data returned from process_blocks")
+            logger.error("No blocks_data returned from extract_blocks")
             return {"success": False, "error": "Failed to get blocks data"}
             
         if not blocks_data.get("success"):
@@ -201,26 +345,13 @@ async def _process_blocks(blocks: int) -> Dict[str, Any]:
                 "blocks_processed": 0
             }
             
-        # Process each block
-        logger.info(f"Processing {len(blocks_list)} blocks")
+        logger.info(f"Processed {len(blocks_list)} blocks")
         blocks_processed = len(blocks_list)
-        for block in blocks_list:
-            try:
-                if not block:
-                    logger.warning("Empty block data")
-                    continue
-                    
-                logger.debug(f"Processing block with {len(block.get('transactions', []))} transactions")
-                mint_extractor.process_block(block)
-                
-            except Exception as e:
-                logger.error(f"Error processing block: {str(e)}")
-                continue
                 
         # Get results
         try:
-            results = mint_extractor.get_results()
-            logger.debug(f"Results from mint_extractor.get_results(): {results}")
+            results = merge_mint_results(blocks_list, get_mint_index())
+            logger.debug(f"Merged mint results: {results}")
             
             # Get new mints and pump tokens
             new_mints = results["new_mints"]
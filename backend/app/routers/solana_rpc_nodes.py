@@ -16,6 +16,7 @@ from ..utils.solana_rpc import get_connection_pool
 from ..utils.solana_query import SolanaQueryHandler
 from ..utils.handlers.rpc_node_extractor import RPCNodeExtractor
 from ..utils.solana_connection_pool import rpc_nodes_cache
+from ..utils.serialization import SolecoJSONResponse
 from ..utils.solana_rpc_constants import KNOWN_RPC_PROVIDERS, SOLANA_OFFICIAL_ENDPOINTS
 from ..config import HELIUS_API_KEY
 from datetime import datetime
@@ -368,7 +369,7 @@ def get_well_known_rpc_urls() -> List[str]:
     # Remove any duplicates and return
     return list(dict.fromkeys(urls))
 
-@router.get("/rpc-nodes", response_model=Dict[str, Any])
+@router.get("/rpc-nodes", response_model=Dict[str, Any], response_class=SolecoJSONResponse)
 async def get_rpc_nodes(
     include_details: bool = Query(False, description="Include detailed information for each RPC node"),
     health_check: bool = Query(False, description="Perform health checks on a sample of RPC nodes"),
@@ -389,7 +390,7 @@ async def get_rpc_nodes(
     if not refresh:
         cached_data = rpc_nodes_cache.get("rpc-nodes")
         if cached_data:
-            return cached_data
+            return SolecoJSONResponse(cached_data)
 
     # Get RPC nodes data
     result = await rpc_node_extractor.get_all_rpc_nodes(
@@ -471,7 +472,8 @@ async def get_rpc_nodes(
     # Update cache
     rpc_nodes_cache.set("rpc-nodes", response)
 
-    return response
+    # Return the response directly so the node list skips jsonable_encoder
+    return SolecoJSONResponse(response)
 
 @router.get("/rpc/stats")
 async def get_rpc_stats():
@@ -107,7 +107,8 @@ async def update_rpc_pool(max_test: int, max_endpoints: int, quick_mode: bool =
         logger.exception(e)
         return False
 
-async def scheduled_update(interval_hours: float, max_test: int, max_endpoints: int, health_check_interval: float):
+async def scheduled_update(interval_hours: float, max_test: int, max_endpoints: int, health_check_interval: float,
+                           initial_update: bool = True):
     """
     Run the RPC pool update on a schedule.
     
@@ -116,6 +117,8 @@ async def scheduled_update(interval_hours: float, max_test: int, max_endpoints:
         max_test: Maximum number of endpoints to test
         max_endpoints: Maximum number of endpoints to keep in the pool
         health_check_interval: Hours between health checks
+        initial_update: Whether to discover endpoints right away; False leaves
+            it to the first health check, e.g. when the pool warm-started
     """
     logger.info(f"Starting scheduled RPC pool update with interval={interval_hours}h, health_check={health_check_interval}h")
     
@@ -128,11 +131,14 @@ async def scheduled_update(interval_hours: float, max_test: int, max_endpoints:
     
     try:
         # Schedule the initial update to run asynchronously instead of blocking
-        logger.info("Scheduling initial RPC pool update to run in background")
-        asyncio.create_task(
-            run_initial_update(max_test, max_endpoints),
-            name="initial_rpc_pool_update"
-        )
+        if initial_update:
+            logger.info("Scheduling initial RPC pool update to run in background")
+            asyncio.create_task(
+                run_initial_update(max_test, max_endpoints),
+                name="initial_rpc_pool_update"
+            )
+        else:
+            logger.info("Skipping initial RPC pool update, the pool started from saved endpoints")
         
         # Main update loop
         while True:
@@ -197,7 +203,8 @@ async def run_initial_update(max_test: int, max_endpoints: int):
 async def start_scheduler(interval_hours: float = 12.0, 
                           health_check_interval: float = 1.0,
                           max_test: int = 50, 
-                          max_endpoints: int = 10) -> asyncio.Task:
+                          max_endpoints: int = 10,
+                          initial_update: bool = True) -> asyncio.Task:
     """
     Start the RPC pool update scheduler as a background task.
     
@@ -206,6 +213,7 @@ async def start_scheduler(interval_hours: float = 12.0,
         health_check_interval: Hours between health checks
         max_test: Maximum number of endpoints to test
         max_endpoints: Maximum number of endpoints to keep in the pool
+        initial_update: Whether to discover endpoints right away
         
     Returns:
         The scheduler task
@@ -219,7 +227,8 @@ async def start_scheduler(interval_hours: float = 12.0,
                 interval_hours=interval_hours,
                 max_test=max_test,
                 max_endpoints=max_endpoints,
-                health_check_interval=health_check_interval
+                health_check_interval=health_check_interval,
+                initial_update=initial_update
             ),
             name="rpc_pool_scheduler"
         )
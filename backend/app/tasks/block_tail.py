@@ -0,0 +1,588 @@
+"""
+Live block tail ingestion.
+
+Follows the chain head and fetches every new block exactly once, runs the
+registered extractors on it and folds the per-block results into rolling
+window aggregates. Endpoints that need "what happened in the last N blocks"
+read those aggregates instead of fetching N blocks per request.
+
+The head is tracked with a websocket ``slotSubscribe`` when the endpoint
+supports it; otherwise the service polls ``getSlot`` on an interval. In both
+cases new block slots are discovered with ``getBlocks`` so skipped slots are
+never requested.
+
+Extractors registered with ``register_worker_extractor`` run in the block
+worker processes on the raw response bytes, so ingestion never decodes or
+walks a block on the event loop.
+"""
+import asyncio
+import inspect
+import logging
+import time
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+try:
+    import websockets
+except ImportError:  # pragma: no cover - websockets is listed in requirements.txt
+    websockets = None
+
+from app.config import BLOCK_TAIL_CONFIG
+from app.utils.solana_error import SlotSkippedError
+from app.utils.solana_rpc import SolanaConnectionPool, get_connection_pool
+from app.utils.handlers.mint_extractor import MintExtractor
+from app.utils.mint_index import get_mint_index
+from app.utils.address_index import AddressIndex, get_address_index
+from app.utils.handlers.address_extractor import AddressExtractor
+from app.utils.metrics import observe_extractor
+from app.utils.block_requirements import normalize_block, normalize_transaction
+from app.utils.block_workers import BlockWorkerPool, block_request_for, get_block_workers, merge_mint_results
+from app.utils.serialization import loads
+
+logger = logging.getLogger("app.tasks.block_tail")
+
+ExtractorFactory = Callable[[], Any]
+WorkerFinalizer = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+# Methods an extractor needs to be fed a block one transaction at a time
+_STREAM_METHODS = ("begin_block", "process_block_transaction", "end_block")
+
+
+@dataclass
+class BlockSummary:
+    """Extractor output for a single block."""
+    slot: int
+    block_time: Optional[int] = None
+    items: Dict[str, List[str]] = field(default_factory=dict)
+    totals: Dict[str, int] = field(default_factory=dict)
+
+
+class RollingWindow:
+    """
+    Aggregate over the most recent ``size`` blocks.
+
+    Item membership is reference counted, so adding a block and evicting the
+    oldest one only touches the items of those two blocks.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.blocks: Deque[BlockSummary] = deque()
+        self.items: Dict[str, Counter] = defaultdict(Counter)
+        self.totals: Counter = Counter()
+
+    def add(self, summary: BlockSummary) -> None:
+        """Add a block, evicting the oldest one when the window is full."""
+        self.blocks.append(summary)
+        self._apply(summary, 1)
+        if len(self.blocks) > self.size:
+            self._apply(self.blocks.popleft(), -1)
+
+    def _apply(self, summary: BlockSummary, sign: int) -> None:
+        for key, values in summary.items.items():
+            counter = self.items[key]
+            for value in values:
+                counter[value] += sign
+                if counter[value] <= 0:
+                    del counter[value]
+        for key, value in summary.totals.items():
+            self.totals[key] += sign * value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current aggregate as plain values."""
+        return {
+            "blocks": len(self.blocks),
+            "start_slot": self.blocks[0].slot if self.blocks else None,
+            "end_slot": self.blocks[-1].slot if self.blocks else None,
+            "items": {key: list(counter) for key, counter in self.items.items()},
+            "totals": dict(self.totals),
+        }
+
+
+class BlockTailIngestor:
+    """
+    Background service that tails the chain and keeps rolling aggregates.
+    """
+
+    def __init__(
+        self,
+        connection_pool: Optional[SolanaConnectionPool] = None,
+        window_sizes: Optional[Tuple[int, ...]] = None,
+        commitment: Optional[str] = None,
+        poll_interval: Optional[float] = None,
+        max_range: Optional[int] = None,
+        fetch_concurrency: Optional[int] = None,
+        fetch_retries: Optional[int] = None,
+        backfill_blocks: Optional[int] = None,
+        workers: Optional[BlockWorkerPool] = None,
+        stream_blocks: Optional[bool] = None,
+    ):
+        """
+        Initialize the ingestor.
+
+        Args:
+            connection_pool: Connection pool to use, defaults to the shared pool
+            window_sizes: Sizes of the rolling windows in blocks
+            commitment: Commitment level for slot and block queries
+            poll_interval: Seconds between head checks without a subscription
+            max_range: Maximum number of slots requested per getBlocks call
+            fetch_concurrency: Maximum concurrent getBlock calls
+            fetch_retries: Retries for a block before it is counted as missed
+            backfill_blocks: Blocks to ingest behind the head on first start
+            workers: Block worker pool for extractors registered with register_worker_extractor
+            stream_blocks: Feed transactions to the extractors while the block
+                response is still being read, when every extractor supports it
+        """
+        self.connection_pool = connection_pool
+        self.window_sizes = tuple(sorted(window_sizes or BLOCK_TAIL_CONFIG['window_sizes']))
+        self.commitment = commitment or BLOCK_TAIL_CONFIG['commitment']
+        self.poll_interval = poll_interval if poll_interval is not None else BLOCK_TAIL_CONFIG['poll_interval']
+        self.max_range = max_range or BLOCK_TAIL_CONFIG['max_range']
+        self.fetch_retries = fetch_retries if fetch_retries is not None else BLOCK_TAIL_CONFIG['fetch_retries']
+        self.backfill_blocks = backfill_blocks if backfill_blocks is not None else BLOCK_TAIL_CONFIG['backfill_blocks']
+        self._fetch_semaphore = asyncio.Semaphore(fetch_concurrency or BLOCK_TAIL_CONFIG['fetch_concurrency'])
+        self.workers = workers
+        self.stream_blocks = stream_blocks if stream_blocks is not None else BLOCK_TAIL_CONFIG['stream_blocks']
+
+        self._extractors: Dict[str, ExtractorFactory] = {}
+        self._worker_extractors: Dict[str, Tuple[str, Optional[WorkerFinalizer]]] = {}
+        self._extractor_fields: Dict[str, Any] = {}
+        self._block_options: Optional[Dict[str, Any]] = None
+        self._windows: Dict[int, RollingWindow] = {size: RollingWindow(size) for size in self.window_sizes}
+        self._next_slot: Optional[int] = None
+        self._head_event = asyncio.Event()
+        self._block_event = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+
+        self.stats = {
+            "blocks_ingested": 0,
+            "blocks_missed": 0,
+            "head_slot": None,
+            "last_slot": None,
+            "last_ingest_time": None,
+            "subscribed": False,
+        }
+
+    def register_extractor(self, name: str, factory: ExtractorFactory) -> None:
+        """
+        Register an extractor run on every ingested block.
+
+        The factory is called once per block. The extractor must provide
+        ``process_block(block)`` (sync or async) and ``get_results()``; list
+        values of the results become window items and numeric values in
+        ``results["stats"]`` become window totals, both keyed ``name.key``.
+        Its ``REQUIRED_FIELDS``, if declared, narrow the getBlock request.
+
+        Args:
+            name: Prefix for the extractor's aggregate keys
+            factory: Callable creating a fresh extractor
+        """
+        self._extractors[name] = factory
+        self._extractor_fields[name] = factory()
+        self._block_options = None
+
+    def register_worker_extractor(self, name: str, extractor: str, finalize: Optional[WorkerFinalizer] = None) -> None:
+        """
+        Register an extractor run in the block worker processes.
+
+        Blocks are then fetched as raw bytes and only decoded on the event
+        loop if in-process extractors are registered as well.
+
+        Args:
+            name: Prefix for the extractor's aggregate keys
+            extractor: Name of the extractor in block_workers.EXTRACTORS
+            finalize: Optional callable turning the worker's extraction result
+                into the extractor results, run in this process (e.g. to
+                consult state the workers do not have)
+        """
+        if self.workers is None:
+            raise ValueError("Worker extractors need a block worker pool")
+        self._worker_extractors[name] = (extractor, finalize)
+        self._block_options = None
+
+    def _get_block_options(self) -> Dict[str, Any]:
+        """getBlock options covering the fields every registered extractor reads."""
+        if self._block_options is None:
+            request = block_request_for(
+                {extractor for extractor, _ in self._worker_extractors.values()},
+                self._extractor_fields.values(),
+            )
+            self._block_options = request.rpc_options(self.commitment)
+        return dict(self._block_options)
+
+    @property
+    def running(self) -> bool:
+        return any(not task.done() for task in self._tasks)
+
+    async def start(self) -> None:
+        """Start following the chain head."""
+        if self.running:
+            return
+        if self.connection_pool is None:
+            self.connection_pool = await get_connection_pool()
+        self._tasks = [asyncio.create_task(self._run(), name="block_tail_ingest")]
+        if websockets is not None:
+            self._tasks.append(asyncio.create_task(self._subscribe_slots(), name="block_tail_subscribe"))
+        logger.info(f"Block tail ingestion started with windows {self.window_sizes}")
+
+    async def stop(self) -> None:
+        """Stop the background tasks."""
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._tasks = []
+        logger.info("Block tail ingestion stopped")
+
+    def get_window(self, num_blocks: int) -> Optional[Dict[str, Any]]:
+        """
+        Get aggregates over the last ``num_blocks`` ingested blocks.
+
+        Args:
+            num_blocks: Number of blocks to aggregate
+
+        Returns:
+            Window snapshot, or None if fewer blocks have been ingested
+        """
+        window = self._windows.get(num_blocks)
+        if window is None:
+            larger = next((size for size in self.window_sizes if size > num_blocks), None)
+            if larger is None:
+                return None
+            # Sizes between the configured windows are folded from the next larger one
+            source = self._windows[larger].blocks
+            if len(source) < num_blocks:
+                return None
+            window = RollingWindow(num_blocks)
+            for summary in list(source)[-num_blocks:]:
+                window.add(summary)
+
+        if len(window.blocks) < num_blocks:
+            return None
+        return window.snapshot()
+
+    def get_blocks_since(self, slot: Optional[int], limit: int) -> List[BlockSummary]:
+        """
+        Get the retained per-block summaries after a slot, oldest first.
+
+        Args:
+            slot: Only return blocks after this slot; None returns the most recent blocks
+            limit: Maximum number of blocks to return
+
+        Returns:
+            The first ``limit`` blocks after ``slot``, or the last ``limit`` blocks if slot is None
+        """
+        # The largest window retains the most blocks
+        blocks = self._windows[self.window_sizes[-1]].blocks
+        if slot is None:
+            return list(blocks)[-limit:]
+        # Blocks are appended in slot order, so walk back from the newest one
+        newer: List[BlockSummary] = []
+        for summary in reversed(blocks):
+            if summary.slot <= slot:
+                break
+            newer.append(summary)
+        newer.reverse()
+        return newer[:limit]
+
+    async def wait_for_block(self, slot: int, timeout: float) -> bool:
+        """
+        Wait until a block after ``slot`` has been ingested.
+
+        Args:
+            slot: Slot the caller has already seen
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if a newer block is available, False on timeout
+        """
+        deadline = time.monotonic() + timeout
+        while self.stats["last_slot"] is None or self.stats["last_slot"] <= slot:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(self._block_event.wait(), remaining)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get ingestion statistics."""
+        stats = dict(self.stats)
+        if stats["head_slot"] is not None and stats["last_slot"] is not None:
+            stats["lag_slots"] = stats["head_slot"] - stats["last_slot"]
+        stats["windows"] = {size: len(window.blocks) for size, window in self._windows.items()}
+        return stats
+
+    async def _run(self) -> None:
+        """Main ingestion loop."""
+        while True:
+            try:
+                head = await self._get_head_slot()
+                self.stats["head_slot"] = head
+                await self._ingest_until(head)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Error in block tail ingestion: {str(e)}")
+
+            try:
+                await asyncio.wait_for(self._head_event.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._head_event.clear()
+
+    async def _get_head_slot(self) -> int:
+        async with await self.connection_pool.acquire() as client:
+            return await client.get_slot(self.commitment)
+
+    async def _ingest_until(self, head: int) -> None:
+        """Ingest every block from the next expected slot up to ``head``."""
+        if self._next_slot is None:
+            self._next_slot = max(0, head - self.backfill_blocks + 1)
+
+        while self._next_slot <= head:
+            end_slot = min(head, self._next_slot + self.max_range - 1)
+            async with await self.connection_pool.acquire() as client:
+                slots = await client.get_blocks(self._next_slot, end_slot, self.commitment)
+
+            # Blocks are fetched and extracted concurrently but added to the windows in slot order
+            summaries = await asyncio.gather(*(self._fetch_and_summarize(slot) for slot in slots))
+            for summary in summaries:
+                if summary is not None:
+                    self._add_summary(summary)
+
+            self._next_slot = end_slot + 1
+
+    def _can_stream(self) -> bool:
+        """Whether blocks can be streamed into the extractors transaction by transaction."""
+        if not self.stream_blocks or self._worker_extractors or not self._extractors:
+            return False
+        if self._get_block_options()["transactionDetails"] not in ("full", "accounts"):
+            return False
+        return all(
+            all(hasattr(extractor, method) for method in _STREAM_METHODS)
+            for extractor in self._extractor_fields.values()
+        )
+
+    async def _fetch_and_summarize(self, slot: int) -> Optional[BlockSummary]:
+        if self._can_stream():
+            return await self._stream_and_summarize(slot)
+        block = await self._fetch_block(slot)
+        if block is None:
+            return None
+        return await self._summarize_block(slot, block)
+
+    async def _fetch_block(self, slot: int) -> Optional[Union[Dict[str, Any], bytes]]:
+        """Fetch a block, retrying transient failures; raw bytes when worker extractors are registered."""
+        raw = bool(self._worker_extractors)
+        async with self._fetch_semaphore:
+            for attempt in range(self.fetch_retries + 1):
+                try:
+                    async with await self.connection_pool.acquire() as client:
+                        if raw:
+                            response = await client.get_block(slot, self._get_block_options(), raw=True)
+                        else:
+                            response = await client.get_block(slot, self._get_block_options())
+                    block = response.get("result") if isinstance(response, dict) and "jsonrpc" in response else response
+                    if block:
+                        return block
+                except SlotSkippedError:
+                    break
+                except Exception as e:
+                    logger.warning(f"Error fetching block {slot} (attempt {attempt + 1}): {str(e)}")
+
+        self.stats["blocks_missed"] += 1
+        return None
+
+    async def _stream_and_summarize(self, slot: int) -> Optional[BlockSummary]:
+        """Fetch a block, running the extractors on each transaction as soon as it is decoded."""
+        block = None
+        async with self._fetch_semaphore:
+            for attempt in range(self.fetch_retries + 1):
+                # A failed attempt may have fed part of the block, so every attempt starts fresh
+                extractors = {name: factory() for name, factory in self._extractors.items()}
+                timings = dict.fromkeys(extractors, 0.0)
+                num_transactions = 0
+
+                def on_transaction(tx_wrapper: Dict[str, Any]) -> None:
+                    nonlocal num_transactions
+                    num_transactions += 1
+                    normalize_transaction(tx_wrapper)
+                    for name, extractor in extractors.items():
+                        start = time.perf_counter()
+                        extractor.process_block_transaction(tx_wrapper)
+                        timings[name] += time.perf_counter() - start
+
+                for extractor in extractors.values():
+                    extractor.begin_block(slot)
+                try:
+                    async with await self.connection_pool.acquire() as client:
+                        response = await client.get_block(slot, self._get_block_options(), on_transaction=on_transaction)
+                    block = response.get("result") if isinstance(response, dict) and "jsonrpc" in response else response
+                    if block:
+                        break
+                except SlotSkippedError:
+                    break
+                except Exception as e:
+                    logger.warning(f"Error streaming block {slot} (attempt {attempt + 1}): {str(e)}")
+
+        if not block:
+            self.stats["blocks_missed"] += 1
+            return None
+
+        summary = BlockSummary(slot=slot, block_time=block.get("blockTime"))
+        for name, extractor in extractors.items():
+            try:
+                extractor.end_block(summary.block_time, block.get("parentSlot"))
+                observe_extractor(name, timings[name], num_transactions)
+                results = extractor.get_results() or {}
+            except Exception as e:
+                logger.error(f"Extractor {name} failed on block {slot}: {str(e)}")
+                continue
+            self._add_results(summary, name, results)
+        return summary
+
+    async def _summarize_block(self, slot: int, block: Union[Dict[str, Any], bytes]) -> Optional[BlockSummary]:
+        """Run the worker and in-process extractors on a block."""
+        summary = BlockSummary(slot=slot)
+
+        if isinstance(block, bytes):
+            names = tuple({extractor for extractor, _ in self._worker_extractors.values()})
+            try:
+                extracted = await self.workers.extract(block, names, slot)
+            except Exception as e:
+                logger.error(f"Block workers failed on block {slot}: {str(e)}")
+                self.stats["blocks_missed"] += 1
+                return None
+            if extracted.get("error"):
+                self.stats["blocks_missed"] += 1
+                return None
+            summary.block_time = extracted["block_time"]
+            for name, (extractor, finalize) in self._worker_extractors.items():
+                try:
+                    results = finalize(extracted) if finalize else extracted["results"].get(extractor)
+                except Exception as e:
+                    logger.error(f"Extractor {name} failed on block {slot}: {str(e)}")
+                    continue
+                self._add_results(summary, name, results or {})
+            if not self._extractors:
+                return summary
+            data = loads(block)
+            block = data.get("result") if isinstance(data, dict) and "jsonrpc" in data else data
+
+        block = normalize_block(block)
+        block.setdefault("slot", slot)
+        summary.block_time = block.get("blockTime")
+
+        num_transactions = len(block.get("transactions") or [])
+        for name, factory in self._extractors.items():
+            try:
+                extractor = factory()
+                start = time.perf_counter()
+                result = extractor.process_block(block)
+                if inspect.isawaitable(result):
+                    await result
+                observe_extractor(name, time.perf_counter() - start, num_transactions)
+                results = extractor.get_results() or {}
+            except Exception as e:
+                logger.error(f"Extractor {name} failed on block {slot}: {str(e)}")
+                continue
+            self._add_results(summary, name, results)
+
+        return summary
+
+    @staticmethod
+    def _add_results(summary: BlockSummary, name: str, results: Dict[str, Any]) -> None:
+        for key, value in results.items():
+            if isinstance(value, (list, set, tuple)):
+                summary.items[f"{name}.{key}"] = list(value)
+        for key, value in (results.get("stats") or {}).items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                summary.totals[f"{name}.{key}"] = value
+
+    def _add_summary(self, summary: BlockSummary) -> None:
+        for window in self._windows.values():
+            window.add(summary)
+
+        self.stats["blocks_ingested"] += 1
+        self.stats["last_slot"] = summary.slot
+        self.stats["last_ingest_time"] = time.time()
+
+        # Wake the waiters of wait_for_block; later waiters get a fresh event
+        self._block_event.set()
+        self._block_event = asyncio.Event()
+
+    async def _subscribe_slots(self) -> None:
+        """Wake the ingestion loop on slot notifications when a websocket is available."""
+        backoff = self.poll_interval
+        while True:
+            try:
+                client = await self.connection_pool.get_client()
+                ws_url = client.endpoint.replace("https://", "wss://", 1).replace("http://", "ws://", 1)
+                async with websockets.connect(ws_url, ping_interval=20) as ws:
+                    await ws.send('{"jsonrpc":"2.0","id":1,"method":"slotSubscribe"}')
+                    self.stats["subscribed"] = True
+                    backoff = self.poll_interval
+                    logger.info(f"Subscribed to slot updates on {ws_url}")
+                    async for _ in ws:
+                        self._head_event.set()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.debug(f"Slot subscription unavailable, polling instead: {str(e)}")
+            self.stats["subscribed"] = False
+            backoff = min(backoff * 2, 300)
+            await asyncio.sleep(backoff)
+
+
+_block_tail: Optional[BlockTailIngestor] = None
+
+
+def get_block_tail() -> BlockTailIngestor:
+    """Get or create the shared block tail ingestor."""
+    global _block_tail
+
+    if _block_tail is None:
+        workers = get_block_workers()
+        _block_tail = BlockTailIngestor(workers=workers)
+        if workers is not None:
+            _block_tail.register_worker_extractor(
+                "mints", "mints", finalize=lambda extracted: merge_mint_results([extracted], get_mint_index())
+            )
+        else:
+            _block_tail.register_extractor("mints", lambda: MintExtractor(mint_index=get_mint_index()))
+
+        address_index = get_address_index()
+        if address_index is not None:
+            if workers is not None:
+                _block_tail.register_worker_extractor(
+                    "addresses", "addresses", finalize=lambda extracted: _index_addresses(extracted, address_index)
+                )
+            else:
+                _block_tail.register_extractor("addresses", lambda: AddressExtractor(address_index=address_index))
+
+    return _block_tail
+
+
+def _index_addresses(extracted: Dict[str, Any], address_index: AddressIndex) -> Dict[str, Any]:
+    """Add a worker's address postings to the index, keeping only their statistics for the windows."""
+    results = extracted["results"].get("addresses") or {}
+    address_index.add_extracted(results)
+    return {"stats": results.get("stats", {})}
+
+
+async def start_block_tail() -> Optional[BlockTailIngestor]:
+    """Start the shared block tail ingestor if it is enabled."""
+    if not BLOCK_TAIL_CONFIG['enabled']:
+        logger.info("Block tail ingestion disabled")
+        return None
+
+    ingestor = get_block_tail()
+    await ingestor.start()
+    return ingestor
@@ -93,10 +93,8 @@ class PumpDataCollector:
         Returns:
             Number of tokens stored
         """
-        stored_count = 0
-        for token in tokens:
-            if self.db.store_token_performance(token):
-                stored_count += 1
+        # One transaction for the whole batch, off the event loop
+        stored_count = await asyncio.to_thread(self.db.store_token_performances, tokens)
                 
         logger.info(f"Stored {stored_count} tokens in the database")
         return stored_count
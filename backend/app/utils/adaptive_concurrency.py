@@ -0,0 +1,196 @@
+"""
+Adaptive per-endpoint concurrency for RPC requests.
+
+Static knobs (fixed batch sizes, sleeps between blocks, a fixed request rate)
+either leave a fast provider idle or keep pushing a provider that is already
+answering with 429s. ``AdaptiveLimit`` instead bounds the requests in flight
+to one endpoint with an AIMD window, as TCP does for packets: every window's
+worth of healthy responses raises the limit by one, and an overload signal
+(HTTP 429, JSON-RPC -32005 or a timeout) halves it. Responses much slower than
+the endpoint's unloaded latency, or a high error rate, hold the window where
+it is, so the limit settles just below what the provider can actually serve.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Deque, Dict, Optional
+
+from app.config import ADAPTIVE_CONCURRENCY_CONFIG
+from .solana_error import RateLimitError, RetryableError, SlotSkippedError, TimeoutError as RPCTimeoutError
+
+logger = logging.getLogger(__name__)
+
+# Errors that mean the endpoint is receiving more than it can serve
+OVERLOAD_ERRORS = (RateLimitError, RPCTimeoutError)
+
+
+class AdaptiveLimit:
+    """
+    AIMD limit on the concurrent requests to one endpoint.
+    """
+
+    def __init__(self, url: str, config: Optional[Dict[str, Any]] = None):
+        """
+        Initialize the limit.
+
+        Args:
+            url: Endpoint URL, used in logs
+            config: Settings, defaults to ADAPTIVE_CONCURRENCY_CONFIG
+        """
+        self.url = url
+        self.config = config or ADAPTIVE_CONCURRENCY_CONFIG
+        self.limit = float(self.config['initial_limit'])
+        self.in_flight = 0
+        self.baseline_latency: Optional[float] = None
+        self.error_rate = 0.0
+        self.stats = {"increases": 0, "decreases": 0, "overloads": 0, "max_queued": 0}
+        self._waiters: Deque[asyncio.Future] = deque()
+        # Requests are numbered when they start; overloads of requests started
+        # before the last decrease were caused by the old window and are ignored
+        self._started = 0
+        self._decreased_at = 0
+
+    @property
+    def window(self) -> int:
+        """Number of requests allowed in flight."""
+        return max(1, int(self.limit))
+
+    @property
+    def load(self) -> float:
+        """Requests in flight or queued, relative to the window."""
+        return (self.in_flight + len(self._waiters)) / self.window
+
+    async def acquire(self) -> int:
+        """
+        Wait for a free slot in the window.
+
+        Returns:
+            Sequence number of the request, to pass to release
+        """
+        if self.in_flight < self.window and not self._waiters:
+            self.in_flight += 1
+        else:
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            self.stats["max_queued"] = max(self.stats["max_queued"], len(self._waiters))
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter.done() and not waiter.cancelled():
+                    # The slot was handed over just before the cancellation
+                    self.in_flight -= 1
+                    self._wake()
+                else:
+                    self._waiters.remove(waiter)
+                raise
+        self._started += 1
+        return self._started
+
+    def release(self, request: int, latency: Optional[float] = None, overloaded: bool = False,
+                failed: bool = False) -> None:
+        """
+        Free a slot and adjust the window to the request's outcome.
+
+        Args:
+            request: Sequence number returned by acquire
+            latency: Latency of a successful request in seconds
+            overloaded: Whether the endpoint signalled overload
+            failed: Whether the request failed for another reason
+
+        A release with neither a latency nor a failure (e.g. a cancelled
+        request) only frees the slot.
+        """
+        saturated = self.in_flight >= self.window or bool(self._waiters)
+        self.in_flight -= 1
+
+        if overloaded:
+            self._on_overload(request)
+        elif failed or latency is not None:
+            alpha = self.config['error_rate_alpha']
+            self.error_rate = (1 - alpha) * self.error_rate + alpha * (1.0 if failed else 0.0)
+            if not failed:
+                self._on_success(latency, saturated)
+
+        self._wake()
+
+    def _on_success(self, latency: float, saturated: bool) -> None:
+        # The baseline follows new minimums at once and drifts up slowly, tracking the unloaded latency
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            self.baseline_latency += self.config['baseline_alpha'] * (latency - self.baseline_latency)
+
+        healthy = (
+            latency <= self.baseline_latency * self.config['latency_tolerance']
+            and self.error_rate <= self.config['max_error_rate']
+        )
+        # Only a full window says anything about whether the endpoint could take more
+        if healthy and saturated and self.limit < self.config['max_limit']:
+            self.limit = min(self.config['max_limit'], self.limit + self.config['increase'] / self.limit)
+            self.stats["increases"] += 1
+
+    def _on_overload(self, request: int) -> None:
+        self.stats["overloads"] += 1
+        if request <= self._decreased_at:
+            return
+        previous = self.window
+        self.limit = max(self.config['min_limit'], self.limit * self.config['decrease_factor'])
+        self._decreased_at = self._started
+        self.stats["decreases"] += 1
+        logger.info(f"Endpoint {self.url} overloaded, concurrency window {previous} -> {self.window}")
+
+    def _wake(self) -> None:
+        """Hand free slots to waiting requests in arrival order."""
+        while self._waiters and self.in_flight < self.window:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self.in_flight += 1
+            waiter.set_result(None)
+
+    def restore(self, limit: Optional[float]) -> None:
+        """Start from a window learned in a previous run."""
+        if limit:
+            self.limit = min(self.config['max_limit'], max(self.config['min_limit'], float(limit)))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "limit": round(self.limit, 2),
+            "window": self.window,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "baseline_latency": self.baseline_latency,
+            "error_rate": round(self.error_rate, 4),
+            **self.stats,
+        }
+
+    @asynccontextmanager
+    async def request(self) -> AsyncIterator[None]:
+        """
+        Run a request inside the window and feed its outcome back.
+
+        Rate-limit errors and timeouts count as overload, other retryable
+        errors as failures, and a normal exit as a success with the elapsed
+        latency. Other exceptions, such as an RPC error or a skipped slot
+        answered by a healthy node, or a cancellation, only free the slot.
+        """
+        request = await self.acquire()
+        started = time.monotonic()
+        try:
+            yield
+        except OVERLOAD_ERRORS:
+            self.release(request, overloaded=True)
+            raise
+        except SlotSkippedError:
+            self.release(request)
+            raise
+        except RetryableError:
+            self.release(request, failed=True)
+            raise
+        except BaseException:
+            self.release(request)
+            raise
+        else:
+            self.release(request, latency=time.monotonic() - started)
@@ -0,0 +1,482 @@
+"""
+Local inverted index of address -> slots and signatures.
+
+Every block the ingestion paths fetch (the block tail, ``process_blocks`` and
+``extract_blocks``) passes through ``AddressExtractor``, which lists for each
+account key, program id and token mint the positions of the transactions that
+touch it. ``AddressIndex`` buffers those postings and its background writer
+(``run()``) writes them in batches to SQLite from a worker thread:
+
+- ``address_index_blocks``: one row per block with its parent slot, block
+  time and the signatures the positions refer to
+- ``address_postings``: one row per address per flush, holding the
+  ``(slot, position)`` entries as varints, slots delta-encoded
+
+Rows older than the retention period (by block time) are dropped. The index
+also tracks which slot ranges it has fully seen: a block with a known parent
+covers every slot after its parent, since the slots in between were skipped.
+Queries like "recent activity for mint X" are then answered from the index
+without RPC calls whenever their window is covered.
+"""
+import asyncio
+import heapq
+import logging
+import threading
+import time
+from bisect import bisect_right
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.config import ADDRESS_INDEX_CONFIG
+from app.database.sqlite import DatabaseCache
+
+logger = logging.getLogger(__name__)
+
+Posting = Tuple[int, int]  # (slot, position of the transaction in the block's signatures)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def encode_postings(entries: Iterable[Posting]) -> bytes:
+    """
+    Encode postings as varints, each slot stored as the delta from the previous one.
+
+    Args:
+        entries: (slot, position) pairs
+
+    Returns:
+        Encoded postings, sorted by slot and position
+    """
+    out = bytearray()
+    previous = 0
+    for slot, position in sorted(entries):
+        _write_varint(out, slot - previous)
+        _write_varint(out, position)
+        previous = slot
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[Posting]:
+    """
+    Decode postings written by ``encode_postings``.
+
+    Args:
+        data: Encoded postings
+
+    Returns:
+        (slot, position) pairs in ascending order
+    """
+    entries = []
+    values = []
+    value = shift = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        values.append(value)
+        value = shift = 0
+    slot = 0
+    for i in range(0, len(values) - 1, 2):
+        slot += values[i]
+        entries.append((slot, values[i + 1]))
+    return entries
+
+
+class SlotCoverage:
+    """Disjoint, sorted slot ranges the index has fully seen."""
+
+    def __init__(self):
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+
+    def add(self, start: int, end: int) -> None:
+        """Mark the slots from start to end (inclusive) as covered, merging adjacent ranges."""
+        i = bisect_right(self._ends, start - 2)
+        j = bisect_right(self._starts, end + 1)
+        if i < j:
+            start = min(start, self._starts[i])
+            end = max(end, self._ends[j - 1])
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+
+    def covered_until(self, slot: int) -> Optional[int]:
+        """
+        Get the last slot of the covered range containing a slot.
+
+        Args:
+            slot: Slot to look up
+
+        Returns:
+            Last covered slot of its range, or None if the slot is not covered
+        """
+        i = bisect_right(self._starts, slot) - 1
+        if i >= 0 and self._ends[i] >= slot:
+            return self._ends[i]
+        return None
+
+    def covers(self, start: int, end: int) -> bool:
+        """Check whether every slot from start to end is covered."""
+        last = self.covered_until(start)
+        return last is not None and last >= end
+
+    def clear(self) -> None:
+        self._starts.clear()
+        self._ends.clear()
+
+    @property
+    def ranges(self) -> List[Tuple[int, int]]:
+        return list(zip(self._starts, self._ends))
+
+
+class AddressIndex:
+    """
+    Address -> (slot, signature) index over recently ingested blocks.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DatabaseCache] = None,
+        retention_seconds: Optional[int] = None,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            db: Database holding the address index tables
+            retention_seconds: Age, by block time, after which blocks are dropped
+        """
+        self.db = db or DatabaseCache()
+        self.retention_seconds = retention_seconds or ADDRESS_INDEX_CONFIG['retention_seconds']
+        self.coverage = SlotCoverage()
+
+        # slot -> (parent_slot, block_time, signatures)
+        self._pending_blocks: Dict[int, Tuple[Optional[int], Optional[int], List[str]]] = {}
+        self._pending_postings: Dict[str, List[Posting]] = {}
+        self._lock = threading.RLock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._flush_requested: Optional[asyncio.Event] = None
+        self._last_prune = time.monotonic()
+        self._loaded = False
+        self.stats = {
+            "blocks_indexed": 0,
+            "transactions_indexed": 0,
+            "flushes": 0,
+            "posting_lists_written": 0,
+            "blocks_pruned": 0,
+            "lookups": 0,
+        }
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> int:
+        """
+        Rebuild the slot coverage from the stored blocks.
+
+        Returns:
+            Number of stored blocks
+        """
+        slots = self.db.get_address_index_slots()
+        with self._lock:
+            self.coverage.clear()
+            for slot, parent_slot in slots:
+                self._cover(slot, parent_slot)
+            for slot, (parent_slot, _, _) in self._pending_blocks.items():
+                self._cover(slot, parent_slot)
+            self._loaded = True
+        logger.info(f"Loaded address index with {len(slots)} blocks covering {self.coverage.ranges}")
+        return len(slots)
+
+    def _cover(self, slot: int, parent_slot: Optional[int]) -> None:
+        start = parent_slot + 1 if parent_slot is not None and parent_slot < slot else slot
+        self.coverage.add(start, slot)
+
+    def add_block(
+        self,
+        slot: int,
+        block_time: Optional[int],
+        parent_slot: Optional[int],
+        signatures: Sequence[str],
+        postings: Dict[str, Sequence[int]],
+    ) -> None:
+        """
+        Add a block's postings; the database write is batched by ``run()``.
+
+        Args:
+            slot: Slot of the block
+            block_time: Block time of the block
+            parent_slot: Parent slot of the block, if known
+            signatures: Signatures of the indexed transactions, by position
+            postings: Address -> positions of the transactions touching it
+        """
+        with self._lock:
+            self._pending_blocks[slot] = (parent_slot, block_time, list(signatures))
+            pending = self._pending_postings
+            for address, positions in postings.items():
+                entries = pending.get(address)
+                if entries is None:
+                    entries = pending[address] = []
+                entries.extend((slot, position) for position in positions)
+            self._cover(slot, parent_slot)
+            self.stats["blocks_indexed"] += 1
+            self.stats["transactions_indexed"] += len(signatures)
+
+        if len(self._pending_blocks) >= ADDRESS_INDEX_CONFIG['max_pending_blocks']:
+            self._request_flush()
+
+    def _request_flush(self) -> None:
+        """Wake the background writer before its next interval; callable from any thread."""
+        loop, event = self._loop, self._flush_requested
+        if loop is None or event is None or event.is_set():
+            return
+        try:
+            loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass  # The writer's loop is closed
+
+    def add_extracted(self, results: Optional[Dict[str, Any]]) -> None:
+        """
+        Add the results of an ``AddressExtractor`` run without an index (e.g. in a block worker).
+
+        Args:
+            results: The extractor's results
+        """
+        if not results or results.get("slot") is None:
+            return
+        self.add_block(
+            results["slot"],
+            results.get("block_time"),
+            results.get("parent_slot"),
+            results.get("signatures") or [],
+            results.get("postings") or {},
+        )
+
+    def index_block(self, block: Dict[str, Any]) -> None:
+        """
+        Index a decoded getBlock result that carries account keys and token balances.
+
+        Walks every transaction of the block, so callers on the event loop run
+        it with ``asyncio.to_thread``.
+
+        Args:
+            block: Block in the json-encoded layout, with ``slot`` set
+        """
+        from app.utils.handlers.address_extractor import AddressExtractor
+
+        AddressExtractor(address_index=self).process_block(block)
+
+    def flush(self) -> bool:
+        """
+        Write pending blocks and postings in one transaction.
+
+        Returns:
+            True if successful, False otherwise (the postings stay pending)
+        """
+        with self._lock:
+            if not self._pending_blocks:
+                return True
+            blocks, self._pending_blocks = self._pending_blocks, {}
+            postings, self._pending_postings = self._pending_postings, {}
+
+        block_rows = [
+            (slot, parent_slot, block_time, "\n".join(signatures))
+            for slot, (parent_slot, block_time, signatures) in blocks.items()
+        ]
+        posting_rows = []
+        for address, entries in postings.items():
+            slots = [slot for slot, _ in entries]
+            posting_rows.append((address, min(slots), max(slots), len(entries), encode_postings(entries)))
+
+        if not self.db.store_address_index(block_rows, posting_rows):
+            with self._lock:
+                for slot, block in blocks.items():
+                    self._pending_blocks.setdefault(slot, block)
+                for address, entries in postings.items():
+                    self._pending_postings.setdefault(address, []).extend(entries)
+            return False
+
+        self.stats["flushes"] += 1
+        self.stats["posting_lists_written"] += len(posting_rows)
+        return True
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """
+        Drop blocks older than the retention period and rebuild the coverage.
+
+        Args:
+            now: Current unix time
+
+        Returns:
+            Number of blocks dropped
+        """
+        cutoff = int((now or time.time()) - self.retention_seconds)
+        dropped = self.db.prune_address_index(cutoff)
+        self._last_prune = time.monotonic()
+        if dropped:
+            self.stats["blocks_pruned"] += dropped
+            self.load()
+        return dropped
+
+    def covered_until(self, slot: int) -> Optional[int]:
+        """Get the last slot of the covered range containing a slot, or None if it is not covered."""
+        return self.coverage.covered_until(slot)
+
+    def covers(self, start_slot: int, end_slot: int) -> bool:
+        """Check whether every slot of a range has been indexed."""
+        return self.coverage.covers(start_slot, end_slot)
+
+    def _postings(
+        self,
+        address: str,
+        start_slot: Optional[int],
+        end_slot: Optional[int],
+        limit: Optional[int] = None,
+    ) -> List[Posting]:
+        """
+        Stored and pending postings of an address within a slot range, newest first.
+
+        With a limit, stored posting lists are decoded newest first and only
+        until the limit is reached by entries no older list can precede.
+        """
+        low = start_slot if start_slot is not None else 0
+        high = end_slot if end_slot is not None else float("inf")
+        with self._lock:
+            entries = {entry for entry in self._pending_postings.get(address, ()) if low <= entry[0] <= high}
+        for _, last_slot, data in self.db.get_address_postings(address, start_slot, end_slot):
+            if limit is not None and len(entries) >= limit and last_slot < heapq.nlargest(limit, entries)[-1][0]:
+                break
+            entries.update(entry for entry in decode_postings(data) if low <= entry[0] <= high)
+        return sorted(entries, reverse=True)[:limit] if limit is not None else sorted(entries, reverse=True)
+
+    def slots(self, address: str, start_slot: Optional[int] = None, end_slot: Optional[int] = None) -> List[int]:
+        """
+        Get the slots in which an address was touched.
+
+        Args:
+            address: Account, mint or program address
+            start_slot: Oldest slot to include
+            end_slot: Newest slot to include
+
+        Returns:
+            Slots, oldest first
+        """
+        self.stats["lookups"] += 1
+        return sorted({slot for slot, _ in self._postings(address, start_slot, end_slot)})
+
+    def lookup(
+        self,
+        address: str,
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the transactions that touched an address, newest first.
+
+        Args:
+            address: Account, mint or program address
+            start_slot: Oldest slot to include
+            end_slot: Newest slot to include
+            since: Oldest block time to include
+            limit: Maximum number of transactions
+
+        Returns:
+            getSignaturesForAddress-style infos with signature, slot and blockTime
+        """
+        self.stats["lookups"] += 1
+        if since is not None:
+            first_slot = self.db.get_address_index_first_slot(since)
+            with self._lock:
+                pending = [slot for slot, (_, block_time, _) in self._pending_blocks.items() if block_time and block_time >= since]
+            if pending:
+                first_slot = min(pending + ([first_slot] if first_slot is not None else []))
+            if first_slot is None:
+                return []
+            start_slot = max(start_slot or 0, first_slot)
+        entries = self._postings(address, start_slot, end_slot, limit)
+        found: List[Dict[str, Any]] = []
+        for i in range(0, len(entries), 500):
+            chunk = entries[i:i + 500]
+            slots = sorted({slot for slot, _ in chunk})
+            with self._lock:
+                blocks = {
+                    slot: (self._pending_blocks[slot][1], self._pending_blocks[slot][2])
+                    for slot in slots if slot in self._pending_blocks
+                }
+            missing = [slot for slot in slots if slot not in blocks]
+            if missing:
+                blocks.update(self.db.get_address_index_blocks(missing))
+            for slot, position in chunk:
+                block = blocks.get(slot)
+                if block is None or position >= len(block[1]):
+                    continue  # Pruned since the postings were read
+                block_time, signatures = block
+                if since is not None and block_time is not None and block_time < since:
+                    return found
+                found.append({"signature": signatures[position], "slot": slot, "blockTime": block_time})
+                if limit is not None and len(found) >= limit:
+                    return found
+        return found
+
+    async def run(self) -> None:
+        """
+        Flush pending postings and prune old blocks in a worker thread until cancelled.
+
+        Writes every ``flush_interval`` seconds, or as soon as ``max_pending_blocks``
+        blocks are pending.
+        """
+        self._loop = asyncio.get_running_loop()
+        self._flush_requested = asyncio.Event()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(self._flush_requested.wait(), ADDRESS_INDEX_CONFIG['flush_interval'])
+                except asyncio.TimeoutError:
+                    pass
+                self._flush_requested.clear()
+                try:
+                    await asyncio.to_thread(self.flush)
+                    if time.monotonic() - self._last_prune >= ADDRESS_INDEX_CONFIG['prune_interval']:
+                        await asyncio.to_thread(self.prune)
+                except Exception as e:
+                    logger.error(f"Error writing address index: {e}")
+        finally:
+            self._loop = self._flush_requested = None
+            await asyncio.to_thread(self.flush)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            **self.stats,
+            "loaded": self._loaded,
+            "pending_blocks": len(self._pending_blocks),
+            "pending_addresses": len(self._pending_postings),
+            "coverage": self.coverage.ranges,
+            "retention_seconds": self.retention_seconds,
+        }
+
+
+_address_index: Optional[AddressIndex] = None
+
+
+def get_address_index() -> Optional[AddressIndex]:
+    """
+    Get or create the shared address index.
+
+    Returns:
+        The index, or None when the address index is disabled
+    """
+    global _address_index
+
+    if not ADDRESS_INDEX_CONFIG['enabled']:
+        return None
+    if _address_index is None:
+        _address_index = AddressIndex()
+    return _address_index
@@ -0,0 +1,295 @@
+"""
+Address-centric query planning for entity-scoped analytics.
+
+Requests about one token, program or collection used to scan every block in
+the window and filter afterwards, so their cost grew with chain throughput.
+When the target addresses are known, ``AddressQueryPlanner`` instead pages
+``getSignaturesForAddress`` back to the start of the window and fetches only
+those transactions with bounded-concurrency ``getTransaction`` calls. The
+transactions are grouped into block-shaped dicts by slot, so the existing
+extractors' ``process_block`` runs on them unchanged. Requests without target
+addresses (global aggregates) keep using block scans.
+
+Signatures come from the local address index (see ``address_index``) for the
+part of the window it covers; only newer slots are paged over RPC.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+from app.config import ADDRESS_QUERY_CONFIG
+from .solana_error import RetryableError
+from .metrics import record_rpc_retry
+from .address_index import AddressIndex, get_address_index
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_PLAN = "address"
+BLOCK_SCAN_PLAN = "blocks"
+
+
+@dataclass
+class AddressQueryResult:
+    """Transactions found for a set of addresses, grouped into block-shaped dicts."""
+
+    blocks: List[Dict[str, Any]] = field(default_factory=list)
+    signatures: int = 0
+    transactions: int = 0
+    truncated: bool = False
+    start_slot: Optional[int] = None
+    end_slot: Optional[int] = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "plan": ADDRESS_PLAN,
+            "signatures_scanned": self.signatures,
+            "transactions_fetched": self.transactions,
+            "slots_with_activity": len(self.blocks),
+            "truncated": self.truncated,
+            "start_slot": self.start_slot,
+            "end_slot": self.end_slot,
+        }
+
+
+def plan_query(addresses: Optional[Iterable[str]]) -> str:
+    """
+    Choose how to answer a query.
+
+    Args:
+        addresses: Target addresses of the query, if it is entity-scoped
+
+    Returns:
+        ADDRESS_PLAN when a few target addresses are known, BLOCK_SCAN_PLAN otherwise
+    """
+    targets = [address for address in (addresses or []) if address]
+    if targets and len(targets) <= ADDRESS_QUERY_CONFIG['max_addresses']:
+        return ADDRESS_PLAN
+    return BLOCK_SCAN_PLAN
+
+
+class AddressQueryPlanner:
+    """
+    Fetches the transactions touching given addresses within a slot window.
+    """
+
+    def __init__(self, query_handler, address_index: Optional[AddressIndex] = None):
+        """
+        Initialize the planner.
+
+        Args:
+            query_handler: SolanaQueryHandler whose connection pool serves the calls
+            address_index: Local address index, defaults to the shared index
+        """
+        self.query_handler = query_handler
+        self.address_index = address_index or get_address_index()
+
+    async def _call(self, method: str, *args: Any, **kwargs: Any) -> Any:
+        """Call a SolanaClient method on a pool client, retrying retryable errors on other clients."""
+        max_retries = ADDRESS_QUERY_CONFIG['max_retries']
+        delay = 0.5
+        for attempt in range(max_retries):
+            client = await self.query_handler.connection_pool.get_client()
+            try:
+                return await getattr(client, method)(*args, **kwargs)
+            except RetryableError as e:
+                if attempt == max_retries - 1:
+                    raise
+                logger.warning(f"Retryable error in {method}, attempt {attempt + 1}/{max_retries}: {str(e)}")
+                record_rpc_retry(method)
+                await asyncio.sleep(delay)
+                delay *= 2
+
+    async def window(self, blocks: int) -> Dict[str, int]:
+        """
+        Get the slot window covered by the most recent ``blocks`` blocks.
+
+        Args:
+            blocks: Number of recent blocks
+
+        Returns:
+            Dict with start_slot and end_slot
+        """
+        await self.query_handler.ensure_initialized()
+        end_slot = await self._call("get_slot")
+        return {"start_slot": max(0, end_slot - blocks + 1), "end_slot": end_slot}
+
+    async def signatures(
+        self,
+        address: str,
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Page an address's signatures, newest first, back to the start of a slot window.
+
+        Args:
+            address: Account, mint, program or collection address
+            start_slot: Oldest slot to include
+            end_slot: Newest slot to include
+            limit: Maximum number of signatures
+
+        Returns:
+            Signature infos within the window
+        """
+        limit = limit or ADDRESS_QUERY_CONFIG['max_transactions']
+        indexed_until = None
+        if self.address_index is not None and start_slot is not None:
+            indexed_until = self.address_index.covered_until(start_slot)
+        if indexed_until is None:
+            return await self._rpc_signatures(address, start_slot, end_slot, limit)
+
+        # Only the slots after the indexed range need RPC calls
+        found: List[Dict[str, Any]] = []
+        if end_slot is None or end_slot > indexed_until:
+            found = await self._rpc_signatures(address, indexed_until + 1, end_slot, limit)
+        if len(found) < limit:
+            indexed_end = indexed_until if end_slot is None else min(end_slot, indexed_until)
+            found.extend(await asyncio.to_thread(
+                self.address_index.lookup, address, start_slot, indexed_end, None, limit - len(found)
+            ))
+        return found
+
+    async def _rpc_signatures(
+        self,
+        address: str,
+        start_slot: Optional[int],
+        end_slot: Optional[int],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Page getSignaturesForAddress back to the start of a slot window."""
+        page_size = ADDRESS_QUERY_CONFIG['page_size']
+        found: List[Dict[str, Any]] = []
+        before = None
+        while len(found) < limit:
+            page = await self._call("get_signatures_for_address", address, before=before, limit=page_size)
+            if not page:
+                break
+            for info in page:
+                slot = info.get("slot", 0)
+                if start_slot is not None and slot < start_slot:
+                    return found
+                if end_slot is not None and slot > end_slot:
+                    continue
+                found.append(info)
+                if len(found) >= limit:
+                    break
+            if len(page) < page_size:
+                break
+            before = page[-1].get("signature")
+        return found
+
+    async def transactions(self, signatures: Sequence[str]) -> List[Dict[str, Any]]:
+        """
+        Fetch parsed transactions with bounded concurrency.
+
+        Args:
+            signatures: Transaction signatures
+
+        Returns:
+            getTransaction results, in the order given; missing transactions are left out
+        """
+        semaphore = asyncio.Semaphore(ADDRESS_QUERY_CONFIG['concurrency'])
+
+        async def fetch(signature: str) -> Optional[Dict[str, Any]]:
+            async with semaphore:
+                try:
+                    return await self._call("get_transaction", signature, encoding="jsonParsed")
+                except Exception as e:
+                    logger.error(f"Error fetching transaction {signature}: {str(e)}")
+                    return None
+
+        results = await asyncio.gather(*(fetch(signature) for signature in signatures))
+        return [tx for tx in results if tx]
+
+    async def fetch(
+        self,
+        addresses: Iterable[str],
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None,
+        blocks: Optional[int] = None,
+    ) -> AddressQueryResult:
+        """
+        Fetch the transactions touching any of the addresses within a slot window.
+
+        Args:
+            addresses: Target addresses
+            start_slot: Oldest slot to include
+            end_slot: Newest slot to include
+            blocks: Use the most recent ``blocks`` slots as the window instead
+
+        Returns:
+            AddressQueryResult with one block-shaped dict per slot, oldest first
+        """
+        await self.query_handler.ensure_initialized()
+        if blocks is not None:
+            bounds = await self.window(blocks)
+            start_slot, end_slot = bounds["start_slot"], bounds["end_slot"]
+
+        result = AddressQueryResult(start_slot=start_slot, end_slot=end_slot)
+        limit = ADDRESS_QUERY_CONFIG['max_transactions']
+        pages = await asyncio.gather(*(
+            self.signatures(address, start_slot, end_slot, limit) for address in dict.fromkeys(addresses)
+        ))
+
+        # A transaction touching several target addresses is fetched once
+        infos: Dict[str, Dict[str, Any]] = {}
+        for page in pages:
+            result.truncated = result.truncated or len(page) >= limit
+            for info in page:
+                infos.setdefault(info["signature"], info)
+        result.signatures = len(infos)
+
+        fetched = await self.transactions(list(infos))
+        result.transactions = len(fetched)
+
+        by_slot: Dict[int, Dict[str, Any]] = {}
+        for tx in fetched:
+            slot = tx.get("slot")
+            block = by_slot.setdefault(slot, {
+                "slot": slot,
+                "parentSlot": slot - 1 if slot else None,
+                "blockTime": tx.get("blockTime"),
+                "transactions": [],
+            })
+            block["transactions"].append({
+                "transaction": tx.get("transaction"),
+                "meta": tx.get("meta"),
+                "version": tx.get("version"),
+            })
+        result.blocks = [by_slot[slot] for slot in sorted(by_slot)]
+        return result
+
+    async def blocks_data(
+        self,
+        addresses: Optional[Iterable[str]],
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None,
+        blocks: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Answer an entity-scoped query in the shape of ``SolanaQueryHandler.process_blocks``.
+
+        Args:
+            addresses: Target addresses of the query
+            start_slot: Oldest slot to include
+            end_slot: Newest slot to include
+            blocks: Use the most recent ``blocks`` slots as the window instead
+
+        Returns:
+            Dict with success, blocks and query_plan, or None if the query
+            should fall back to a block scan
+        """
+        if plan_query(addresses) != ADDRESS_PLAN:
+            return None
+        try:
+            result = await self.fetch(addresses, start_slot=start_slot, end_slot=end_slot, blocks=blocks)
+        except Exception as e:
+            logger.warning(f"Address query failed, falling back to block scan: {str(e)}")
+            return None
+        logger.info(
+            f"Address query found {result.transactions} transactions in {len(result.blocks)} slots "
+            f"for {len(list(addresses))} address(es)"
+        )
+        return {"success": True, "blocks": result.blocks, "query_plan": result.stats()}
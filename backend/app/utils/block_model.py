@@ -0,0 +1,255 @@
+"""
+Compact per-block transaction model.
+
+A decoded ``getBlock`` result stores every account key as its own 44-char
+string in every transaction that touches it. ``CompactBlock`` interns the
+keys once per block in a ``KeyTable`` and stores transactions as
+``__slots__`` records that refer to keys by integer id:
+
+- ``CompactTransaction.accounts``: ``array('I')`` of key ids, in the
+  transaction's own account order (static keys, then loaded writable and
+  readonly addresses)
+- ``CompactInstruction``: program key id, ``array('I')`` of account key ids
+  and the instruction data as received (base58); ``data_bytes()`` decodes it
+- ``TokenBalances``: parallel arrays of account ids, mint ids, raw amounts
+  and decimals
+
+Program-id checks become integer set lookups: resolve the ids once per block
+with ``KeyTable.ids`` and test ``instruction.program in ids``. Extractors that
+set ``ACCEPTS_COMPACT_BLOCK`` are handed a ``CompactBlock`` by the block
+workers instead of the decoded dict.
+
+Blocks are built from the ``json``-encoded layout (see
+``block_requirements.normalize_block``); ``jsonParsed`` instructions are kept
+only as far as they carry ``programId`` and ``accounts``.
+"""
+import logging
+import sys
+from array import array
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+
+import base58
+
+logger = logging.getLogger(__name__)
+
+
+class KeyTable:
+    """Interned account keys of one block, addressed by integer id."""
+
+    __slots__ = ("keys", "_ids")
+
+    def __init__(self):
+        self.keys: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def intern(self, key: str) -> int:
+        """
+        Get the id of a key, adding it to the table if needed.
+
+        Args:
+            key: Base58 account key
+
+        Returns:
+            The key's id in this block
+        """
+        key_id = self._ids.get(key)
+        if key_id is None:
+            key_id = len(self.keys)
+            key = sys.intern(key)
+            self.keys.append(key)
+            self._ids[key] = key_id
+        return key_id
+
+    def id_of(self, key: str) -> Optional[int]:
+        """Get the id of a key, or None if the block never references it."""
+        return self._ids.get(key)
+
+    def ids(self, keys: Iterable[str]) -> FrozenSet[int]:
+        """
+        Resolve a set of addresses (e.g. program ids) to the ids used in this block.
+
+        Args:
+            keys: Base58 account keys
+
+        Returns:
+            Ids of the keys that occur in the block
+        """
+        ids = self._ids
+        return frozenset(ids[key] for key in keys if key in ids)
+
+    def __getitem__(self, key_id: int) -> str:
+        return self.keys[key_id]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+class CompactInstruction:
+    """One instruction with its program and accounts as key ids."""
+
+    __slots__ = ("program", "accounts", "data")
+
+    def __init__(self, program: int, accounts: array, data: str):
+        self.program = program
+        self.accounts = accounts
+        self.data = data
+
+    def data_bytes(self) -> bytes:
+        """Decode the base58 instruction data."""
+        return base58.b58decode(self.data) if self.data else b""
+
+
+class TokenBalances:
+    """Pre- or post-transaction token balances as parallel arrays."""
+
+    __slots__ = ("accounts", "mints", "amounts", "decimals")
+
+    def __init__(self):
+        self.accounts = array("I")  # Key id of the token account
+        self.mints = array("I")     # Key id of the mint
+        self.amounts = array("Q")   # Raw token amount
+        self.decimals = array("B")
+
+    def __len__(self) -> int:
+        return len(self.mints)
+
+
+class CompactTransaction:
+    """One transaction of a CompactBlock."""
+
+    __slots__ = (
+        "signature", "accounts", "instructions", "inner_instructions",
+        "err", "fee", "log_messages", "pre_token_balances", "post_token_balances",
+    )
+
+    def __init__(self):
+        self.signature: Optional[str] = None
+        self.accounts = array("I")
+        self.instructions: Tuple[CompactInstruction, ...] = ()
+        self.inner_instructions: Tuple[CompactInstruction, ...] = ()  # Flattened across groups
+        self.err: Any = None
+        self.fee: int = 0
+        self.log_messages: Tuple[str, ...] = ()
+        self.pre_token_balances = TokenBalances()
+        self.post_token_balances = TokenBalances()
+
+    def all_instructions(self) -> Iterator[CompactInstruction]:
+        """Top-level instructions followed by inner instructions."""
+        yield from self.instructions
+        yield from self.inner_instructions
+
+
+class CompactBlock:
+    """A block with interned account keys and compact transaction records."""
+
+    __slots__ = ("slot", "block_time", "blockhash", "parent_slot", "keys", "transactions")
+
+    def __init__(self, slot: Optional[int] = None, block_time: Optional[int] = None):
+        self.slot = slot
+        self.block_time = block_time
+        self.blockhash: Optional[str] = None
+        self.parent_slot: Optional[int] = None
+        self.keys = KeyTable()
+        self.transactions: List[CompactTransaction] = []
+
+    def __len__(self) -> int:
+        return len(self.transactions)
+
+    @classmethod
+    def from_block(cls, block: Dict[str, Any], slot: Optional[int] = None) -> "CompactBlock":
+        """
+        Build a compact block from a decoded getBlock result.
+
+        Args:
+            block: getBlock result in the json-encoded layout
+            slot: Slot of the block, used when the block does not carry one
+
+        Returns:
+            The compact block
+        """
+        compact = cls(slot=block.get("slot", slot), block_time=block.get("blockTime"))
+        compact.blockhash = block.get("blockhash")
+        compact.parent_slot = block.get("parentSlot")
+        for tx_wrapper in block.get("transactions") or ():
+            try:
+                compact.add_transaction(tx_wrapper)
+            except Exception as e:
+                logger.error(f"Error compacting transaction in block {compact.slot}: {str(e)}")
+        return compact
+
+    def add_transaction(self, tx_wrapper: Dict[str, Any]) -> Optional[CompactTransaction]:
+        """
+        Append one entry of a block's transactions list.
+
+        Args:
+            tx_wrapper: Transaction entry with ``transaction`` and ``meta``
+
+        Returns:
+            The compact transaction, or None if the entry is malformed
+        """
+        if not isinstance(tx_wrapper, dict):
+            return None
+        transaction = tx_wrapper.get("transaction")
+        if not isinstance(transaction, dict):
+            return None
+        message = transaction.get("message") or {}
+        meta = tx_wrapper.get("meta") or {}
+        intern = self.keys.intern
+
+        tx = CompactTransaction()
+        signatures = transaction.get("signatures")
+        if signatures:
+            tx.signature = signatures[0]
+
+        accounts = tx.accounts
+        for key in message.get("accountKeys") or ():
+            accounts.append(intern(key if isinstance(key, str) else key.get("pubkey", "")))
+        loaded = meta.get("loadedAddresses")
+        if loaded:
+            for key in loaded.get("writable") or ():
+                accounts.append(intern(key))
+            for key in loaded.get("readonly") or ():
+                accounts.append(intern(key))
+
+        tx.instructions = self._instructions(message.get("instructions"), accounts)
+        inner = []
+        for group in meta.get("innerInstructions") or ():
+            inner.extend(self._instructions(group.get("instructions"), accounts))
+        tx.inner_instructions = tuple(inner)
+
+        tx.err = meta.get("err")
+        tx.fee = meta.get("fee") or 0
+        tx.log_messages = tuple(map(sys.intern, meta.get("logMessages") or ()))
+        self._token_balances(meta.get("preTokenBalances"), accounts, tx.pre_token_balances)
+        self._token_balances(meta.get("postTokenBalances"), accounts, tx.post_token_balances)
+
+        self.transactions.append(tx)
+        return tx
+
+    def _instructions(self, instructions: Optional[List[Any]], accounts: array) -> Tuple[CompactInstruction, ...]:
+        """Translate instructions to key ids through the transaction's account table."""
+        compact = []
+        intern = self.keys.intern
+        for ix in instructions or ():
+            if not isinstance(ix, dict):
+                continue
+            if "programIdIndex" in ix:
+                program = accounts[ix["programIdIndex"]]
+                ix_accounts = array("I", [accounts[index] for index in ix.get("accounts") or ()])
+            else:
+                # jsonParsed instructions name their program and accounts directly
+                program = intern(ix.get("programId", ""))
+                ix_accounts = array("I", [intern(key) for key in ix.get("accounts") or ()])
+            data = ix.get("data")
+            compact.append(CompactInstruction(program, ix_accounts, data if isinstance(data, str) else ""))
+        return tuple(compact)
+
+    def _token_balances(self, balances: Optional[List[Dict[str, Any]]], accounts: array, out: TokenBalances) -> None:
+        """Fill parallel token balance arrays."""
+        intern = self.keys.intern
+        for balance in balances or ():
+            amount = balance.get("uiTokenAmount") or {}
+            out.accounts.append(accounts[balance.get("accountIndex", 0)])
+            out.mints.append(intern(balance.get("mint", "")))
+            out.amounts.append(int(amount.get("amount") or 0))
+            out.decimals.append(amount.get("decimals") or 0)
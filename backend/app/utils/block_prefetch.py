@@ -0,0 +1,164 @@
+"""
+Read-ahead for sequential block analysis.
+
+Fetching the blocks of a slot range one at a time leaves the consumer idle
+for a full round trip after every block, and requesting every slot of the
+range wastes a call (and a retry) on each slot that was skipped. A
+``BlockPrefetcher`` first asks ``getBlocks`` which slots of the range hold a
+block, then keeps the next ``read_ahead`` of those blocks in flight while the
+caller processes the current one. Blocks are yielded in slot order and at
+most ``read_ahead`` of them are fetched but not yet consumed, so memory stays
+bounded however long the range is. If listing a sub-range fails (getBlocks
+unsupported, rate limited or timed out), every slot of it is fetched instead;
+the fetcher must then fetch exactly the slot it is given and raise
+``SlotSkippedError`` for a skipped one, and those slots are dropped.
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.config import BLOCK_PREFETCH_CONFIG
+from .solana_error import SlotSkippedError
+
+logger = logging.getLogger(__name__)
+
+SlotLister = Callable[[int, int], Awaitable[List[int]]]
+BlockFetcher = Callable[[int], Awaitable[Any]]
+
+
+class BlockPrefetcher:
+    """
+    Iterate over the blocks of a slot range, fetching ahead of the consumer.
+    """
+
+    def __init__(
+        self,
+        get_slots: SlotLister,
+        fetch_block: BlockFetcher,
+        start_slot: int,
+        end_slot: int,
+        descending: bool = False,
+        read_ahead: Optional[int] = None,
+        slots_per_request: Optional[int] = None,
+    ):
+        """
+        Initialize the prefetcher.
+
+        Args:
+            get_slots: Coroutine function returning the slots with a block
+                between two slots (inclusive), e.g. a getBlocks call
+            fetch_block: Coroutine function fetching the block of exactly the
+                given slot, raising SlotSkippedError if it was skipped
+            start_slot: Lowest slot of the range
+            end_slot: Highest slot of the range
+            descending: Yield the newest block first
+            read_ahead: Blocks fetched ahead of the one being processed
+            slots_per_request: Slots covered by one get_slots call
+        """
+        if start_slot > end_slot:
+            raise ValueError("Start slot must be less than or equal to end slot")
+        self.get_slots = get_slots
+        self.fetch_block = fetch_block
+        self.start_slot = start_slot
+        self.end_slot = end_slot
+        self.descending = descending
+        self.read_ahead = max(1, read_ahead or BLOCK_PREFETCH_CONFIG['read_ahead'])
+        self.slots_per_request = max(1, slots_per_request or BLOCK_PREFETCH_CONFIG['slots_per_request'])
+        self.stats = {
+            "slots_in_range": end_slot - start_slot + 1,
+            "slots_listed": 0,
+            "confirmed_slots": 0,
+            "blocks_fetched": 0,
+            "skipped_on_fetch": 0,
+            "slot_list_requests": 0,
+            "slot_list_failures": 0,
+            "wait_seconds": 0.0,
+        }
+
+    def _chunks(self) -> Iterator[Tuple[int, int]]:
+        """Sub-ranges of at most slots_per_request slots, in iteration order."""
+        if self.descending:
+            high = self.end_slot
+            while high >= self.start_slot:
+                low = max(self.start_slot, high - self.slots_per_request + 1)
+                yield low, high
+                high = low - 1
+        else:
+            low = self.start_slot
+            while low <= self.end_slot:
+                high = min(self.end_slot, low + self.slots_per_request - 1)
+                yield low, high
+                low = high + 1
+
+    async def slots(self) -> AsyncIterator[int]:
+        """Yield the slots of the range that hold a block, in iteration order."""
+        for low, high in self._chunks():
+            self.stats["slot_list_requests"] += 1
+            self.stats["slots_listed"] += high - low + 1
+            try:
+                confirmed = sorted(slot for slot in await self.get_slots(low, high) if low <= slot <= high)
+            except Exception as e:
+                logger.warning(f"Could not list slots {low}-{high}, fetching every slot: {str(e)}")
+                self.stats["slot_list_failures"] += 1
+                confirmed = list(range(low, high + 1))
+            self.stats["confirmed_slots"] += len(confirmed)
+            for slot in reversed(confirmed) if self.descending else confirmed:
+                yield slot
+
+    async def _fetch(self, slot: int) -> Any:
+        block = await self.fetch_block(slot)
+        self.stats["blocks_fetched"] += 1
+        return block
+
+    async def __aiter__(self) -> AsyncIterator[Tuple[int, Any]]:
+        """
+        Yield (slot, block) pairs in slot order.
+
+        A failed fetch is yielded as (slot, exception) so one bad block does
+        not end the iteration; slots found skipped when fetched are left out.
+        """
+        pending: Deque[Tuple[int, asyncio.Task]] = deque()
+        slots = self.slots().__aiter__()
+        exhausted = False
+
+        async def fill() -> None:
+            nonlocal exhausted
+            while not exhausted and len(pending) < self.read_ahead:
+                try:
+                    slot = await slots.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    return
+                pending.append((slot, asyncio.create_task(self._fetch(slot))))
+
+        try:
+            await fill()
+            while pending:
+                slot, task = pending.popleft()
+                if not task.done():
+                    waited = time.monotonic()
+                    await asyncio.wait((task,))
+                    self.stats["wait_seconds"] += time.monotonic() - waited
+                # Top the buffer up before handing the block over, so fetches run while it is processed
+                await fill()
+                if isinstance(task.exception(), SlotSkippedError):
+                    self.stats["skipped_on_fetch"] += 1
+                    continue
+                yield slot, task.exception() or task.result()
+        finally:
+            for _, task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+            await slots.aclose()
+            logger.debug(
+                f"Prefetched {self.stats['blocks_fetched']} blocks of {self.stats['slots_in_range']} slots "
+                f"({self.stats['confirmed_slots']} confirmed), consumer waited {self.stats['wait_seconds']:.2f}s"
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get prefetch statistics; skipped_slots counts both slots left out by listing and those found skipped on fetch."""
+        skipped = self.stats["slots_listed"] - self.stats["confirmed_slots"] + self.stats["skipped_on_fetch"]
+        return {**self.stats, "skipped_slots": skipped}
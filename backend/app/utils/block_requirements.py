@@ -0,0 +1,269 @@
+"""
+Block data requirements.
+
+Extractors declare the block fields they read in a ``REQUIRED_FIELDS`` class
+attribute. ``plan_block_request`` turns the union of those fields into the
+cheapest ``getBlock`` request that covers them:
+
+- ``transactionDetails``: ``none``, ``signatures``, ``accounts`` or ``full``
+- ``encoding``: ``jsonParsed`` only when parsed instructions are needed;
+  otherwise ``base64`` with local decoding when enabled, or ``json``
+- ``rewards``: only when requested
+
+``normalize_block`` then rewrites the lighter response shapes into the
+``json``-encoded ``full`` layout the extractors already understand, so an
+extractor never needs to know which request was made.
+
+Extractors that declare nothing get every field, which is today's behaviour.
+"""
+import base64
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+import base58
+
+from app.config import BLOCK_REQUEST_CONFIG
+
+try:
+    from solders.transaction import VersionedTransaction
+except ImportError:  # pragma: no cover - solders is listed in requirements.txt
+    VersionedTransaction = None
+
+logger = logging.getLogger(__name__)
+
+# Block fields an extractor can require
+BLOCK_TIME = "block_time"
+REWARDS = "rewards"
+TRANSACTION_COUNT = "transaction_count"
+SIGNATURES = "signatures"
+ACCOUNT_KEYS = "account_keys"
+BALANCES = "balances"
+TOKEN_BALANCES = "token_balances"
+STATUS = "status"
+INSTRUCTIONS = "instructions"
+INNER_INSTRUCTIONS = "inner_instructions"
+LOG_MESSAGES = "log_messages"
+PARSED_INSTRUCTIONS = "parsed_instructions"
+
+DETAIL_LEVELS = ("none", "signatures", "accounts", "full")
+
+# Lowest transactionDetails level that returns each field
+_FIELD_LEVELS = {
+    BLOCK_TIME: "none",
+    REWARDS: "none",
+    TRANSACTION_COUNT: "signatures",
+    SIGNATURES: "signatures",
+    ACCOUNT_KEYS: "accounts",
+    BALANCES: "accounts",
+    TOKEN_BALANCES: "accounts",
+    STATUS: "accounts",
+    INSTRUCTIONS: "full",
+    INNER_INSTRUCTIONS: "full",
+    LOG_MESSAGES: "full",
+    PARSED_INSTRUCTIONS: "full",
+}
+
+ALL_FIELDS: FrozenSet[str] = frozenset(_FIELD_LEVELS)
+
+
+@dataclass(frozen=True)
+class BlockRequest:
+    """The getBlock parameters chosen for a set of required fields."""
+    transaction_details: str = "full"
+    encoding: str = "jsonParsed"
+    rewards: bool = True
+
+    def rpc_options(self, commitment: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Build the getBlock config object.
+
+        Args:
+            commitment: Optional commitment level
+
+        Returns:
+            Options dict for ``getBlock``
+        """
+        options = {
+            "encoding": self.encoding,
+            "transactionDetails": self.transaction_details,
+            "rewards": self.rewards,
+            "maxSupportedTransactionVersion": 0,
+        }
+        if commitment:
+            options["commitment"] = commitment
+        return options
+
+
+def required_fields(extractor: Any) -> FrozenSet[str]:
+    """
+    Get the fields an extractor class or instance reads.
+
+    Args:
+        extractor: Extractor class or instance
+
+    Returns:
+        Declared REQUIRED_FIELDS, or every field if it declares none
+    """
+    fields = getattr(extractor, "REQUIRED_FIELDS", None)
+    if fields is None:
+        return ALL_FIELDS
+    unknown = set(fields) - ALL_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown block fields {sorted(unknown)} required by {extractor}")
+    return frozenset(fields)
+
+
+def plan_block_request(fields: Iterable[str], local_decode: Optional[bool] = None) -> BlockRequest:
+    """
+    Pick the cheapest getBlock request that returns every field.
+
+    Args:
+        fields: Required block fields
+        local_decode: Fetch base64 transactions and decode them locally
+            instead of asking for json; defaults to the configured value
+
+    Returns:
+        The block request to make
+    """
+    fields = frozenset(fields)
+    unknown = fields - ALL_FIELDS
+    if unknown:
+        raise ValueError(f"Unknown block fields: {sorted(unknown)}")
+    if local_decode is None:
+        local_decode = BLOCK_REQUEST_CONFIG['local_decode']
+
+    level = max((_FIELD_LEVELS[field] for field in fields), key=DETAIL_LEVELS.index, default="none")
+    if PARSED_INSTRUCTIONS in fields:
+        encoding = "jsonParsed"
+    elif level == "full" and local_decode and VersionedTransaction is not None:
+        encoding = "base64"
+    else:
+        encoding = "json"
+    return BlockRequest(transaction_details=level, encoding=encoding, rewards=REWARDS in fields)
+
+
+def plan_for_extractors(extractors: Iterable[Any], local_decode: Optional[bool] = None) -> BlockRequest:
+    """
+    Pick the cheapest getBlock request covering every extractor.
+
+    Args:
+        extractors: Extractor classes or instances
+        local_decode: See plan_block_request
+
+    Returns:
+        The block request to make
+    """
+    fields = set()
+    for extractor in extractors:
+        fields |= required_fields(extractor)
+    return plan_block_request(fields, local_decode)
+
+
+def _decode_base64_transaction(encoded: List[str]) -> Dict[str, Any]:
+    """Decode a base64 transaction into the json-encoded transaction layout."""
+    tx = VersionedTransaction.from_bytes(base64.b64decode(encoded[0]))
+    message = tx.message
+    header = message.header
+    decoded_message = {
+        "accountKeys": [str(key) for key in message.account_keys],
+        "header": {
+            "numRequiredSignatures": header.num_required_signatures,
+            "numReadonlySignedAccounts": header.num_readonly_signed_accounts,
+            "numReadonlyUnsignedAccounts": header.num_readonly_unsigned_accounts,
+        },
+        "recentBlockhash": str(message.recent_blockhash),
+        "instructions": [
+            {
+                "programIdIndex": ix.program_id_index,
+                "accounts": list(ix.accounts),
+                "data": base58.b58encode(ix.data).decode(),
+                "stackHeight": None,
+            }
+            for ix in message.instructions
+        ],
+    }
+    lookups = getattr(message, "address_table_lookups", None)
+    if lookups:
+        decoded_message["addressTableLookups"] = [
+            {
+                "accountKey": str(lookup.account_key),
+                "writableIndexes": list(lookup.writable_indexes),
+                "readonlyIndexes": list(lookup.readonly_indexes),
+            }
+            for lookup in lookups
+        ]
+    return {"message": decoded_message, "signatures": [str(sig) for sig in tx.signatures]}
+
+
+def _normalize_accounts_transaction(tx_wrapper: Dict[str, Any]) -> None:
+    """Rewrite a transactionDetails=accounts entry into the json-encoded full layout."""
+    transaction = tx_wrapper.get("transaction") or {}
+    static_keys, writable, readonly = [], [], []
+    for account in transaction.get("accountKeys", []):
+        if isinstance(account, str):
+            static_keys.append(account)
+        elif account.get("source") == "lookupTable":
+            (writable if account.get("writable") else readonly).append(account["pubkey"])
+        else:
+            static_keys.append(account["pubkey"])
+    tx_wrapper["transaction"] = {
+        "signatures": transaction.get("signatures", []),
+        "message": {"accountKeys": static_keys, "instructions": []},
+    }
+    meta = tx_wrapper.get("meta")
+    if isinstance(meta, dict) and (writable or readonly):
+        meta.setdefault("loadedAddresses", {"writable": writable, "readonly": readonly})
+
+
+def normalize_transaction(tx_wrapper: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rewrite one getBlock transaction entry into the json-encoded full layout.
+
+    Used on its own for transactions streamed out of a block response.
+
+    Args:
+        tx_wrapper: Entry of the block's transactions list
+
+    Returns:
+        The same entry, rewritten in place
+    """
+    if not isinstance(tx_wrapper, dict):
+        return tx_wrapper
+    transaction = tx_wrapper.get("transaction")
+    if isinstance(transaction, list):
+        try:
+            tx_wrapper["transaction"] = _decode_base64_transaction(transaction)
+        except Exception as e:
+            logger.error(f"Error decoding base64 transaction: {str(e)}")
+            tx_wrapper["transaction"] = {"signatures": [], "message": {}}
+    elif isinstance(transaction, dict) and "message" not in transaction and "accountKeys" in transaction:
+        _normalize_accounts_transaction(tx_wrapper)
+    return tx_wrapper
+
+
+def normalize_block(block: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Rewrite a getBlock result into the json-encoded full-details layout.
+
+    Handles ``signatures``-only and ``accounts`` responses and base64
+    transactions; ``json`` and ``jsonParsed`` blocks are returned unchanged.
+
+    Args:
+        block: getBlock result
+
+    Returns:
+        The same block object, rewritten in place
+    """
+    if not isinstance(block, dict):
+        return block
+
+    if "transactions" not in block:
+        signatures = block.get("signatures")
+        if signatures is not None:
+            block["transactions"] = [{"transaction": {"signatures": [sig], "message": {}}, "meta": {}} for sig in signatures]
+        return block
+
+    for tx_wrapper in block["transactions"]:
+        normalize_transaction(tx_wrapper)
+    return block
@@ -0,0 +1,324 @@
+"""
+Process-pool worker tier for block extraction.
+
+Decoding a large ``getBlock`` response and walking its transactions is pure
+CPU work; on the event loop it stalls every other request. The worker pool
+hands the raw response bytes to worker processes, which decode the block, run
+the requested extractors and send back only their compact results, so the
+full block dict never crosses the process boundary.
+
+Submissions are bounded: once ``max_pending`` blocks are queued or running,
+``extract`` waits for a slot, which pushes back on whoever is fetching blocks.
+"""
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Iterable, Optional, Sequence, Tuple
+
+from app.config import BLOCK_WORKER_CONFIG
+from app.utils.block_model import CompactBlock
+from app.utils.block_requirements import BlockRequest, normalize_block, plan_for_extractors
+from app.utils.serialization import loads
+from app.utils.metrics import observe_block_worker_wait, observe_extractor, set_block_workers_pending
+
+logger = logging.getLogger(__name__)
+
+# Extractors the workers can run: name -> import path and result keys too large to send back
+EXTRACTORS: Dict[str, Dict[str, Any]] = {
+    "mints": {"path": "app.utils.handlers.mint_extractor:MintExtractor"},
+    "pump": {"path": "app.utils.handlers.pump_extractor:PumpExtractor"},
+    "blocks": {"path": "app.utils.handlers.block_extractor:BlockExtractor", "exclude": ("blocks",)},
+    "programs": {"path": "app.utils.handlers.program_extractor:ProgramExtractor", "exclude": ("program_operations",)},
+    "addresses": {"path": "app.utils.handlers.address_extractor:AddressExtractor"},
+}
+
+_extractor_classes: Dict[str, Any] = {}
+
+
+def _extractor_class(name: str):
+    cls = _extractor_classes.get(name)
+    if cls is None:
+        module_name, _, attr = EXTRACTORS[name]["path"].partition(":")
+        cls = getattr(importlib.import_module(module_name), attr)
+        _extractor_classes[name] = cls
+    return cls
+
+
+def block_request_for(extractors: Iterable[str], extra: Iterable[Any] = ()) -> BlockRequest:
+    """
+    Plan the getBlock request that covers the named worker extractors.
+
+    Args:
+        extractors: Names of extractors from EXTRACTORS
+        extra: Further extractor classes or instances read in-process
+
+    Returns:
+        The cheapest block request returning every field they read
+    """
+    return plan_for_extractors([_extractor_class(name) for name in extractors] + list(extra))
+
+
+def _init_worker() -> None:
+    """Keep worker logs at warning level; per-block info logs belong to the parent."""
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+
+
+def extract_block(raw: bytes, extractors: Tuple[str, ...], slot: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Decode a block and run extractors on it.
+
+    Runs inside a worker process, or inline when the pool has no workers.
+
+    Args:
+        raw: getBlock response body, either the JSON-RPC envelope or the bare block
+        extractors: Names of extractors from EXTRACTORS to run
+        slot: Slot of the block, used when the block itself does not carry one
+
+    Returns:
+        Dictionary with the slot, block time, transaction count, per-extractor
+        results and per-extractor timings; extractors that accept a
+        CompactBlock share one, whose build time is reported as compact_seconds
+    """
+    start = time.perf_counter()
+    data = loads(raw)
+    block = data.get("result") if isinstance(data, dict) and "jsonrpc" in data else data
+    block = normalize_block(block)
+    decode_seconds = time.perf_counter() - start
+
+    extracted = {
+        "slot": slot,
+        "block_time": None,
+        "transactions": 0,
+        "results": {},
+        "timings": {},
+        "decode_seconds": decode_seconds,
+    }
+    if not isinstance(block, dict):
+        extracted["error"] = "Invalid block data"
+        return extracted
+
+    if slot is not None:
+        block.setdefault("slot", slot)
+    extracted["slot"] = block.get("slot", slot)
+    extracted["block_time"] = block.get("blockTime")
+    extracted["transactions"] = len(block.get("transactions") or [])
+
+    compact = None
+    for name in extractors:
+        try:
+            extractor_class = _extractor_class(name)
+            extractor = extractor_class()
+            extractor_start = time.perf_counter()
+            if getattr(extractor_class, "ACCEPTS_COMPACT_BLOCK", False):
+                if compact is None:
+                    compact = CompactBlock.from_block(block)
+                    extracted["compact_seconds"] = time.perf_counter() - extractor_start
+                    extractor_start = time.perf_counter()
+                extractor.process_block(compact)
+            else:
+                extractor.process_block(block)
+            results = extractor.get_results() or {}
+            extracted["timings"][name] = time.perf_counter() - extractor_start
+        except Exception as e:
+            logger.error(f"Extractor {name} failed on block {extracted['slot']}: {str(e)}")
+            continue
+        for key in EXTRACTORS[name].get("exclude", ()):
+            results.pop(key, None)
+        extracted["results"][name] = results
+
+    return extracted
+
+
+class BlockWorkerPool:
+    """
+    Bounded pool of extraction worker processes.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        start_method: Optional[str] = None,
+    ):
+        """
+        Initialize the pool; worker processes are started on first use.
+
+        Args:
+            max_workers: Worker processes, 0 to run extraction inline
+            max_pending: Blocks queued or running before submitters wait
+            start_method: multiprocessing start method for the workers
+        """
+        self.max_workers = BLOCK_WORKER_CONFIG['max_workers'] if max_workers is None else max_workers
+        self.max_pending = max_pending or max(1, self.max_workers) * BLOCK_WORKER_CONFIG['max_pending_per_worker']
+        self.start_method = start_method or BLOCK_WORKER_CONFIG['start_method']
+
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._slots = asyncio.Semaphore(self.max_pending)
+        self._pending = 0
+        self.stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "restarts": 0,
+            "queue_wait_seconds": 0.0,
+            "max_queue_wait_seconds": 0.0,
+        }
+
+    @property
+    def inline(self) -> bool:
+        return self.max_workers <= 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=_init_worker,
+            )
+            logger.info(f"Started block worker pool with {self.max_workers} workers ({self.start_method})")
+        return self._executor
+
+    async def extract(self, raw: bytes, extractors: Sequence[str], slot: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Decode a block and run extractors on it in a worker process.
+
+        Waits for a free slot when ``max_pending`` blocks are already in flight.
+
+        Args:
+            raw: getBlock response body
+            extractors: Names of extractors from EXTRACTORS to run
+            slot: Slot of the block
+
+        Returns:
+            Compact extraction result, see ``extract_block``
+        """
+        names = tuple(extractors)
+        unknown = [name for name in names if name not in EXTRACTORS]
+        if unknown:
+            raise ValueError(f"Unknown block worker extractors: {unknown}")
+
+        wait_start = time.perf_counter()
+        async with self._slots:
+            waited = time.perf_counter() - wait_start
+            self.stats["queue_wait_seconds"] += waited
+            self.stats["max_queue_wait_seconds"] = max(self.stats["max_queue_wait_seconds"], waited)
+            observe_block_worker_wait(waited)
+
+            self.stats["submitted"] += 1
+            self._pending += 1
+            set_block_workers_pending(self._pending)
+            try:
+                if self.inline:
+                    extracted = extract_block(raw, names, slot)
+                else:
+                    loop = asyncio.get_running_loop()
+                    extracted = await loop.run_in_executor(self._get_executor(), extract_block, raw, names, slot)
+            except BrokenProcessPool:
+                # A worker died (e.g. OOM); the next submission starts a fresh pool
+                logger.error("Block worker pool broke, restarting it")
+                self.stats["failed"] += 1
+                self.stats["restarts"] += 1
+                self._executor = None
+                raise
+            except Exception:
+                self.stats["failed"] += 1
+                raise
+            finally:
+                self._pending -= 1
+                set_block_workers_pending(self._pending)
+
+        self.stats["completed"] += 1
+        for name, seconds in extracted["timings"].items():
+            observe_extractor(name, seconds, extracted["transactions"])
+        return extracted
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+            logger.info("Block worker pool stopped")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool statistics."""
+        return {
+            **self.stats,
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self._pending,
+            "running": self._executor is not None,
+        }
+
+
+def merge_mint_results(extractions: Iterable[Dict[str, Any]], mint_index: Optional[Any] = None) -> Dict[str, Any]:
+    """
+    Combine per-block ``mints`` results into one MintExtractor-shaped result.
+
+    Workers have no access to the mint index, so their new mints are only
+    candidates; with an index, each block's candidates are claimed against
+    it in slot order, as MintExtractor would have done in-process.
+
+    Args:
+        extractions: Extraction results from ``extract``
+        mint_index: Optional MintIndex deciding which candidates are new
+
+    Returns:
+        Dictionary with all_mints, new_mints, pump_tokens and stats
+    """
+    all_mints, new_mints, pump_tokens = set(), set(), set()
+    mint_operations = token_operations = 0
+    for extracted in sorted(extractions, key=lambda e: e.get("slot") or 0):
+        results = extracted.get("results", {}).get("mints")
+        if not results:
+            continue
+        candidates = [mint for mint in results.get("new_mints", []) if mint not in new_mints]
+        if mint_index is not None:
+            candidates = mint_index.claim_new(candidates, extracted.get("slot"), extracted.get("block_time"))
+        all_mints.update(results.get("all_mints", []))
+        new_mints.update(candidates)
+        pump_tokens.update(results.get("pump_tokens", []))
+        mint_operations += len(candidates)
+        token_operations += results.get("stats", {}).get("token_operations", 0)
+
+    return {
+        "all_mints": list(all_mints),
+        "new_mints": list(new_mints),
+        "pump_tokens": list(pump_tokens),
+        "stats": {
+            "total_all_mints": len(all_mints),
+            "total_new_mints": len(new_mints),
+            "total_pump_tokens": len(pump_tokens),
+            "mint_operations": mint_operations,
+            "token_operations": token_operations
+        }
+    }
+
+
+_block_workers: Optional[BlockWorkerPool] = None
+
+
+def get_block_workers() -> Optional[BlockWorkerPool]:
+    """
+    Get or create the shared block worker pool.
+
+    Returns:
+        The pool, or None when block workers are disabled
+    """
+    global _block_workers
+
+    if not BLOCK_WORKER_CONFIG['enabled']:
+        return None
+    if _block_workers is None:
+        _block_workers = BlockWorkerPool()
+    return _block_workers
+
+
+def shutdown_block_workers() -> None:
+    """Stop the shared block worker pool if it was started."""
+    if _block_workers is not None:
+        _block_workers.shutdown()
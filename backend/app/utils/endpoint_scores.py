@@ -0,0 +1,137 @@
+"""
+Persisted RPC endpoint scores for warm starts.
+
+Startup used to probe every default endpoint with ``getHealth`` before the
+app accepted requests, and endpoint ranking started from nothing on every
+restart. ``EndpointScoreStore`` snapshots the shared endpoint registry (see
+``rpc_transport``) and the pool's ranked endpoint list to SQLite, so the
+next start can restore both at once and check the endpoints' health in the
+background (see ``SolanaConnectionPool.warm_start``).
+
+URLs carrying an API key are not written to disk; they come back from the
+configured default endpoints.
+"""
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Callable, Iterable, List, Optional
+
+from app.config import RPC_WARM_START_CONFIG
+from app.database.sqlite import DatabaseCache
+from .rpc_transport import RpcTransport, get_rpc_transport
+
+logger = logging.getLogger(__name__)
+
+
+def _has_secret(url: str) -> bool:
+    lowered = url.lower()
+    return 'api-key=' in lowered or 'apikey=' in lowered
+
+
+class EndpointScoreStore:
+    """
+    Saves and restores the endpoint registry and the pool's endpoint list.
+    """
+
+    def __init__(self, db: Optional[DatabaseCache] = None, transport: Optional[RpcTransport] = None):
+        """
+        Initialize the store.
+
+        Args:
+            db: Database holding the rpc_endpoint_scores table
+            transport: Transport whose registry is saved and restored, defaults to the shared one
+        """
+        self.db = db or DatabaseCache()
+        self.transport = transport or get_rpc_transport()
+        self._loaded: Optional[List[str]] = None
+        self.stats = {"saves": 0, "restored_endpoints": 0}
+
+    def load(self) -> List[str]:
+        """
+        Restore saved endpoint scores into the registry, once per process.
+
+        Endpoints that already have live statistics keep them.
+
+        Returns:
+            The saved pool endpoints, best first; empty if nothing recent was saved
+        """
+        if self._loaded is not None:
+            return list(self._loaded)
+        since = time.time() - RPC_WARM_START_CONFIG['max_age_seconds']
+        pool_endpoints = []
+        for row in self.db.get_rpc_endpoint_scores(since):
+            state = self.transport.endpoint(row["url"])
+            if not state.total_requests:
+                state.restore(row["stats"])
+                self.stats["restored_endpoints"] += 1
+            if row["pool_rank"] is not None:
+                pool_endpoints.append(row["url"])
+        self._loaded = pool_endpoints
+        if pool_endpoints:
+            logger.info(f"Restored scores of {self.stats['restored_endpoints']} RPC endpoints, {len(pool_endpoints)} in the pool")
+        return list(pool_endpoints)
+
+    def save(self, pool_endpoints: Iterable[str]) -> bool:
+        """
+        Snapshot the registry and the pool's endpoints.
+
+        Args:
+            pool_endpoints: URLs of the endpoints currently in the pool
+
+        Returns:
+            True if the snapshot was written
+        """
+        now = time.time()
+        members = [url for url in dict.fromkeys(pool_endpoints) if not _has_secret(url)]
+        members.sort(key=lambda url: self.transport.endpoint(url).score())
+        ranks = {self.transport.endpoint(url).url: rank for rank, url in enumerate(members)}
+        rows = [
+            (url, ranks.get(url), json.dumps(state.to_dict()), now)
+            for url, state in list(self.transport.endpoints.items())
+            if not _has_secret(url) and (state.total_requests or url in ranks)
+        ]
+        if not self.db.store_rpc_endpoint_scores(rows):
+            return False
+        self.stats["saves"] += 1
+        return True
+
+    async def run(self, get_pool_endpoints: Callable[[], Any]) -> None:
+        """
+        Snapshot the registry periodically; cancelling the task writes a final snapshot.
+
+        Args:
+            get_pool_endpoints: Returns the pool's endpoint URLs, or an awaitable of them
+        """
+        async def snapshot() -> None:
+            endpoints = get_pool_endpoints()
+            if asyncio.iscoroutine(endpoints):
+                endpoints = await endpoints
+            await asyncio.to_thread(self.save, list(endpoints))
+
+        try:
+            while True:
+                await asyncio.sleep(RPC_WARM_START_CONFIG['save_interval'])
+                try:
+                    await snapshot()
+                except Exception as e:
+                    logger.error(f"Error saving RPC endpoint scores: {str(e)}")
+        except asyncio.CancelledError:
+            try:
+                await snapshot()
+            except Exception as e:
+                logger.error(f"Error saving RPC endpoint scores: {str(e)}")
+            raise
+
+
+_endpoint_score_store: Optional[EndpointScoreStore] = None
+
+
+def get_endpoint_score_store() -> Optional[EndpointScoreStore]:
+    """Get the shared EndpointScoreStore, or None when warm starts are disabled."""
+    global _endpoint_score_store
+    if not RPC_WARM_START_CONFIG['enabled']:
+        return None
+    if _endpoint_score_store is None:
+        _endpoint_score_store = EndpointScoreStore()
+    return _endpoint_score_store
@@ -0,0 +1,164 @@
+"""
+Address Extractor - Collects which transactions of a block touch each address
+"""
+
+import logging
+from typing import Any, Dict, List, Optional, Union
+
+from ...config import ADDRESS_INDEX_CONFIG
+from ..block_model import CompactBlock
+from ..block_requirements import ACCOUNT_KEYS, BLOCK_TIME, SIGNATURES, TOKEN_BALANCES
+
+logger = logging.getLogger(__name__)
+
+
+class AddressExtractor:
+    """
+    Builds per-block postings: address -> positions of the transactions touching it.
+
+    An address touches a transaction when it is one of its account keys
+    (static or loaded through a lookup table, which includes every invoked
+    program) or the mint of one of its token balances. Positions index the
+    block's ``signatures`` list, which leaves out transactions invoking an
+    excluded program (votes, by default).
+    """
+
+    # Account keys, token balance mints and signatures; no instructions needed
+    REQUIRED_FIELDS = frozenset({ACCOUNT_KEYS, BLOCK_TIME, SIGNATURES, TOKEN_BALANCES})
+    ACCEPTS_COMPACT_BLOCK = True
+
+    def __init__(self, address_index: Optional[Any] = None):
+        """
+        Initialize the extractor.
+
+        Args:
+            address_index: Optional AddressIndex; when given, each finished
+                block is added to it and only statistics are returned
+        """
+        self.address_index = address_index
+        self.excluded = frozenset(ADDRESS_INDEX_CONFIG['exclude_programs'])
+        self.slot: Optional[int] = None
+        self.block_time: Optional[int] = None
+        self.parent_slot: Optional[int] = None
+        self.signatures: List[str] = []
+        self.postings: Dict[str, List[int]] = {}
+        self.skipped = 0
+
+    def process_block(self, block: Union[Dict[str, Any], CompactBlock]) -> None:
+        """Collect the postings of a block (dict or CompactBlock)."""
+        try:
+            if isinstance(block, CompactBlock):
+                self.process_compact_block(block)
+                return
+            if not block or not isinstance(block, dict):
+                logger.warning("Invalid block data format")
+                return
+            self.begin_block(block.get("slot"), block.get("blockTime"))
+            for tx_wrapper in block.get("transactions") or ():
+                self.process_block_transaction(tx_wrapper)
+            self.end_block(parent_slot=block.get("parentSlot"))
+        except Exception as e:
+            logger.error(f"Error extracting addresses from block: {str(e)}")
+
+    def process_compact_block(self, block: CompactBlock) -> None:
+        """Collect the postings of a CompactBlock, working on key ids until the end."""
+        self.begin_block(block.slot, block.block_time)
+        excluded = block.keys.ids(self.excluded)
+        by_id: Dict[int, List[int]] = {}
+        for tx in block.transactions:
+            if not tx.signature:
+                continue
+            keys = set(tx.accounts)
+            for balances in (tx.pre_token_balances, tx.post_token_balances):
+                keys.update(balances.mints)
+            if excluded and not excluded.isdisjoint(keys):
+                self.skipped += 1
+                continue
+            position = len(self.signatures)
+            self.signatures.append(tx.signature)
+            for key_id in keys:
+                by_id.setdefault(key_id, []).append(position)
+        keys = block.keys
+        self.postings = {keys[key_id]: positions for key_id, positions in by_id.items() if keys[key_id]}
+        self.end_block(parent_slot=block.parent_slot)
+
+    def begin_block(self, slot: Optional[Any] = None, block_time: Optional[int] = None) -> None:
+        """
+        Start a block whose transactions are passed to process_block_transaction one at a time.
+
+        Args:
+            slot: Slot of the block
+            block_time: Block time if already known; otherwise pass it to end_block
+        """
+        self.slot = slot if isinstance(slot, int) else None
+        self.block_time = block_time or None
+        self.parent_slot = None
+        self.signatures = []
+        self.postings = {}
+        self.skipped = 0
+
+    def process_block_transaction(self, tx_wrapper: Dict[str, Any]) -> None:
+        """Add one entry of a block's transactions list."""
+        if not isinstance(tx_wrapper, dict):
+            return
+        transaction = tx_wrapper.get("transaction")
+        if not isinstance(transaction, dict) or not transaction.get("signatures"):
+            return
+        message = transaction.get("message") or {}
+        meta = tx_wrapper.get("meta") or {}
+
+        keys = {key if isinstance(key, str) else key.get("pubkey", "") for key in message.get("accountKeys") or ()}
+        loaded = meta.get("loadedAddresses")
+        if loaded:
+            keys.update(loaded.get("writable") or ())
+            keys.update(loaded.get("readonly") or ())
+        for balance in (meta.get("preTokenBalances") or []) + (meta.get("postTokenBalances") or []):
+            keys.add(balance.get("mint", ""))
+        keys.discard("")
+        if not self.excluded.isdisjoint(keys):
+            self.skipped += 1
+            return
+
+        position = len(self.signatures)
+        self.signatures.append(transaction["signatures"][0])
+        postings = self.postings
+        for key in keys:
+            positions = postings.get(key)
+            if positions is None:
+                postings[key] = [position]
+            else:
+                positions.append(position)
+
+    def end_block(self, block_time: Optional[int] = None, parent_slot: Optional[int] = None) -> None:
+        """
+        Finish the current block and add it to the address index, if there is one.
+
+        Args:
+            block_time: Block time, when it was not known at begin_block
+            parent_slot: Parent slot of the block; the slots between it and
+                the block are then known to be skipped
+        """
+        if block_time:
+            self.block_time = block_time
+        if parent_slot is not None:
+            self.parent_slot = parent_slot
+        if self.address_index is not None and self.slot is not None:
+            self.address_index.add_block(self.slot, self.block_time, self.parent_slot, self.signatures, self.postings)
+
+    def get_results(self) -> Dict[str, Any]:
+        """Get the block's postings, or only statistics when they went to an address index."""
+        stats = {
+            "indexed_transactions": len(self.signatures),
+            "indexed_addresses": len(self.postings),
+            "skipped_transactions": self.skipped,
+        }
+        if self.address_index is not None:
+            return {"stats": stats}
+        return {
+            "slot": self.slot,
+            "block_time": self.block_time,
+            "parent_slot": self.parent_slot,
+            "signatures": self.signatures,
+            "postings": self.postings,
+            "stats": stats,
+        }
@@ -3,9 +3,11 @@ Base handler for Solana RPC responses.
 Provides common functionality and error handling for all response handlers.
 """
 
+import asyncio
+import inspect
 import logging
 import time
-from typing import Any, Dict, List, Optional, Union, Tuple, Set
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Union, Tuple, Set
 from dataclasses import dataclass, field
 from ..solana_error import (
     NodeBehindError,
@@ -14,6 +16,8 @@ from ..solana_error import (
     NodeUnhealthyError
 )
 from ..logging_config import setup_logging
+from ..metrics import observe_handler_batch
+from ...config import HANDLER_BATCH_CONFIG
 from collections import defaultdict
 
 # Configure logging
@@ -110,11 +114,43 @@ class TransactionStats:
             "token_addresses": list(self.token_addresses)
         }
 
+@dataclass
+class BatchStats:
+    """Timing of batch-mode transaction loops (see BaseHandler.process_batched)"""
+    batches: int = 0
+    transactions: int = 0
+    total_seconds: float = 0.0
+    last_batch_size: int = 0
+    last_batch_ms: float = 0.0
+    max_batch_ms: float = 0.0
+
+    def record(self, seconds: float, size: int) -> None:
+        """Record one finished batch"""
+        batch_ms = seconds * 1000
+        self.batches += 1
+        self.transactions += size
+        self.total_seconds += seconds
+        self.last_batch_size = size
+        self.last_batch_ms = batch_ms
+        self.max_batch_ms = max(self.max_batch_ms, batch_ms)
+
+    def get_current(self) -> Dict[str, Any]:
+        """Get current batch statistics as a dictionary"""
+        return {
+            "batches": self.batches,
+            "transactions": self.transactions,
+            "avg_batch_ms": round(self.total_seconds * 1000 / max(self.batches, 1), 3),
+            "last_batch_size": self.last_batch_size,
+            "last_batch_ms": round(self.last_batch_ms, 3),
+            "max_batch_ms": round(self.max_batch_ms, 3),
+        }
+
 class BaseHandler:
     """Base class for all Solana transaction handlers"""
     
     def __init__(self):
         self.stats = TransactionStats()
+        self.batch_stats = BatchStats()
         # Common program IDs
         self.SYSTEM_PROGRAMS = {
             'Vote111111111111111111111111111111111111111': 'vote',
@@ -214,15 +250,7 @@ class BaseHandler:
             self.stats.increment_block()
             start_time = time.time()
                 
-            results = []
-            for tx in transactions:
-                try:
-                    result = await self.process(tx)
-                    if result:
-                        results.append(result)
-                except Exception as e:
-                    logger.error(f"Error processing transaction: {str(e)}")
-                    self.stats.update_error_count(type(e).__name__)
+            results = [result for result in await self.process_batched(transactions) if result]
 
             # Update processing duration
             self.stats.processing_duration = time.time() - start_time
@@ -230,7 +258,8 @@ class BaseHandler:
             # Return results with statistics
             return {
                 'results': results,
-                'statistics': self.stats.get_current()
+                'statistics': self.stats.get_current(),
+                'batches': self.batch_stats.get_current()
             }
             
         except Exception as e:
@@ -240,6 +269,65 @@ class BaseHandler:
                 'statistics': self.stats.get_current()
             }
 
+    async def process_batched(
+            self,
+            transactions: Iterable[Any],
+            process: Optional[Callable[[Any], Union[Any, Awaitable[Any]]]] = None
+        ) -> List[Any]:
+        """Run a per-transaction function over a block in batches.
+
+        Handler ``process`` coroutines are CPU-bound and never suspend, so
+        awaiting them one after another holds the event loop for the whole
+        block. Here the transactions run back to back in a tight loop, and
+        the loop is only given back between batches: after
+        ``max_transactions`` transactions or ``max_batch_ms`` milliseconds
+        (see ``HANDLER_BATCH_CONFIG``), whichever comes first. Batch timings
+        go to ``self.batch_stats`` and the handler batch metrics.
+
+        Args:
+            transactions: Transactions to process
+            process: Function called with each transaction; may be sync or
+                async. Defaults to ``self.process``
+
+        Returns:
+            One result per transaction, None where processing raised
+        """
+        process = process or self.process
+        max_transactions = max(1, HANDLER_BATCH_CONFIG['max_transactions'])
+        max_seconds = HANDLER_BATCH_CONFIG['max_batch_ms'] / 1000
+        handler = type(self).__name__
+        clock = time.perf_counter
+
+        results: List[Any] = []
+        batch_start = clock()
+        batch_size = 0
+        for tx in transactions:
+            try:
+                result = process(tx)
+                if inspect.isawaitable(result):
+                    result = await result
+            except Exception as e:
+                logger.error(f"Error processing transaction: {str(e)}")
+                if isinstance(self.stats, TransactionStats):
+                    self.stats.update_error_count(type(e).__name__)
+                result = None
+            results.append(result)
+
+            batch_size += 1
+            elapsed = clock() - batch_start
+            if batch_size >= max_transactions or elapsed >= max_seconds:
+                self.batch_stats.record(elapsed, batch_size)
+                observe_handler_batch(handler, elapsed, batch_size)
+                await asyncio.sleep(0)
+                batch_start = clock()
+                batch_size = 0
+
+        if batch_size:
+            elapsed = clock() - batch_start
+            self.batch_stats.record(elapsed, batch_size)
+            observe_handler_batch(handler, elapsed, batch_size)
+        return results
+
     def _validate_transaction(self, transaction: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any], List[str], List[Dict[str, Any]]]:
         """Validate transaction data and extract key components."""
         try:
@@ -249,11 +337,11 @@ class BaseHandler:
             if isinstance(transaction, list):
                 tx = transaction[0] if transaction else None
                 meta = transaction[1] if len(transaction) > 1 else None
-                logger.debug(f"Extracted from list: tx={bool(tx)}, meta={bool(meta)}")
+                logger.debug("Extracted from list: tx=%s, meta=%s", bool(tx), bool(meta))
             else:
                 tx = transaction
                 meta = transaction.get('meta') if isinstance(transaction, dict) else None
-                logger.debug(f"Extracted from dict: tx={bool(tx)}, meta={bool(meta)}")
+                logger.debug("Extracted from dict: tx=%s, meta=%s", bool(tx), bool(meta))
                 
             # Handle transaction object
             if isinstance(tx, dict) and 'transaction' in tx:
@@ -264,7 +352,7 @@ class BaseHandler:
             message = None
             if isinstance(tx, dict):
                 message = tx.get('message', {})
-                logger.debug(f"Extracted message type: {type(message)}")
+                logger.debug("Extracted message type: %s", type(message))
                 
                 if isinstance(message, str):
                     logger.debug("Attempting to decode string message")
@@ -275,7 +363,7 @@ class BaseHandler:
                         message = json.loads(decoded)
                         logger.debug("Successfully decoded message")
                     except Exception as e:
-                        logger.debug(f"Failed to decode message: {str(e)}")
+                        logger.debug("Failed to decode message: %s", e)
                         message = {'raw': message}
                         
             # Get account keys
@@ -285,22 +373,22 @@ class BaseHandler:
                 keys = message.get('accountKeys', [])
                 if isinstance(keys, list):
                     account_keys.extend(str(key) for key in keys if key)
-                logger.debug(f"Found {len(account_keys)} account keys")
+                logger.debug("Found %s account keys", len(account_keys))
                     
             # Get instructions
             instructions = []
             if isinstance(message, dict):
                 raw_instructions = message.get('instructions', [])
-                logger.debug(f"Found {len(raw_instructions)} raw instructions")
+                logger.debug("Found %s raw instructions", len(raw_instructions))
                 
                 if isinstance(raw_instructions, list):
                     for idx, instr in enumerate(raw_instructions):
-                        logger.debug(f"Processing instruction {idx}, type: {type(instr)}")
+                        logger.debug("Processing instruction %s, type: %s", idx, type(instr))
                         instruction = None
                         
                         # Handle string instruction
                         if isinstance(instr, str):
-                            logger.debug(f"Processing string instruction: {instr[:32]}...")
+                            logger.debug("Processing string instruction: %s...", instr[:32])
                             if account_keys:
                                 instruction = {
                                     'programId': account_keys[0],
@@ -313,7 +401,7 @@ class BaseHandler:
                                     'accounts': [],
                                     'data': instr
                                 }
-                            logger.debug(f"Converted string instruction: {instruction}")
+                            logger.debug("Converted string instruction: %s", instruction)
                                 
                         # Handle dict instruction
                         elif isinstance(instr, dict):
@@ -325,7 +413,7 @@ class BaseHandler:
                         else:
                             logger.warning(f"Skipping instruction {idx} of unknown type: {type(instr)}")
                             
-            logger.debug(f"Processed {len(instructions)} instructions")
+            logger.debug("Processed %s instructions", len(instructions))
             return message, meta, account_keys, instructions
             
         except Exception as e:
@@ -335,14 +423,14 @@ class BaseHandler:
     def _extract_program_id(self, instruction: Dict[str, Any], account_keys: List[str]) -> Optional[str]:
         """Extract program ID from instruction using multiple methods"""
         try:
-            logger.debug(f"Extracting program ID from instruction type: {type(instruction)}")
+            logger.debug("Extracting program ID from instruction type: %s", type(instruction))
             
             # Handle string instruction
             if isinstance(instruction, str):
                 logger.debug("Processing string instruction")
                 if account_keys:
                     program_id = account_keys[0]
-                    logger.debug(f"Using first account key as program ID: {program_id}")
+                    logger.debug("Using first account key as program ID: %s", program_id)
                     return program_id
                 return None
                 
@@ -352,20 +440,20 @@ class BaseHandler:
                 # Direct program ID
                 program_id = instruction.get('programId')
                 if program_id:
-                    logger.debug(f"Found direct program ID: {program_id}")
+                    logger.debug("Found direct program ID: %s", program_id)
                     return str(program_id)
                     
                 # Program ID from index
                 program_idx = instruction.get('programIdIndex')
                 if isinstance(program_idx, int) and 0 <= program_idx < len(account_keys):
                     program_id = account_keys[program_idx]
-                    logger.debug(f"Found program ID from index {program_idx}: {program_id}")
+                    logger.debug("Found program ID from index %s: %s", program_idx, program_id)
                     return program_id
                     
             # Default to first account key if available
             if account_keys:
                 program_id = account_keys[0]
-                logger.debug(f"Using default first account key: {program_id}")
+                logger.debug("Using default first account key: %s", program_id)
                 return program_id
                 
         except Exception as e:
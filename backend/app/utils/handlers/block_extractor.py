@@ -2,14 +2,21 @@
 Block Extractor - Handles extraction and analysis of Solana block data
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Union
 import logging
 
+from ..block_model import CompactBlock
+from ..block_requirements import BLOCK_TIME, TRANSACTION_COUNT
+
 logger = logging.getLogger(__name__)
 
 class BlockExtractor:
     """Handles extraction and analysis of block data"""
     
+    # Only counts transactions, so a signatures-only block is enough
+    REQUIRED_FIELDS = frozenset({BLOCK_TIME, TRANSACTION_COUNT})
+    ACCEPTS_COMPACT_BLOCK = True
+    
     def __init__(self):
         """Initialize the block extractor"""
         self.blocks: List[Dict] = []
@@ -20,9 +27,9 @@ class BlockExtractor:
             'slots': []
         }
         
-    def process_block(self, block: Dict[str, Any]) -> None:
-        """Process a single block and update statistics"""
-        if not block:
+    def process_block(self, block: Union[Dict[str, Any], CompactBlock]) -> None:
+        """Process a single block (dict or CompactBlock) and update statistics"""
+        if block is None or (isinstance(block, dict) and not block):
             logger.warning("Empty block data received")
             return
             
@@ -31,20 +38,24 @@ class BlockExtractor:
             self.blocks.append(block)
             
             # Update statistics
-            transactions = block.get('transactions', [])
+            if isinstance(block, CompactBlock):
+                transactions, block_time, slot = block.transactions, block.block_time, block.slot
+            else:
+                transactions = block.get('transactions', [])
+                block_time, slot = block.get('blockTime'), block.get('slot')
             self.stats['total_transactions'] += len(transactions)
             
-            if block.get('blockTime'):
-                self.stats['block_times'].append(block['blockTime'])
+            if block_time:
+                self.stats['block_times'].append(block_time)
                 
-            if block.get('slot'):
-                self.stats['slots'].append(block['slot'])
+            if slot:
+                self.stats['slots'].append(slot)
                 
             # Update average
             if self.blocks:
                 self.stats['avg_transactions'] = self.stats['total_transactions'] / len(self.blocks)
                 
-            logger.debug(f"Processed block {block.get('slot')} with {len(transactions)} transactions")
+            logger.debug(f"Processed block {slot} with {len(transactions)} transactions")
             
         except Exception as e:
             logger.error(f"Error processing block: {str(e)}")
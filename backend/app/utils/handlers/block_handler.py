@@ -105,32 +105,11 @@ class BlockHandler(BaseHandler):
                 return None
 
             # Process transactions
-            processed_txs = []
-            for tx in result.get("transactions", []):
-                try:
-                    if not isinstance(tx, dict):
-                        continue
-
-                    meta = tx.get("meta")
-                    if not meta:
-                        continue
-
-                    # Skip failed transactions
-                    if meta.get("err") is not None:
-                        continue
-
-                    transaction = tx.get("transaction")
-                    if not transaction:
-                        continue
-
-                    # Process transaction
-                    processed_tx = self._process_transaction(transaction, meta)
-                    if processed_tx:
-                        processed_txs.append(processed_tx)
-
-                except Exception as e:
-                    logger.warning(f"Error processing transaction in block {block_num}: {str(e)}")
-                    continue
+            processed_txs = [
+                processed_tx
+                for processed_tx in await self.process_batched(result.get("transactions", []), self._process_block_transaction)
+                if processed_tx
+            ]
 
             # Update stats
             self.stats.increment_total()
@@ -146,6 +125,25 @@ class BlockHandler(BaseHandler):
             self.stats.update_error_count(type(e).__name__)
             return None
 
+    def _process_block_transaction(self, tx: Any) -> Optional[Dict[str, Any]]:
+        """Process one entry of a block's transactions list, skipping failed transactions."""
+        if not isinstance(tx, dict):
+            return None
+
+        meta = tx.get("meta")
+        if not meta:
+            return None
+
+        # Skip failed transactions
+        if meta.get("err") is not None:
+            return None
+
+        transaction = tx.get("transaction")
+        if not transaction:
+            return None
+
+        return self._process_transaction(transaction, meta)
+
     def _process_transaction(self, transaction: Dict[str, Any], meta: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Process a single transaction and extract key information."""
         try:
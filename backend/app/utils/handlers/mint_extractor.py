@@ -4,14 +4,24 @@ Specialized handler for extracting new mint addresses from Solana transactions.
 
 import logging
 import base58
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, FrozenSet, List, Optional, Set, Union
 from .base_handler import BaseHandler
+from ..block_model import CompactBlock, CompactTransaction, KeyTable
+from ..block_requirements import (
+    ACCOUNT_KEYS, BLOCK_TIME, INNER_INSTRUCTIONS, INSTRUCTIONS, LOG_MESSAGES, TOKEN_BALANCES
+)
 
 logger = logging.getLogger(__name__)
 
 class MintExtractor(BaseHandler):
     """Handler for extracting new mint addresses from transactions."""
     
+    # Block fields read; instructions are matched by programIdIndex, so json encoding suffices
+    REQUIRED_FIELDS = frozenset({
+        ACCOUNT_KEYS, BLOCK_TIME, INSTRUCTIONS, INNER_INSTRUCTIONS, LOG_MESSAGES, TOKEN_BALANCES
+    })
+    ACCEPTS_COMPACT_BLOCK = True
+    
     # Token program IDs
     TOKEN_PROGRAMS = {
         'TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA': 'Token Program',
@@ -51,8 +61,20 @@ class MintExtractor(BaseHandler):
         "createMasterEdition": "c"
     }
     
-    def __init__(self):
+    def __init__(self, mint_index: Optional[Any] = None):
+        """
+        Initialize the extractor.
+        
+        Args:
+            mint_index: Optional MintIndex; when given, a mint is only new
+                the first time it is ever seen, not just in this instance
+        """
         super().__init__()
+        self.mint_index = mint_index
+        self._block_slot: Optional[int] = None
+        self._block_time: Optional[int] = None
+        # New mints waiting for the block time of a block begun without one
+        self._unindexed: Optional[List[str]] = None
         self.mint_addresses: Set[str] = set()  # All mint addresses (both new and existing)
         self.new_mint_addresses: Set[str] = set()  # Only newly created mint addresses
         self.pump_tokens: Set[str] = set()  # All pump tokens
@@ -88,9 +110,12 @@ class MintExtractor(BaseHandler):
             logger.debug(f"Error checking initialize mint: {str(e)}")
             return False
 
-    def _is_metadata_instruction(self, instruction: Dict[str, Any]) -> bool:
-        """Check if instruction is from metadata program."""
+    def _is_metadata_instruction(self, instruction: Dict[str, Any], account_keys: List[str]) -> bool:
+        """Check if instruction is from metadata program, by programIdIndex or (jsonParsed) programId."""
         try:
+            index = instruction.get('programIdIndex')
+            if isinstance(index, int) and 0 <= index < len(account_keys):
+                return account_keys[index] == self.METADATA_PROGRAM_ID
             return instruction.get('programId') == self.METADATA_PROGRAM_ID
         except Exception as e:
             logger.debug(f"Metadata instruction check error: {str(e)}")
@@ -152,11 +177,11 @@ class MintExtractor(BaseHandler):
         for log in log_messages:
             if "initializeMint" in log:
                 parts = log.split()
-                if len(parts) > 2 and self.is_valid_mint_address(parts[2]):
+                if len(parts) > 2 and self._enhanced_mint_validation(parts[2]):
                     return parts[2]
             elif "createMetadata" in log:
                 parts = log.split()
-                if len(parts) > 3 and self.is_valid_mint_address(parts[3]):
+                if len(parts) > 3 and self._enhanced_mint_validation(parts[3]):
                     return parts[3]
         return None
 
@@ -195,6 +220,11 @@ class MintExtractor(BaseHandler):
             # Only add to new_mint_addresses if it's a new mint
             if self._is_new_mint(address):
                 self.new_mint_addresses.add(address)
+                if self.mint_index is not None:
+                    if self._unindexed is not None:
+                        self._unindexed.append(address)
+                    else:
+                        self.mint_index.add(address, self._block_slot, self._block_time)
                 self.stats.mint_operations += 1
                 logger.info(f"Validated new mint: {address}")
             
@@ -208,20 +238,24 @@ class MintExtractor(BaseHandler):
     def _is_new_mint(self, address: str) -> bool:
         """
         Determine if a mint address is new.
-        Currently, we consider a mint address new if it's not already in our new_mint_addresses set
-        and it passes our enhanced validation.
-        This could be enhanced with more sophisticated checks in the future.
+        A mint address is new if it's not already in our new_mint_addresses set and,
+        when a mint index is attached, no extractor saw it before the current block.
         """
         # Check if this is the first time we're seeing this mint address
-        is_new = address not in self.new_mint_addresses
+        if address in self.new_mint_addresses:
+            return False
         
-        # Additional checks could be added here in the future
-        # For example, checking if the mint was created in the current block
+        # Consult the global first-seen index
+        if self.mint_index is not None:
+            return self.mint_index.is_new(address, self._block_slot)
         
-        return is_new
+        return True
 
-    def process_block(self, block: Dict[str, Any]) -> None:
+    def process_block(self, block: Union[Dict[str, Any], CompactBlock]) -> None:
         """Process a block to extract new mint addresses."""
+        if isinstance(block, CompactBlock):
+            self.process_compact_block(block)
+            return
         try:
             if not block or not isinstance(block, dict):
                 logger.warning("Invalid block data format")
@@ -233,22 +267,13 @@ class MintExtractor(BaseHandler):
                 return
                 
             block_time = block.get('blockTime', 0)
-            block_slot = block.get('parentSlot', 'unknown')
+            block_slot = block.get('slot', block.get('parentSlot', 'unknown'))
+            self.begin_block(block_slot, block_time)
             logger.info(f"Processing block {block_slot} with {len(transactions)} transactions")
             
             for tx_wrapper in transactions:
-                if not isinstance(tx_wrapper, dict):
-                    logger.warning("Invalid transaction wrapper format")
-                    continue
-                    
-                tx = tx_wrapper.get('transaction')
-                meta = tx_wrapper.get('meta')
-                
-                if not isinstance(tx, dict) or not isinstance(meta, dict):
-                    logger.debug("Invalid transaction or meta format")
-                    continue
-                    
-                self.process_transaction(tx, meta)
+                self.process_block_transaction(tx_wrapper)
+            self.end_block()
                 
             if self.new_mint_addresses:
                 logger.info(f"Found {len(self.new_mint_addresses)} new mints in block {block_slot}")
@@ -256,6 +281,114 @@ class MintExtractor(BaseHandler):
         except Exception as e:
             logger.error(f"Error processing block: {str(e)}", exc_info=True)
             
+    def process_compact_block(self, block: CompactBlock) -> None:
+        """
+        Process a compact block to extract new mint addresses.
+        
+        Program checks are integer lookups against the block's key table and
+        each distinct key is validated once per block.
+        
+        Args:
+            block: Compact block
+        """
+        try:
+            self.begin_block(block.slot, block.block_time)
+            keys = block.keys
+            token_programs = keys.ids(self.TOKEN_PROGRAMS)
+            metadata_program = keys.id_of(self.METADATA_PROGRAM_ID)
+            valid: Dict[int, bool] = {}
+            for tx in block.transactions:
+                self._process_compact_transaction(tx, keys, token_programs, metadata_program, valid)
+            self.end_block()
+            if self.new_mint_addresses:
+                logger.info(f"Found {len(self.new_mint_addresses)} new mints in block {block.slot}")
+        except Exception as e:
+            logger.error(f"Error processing compact block: {str(e)}", exc_info=True)
+
+    def _process_compact_transaction(
+        self,
+        tx: CompactTransaction,
+        keys: KeyTable,
+        token_programs: FrozenSet[int],
+        metadata_program: Optional[int],
+        valid: Dict[int, bool]
+    ) -> None:
+        """Process one transaction of a compact block; valid caches mint validation by key id."""
+        if not tx.accounts:
+            return
+        
+        def is_valid_mint(key_id: int) -> bool:
+            result = valid.get(key_id)
+            if result is None:
+                result = valid[key_id] = self._enhanced_mint_validation(keys[key_id])
+            return result
+        
+        initialize = (self.TOKEN_IX_DISCRIMINATORS["initializeMint"], self.TOKEN_IX_DISCRIMINATORS["initializeMint2"])
+        for ix in tx.all_instructions():
+            if ix.program in token_programs and ix.data[:1] in initialize and len(ix.accounts) >= 2:
+                mint = keys[ix.accounts[0]]
+                if self.is_valid_base58(mint) and mint not in self.KNOWN_TOKEN_MINTS:
+                    self._register_mint(mint)
+        
+        pre_mints = tx.pre_token_balances.mints
+        post_mints = tx.post_token_balances.mints
+        for mint_id in set(pre_mints).union(post_mints):
+            if is_valid_mint(mint_id):
+                self.mint_addresses.add(keys[mint_id])
+        for pre_id, post_id in zip(pre_mints, post_mints):
+            if pre_id != post_id and is_valid_mint(post_id):
+                self._register_mint(keys[post_id])
+        
+        for mint in self._process_log_messages(tx.log_messages):
+            self._register_mint(mint)
+        
+        if metadata_program is not None and any(ix.program == metadata_program for ix in tx.instructions):
+            if mint := self._extract_metadata_mint(tx.log_messages):
+                self._register_mint(mint)
+
+    def begin_block(self, slot: Optional[Any] = None, block_time: Optional[int] = None) -> None:
+        """
+        Start a block whose transactions are passed to process_block_transaction
+        one at a time, e.g. while the block response is still being read.
+        
+        Args:
+            slot: Slot of the block
+            block_time: Block time if already known; otherwise pass it to end_block
+        """
+        self._block_slot = slot if isinstance(slot, int) else None
+        self._block_time = block_time or None
+        self._unindexed = None if self._block_time else []
+
+    def process_block_transaction(self, tx_wrapper: Dict[str, Any]) -> None:
+        """Process one entry of a block's transactions list."""
+        if not isinstance(tx_wrapper, dict):
+            logger.warning("Invalid transaction wrapper format")
+            return
+            
+        tx = tx_wrapper.get('transaction')
+        meta = tx_wrapper.get('meta')
+        
+        if not isinstance(tx, dict) or not isinstance(meta, dict):
+            logger.debug("Invalid transaction or meta format")
+            return
+            
+        self.process_transaction(tx, meta)
+
+    def end_block(self, block_time: Optional[int] = None, parent_slot: Optional[int] = None) -> None:
+        """
+        Finish the current block and index the new mints that were waiting for its block time.
+        
+        Args:
+            block_time: Block time, when it was not known at begin_block
+            parent_slot: Parent slot of the block (not used here)
+        """
+        if block_time:
+            self._block_time = block_time
+        if self.mint_index is not None:
+            for address in self._unindexed or ():
+                self.mint_index.add(address, self._block_slot, self._block_time)
+        self._unindexed = None
+
     def process_transaction(self, transaction: Dict[str, Any], meta: Dict[str, Any]) -> None:
         """Process a transaction to extract new mint addresses."""
         try:
@@ -325,7 +458,7 @@ class MintExtractor(BaseHandler):
                 self._register_mint(mint)
 
             # 4. Metadata program analysis
-            if any(self._is_metadata_instruction(ix) for ix in instructions if isinstance(ix, dict)):
+            if any(self._is_metadata_instruction(ix, account_keys) for ix in instructions if isinstance(ix, dict)):
                 if mint := self._extract_metadata_mint(log_messages):
                     self._register_mint(mint)
 
@@ -54,28 +54,7 @@ class MintHandler(BaseHandler):
                 'statistics': self.stats.copy()
             }
 
-            for tx_data in transactions:
-                try:
-                    # Extract transaction and account keys
-                    transaction = tx_data.get('transaction')
-                    meta = tx_data.get('meta')
-                    
-                    if not transaction or not meta:
-                        continue
-
-                    # Get account keys
-                    account_keys = []
-                    if isinstance(transaction, dict):
-                        message = transaction.get('message', {})
-                        if isinstance(message, dict):
-                            account_keys = message.get('accountKeys', [])
-                    
-                    # Process the transaction
-                    await self.process_transaction(transaction, account_keys)
-
-                except Exception as e:
-                    logger.error(f"Error processing transaction: {str(e)}", exc_info=True)
-                    continue
+            await self.process_batched(transactions, self._process_response_transaction)
 
             # Convert sets to lists for JSON serialization
             result['mint_addresses'] = list(result['mint_addresses'])
@@ -85,6 +64,30 @@ class MintHandler(BaseHandler):
             logger.error(f"Error handling response: {str(e)}", exc_info=True)
             return {"success": False, "error": str(e)}
 
+    async def _process_response_transaction(self, tx_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Process one entry of a response's transactions list"""
+        try:
+            # Extract transaction and account keys
+            transaction = tx_data.get('transaction')
+            meta = tx_data.get('meta')
+
+            if not transaction or not meta:
+                return None
+
+            # Get account keys
+            account_keys = []
+            if isinstance(transaction, dict):
+                message = transaction.get('message', {})
+                if isinstance(message, dict):
+                    account_keys = message.get('accountKeys', [])
+
+            # Process the transaction
+            return await self.process_transaction(transaction, account_keys)
+
+        except Exception as e:
+            logger.error(f"Error processing transaction: {str(e)}", exc_info=True)
+            return None
+
     async def process_transaction(self, transaction: Any, account_keys: List[str]) -> Dict[str, Any]:
         """Process a transaction and extract mint-related data"""
         try:
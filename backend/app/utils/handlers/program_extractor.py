@@ -5,11 +5,16 @@ Program Extractor - Handles extraction and analysis of program-related activitie
 from typing import Dict, Any, List, Optional, Set
 import logging
 
+from ..block_requirements import ACCOUNT_KEYS, PARSED_INSTRUCTIONS, SIGNATURES
+
 logger = logging.getLogger(__name__)
 
 class ProgramExtractor:
     """Handles extraction and analysis of program-related activities"""
     
+    # Block fields read; program operations are classified from parsed instructions
+    REQUIRED_FIELDS = frozenset({ACCOUNT_KEYS, PARSED_INSTRUCTIONS, SIGNATURES})
+    
     def __init__(self):
         """Initialize the program extractor"""
         self.program_operations: List[Dict] = []
@@ -268,9 +268,8 @@ class ProgramHandler(BaseHandler):
             })
             
             # Process each transaction
-            for tx in transactions:
+            for result in await self.process_batched(transactions):
                 try:
-                    result = await self.process(tx)
                     if not result or not isinstance(result, dict):
                         continue
                         
@@ -6,11 +6,16 @@ from typing import Dict, Any, List, Optional, Set
 import logging
 from datetime import datetime
 
+from ..block_requirements import ACCOUNT_KEYS, BLOCK_TIME, PARSED_INSTRUCTIONS
+
 logger = logging.getLogger(__name__)
 
 class PumpExtractor:
     """Handles extraction and analysis of pump and dump activities"""
     
+    # Block fields read; trading instructions are recognized by their parsed programId
+    REQUIRED_FIELDS = frozenset({ACCOUNT_KEYS, BLOCK_TIME, PARSED_INSTRUCTIONS})
+    
     def __init__(self):
         """Initialize the pump extractor"""
         self.pump_operations: List[Dict] = []
@@ -154,9 +154,8 @@ class PumpHandler(BaseHandler):
             pump_candidates = {}  # token -> {holders: set(), tx_count: int}
             
             # Process each transaction
-            for tx in transactions:
+            for result in await self.process_batched(transactions):
                 try:
-                    result = await self.process(tx)
                     if not result or not isinstance(result, dict):
                         continue
                         
@@ -4,6 +4,8 @@ import json
 import logging
 import sys
 
+from ..serialization import get_converter
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,6 +42,15 @@ def serialize_solana_object(obj, recursion_depth=0):
     if isinstance(obj, Pubkey):
         return str(obj)
 
+    # Dispatch on type through the converter table; reflection only runs once per type
+    if not isinstance(obj, MagicMock):
+        converter = get_converter(type(obj))
+        if converter is not None:
+            try:
+                return serialize_solana_object(converter(obj), recursion_depth + 1)
+            except Exception as e:
+                logger.debug(f"Converter for {type(obj).__name__} failed: {str(e)}")
+
     # Handle MagicMock objects first
     if isinstance(obj, MagicMock):
         try:
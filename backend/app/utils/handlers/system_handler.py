@@ -163,9 +163,8 @@ class SystemHandler(BaseHandler):
             vote_ops = defaultdict(int)
             
             # Process each transaction
-            for tx in transactions:
+            for result in await self.process_batched(transactions):
                 try:
-                    result = await self.process(tx)
                     if not result or not isinstance(result, dict):
                         continue
                         
@@ -81,10 +81,9 @@ class TokenHandler(BaseHandler):
             }
             
             # Process each transaction
-            for tx_idx, tx_data in enumerate(transactions):
+            for tx_idx, tx_result in enumerate(await self.process_batched(transactions)):
                 try:
-                    tx_result = await self.process(tx_data)
-                    if tx_result.get('success', False):
+                    if tx_result and tx_result.get('success', False):
                         # Update statistics
                         result['statistics']['total_transactions'] += 1
                         result['statistics']['total_operations'] += tx_result['statistics'].get('total_operations', 0)
@@ -229,9 +228,8 @@ class TokenHandler(BaseHandler):
             })
             
             # Process each transaction
-            for tx in transactions:
+            for result in await self.process_batched(transactions):
                 try:
-                    result = await self.process(tx)
                     if not result or not isinstance(result, dict):
                         continue
                         
@@ -207,9 +207,8 @@ class TokenMarketActivityHandler(BaseHandler):
             token_metrics = {}  # token -> {holders, tx_count, volume, etc}
             
             # Process each transaction
-            for tx in transactions:
+            for result in await self.process_batched(transactions):
                 try:
-                    result = await self.process(tx)
                     if not result or not isinstance(result, dict):
                         continue
                         
@@ -0,0 +1,126 @@
+"""
+Import-time profiling for the diagnostics endpoints.
+
+Cold start matters for autoscaled workers and CLI invocations, so the time
+spent importing the app and its routers is tracked here: ``record_import``
+keeps the duration of imports done at runtime (e.g. routers loaded on their
+first request, see ``app.routers.loader``), and ``profile_imports`` runs
+``python -X importtime`` on a module in a fresh interpreter and reports the
+slowest imports, so regressions show up without attaching a profiler.
+"""
+import asyncio
+import logging
+import re
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Only the app's own modules can be profiled
+_MODULE_PATTERN = re.compile(r"^app(\.[A-Za-z_][A-Za-z0-9_]*)*$")
+_IMPORTTIME_LINE = re.compile(r"^import time:\s*(\d+)\s*\|\s*(\d+)\s*\|( *)(\S+)\s*$")
+_BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+_process_started = time.time()
+_imports: Dict[str, Dict[str, Any]] = {}
+
+
+def record_import(name: str, seconds: float, lazy: bool = False) -> None:
+    """
+    Record how long importing a module took.
+
+    Args:
+        name: Module or router name
+        seconds: Import duration
+        lazy: Whether the import was deferred until first use
+    """
+    _imports[name] = {"seconds": round(seconds, 4), "lazy": lazy, "loaded_at": time.time()}
+
+
+def get_import_stats() -> Dict[str, Any]:
+    """Imports recorded in this process, slowest first."""
+    return {
+        "process_started": _process_started,
+        "imports": dict(sorted(_imports.items(), key=lambda item: -item[1]["seconds"])),
+    }
+
+
+def parse_importtime(output: str, top: int = 25, root: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Parse the report printed by ``python -X importtime``.
+
+    Args:
+        output: The interpreter's stderr
+        top: Number of entries to return
+        root: Only report this top-level import and the imports it triggered,
+            leaving out the interpreter's own startup imports
+
+    Returns:
+        Dicts with module, self_us, cumulative_us and depth, slowest cumulative time first
+    """
+    entries: List[Dict[str, Any]] = []
+    subtree: List[Dict[str, Any]] = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, module = match.groups()
+        entry = {
+            "module": module,
+            "self_us": int(self_us),
+            "cumulative_us": int(cumulative_us),
+            "depth": (len(indent) - 1) // 2,
+        }
+        # A module is reported after everything it imported, so a top-level line closes a subtree
+        subtree.append(entry)
+        if entry["depth"] == 0:
+            if root is None or module == root:
+                entries.extend(subtree)
+            subtree = []
+    entries.sort(key=lambda entry: -entry["cumulative_us"])
+    return entries[:top]
+
+
+async def profile_imports(module: str = "app.main", top: int = 25, timeout: float = 60.0) -> Dict[str, Any]:
+    """
+    Import a module in a fresh interpreter with ``-X importtime``.
+
+    Args:
+        module: Module under the app package, e.g. app.main
+        top: Number of slowest imports to report
+        timeout: Seconds to wait for the interpreter
+
+    Returns:
+        Dict with module, total_seconds, returncode and top (see parse_importtime)
+
+    Raises:
+        ValueError: If the module is not part of the app package
+    """
+    if not _MODULE_PATTERN.match(module):
+        raise ValueError(f"Only modules of the app package can be profiled, got {module!r}")
+
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-X", "importtime", "-c", f"import {module}",
+        cwd=str(_BACKEND_DIR),
+        stdout=asyncio.subprocess.DEVNULL,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        _, stderr = await asyncio.wait_for(process.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+
+    entries = parse_importtime(stderr.decode(errors="replace"), top=top, root=module)
+    total = next((entry["cumulative_us"] for entry in entries if entry["module"] == module), None)
+    if process.returncode != 0:
+        logger.error(f"Profiling the import of {module} failed with exit code {process.returncode}")
+    return {
+        "module": module,
+        "total_seconds": total / 1e6 if total is not None else None,
+        "returncode": process.returncode,
+        "top": entries,
+    }
@@ -0,0 +1,206 @@
+"""
+Incremental decoding of large JSON-RPC responses.
+
+``ArrayStreamDecoder`` is fed the response body chunk by chunk and decodes
+the elements of one nested array (e.g. ``result.transactions`` of a
+``getBlock`` response) as soon as each element's closing bracket arrives.
+Elements are located with a bracket/string scanner and decoded individually
+with the regular ``loads``, so the whole body is never buffered and a
+consumer can start on the first transaction while the rest is in flight.
+
+Everything outside the streamed array is kept and decoded by ``close()``,
+with the array replaced by an empty list.
+"""
+import re
+from typing import Any, List, Optional, Sequence
+
+from app.utils.serialization import loads
+
+# A complete string, or a structural character; a lone quote means a string
+# is cut off at the end of the buffer
+_TOKEN = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[\[\]{}:"]')
+
+_OPEN = (ord("{"), ord("["))
+_CLOSE = (ord("}"), ord("]"))
+_QUOTE = ord('"')
+_COLON = ord(":")
+_SKIP = frozenset(b" \t\r\n,")
+
+
+class ArrayStreamDecoder:
+    """
+    Decode the elements of one array of a JSON document as the bytes arrive.
+
+    Streamed elements must be objects, arrays or strings.
+    """
+
+    def __init__(self, path: Sequence[str]):
+        """
+        Initialize the decoder.
+
+        Args:
+            path: Object keys leading to the array to stream, e.g.
+                ``("result", "transactions")``
+        """
+        self.path = list(path)
+        self.bytes_received = 0
+        self.items_decoded = 0
+        self._buf = bytearray()
+        self._skeleton = bytearray()
+        self._stack: List[list] = []  # [opening byte, current key] per open container
+        self._key: Optional[bytes] = None
+        self._array_depth: Optional[int] = None  # Stack depth inside the streamed array
+        self._item_start: Optional[int] = None
+        self._scan = 0  # Buffer offset the next feed resumes scanning at
+        self._found = False
+
+    @property
+    def found(self) -> bool:
+        """Whether the streamed array was present in the document."""
+        return self._found
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """
+        Feed the next chunk of the document.
+
+        Args:
+            chunk: Next bytes of the body
+
+        Returns:
+            The array elements completed by this chunk
+        """
+        self.bytes_received += len(chunk)
+        buf = self._buf
+        buf += chunk
+        items: List[Any] = []
+        pos = self._scan
+        copied = 0
+
+        while True:
+            if self._array_depth is not None and self._item_start is None and len(self._stack) == self._array_depth:
+                pos = self._next_items(buf, pos, items)
+            pos, copied, done = self._scan_tokens(buf, pos, copied, items)
+            if done:
+                break
+
+        if self._array_depth is None:
+            self._skeleton += buf[copied:pos]
+        keep = self._item_start if self._item_start is not None else pos
+        if self._item_start is not None:
+            self._item_start = 0
+        self._scan = pos - keep
+        del buf[:keep]
+        self.items_decoded += len(items)
+        return items
+
+    def _next_items(self, buf: bytearray, pos: int, items: List[Any]) -> int:
+        """
+        Fast path: cut complete object elements at their likely boundaries.
+
+        An element ends at a ``}`` followed by ``,`` and the first key of the
+        element, or by the closing ``]``. A candidate is only accepted if the
+        slice decodes, so a false match inside an element just costs a failed
+        decode; elements not found this way go through the token scanner.
+        """
+        size = len(buf)
+        while True:
+            while pos < size and buf[pos] in _SKIP:
+                pos += 1
+            if pos >= size or buf[pos] != _OPEN[0]:
+                return pos
+            key = _TOKEN.match(buf, pos + 1)
+            if key is None or buf[pos + 1] != _QUOTE or key.end() - key.start() == 1:
+                return pos
+            item = self._cut(buf, pos, b"},{" + buf[key.start():key.end()], 1)
+            if item is None:
+                item = self._cut(buf, pos, b"}]", 1)
+            if item is None:
+                return pos
+            value, pos = item
+            items.append(value)
+
+    @staticmethod
+    def _cut(buf: bytearray, start: int, separator: bytes, offset: int) -> Optional[tuple]:
+        """Decode the element starting at start that ends where separator begins."""
+        end = buf.find(separator, start)
+        while end != -1:
+            try:
+                return loads(bytes(buf[start:end + offset])), end + offset
+            except ValueError:
+                end = buf.find(separator, end + 1)
+        return None
+
+    def _scan_tokens(self, buf: bytearray, pos: int, copied: int, items: List[Any]) -> tuple:
+        """
+        Scan structural tokens from pos.
+
+        Returns:
+            Tuple of the position reached, the skeleton copy offset, and
+            whether the buffer is exhausted (otherwise the fast path can
+            take over at an element boundary)
+        """
+        stack = self._stack
+        path_depth = len(self.path)
+
+        for match in _TOKEN.finditer(buf, pos):
+            start = match.start()
+            char = buf[start]
+            if char == _QUOTE:
+                if match.end() - start == 1:
+                    # Cut-off string; rescan it with the next chunk
+                    return start, copied, True
+                depth = len(stack)
+                if self._array_depth is not None:
+                    if depth == self._array_depth and self._item_start is None:
+                        items.append(loads(bytes(buf[start:match.end()])))
+                elif depth <= path_depth and depth and stack[-1][0] == _OPEN[0]:
+                    self._key = bytes(buf[start:match.end()])
+            elif char == _COLON:
+                if self._key is not None:
+                    stack[-1][1] = loads(self._key)
+                    self._key = None
+            elif char in _OPEN:
+                self._key = None
+                if self._array_depth is not None:
+                    if len(stack) == self._array_depth:
+                        self._item_start = start
+                elif char == _OPEN[1] and len(stack) == path_depth and \
+                        [entry[1] for entry in stack] == self.path:
+                    # Keep the opening bracket; the elements never reach the skeleton
+                    self._skeleton += buf[copied:start + 1]
+                    self._array_depth = len(stack) + 1
+                    self._found = True
+                    stack.append([char, None])
+                    return match.end(), copied, False
+                stack.append([char, None])
+            else:
+                if not stack:
+                    raise ValueError("Unbalanced JSON document")
+                stack.pop()
+                depth = len(stack)
+                if self._array_depth is not None:
+                    if self._item_start is not None and depth == self._array_depth:
+                        items.append(loads(bytes(buf[self._item_start:start + 1])))
+                        self._item_start = None
+                        return match.end(), copied, False
+                    elif depth < self._array_depth:
+                        self._array_depth = None
+                        copied = start
+        return len(buf), copied, True
+
+    def close(self) -> Any:
+        """
+        Finish decoding.
+
+        Returns:
+            The document with the streamed array emptied
+
+        Raises:
+            ValueError: If the document is incomplete or not valid JSON
+        """
+        if self._stack or self._array_depth is not None:
+            raise ValueError("Truncated JSON document")
+        document = loads(bytes(self._skeleton + self._buf))
+        self._skeleton = bytearray()
+        self._buf = bytearray()
+        return document
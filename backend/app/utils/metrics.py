@@ -0,0 +1,206 @@
+"""
+Prometheus metrics for the hot paths: RPC calls, caches, extractors, handlers, block workers and the event loop.
+
+All metrics are registered in the default registry and served by the
+``/metrics`` ASGI app mounted in ``main.py``. Recording helpers cache the
+labelled children so a hot-path observation is a dict lookup plus the
+metric update itself.
+"""
+import asyncio
+from typing import Dict, Tuple
+from urllib.parse import urlparse
+
+from prometheus_client import REGISTRY, Counter, Gauge, Histogram
+
+
+def _metric(metric_cls, name: str, documentation: str, labelnames=(), **kwargs):
+    """Create a metric, reusing it if this module was already imported under another package path."""
+    existing = REGISTRY._names_to_collectors.get(name)
+    if existing is not None:
+        return existing
+    return metric_cls(name, documentation, labelnames, **kwargs)
+
+
+RPC_LATENCY = _metric(
+    Histogram,
+    "soleco_rpc_request_duration_seconds",
+    "Solana RPC request latency",
+    ["method", "endpoint"],
+    buckets=(0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+RPC_ERRORS = _metric(
+    Counter,
+    "soleco_rpc_errors_total",
+    "Solana RPC errors by kind",
+    ["method", "endpoint", "kind"],
+)
+RPC_RETRIES = _metric(
+    Counter,
+    "soleco_rpc_retries_total",
+    "Solana RPC retry attempts",
+    ["method"],
+)
+CACHE_REQUESTS = _metric(
+    Counter,
+    "soleco_cache_requests_total",
+    "Cache lookups by cache, endpoint and result",
+    ["cache", "endpoint", "result"],
+)
+EXTRACTOR_BLOCK_SECONDS = _metric(
+    Histogram,
+    "soleco_extractor_block_seconds",
+    "Time an extractor spends on one block",
+    ["extractor"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+EXTRACTOR_TRANSACTION_SECONDS = _metric(
+    Histogram,
+    "soleco_extractor_transaction_seconds",
+    "Average time an extractor spends per transaction, observed once per block",
+    ["extractor"],
+    buckets=(0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005),
+)
+EXTRACTOR_TRANSACTIONS = _metric(
+    Counter,
+    "soleco_extractor_transactions_total",
+    "Transactions processed by extractors",
+    ["extractor"],
+)
+HANDLER_BATCH_SECONDS = _metric(
+    Histogram,
+    "soleco_handler_batch_seconds",
+    "Time a handler spends on one batch of transactions between event loop yields",
+    ["handler"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25),
+)
+HANDLER_TRANSACTIONS = _metric(
+    Counter,
+    "soleco_handler_transactions_total",
+    "Transactions processed by handlers in batch mode",
+    ["handler"],
+)
+EVENT_LOOP_LAG = _metric(
+    Histogram,
+    "soleco_event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0),
+)
+EVENT_LOOP_LAG_LAST = _metric(
+    Gauge,
+    "soleco_event_loop_lag_last_seconds",
+    "Most recent event loop lag sample",
+)
+BLOCK_WORKERS_PENDING = _metric(
+    Gauge,
+    "soleco_block_workers_pending",
+    "Blocks queued or running in the block worker pool",
+)
+BLOCK_WORKER_WAIT = _metric(
+    Histogram,
+    "soleco_block_worker_wait_seconds",
+    "Time a block waited for a free block worker slot",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+_children: Dict[Tuple, object] = {}
+_endpoint_labels: Dict[str, str] = {}
+
+
+def _child(metric, *labels):
+    key = (metric, labels)
+    child = _children.get(key)
+    if child is None:
+        child = metric.labels(*labels)
+        _children[key] = child
+    return child
+
+
+def endpoint_label(endpoint: str) -> str:
+    """
+    Reduce an RPC endpoint URL to its host so API keys never become label values.
+
+    Args:
+        endpoint: Endpoint URL
+
+    Returns:
+        Host name of the endpoint
+    """
+    label = _endpoint_labels.get(endpoint)
+    if label is None:
+        label = urlparse(endpoint).hostname or "unknown"
+        _endpoint_labels[endpoint] = label
+    return label
+
+
+def observe_rpc(method: str, endpoint: str, seconds: float) -> None:
+    """Record the latency of an RPC call."""
+    _child(RPC_LATENCY, method, endpoint_label(endpoint)).observe(seconds)
+
+
+def record_rpc_error(method: str, endpoint: str, kind: str) -> None:
+    """Record a failed RPC call; kind is e.g. rate_limited, timeout or connection."""
+    _child(RPC_ERRORS, method, endpoint_label(endpoint), kind).inc()
+
+
+def record_rpc_retry(method: str) -> None:
+    """Record a retry of an RPC call."""
+    _child(RPC_RETRIES, method).inc()
+
+
+def record_cache(cache: str, endpoint: str, hit: bool) -> None:
+    """Record a cache lookup."""
+    _child(CACHE_REQUESTS, cache, endpoint, "hit" if hit else "miss").inc()
+
+
+def observe_extractor(extractor: str, seconds: float, transactions: int = 0) -> None:
+    """
+    Record the time an extractor spent on one block.
+
+    Args:
+        extractor: Extractor name
+        seconds: Time spent on the block
+        transactions: Number of transactions in the block
+    """
+    _child(EXTRACTOR_BLOCK_SECONDS, extractor).observe(seconds)
+    if transactions:
+        _child(EXTRACTOR_TRANSACTION_SECONDS, extractor).observe(seconds / transactions)
+        _child(EXTRACTOR_TRANSACTIONS, extractor).inc(transactions)
+
+
+def observe_handler_batch(handler: str, seconds: float, transactions: int) -> None:
+    """
+    Record one batch of a handler's transaction loop.
+
+    Args:
+        handler: Handler class name
+        seconds: Time spent on the batch
+        transactions: Number of transactions in the batch
+    """
+    _child(HANDLER_BATCH_SECONDS, handler).observe(seconds)
+    _child(HANDLER_TRANSACTIONS, handler).inc(transactions)
+
+
+def set_block_workers_pending(pending: int) -> None:
+    """Record the number of blocks in flight in the block worker pool."""
+    BLOCK_WORKERS_PENDING.set(pending)
+
+
+def observe_block_worker_wait(seconds: float) -> None:
+    """Record how long a block waited for a block worker slot."""
+    BLOCK_WORKER_WAIT.observe(seconds)
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """
+    Sample event loop lag until cancelled.
+
+    Args:
+        interval: Seconds between samples
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG.observe(lag)
+        EVENT_LOOP_LAG_LAST.set(lag)
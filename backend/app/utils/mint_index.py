@@ -0,0 +1,391 @@
+"""
+Persistent index of every mint address seen by the extractors.
+
+A Bloom filter in memory answers "never seen" without touching the database,
+and an LRU cache of first-seen slots confirms the positives, which are most
+of the traffic since popular mints are seen in every block. The SQLite
+``mint_index`` table holds each mint's first-seen slot and time and is only
+queried for positives the cache does not hold. New sightings are buffered
+and written in batches; from the event loop, the writes and the Bloom filter
+rebuilds run in a worker thread.
+"""
+import asyncio
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.database.sqlite import DatabaseCache
+
+logger = logging.getLogger(__name__)
+
+_HASH_MASK = (1 << 64) - 1
+
+
+class BloomFilter:
+    """
+    Bloom filter over strings using double hashing of Python's string hash.
+
+    The string hash is cached on the ``str`` object, so a lookup costs one
+    multiply-add and bit test per probe. The filter is rebuilt from the
+    database on every start, which is why a per-process hash seed is fine.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Size the filter for a capacity and false positive rate.
+
+        Args:
+            capacity: Expected number of items
+            error_rate: Target false positive rate at capacity
+        """
+        self.capacity = max(1, capacity)
+        self.error_rate = error_rate
+        self.num_bits = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.num_hashes = max(1, round(self.num_bits / self.capacity * math.log(2)))
+        self._bits = bytearray((self.num_bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        h = hash(item) & _HASH_MASK
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        m = self.num_bits
+        return [(h1 + i * h2) % m for i in range(self.num_hashes)]
+
+    def add(self, item: str) -> None:
+        """Add an item to the filter."""
+        bits = self._bits
+        for pos in self._positions(item):
+            bits[pos >> 3] |= 1 << (pos & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        h = hash(item) & _HASH_MASK
+        h1 = h & 0xFFFFFFFF
+        h2 = (h >> 32) | 1
+        m = self.num_bits
+        for i in range(self.num_hashes):
+            pos = (h1 + i * h2) % m
+            if not bits[pos >> 3] & (1 << (pos & 7)):
+                return False
+        return True
+
+    @property
+    def size_bytes(self) -> int:
+        return len(self._bits)
+
+
+class MintIndex:
+    """
+    Global first-seen index of mint addresses.
+    """
+
+    def __init__(
+        self,
+        db: Optional[DatabaseCache] = None,
+        capacity: int = 5_000_000,
+        error_rate: float = 0.001,
+        flush_size: int = 500,
+        flush_interval: float = 5.0,
+        cache_size: int = 200_000,
+    ):
+        """
+        Initialize the index.
+
+        Args:
+            db: Database holding the mint_index table
+            capacity: Initial Bloom filter capacity
+            error_rate: Bloom filter false positive rate
+            flush_size: Pending sightings that trigger a database write
+            flush_interval: Maximum seconds a sighting stays unwritten
+            cache_size: First-seen slots kept in memory to confirm Bloom positives
+        """
+        self.db = db or DatabaseCache()
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.cache_size = cache_size
+
+        self._bloom = BloomFilter(capacity, error_rate)
+        self._first_seen: "OrderedDict[str, Optional[int]]" = OrderedDict()
+        self._pending: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        # Sightings being written; still answered from memory until committed
+        self._flushing: Dict[str, Tuple[Optional[int], Optional[int]]] = {}
+        # Mints added while the Bloom filter is rebuilt, replayed into the new filter
+        self._journal: Optional[List[str]] = None
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self._flush_lock = threading.Lock()
+        self._background: Set[asyncio.Task] = set()
+        self._flush_scheduled = False
+        self._loaded = False
+        self.stats = {
+            "lookups": 0,
+            "bloom_negatives": 0,
+            "cache_hits": 0,
+            "db_confirmations": 0,
+            "false_positives": 0,
+            "flushes": 0,
+            "resizes": 0,
+        }
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self) -> int:
+        """
+        Build the Bloom filter and warm the first-seen cache from the database.
+
+        Sightings added while the table is read are kept; the new filter
+        replaces the old one only once it covers them.
+
+        Returns:
+            Number of mints loaded
+        """
+        with self._lock:
+            self._journal = list(self._pending) + list(self._flushing)
+            capacity = self.capacity
+
+        try:
+            total = self.db.count_indexed_mints()
+            capacity = max(capacity, total * 2)
+            bloom = BloomFilter(capacity, self.error_rate)
+
+            def rows():
+                for mint, first_seen_slot in self.db.iter_indexed_mints():
+                    bloom.add(mint)
+                    yield mint, first_seen_slot
+
+            # The cache starts with the most recently first-seen mints, the likeliest to be seen again
+            recent = heapq.nlargest(self.cache_size, rows(), key=lambda row: row[1] or 0)
+            cache: "OrderedDict[str, Optional[int]]" = OrderedDict(reversed(recent))
+
+            with self._lock:
+                for mint in self._journal:
+                    bloom.add(mint)
+                # Sightings cached since the load started are fresher than the table
+                for mint, first_seen_slot in self._first_seen.items():
+                    cache[mint] = first_seen_slot
+                    if len(cache) > self.cache_size:
+                        cache.popitem(last=False)
+                self._bloom = bloom
+                self._first_seen = cache
+                self.capacity = max(self.capacity, capacity)
+                self._loaded = True
+        finally:
+            with self._lock:
+                self._journal = None
+
+        logger.info(
+            f"Loaded mint index with {total} mints "
+            f"({bloom.size_bytes / 1024 / 1024:.1f} MiB Bloom filter, {bloom.num_hashes} hashes)"
+        )
+        return total
+
+    def _cache(self, mint: str, first_seen_slot: Optional[int]) -> None:
+        """Remember a mint's earliest known first-seen slot, evicting the least recently used."""
+        with self._lock:
+            cached = self._first_seen.get(mint)
+            if cached is None or (first_seen_slot is not None and first_seen_slot < cached):
+                self._first_seen[mint] = first_seen_slot
+            self._first_seen.move_to_end(mint)
+            if len(self._first_seen) > self.cache_size:
+                self._first_seen.popitem(last=False)
+
+    def is_new(self, mint: str, slot: Optional[int] = None) -> bool:
+        """
+        Check whether a mint is new as of a slot.
+
+        A mint is new if it has never been seen, or if it was first seen at
+        ``slot`` or later, so reprocessing a block gives the same answer.
+
+        Args:
+            mint: Mint address
+            slot: Slot the mint is being seen in
+
+        Returns:
+            True if the mint is new
+        """
+        self.stats["lookups"] += 1
+        if mint not in self._bloom:
+            self.stats["bloom_negatives"] += 1
+            return True
+
+        pending = self._pending.get(mint) or self._flushing.get(mint)
+        if pending is not None:
+            return self._first_seen_at_or_after(pending[0], slot)
+
+        with self._lock:
+            if mint in self._first_seen:
+                self._first_seen.move_to_end(mint)
+                self.stats["cache_hits"] += 1
+                return self._first_seen_at_or_after(self._first_seen[mint], slot)
+
+        # Positives the cache does not hold are confirmed against the table to rule out false positives
+        self.stats["db_confirmations"] += 1
+        row = self.db.get_first_seen_mints([mint]).get(mint)
+        if row is None:
+            self.stats["false_positives"] += 1
+            return True
+        self._cache(mint, row["first_seen_slot"])
+        return self._first_seen_at_or_after(row["first_seen_slot"], slot)
+
+    @staticmethod
+    def _first_seen_at_or_after(first_seen_slot: Optional[int], slot: Optional[int]) -> bool:
+        return first_seen_slot is not None and slot is not None and first_seen_slot >= slot
+
+    def _run_in_background(self, func: Callable[[], Any]) -> None:
+        """Run func in a worker thread when called from the event loop, inline otherwise."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            func()
+            return
+        task = loop.create_task(asyncio.to_thread(func))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def add(self, mint: str, slot: Optional[int] = None, block_time: Optional[int] = None) -> None:
+        """
+        Record a mint sighting; the database write is batched and keeps the earliest slot.
+
+        Args:
+            mint: Mint address
+            slot: Slot the mint was seen in
+            block_time: Block time the mint was seen at
+        """
+        with self._lock:
+            pending = self._pending.get(mint)
+            if pending is not None:
+                if slot is not None and (pending[0] is None or slot < pending[0]):
+                    self._pending[mint] = (slot, block_time)
+                    self._cache(mint, slot)
+                return
+            self._pending[mint] = (slot, block_time)
+            self._cache(mint, slot)
+            self._bloom.add(mint)
+            if self._journal is not None:
+                self._journal.append(mint)
+            elif self._bloom.count > self._bloom.capacity:
+                logger.info("Mint index exceeded Bloom filter capacity, resizing")
+                self.capacity *= 2
+                self.stats["resizes"] += 1
+                # Marks the rebuild as running until load() takes over the journal
+                self._journal = []
+                self._run_in_background(self.load)
+
+            flush = not self._flush_scheduled and (
+                len(self._pending) >= self.flush_size or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+            if flush:
+                self._flush_scheduled = True
+        if flush:
+            self._run_in_background(self.flush)
+
+    def claim_new(self, mints: Iterable[str], slot: Optional[int] = None, block_time: Optional[int] = None) -> List[str]:
+        """
+        Filter candidate mints from one block down to the new ones and record them.
+
+        Used for extractor results produced without access to the index, such
+        as those returned by the block worker processes.
+
+        Args:
+            mints: Candidate new mint addresses
+            slot: Slot the mints were seen in
+            block_time: Block time the mints were seen at
+
+        Returns:
+            The mints that are new as of ``slot``
+        """
+        new_mints = []
+        for mint in mints:
+            if self.is_new(mint, slot):
+                self.add(mint, slot, block_time)
+                new_mints.append(mint)
+        return new_mints
+
+    def flush(self) -> bool:
+        """
+        Write pending sightings to the database in one transaction.
+
+        New sightings keep being accepted while the batch is written; a failed
+        batch is merged back into the pending sightings.
+
+        Returns:
+            True if successful, False otherwise
+        """
+        with self._flush_lock:
+            with self._lock:
+                self._flush_scheduled = False
+                self._last_flush = time.monotonic()
+                if not self._pending:
+                    return True
+                self._flushing, self._pending = self._pending, {}
+                rows = [(mint, slot, block_time) for mint, (slot, block_time) in self._flushing.items()]
+
+            stored = self.db.store_first_seen_mints(rows)
+
+            with self._lock:
+                if not stored:
+                    for mint, sighting in self._flushing.items():
+                        pending = self._pending.get(mint)
+                        if pending is None or (sighting[0] is not None and (pending[0] is None or sighting[0] < pending[0])):
+                            self._pending[mint] = sighting
+                else:
+                    self.stats["flushes"] += 1
+                self._flushing = {}
+            return stored
+
+    def first_seen(self, mints: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get first-seen information for mint addresses.
+
+        Args:
+            mints: Mint addresses to look up
+
+        Returns:
+            Mapping of known mint address to its first-seen slot and time
+        """
+        result = {}
+        lookup = []
+        for mint in mints:
+            pending = self._pending.get(mint) or self._flushing.get(mint)
+            if pending is not None:
+                result[mint] = {"first_seen_slot": pending[0], "first_seen_time": pending[1]}
+            elif mint in self._bloom:
+                lookup.append(mint)
+        if lookup:
+            result.update(self.db.get_first_seen_mints(lookup))
+        return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        return {
+            **self.stats,
+            "loaded": self._loaded,
+            "bloom_items": self._bloom.count,
+            "bloom_capacity": self._bloom.capacity,
+            "bloom_bytes": self._bloom.size_bytes,
+            "pending": len(self._pending) + len(self._flushing),
+            "cached": len(self._first_seen),
+        }
+
+
+_mint_index: Optional[MintIndex] = None
+
+
+def get_mint_index() -> MintIndex:
+    """Get or create the shared mint index."""
+    global _mint_index
+
+    if _mint_index is None:
+        _mint_index = MintIndex()
+
+    return _mint_index
@@ -0,0 +1,380 @@
+"""
+Shared upstream client for the Pump.fun frontend API.
+
+All requests go through one pooled ``httpx.AsyncClient`` and the Pump.fun
+request throttler. Identical requests that are already in flight share one
+upstream call, and successful responses are kept in memory for a TTL chosen
+by URL path (see ``PUMP_UPSTREAM_CACHE_TTLS``), so endpoints that combine
+several upstream calls can issue them concurrently with ``asyncio.gather``.
+Callers forcing a refresh pass ``use_cache=False`` to skip the cached copy.
+"""
+import asyncio
+import logging
+import random
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+import httpx
+from fastapi import HTTPException
+
+from app.constants.cache import (
+    PUMP_UPSTREAM_CACHE_MAX_ENTRIES,
+    PUMP_UPSTREAM_CACHE_TTLS,
+    PUMP_UPSTREAM_DEFAULT_TTL,
+)
+
+logger = logging.getLogger(__name__)
+
+PUMP_API_BASE_URL = "https://frontend-api.pump.fun"
+
+
+# Request throttling for Pump.fun API
+class RequestThrottler:
+    """
+    Request throttler to limit concurrent requests to the Pump.fun API.
+    This helps prevent rate limiting by ensuring we don't overwhelm the API.
+    """
+    def __init__(self, max_concurrent=3, rate_limit=10, time_window=60):
+        """
+        Initialize the request throttler.
+
+        Args:
+            max_concurrent: Maximum number of concurrent requests
+            rate_limit: Maximum number of requests in time_window
+            time_window: Time window in seconds for rate limiting
+        """
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.rate_limit = rate_limit
+        self.time_window = time_window
+        self.request_timestamps = []
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Acquire permission to make a request.
+        This will block if we've reached the maximum concurrent requests
+        or if we've exceeded the rate limit.
+        """
+        # First check rate limiting
+        async with self.lock:
+            now = datetime.now().timestamp()
+            # Remove timestamps older than the time window
+            self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < self.time_window]
+
+            # Check if we've exceeded the rate limit
+            if len(self.request_timestamps) >= self.rate_limit:
+                # Calculate time to wait
+                oldest = min(self.request_timestamps)
+                wait_time = self.time_window - (now - oldest) + 0.1  # Add a small buffer
+                logger.warning(f"Rate limit reached, waiting {wait_time:.2f}s before making request")
+                await asyncio.sleep(wait_time)
+
+                # Recursively try again after waiting
+                return await self.acquire()
+
+            # Add current timestamp
+            self.request_timestamps.append(now)
+
+        # Now acquire the semaphore for concurrent request limiting
+        await self.semaphore.acquire()
+
+    def release(self):
+        """Release the semaphore."""
+        self.semaphore.release()
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+class PumpClient:
+    """
+    Pooled, deduplicating and caching client for Pump.fun upstream calls.
+    """
+
+    def __init__(
+        self,
+        base_url: str = PUMP_API_BASE_URL,
+        throttler: Optional[RequestThrottler] = None,
+        timeout: float = 45.0,
+        max_retries: int = 5,
+        base_delay: float = 2.0,
+    ):
+        """
+        Initialize the client.
+
+        Args:
+            base_url: Pump.fun API base URL, prepended to relative paths
+            throttler: Request throttler shared by all upstream calls
+            timeout: Per-request timeout in seconds
+            max_retries: Attempts per upstream call
+            base_delay: Base of the exponential retry backoff in seconds
+        """
+        self.base_url = base_url.rstrip("/")
+        self.throttler = throttler or RequestThrottler(max_concurrent=3, rate_limit=10, time_window=60)
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self._client: Optional[httpx.AsyncClient] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.stats = {"requests": 0, "cache_hits": 0, "deduplicated": 0, "upstream_calls": 0}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=self.timeout,
+                headers={
+                    "accept": "*/*",
+                    "User-Agent": "Soleco/1.0 (https://github.com/homezloco/soleco)"
+                },
+                limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            )
+        return self._client
+
+    async def close(self) -> None:
+        """Close the pooled HTTP client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    def url(self, path: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """
+        Build an upstream URL.
+
+        Args:
+            path: Path relative to the base URL, or an absolute URL
+            params: Query parameters
+
+        Returns:
+            The absolute URL
+        """
+        url = path if path.startswith("http") else f"{self.base_url}{path}"
+        if params:
+            url += ("&" if "?" in url else "?") + urlencode(params)
+        return url
+
+    @staticmethod
+    def cache_ttl(url: str) -> float:
+        """
+        Get the response cache TTL for a URL from the longest matching path prefix.
+
+        Args:
+            url: Absolute upstream URL
+
+        Returns:
+            TTL in seconds; 0 disables caching
+        """
+        path = urlsplit(url).path
+        best = None
+        for prefix in PUMP_UPSTREAM_CACHE_TTLS:
+            if path.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return PUMP_UPSTREAM_CACHE_TTLS[best] if best is not None else PUMP_UPSTREAM_DEFAULT_TTL
+
+    async def get(
+        self,
+        path: str,
+        params: Optional[Dict[str, Any]] = None,
+        required: bool = True,
+        use_cache: bool = True,
+        ttl: Optional[float] = None,
+    ) -> Any:
+        """
+        GET a Pump.fun API resource.
+
+        Args:
+            path: Path relative to the base URL, or an absolute URL
+            params: Query parameters
+            required: Whether failures raise (if False, returns None instead)
+            use_cache: Whether a cached response may be returned; the fresh
+                response is cached either way
+            ttl: Cache TTL of the response in seconds, defaults to ``cache_ttl(url)``
+
+        Returns:
+            The decoded JSON response, or None if not required and the call failed
+
+        Raises:
+            HTTPException: If required and the call failed
+        """
+        url = self.url(path, params)
+        self.stats["requests"] += 1
+
+        cached = self._cache.get(url) if use_cache else None
+        if cached is not None:
+            if cached[0] > time.monotonic():
+                self.stats["cache_hits"] += 1
+                return cached[1]
+            del self._cache[url]
+
+        future = self._inflight.get(url)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch(url))
+            self._inflight[url] = future
+            ttl = self.cache_ttl(url) if ttl is None else ttl
+            future.add_done_callback(lambda done, url=url, ttl=ttl: self._finish(url, done, ttl))
+        else:
+            self.stats["deduplicated"] += 1
+
+        try:
+            # Shielded so one caller being cancelled does not cancel the call for the others
+            return await asyncio.shield(future)
+        except HTTPException:
+            if required:
+                raise
+            return None
+
+    def _finish(self, url: str, future: asyncio.Future, ttl: float) -> None:
+        """Drop a finished call from the in-flight table and cache its response."""
+        if self._inflight.get(url) is future:
+            del self._inflight[url]
+        if future.cancelled() or future.exception() is not None:
+            return
+        if ttl > 0:
+            self._cache[url] = (time.monotonic() + ttl, future.result())
+            self._cache.move_to_end(url)
+            while len(self._cache) > PUMP_UPSTREAM_CACHE_MAX_ENTRIES:
+                self._cache.popitem(last=False)
+
+    async def get_latest_coins(self, limit: int, offset: int = 0, include_nsfw: bool = True) -> List[Dict[str, Any]]:
+        """
+        Fetch a page of the newest coins in one request; like ``/coins/latest``, it is never cached.
+
+        Args:
+            limit: Number of coins
+            offset: Number of newest coins to skip
+            include_nsfw: Whether to include NSFW coins
+
+        Returns:
+            Coins, newest first; empty if the page could not be fetched
+        """
+        coins = await self.get(
+            "/coins",
+            {
+                "offset": offset,
+                "limit": limit,
+                "sort": "created_timestamp",
+                "order": "DESC",
+                "includeNsfw": str(include_nsfw).lower(),
+            },
+            required=False,
+            ttl=0,
+        )
+        if not isinstance(coins, list):
+            return []
+        return [coin for coin in coins if isinstance(coin, dict) and "mint" in coin][:limit]
+
+    async def _fetch(self, url: str) -> Any:
+        """
+        Make one upstream call with retries and rate limiting protection.
+
+        Args:
+            url: Absolute upstream URL
+
+        Returns:
+            The decoded JSON response
+
+        Raises:
+            HTTPException: If the call failed
+        """
+        max_retries = self.max_retries
+        base_delay = self.base_delay
+
+        # Extract endpoint from URL for logging
+        endpoint = url.split("/")[-1].split("?")[0]
+
+        for retry in range(max_retries):
+            try:
+                # Calculate exponential backoff delay if this is a retry
+                if retry > 0:
+                    delay = base_delay * (2 ** retry)
+                    logger.info(f"Retry {retry}/{max_retries} for {endpoint} with {delay:.1f}s delay")
+                    await asyncio.sleep(delay)
+
+                logger.info(f"Making request to: {url}")
+
+                async with self.throttler:
+                    start_time = time.time()
+                    self.stats["upstream_calls"] += 1
+                    response = await self._get_client().get(url)
+
+                    request_time = time.time() - start_time
+                    logger.info(f"Response status for {endpoint}: {response.status_code} (took {request_time:.2f}s)")
+
+                    if response.status_code == 404:
+                        raise HTTPException(status_code=404, detail="Resource not found")
+                    elif response.status_code == 429:
+                        # Rate limited, use exponential backoff
+                        if retry < max_retries - 1:
+                            # Extract retry-after header if available
+                            retry_after = response.headers.get('retry-after')
+                            if retry_after and retry_after.isdigit():
+                                wait_time = int(retry_after) + random.uniform(0.5, 2.0)
+                            else:
+                                wait_time = base_delay * (2 ** retry) + random.uniform(1, 3)
+
+                            logger.warning(f"Rate limited on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
+                            await asyncio.sleep(wait_time)
+                            continue
+                        logger.error(f"Rate limited after {max_retries} retries on {endpoint}")
+                        raise HTTPException(
+                            status_code=429,
+                            detail=f"Rate limited by Pump.fun API after {max_retries} retries. Please try again later."
+                        )
+                    elif response.status_code == 500:
+                        if retry < max_retries - 1:
+                            wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
+                            logger.warning(f"Server error (500) on {endpoint}. Retrying in {wait_time:.1f}s")
+                            await asyncio.sleep(wait_time)
+                            continue
+                        raise HTTPException(status_code=502, detail="Pump.fun API server error")
+
+                    response.raise_for_status()
+                    return response.json()
+            except HTTPException:
+                raise
+            except httpx.TimeoutException as e:
+                logger.error(f"Timeout error occurred while fetching {endpoint} from Pump.fun: {e}")
+                error = HTTPException(status_code=504, detail=f"Timeout error fetching data from Pump.fun: {str(e)}")
+            except httpx.ConnectError as e:
+                logger.error(f"Connection error occurred while fetching {endpoint} from Pump.fun: {e}")
+                error = HTTPException(status_code=503, detail=f"Connection error fetching data from Pump.fun: {str(e)}")
+            except httpx.HTTPError as e:
+                logger.error(f"HTTP error occurred while fetching {endpoint} from Pump.fun: {e}")
+                error = HTTPException(status_code=502, detail=f"Error fetching data from Pump.fun: {str(e)}")
+            except Exception as e:
+                logger.error(f"Unexpected error occurred while fetching {endpoint} from Pump.fun: {e}")
+                error = HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
+
+            if retry < max_retries - 1:
+                wait_time = base_delay * (2 ** retry) + random.uniform(0.5, 1.5)
+                logger.warning(f"Error on {endpoint}. Waiting {wait_time:.1f}s before retry {retry + 1}/{max_retries}")
+                await asyncio.sleep(wait_time)
+                continue
+            raise error
+
+        # If we get here, all retries failed
+        raise HTTPException(status_code=503, detail=f"Failed to fetch {endpoint} data after {max_retries} retries")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get client statistics."""
+        return {**self.stats, "cached": len(self._cache), "inflight": len(self._inflight)}
+
+
+_pump_client: Optional[PumpClient] = None
+
+
+def get_pump_client() -> PumpClient:
+    """Get or create the shared Pump.fun client."""
+    global _pump_client
+
+    if _pump_client is None:
+        _pump_client = PumpClient()
+
+    return _pump_client
@@ -0,0 +1,292 @@
+"""
+Shared transport for Solana RPC calls.
+
+``SolanaClient`` instances used to open their own ``aiohttp`` session each,
+and every connection pool (``solana_rpc``, ``solana_connection`` and
+``solana_connection_pool``) kept its own health counters and rate-limit state
+for the same providers. ``RpcTransport`` holds the one keep-alive session
+that all ``SolanaClient`` instances send through and a single registry of
+per-endpoint state (success/failure counts, latency, cooldowns), which every
+pool reads and updates, so a 429 seen through one pool takes the endpoint out
+of rotation for all of them.
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+
+from app.config import ADAPTIVE_CONCURRENCY_CONFIG, RPC_TRANSPORT_CONFIG
+from .adaptive_concurrency import AdaptiveLimit
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_endpoint(url: str) -> str:
+    """Registry key for an endpoint URL."""
+    return url.strip().rstrip('/')
+
+
+class EndpointState:
+    """
+    Health and rate-limit state of one RPC endpoint.
+    """
+
+    def __init__(self, url: str):
+        self.url = url
+        self.success_count = 0
+        self.failure_count = 0
+        self.current_failures = 0
+        self.rate_limited_count = 0
+        self.avg_latency: Optional[float] = None
+        self.last_latency: Optional[float] = None
+        self.last_success: Optional[float] = None
+        self.last_failure: Optional[float] = None
+        self.last_rate_limited: Optional[float] = None
+        self.cooldown_until = 0.0
+        self.ssl_verify: Optional[bool] = None
+        # Requests in flight to the endpoint are bounded by an adaptive window, unless turned off
+        self.concurrency = AdaptiveLimit(url) if ADAPTIVE_CONCURRENCY_CONFIG['enabled'] else None
+
+    @property
+    def total_requests(self) -> int:
+        return self.success_count + self.failure_count
+
+    @property
+    def success_rate(self) -> float:
+        return self.success_count / self.total_requests if self.total_requests else 0.0
+
+    def record(self, success: bool, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        """
+        Record the outcome of a request.
+
+        Args:
+            success: Whether the request succeeded
+            latency: Request latency in seconds, if known
+            rate_limited: Whether the endpoint answered with a rate-limit error
+        """
+        now = time.time()
+        if success:
+            self.success_count += 1
+            self.current_failures = 0
+            self.last_success = now
+            if latency is not None:
+                alpha = RPC_TRANSPORT_CONFIG['latency_alpha']
+                self.last_latency = latency
+                self.avg_latency = latency if self.avg_latency is None else alpha * latency + (1 - alpha) * self.avg_latency
+            return
+
+        self.failure_count += 1
+        self.current_failures += 1
+        self.last_failure = now
+        if rate_limited:
+            self.rate_limited_count += 1
+            self.last_rate_limited = now
+            self.cool_down(random.uniform(*RPC_TRANSPORT_CONFIG['rate_limit_cooldown']))
+        elif self.current_failures >= RPC_TRANSPORT_CONFIG['max_consecutive_failures']:
+            self.cool_down(RPC_TRANSPORT_CONFIG['failure_cooldown'])
+
+    def cool_down(self, seconds: float) -> None:
+        """Take the endpoint out of rotation for the given number of seconds."""
+        self.cooldown_until = max(self.cooldown_until, time.time() + seconds)
+        logger.warning(f"Endpoint {self.url} cooling down for {seconds:.1f}s")
+
+    def is_available(self, now: Optional[float] = None) -> bool:
+        """Whether the endpoint is out of its cooldown."""
+        return (now or time.time()) >= self.cooldown_until
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "success_count": self.success_count,
+            "failure_count": self.failure_count,
+            "current_failures": self.current_failures,
+            "success_rate": self.success_rate,
+            "avg_latency": self.avg_latency or 0,
+            "last_latency": self.last_latency or 0,
+            "last_success": self.last_success,
+            "rate_limited_count": self.rate_limited_count,
+            "last_rate_limited": self.last_rate_limited,
+            "cooldown_until": self.cooldown_until,
+            "concurrency": self.concurrency.to_dict() if self.concurrency is not None else None,
+        }
+
+    def restore(self, stats: Dict[str, Any]) -> None:
+        """
+        Load counters and latency saved by to_dict, e.g. from a previous run.
+
+        Args:
+            stats: Dict produced by to_dict; cooldowns that have ended are ignored
+        """
+        self.success_count = stats.get("success_count", 0)
+        self.failure_count = stats.get("failure_count", 0)
+        self.current_failures = stats.get("current_failures", 0)
+        self.rate_limited_count = stats.get("rate_limited_count", 0)
+        self.avg_latency = stats.get("avg_latency") or None
+        self.last_latency = stats.get("last_latency") or None
+        self.last_success = stats.get("last_success")
+        self.last_rate_limited = stats.get("last_rate_limited")
+        self.cooldown_until = max(self.cooldown_until, stats.get("cooldown_until") or 0.0)
+        if self.concurrency is not None:
+            self.concurrency.restore((stats.get("concurrency") or {}).get("limit"))
+
+    def score(self) -> tuple:
+        """Sort key ranking endpoints by success rate, then latency; lower is better."""
+        return (-self.success_rate, self.avg_latency if self.avg_latency is not None else float('inf'))
+
+
+class RpcTransport:
+    """
+    Keep-alive HTTP session and endpoint registry shared by all RPC pools.
+    """
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointState] = {}
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_clients: Dict[str, Any] = {}
+        self.stats = {"sessions_created": 0}
+
+    def endpoint(self, url: str) -> EndpointState:
+        """
+        Get the state of an endpoint, registering it on first use.
+
+        Args:
+            url: Endpoint URL
+
+        Returns:
+            The endpoint's EndpointState
+        """
+        key = normalize_endpoint(url)
+        state = self.endpoints.get(key)
+        if state is None:
+            state = self.endpoints[key] = EndpointState(key)
+        return state
+
+    def get(self, url: str) -> Optional[EndpointState]:
+        """Get the state of an endpoint, if it has been registered."""
+        return self.endpoints.get(normalize_endpoint(url))
+
+    def record(self, url: str, success: bool, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        """Record the outcome of a request to an endpoint (see EndpointState.record)."""
+        self.endpoint(url).record(success, latency, rate_limited)
+
+    def concurrency(self, url: str) -> Optional[AdaptiveLimit]:
+        """Get the adaptive concurrency limit of an endpoint, or None if adaptive concurrency is off."""
+        return self.endpoint(url).concurrency
+
+    def load(self, url: str) -> float:
+        """Fraction of an endpoint's concurrency window in use; 0 for unknown endpoints or without limits."""
+        state = self.get(url)
+        if state is None or state.concurrency is None:
+            return 0.0
+        return state.concurrency.load
+
+    def is_available(self, url: str, now: Optional[float] = None) -> bool:
+        """Whether an endpoint is out of its cooldown; unknown endpoints are available."""
+        state = self.get(url)
+        return state is None or state.is_available(now)
+
+    def available(self, urls: List[str]) -> List[str]:
+        """Filter a list of endpoint URLs down to those out of cooldown."""
+        now = time.time()
+        return [url for url in urls if self.is_available(url, now)]
+
+    def session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared session, creating it for the running event loop if needed.
+
+        Returns:
+            A keep-alive ClientSession; callers must not close it
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=RPC_TRANSPORT_CONFIG['connection_limit'],
+                limit_per_host=RPC_TRANSPORT_CONFIG['connection_limit_per_host'],
+                keepalive_timeout=RPC_TRANSPORT_CONFIG['keepalive_timeout'],
+                ttl_dns_cache=RPC_TRANSPORT_CONFIG['dns_cache_ttl'],
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+            self._async_clients = {}
+            self.stats["sessions_created"] += 1
+        return self._session
+
+    def request_kwargs(self, url: str, ssl_verify: bool = True) -> Dict[str, Any]:
+        """
+        Per-request options for an endpoint, since the shared session serves all of them.
+
+        Args:
+            url: Endpoint URL
+            ssl_verify: Whether the caller wants certificates verified
+
+        Returns:
+            Keyword arguments for ClientSession.post
+        """
+        state = self.endpoint(url)
+        if state.ssl_verify is not None:
+            ssl_verify = ssl_verify and state.ssl_verify
+        if not ssl_verify and url.startswith("https"):
+            return {"ssl": False}
+        return {}
+
+    def async_client(self, url: str, timeout: float = 10.0) -> Any:
+        """
+        Get the shared solana-py AsyncClient for an endpoint on the running event loop.
+
+        Args:
+            url: Endpoint URL
+            timeout: Request timeout in seconds, used when the client is created
+
+        Returns:
+            An AsyncClient; callers must not close it
+        """
+        from solana.rpc.async_api import AsyncClient
+
+        self.session()  # Drops clients bound to a previous event loop
+        key = normalize_endpoint(url)
+        client = self._async_clients.get(key)
+        if client is None:
+            client = self._async_clients[key] = AsyncClient(url, timeout=timeout)
+        return client
+
+    async def close(self) -> None:
+        """Close the shared session and AsyncClients."""
+        for client in list(self._async_clients.values()):
+            try:
+                await client.close()
+            except Exception as e:
+                logger.warning(f"Error closing AsyncClient: {str(e)}")
+        self._async_clients = {}
+        if self._session is not None and not self._session.closed:
+            try:
+                await self._session.close()
+            except Exception as e:
+                logger.warning(f"Error closing shared RPC session: {str(e)}")
+        self._session = None
+        self._session_loop = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Registry contents and connection counts."""
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        now = time.time()
+        return {
+            "endpoints": {url: state.to_dict() for url, state in self.endpoints.items()},
+            "cooling_down": [url for url, state in self.endpoints.items() if not state.is_available(now)],
+            "idle_connections": sum(len(conns) for conns in connector._conns.values()) if connector else 0,
+            "async_clients": len(self._async_clients),
+            **self.stats,
+        }
+
+
+_rpc_transport: Optional[RpcTransport] = None
+
+
+def get_rpc_transport() -> RpcTransport:
+    """Get the shared RpcTransport instance."""
+    global _rpc_transport
+    if _rpc_transport is None:
+        _rpc_transport = RpcTransport()
+    return _rpc_transport
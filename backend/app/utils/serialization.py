@@ -0,0 +1,184 @@
+"""
+Fast-path JSON serialization for API responses and cache blobs.
+
+Serialization is driven by a per-type converter table instead of reflective
+recursion: ``dumps`` hands native containers straight to orjson and only calls
+back into Python for types orjson does not understand (solders keys,
+signatures, RPC responses, ...). The converter for each such type is resolved
+once and memoized, so the ``hasattr`` probing happens per type, not per value.
+"""
+import json
+import logging
+from typing import Any, Callable, Dict, Optional, Type
+
+from starlette.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is listed in requirements.txt
+    orjson = None
+
+from solders.hash import Hash
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+
+logger = logging.getLogger(__name__)
+
+Converter = Callable[[Any], Any]
+
+# Explicitly registered converters keyed by exact type
+_CONVERTERS: Dict[Type, Converter] = {}
+
+# Converters resolved for types that were not registered explicitly
+_RESOLVED: Dict[Type, Optional[Converter]] = {}
+
+_PRIMITIVES = (str, int, float, bool, type(None))
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def register_converter(obj_type: Type, converter: Converter) -> None:
+    """
+    Register a converter that turns ``obj_type`` instances into JSON-compatible values.
+
+    Args:
+        obj_type: Type handled by the converter
+        converter: Callable returning a JSON-compatible value
+    """
+    _CONVERTERS[obj_type] = converter
+    _RESOLVED.clear()
+
+
+def _from_solders_json(obj: Any) -> Any:
+    """Convert a solders object through its native JSON encoder."""
+    return loads(obj.to_json())
+
+
+def _resolve_converter(obj_type: Type) -> Optional[Converter]:
+    """Find the converter for a type that has no exact registration."""
+    for base in obj_type.__mro__[1:]:
+        if base in _CONVERTERS:
+            return _CONVERTERS[base]
+
+    if obj_type.__module__.startswith("solders"):
+        if callable(getattr(obj_type, "to_json", None)):
+            return _from_solders_json
+        return str
+
+    if callable(getattr(obj_type, "to_dict", None)):
+        return lambda obj: obj.to_dict()
+
+    if callable(getattr(obj_type, "to_json", None)):
+        return lambda obj: _maybe_loads(obj.to_json())
+
+    return None
+
+
+def _maybe_loads(value: Any) -> Any:
+    """Parse JSON text returned by ``to_json``; plain strings are kept as-is."""
+    if isinstance(value, (str, bytes)) and value[:1] in ("{", "[", b"{", b"["):
+        return loads(value)
+    return value
+
+
+def get_converter(obj_type: Type) -> Optional[Converter]:
+    """
+    Get the converter for a type, resolving and memoizing it on first use.
+
+    Args:
+        obj_type: Type to look up
+
+    Returns:
+        The converter or None if the type has no known JSON representation
+    """
+    converter = _CONVERTERS.get(obj_type)
+    if converter is not None:
+        return converter
+
+    try:
+        return _RESOLVED[obj_type]
+    except KeyError:
+        converter = _resolve_converter(obj_type)
+        _RESOLVED[obj_type] = converter
+        return converter
+
+
+def _default(obj: Any) -> Any:
+    """orjson ``default`` hook for types without native support."""
+    converter = get_converter(type(obj))
+    if converter is not None:
+        return converter(obj)
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.hex()
+    if hasattr(obj, "__dict__"):
+        return {k: v for k, v in vars(obj).items() if not k.startswith("_")}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def to_jsonable(obj: Any) -> Any:
+    """
+    Convert an object tree into plain JSON-compatible Python values.
+
+    Only needed when callers want Python objects back; ``dumps`` does not
+    use it because orjson walks native containers itself.
+
+    Args:
+        obj: Object to convert
+
+    Returns:
+        JSON-compatible representation of the object
+    """
+    if isinstance(obj, _PRIMITIVES):
+        return obj
+    if isinstance(obj, dict):
+        return {k if isinstance(k, str) else str(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return [to_jsonable(item) for item in obj]
+    return to_jsonable(_default(obj))
+
+
+def dumps(obj: Any) -> bytes:
+    """
+    Serialize an object to JSON bytes.
+
+    Args:
+        obj: Object to serialize
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+    return json.dumps(to_jsonable(obj), separators=(",", ":")).encode("utf-8")
+
+
+def loads(data: Any) -> Any:
+    """
+    Parse JSON from bytes or text.
+
+    Args:
+        data: JSON document as bytes, bytearray, memoryview or str
+
+    Returns:
+        Parsed Python value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+class SolecoJSONResponse(JSONResponse):
+    """JSON response rendered with the fast serializer."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+register_converter(Pubkey, str)
+register_converter(Signature, str)
+register_converter(Hash, str)
@@ -0,0 +1,208 @@
+"""
+Shared map of skipped and confirmed slots.
+
+A skipped slot costs a getBlock round trip and an exception every time a
+range scan or a retry loop touches it, although whether a slot holds a block
+never changes once the cluster has confirmed it. ``SlotMap`` remembers the
+answer in two bitmaps per epoch, one marking the slots whose state is known
+and one marking the known slots that hold a block. It is filled from
+``getBlocks`` range calls and from blocks returned by ``getBlock``, and the
+RPC client consults it before sending either request, so slots known to be
+empty are never requested again. Skips are only taken from ``getBlocks``: a
+skip error from ``getBlock`` (-32007, -32009) can also mean that the one node
+answering lacks the slot, and the map is shared by every endpoint. Epochs are evicted least recently used
+first, which bounds memory at about 108 KB per epoch kept.
+"""
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.config import SLOT_MAP_CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class SlotMap:
+    """
+    Known/confirmed bitmaps of recent slots, one pair per epoch.
+    """
+
+    def __init__(self, slots_per_epoch: Optional[int] = None, max_epochs: Optional[int] = None):
+        """
+        Initialize the map.
+
+        Args:
+            slots_per_epoch: Slots covered by one pair of bitmaps
+            max_epochs: Epochs kept before the least recently used is evicted
+        """
+        self.slots_per_epoch = slots_per_epoch or SLOT_MAP_CONFIG['slots_per_epoch']
+        self.max_epochs = max_epochs or SLOT_MAP_CONFIG['max_epochs']
+        self._epochs: "OrderedDict[int, Tuple[bytearray, bytearray]]" = OrderedDict()
+        self.stats = {
+            "requests_avoided": 0,
+            "ranges_recorded": 0,
+            "ranges_answered": 0,
+            "evicted_epochs": 0,
+        }
+
+    def _bitmaps(self, slot: int, create: bool = False) -> Optional[Tuple[bytearray, bytearray]]:
+        """Known and confirmed bitmaps of the slot's epoch, or None if the epoch holds nothing."""
+        epoch = slot // self.slots_per_epoch
+        bitmaps = self._epochs.get(epoch)
+        if bitmaps is None:
+            if not create:
+                return None
+            size = (self.slots_per_epoch + 7) // 8
+            bitmaps = self._epochs[epoch] = (bytearray(size), bytearray(size))
+            while len(self._epochs) > self.max_epochs:
+                evicted, _ = self._epochs.popitem(last=False)
+                self.stats["evicted_epochs"] += 1
+                logger.debug(f"Evicted slot map of epoch {evicted}")
+        self._epochs.move_to_end(epoch)
+        return bitmaps
+
+    def _set(self, slot: int, confirmed: bool) -> None:
+        known, blocks = self._bitmaps(slot, create=True)
+        index = slot % self.slots_per_epoch
+        mask = 1 << (index & 7)
+        known[index >> 3] |= mask
+        if confirmed:
+            blocks[index >> 3] |= mask
+        else:
+            blocks[index >> 3] &= ~mask & 0xFF
+
+    def get(self, slot: int) -> Optional[bool]:
+        """
+        Look a slot up.
+
+        Args:
+            slot: Slot number
+
+        Returns:
+            True if the slot holds a block, False if it was skipped, None if unknown
+        """
+        bitmaps = self._bitmaps(slot)
+        if bitmaps is None:
+            return None
+        known, blocks = bitmaps
+        index = slot % self.slots_per_epoch
+        mask = 1 << (index & 7)
+        if not known[index >> 3] & mask:
+            return None
+        return bool(blocks[index >> 3] & mask)
+
+    def is_skipped(self, slot: int) -> bool:
+        """Whether a slot is known to be skipped; every hit counts as a request avoided."""
+        if self.get(slot) is False:
+            self.stats["requests_avoided"] += 1
+            return True
+        return False
+
+    def record_confirmed(self, slot: int) -> None:
+        """Record a slot that returned a block."""
+        self._set(slot, confirmed=True)
+
+    def record_blocks(self, start_slot: int, end_slot: int, slots: Iterable[int]) -> None:
+        """
+        Record a getBlocks answer.
+
+        Slots after the last listed one are left unknown, as getBlocks stops
+        at the commitment's latest slot rather than at end_slot.
+
+        Args:
+            start_slot: First slot of the requested range
+            end_slot: Last slot of the requested range
+            slots: Slots the call listed as holding a block
+        """
+        confirmed = sorted(slot for slot in slots if start_slot <= slot <= end_slot)
+        if not confirmed:
+            return
+        listed = iter(confirmed)
+        next_block = next(listed)
+        for slot in range(start_slot, confirmed[-1] + 1):
+            if slot == next_block:
+                self._set(slot, confirmed=True)
+                next_block = next(listed, None)
+            else:
+                self._set(slot, confirmed=False)
+        self.stats["ranges_recorded"] += 1
+
+    def known_until(self, start_slot: int, end_slot: int) -> int:
+        """
+        Find how far the state of a range is known.
+
+        Args:
+            start_slot: First slot of the range
+            end_slot: Last slot of the range
+
+        Returns:
+            The last slot such that every slot from start_slot to it is known,
+            or start_slot - 1 if start_slot itself is unknown
+        """
+        slot = start_slot
+        while slot <= end_slot:
+            bitmaps = self._bitmaps(slot)
+            if bitmaps is None:
+                break
+            known = bitmaps[0]
+            index = slot % self.slots_per_epoch
+            # Whole bytes of known slots are skipped eight at a time
+            if index & 7 == 0 and known[index >> 3] == 0xFF and slot + 7 <= end_slot:
+                slot += 8
+                continue
+            if not known[index >> 3] & (1 << (index & 7)):
+                break
+            slot += 1
+        return min(slot, end_slot + 1) - 1
+
+    def confirmed_in(self, start_slot: int, end_slot: int) -> List[int]:
+        """Slots of a range known to hold a block, ascending."""
+        return [slot for slot in range(start_slot, end_slot + 1) if self.get(slot)]
+
+    def known_blocks(self, start_slot: int, end_slot: int) -> Tuple[List[int], int]:
+        """
+        Answer as much of a getBlocks range as the map knows.
+
+        Args:
+            start_slot: First slot of the range
+            end_slot: Last slot of the range
+
+        Returns:
+            Slots known to hold a block from start_slot on, and the first slot
+            left to request (end_slot + 1 when the whole range is known)
+        """
+        known_until = self.known_until(start_slot, end_slot)
+        if known_until >= end_slot:
+            self.stats["ranges_answered"] += 1
+        return self.confirmed_in(start_slot, known_until), known_until + 1
+
+    def clear(self) -> None:
+        """Forget every slot."""
+        self._epochs.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get map statistics."""
+        return {
+            "epochs": sorted(self._epochs),
+            "memory_bytes": sum(len(known) + len(blocks) for known, blocks in self._epochs.values()),
+            **self.stats,
+        }
+
+
+_slot_map: Optional[SlotMap] = None
+
+
+def get_slot_map() -> Optional[SlotMap]:
+    """
+    Get or create the shared slot map.
+
+    Returns:
+        The map, or None when the slot map is disabled
+    """
+    global _slot_map
+
+    if not SLOT_MAP_CONFIG['enabled']:
+        return None
+    if _slot_map is None:
+        _slot_map = SlotMap()
+    return _slot_map
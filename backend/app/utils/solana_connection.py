@@ -8,6 +8,7 @@ from solana.rpc.async_api import AsyncClient
 from .solana_error import RPCError
 from .logging_config import setup_logging
 from .solana_ssl_config import should_bypass_ssl_verification
+from .rpc_transport import get_rpc_transport
 import time
 from datetime import datetime
 
@@ -53,6 +54,9 @@ class SolanaConnectionPool:
         # Track endpoint-specific settings
         self._endpoint_settings: Dict[str, Dict[str, Any]] = {}
         
+        # Endpoint health and rate-limit state is shared with every other pool
+        self._transport = get_rpc_transport()
+        
     def get_primary_endpoint(self) -> str:
         """Get the primary endpoint URL."""
         return self.endpoints[0] if self.endpoints else ""
@@ -110,6 +114,7 @@ class SolanaConnectionPool:
                                 self._endpoint_settings[endpoint] = {
                                     "ssl_verify": False
                                 }
+                                self._transport.endpoint(endpoint).ssl_verify = False
                                 
                                 # Add to SSL bypass list for future use
                                 from .solana_ssl_config import add_ssl_bypass_endpoint
@@ -160,16 +165,23 @@ class SolanaConnectionPool:
             return self._pool[self._current_client_index]
             
     async def get_client(self) -> AsyncClient:
-        """Get a healthy client from the pool."""
+        """Get a healthy client from the pool, skipping endpoints cooling down in the shared registry."""
         if not self._initialized:
             await self.initialize()
             
         async with self._pool_lock:
             if not self._pool:
                 raise RPCError("No healthy clients available")
-                
-            client = self._pool[self._current_client_index]
-            return client
+            
+            now = time.time()
+            for offset in range(len(self._pool)):
+                index = (self._current_client_index + offset) % len(self._pool)
+                if self._transport.is_available(self._pool[index].endpoint, now):
+                    self._current_client_index = index
+                    return self._pool[index]
+            
+            # Every endpoint is cooling down; keep using the current one
+            return self._pool[self._current_client_index % len(self._pool)]
             
     async def close(self):
         """Close all clients and cleanup resources"""
@@ -364,11 +376,18 @@ class SolanaConnectionPool:
         if not self._initialized:
             await self.initialize()
             
+        endpoint_stats = {}
+        for endpoint in self.endpoints:
+            state = self._transport.get(endpoint)
+            if state is not None:
+                endpoint_stats[endpoint] = state.to_dict()
+        
         return {
             "initialized": self._initialized,
             "pool_size": len(self._pool),
             "endpoints": self.endpoints,
             "current_index": self._current_client_index,
+            "endpoint_stats": endpoint_stats,
             "timestamp": datetime.now().isoformat()
         }
         
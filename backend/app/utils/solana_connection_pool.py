@@ -12,6 +12,9 @@ import functools
 import aiohttp
 import sys
 
+from .metrics import record_cache
+from .rpc_transport import get_rpc_transport
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
@@ -22,20 +25,23 @@ HELIUS_API_KEY = os.environ.get("HELIUS_API_KEY", "")
 class SimpleCache:
     """Simple time-based cache for RPC responses"""
     
-    def __init__(self, ttl_seconds=60):
-        """Initialize the cache with a time-to-live in seconds"""
+    def __init__(self, ttl_seconds=60, name="simple"):
+        """Initialize the cache with a time-to-live in seconds and a name used in metrics"""
         self.cache = {}
         self.ttl_seconds = ttl_seconds
+        self.name = name
         
     def get(self, key):
         """Get a value from the cache if it exists and is not expired"""
         if key in self.cache:
             value, timestamp = self.cache[key]
             if time.time() - timestamp < self.ttl_seconds:
+                record_cache("memory", self.name, True)
                 return value
             else:
                 # Remove expired item
                 del self.cache[key]
+        record_cache("memory", self.name, False)
         return None
         
     def set(self, key, value):
@@ -59,15 +65,15 @@ class SimpleCache:
 
 # Create global cache instances with different TTLs
 # Performance metrics cache - 30 seconds TTL
-performance_cache = SimpleCache(ttl_seconds=30)
+performance_cache = SimpleCache(ttl_seconds=30, name="performance")
 # Block production cache - 60 seconds TTL
-block_production_cache = SimpleCache(ttl_seconds=60)
+block_production_cache = SimpleCache(ttl_seconds=60, name="block_production")
 # Network status cache - 15 seconds TTL
-network_status_cache = SimpleCache(ttl_seconds=15)
+network_status_cache = SimpleCache(ttl_seconds=15, name="network_status")
 # RPC nodes cache - 2 minutes TTL
-rpc_nodes_cache = SimpleCache(ttl_seconds=120)
+rpc_nodes_cache = SimpleCache(ttl_seconds=120, name="rpc_nodes")
 # Mint analytics cache - 60 seconds TTL
-mint_analytics_cache = SimpleCache(ttl_seconds=60)
+mint_analytics_cache = SimpleCache(ttl_seconds=60, name="mint_analytics")
 
 class SolanaConnectionPool:
     """Pool of Solana RPC connections with fallback support"""
@@ -104,11 +110,17 @@ class SolanaConnectionPool:
             ]
             self.rpc_endpoints.extend(top_performing_endpoints)
         
-        # Initialize client dictionary and tracking variables
+        # Initialize client dictionary and tracking variables; clients and endpoint
+        # stats are shared with every other pool through the RPC transport
         self.clients: Dict[str, AsyncClient] = {}
-        self.endpoint_stats: Dict[str, Dict[str, Any]] = {}
         self.current_endpoint = 0
         self._initialized = False
+        self._transport = get_rpc_transport()
+    
+    @property
+    def endpoint_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of every endpoint in the shared registry, by URL."""
+        return {url: state.to_dict() for url, state in self._transport.endpoints.items()}
         
     async def initialize(self, endpoints=None):
         """Initialize connections to all endpoints"""
@@ -151,39 +163,27 @@ class SolanaConnectionPool:
             url = endpoint["url"]
             name = endpoint["name"]
 
-            # Skip if endpoint has failed too many times
-            if url in self.endpoint_stats and self.endpoint_stats[url]["failure_count"] > 3:
+            # Skip if endpoint is cooling down after repeated failures or rate limiting
+            if not self._transport.is_available(url):
                 logger.warning(f"Skipping {name} due to repeated failures")
                 continue
 
-            # Initialize stats
-            self.endpoint_stats[url] = {
-                "success_count": 0,
-                "failure_count": 0,
-                "avg_latency": 0,
-                "last_latency": 0,
-                "last_success": None
-            }
-
             for attempt in range(3):  # Retry up to 3 times
                 try:
-                    client = AsyncClient(url, timeout=10.0)  # Increased timeout
+                    client = self._transport.async_client(url, timeout=10.0)  # Increased timeout
                     # Test connection with timeout
                     start_time = time.time()
                     await asyncio.wait_for(client.get_version(), timeout=10.0)  # Increased timeout
                     latency = time.time() - start_time
 
                     self.clients[url] = client
-                    self.endpoint_stats[url]["avg_latency"] = latency
-                    self.endpoint_stats[url]["last_latency"] = latency
-                    self.endpoint_stats[url]["success_count"] = 1
-                    self.endpoint_stats[url]["last_success"] = time.time()
+                    self._transport.record(url, True, latency)
 
                     logger.info(f"Successfully connected to {name} (latency: {latency:.3f}s)")
                     break
                 except Exception as e:
                     logger.error(f"Attempt {attempt + 1} failed to connect to {name}: {str(e)}")
-                    self.endpoint_stats[url]["failure_count"] += 1
+                    self._transport.record(url, False)
                     if attempt == 2:  # Last attempt failed
                         logger.error(f"Failed to connect to {name} after 3 attempts")
                     await asyncio.sleep(1)  # Wait before retry
@@ -256,17 +256,10 @@ class SolanaConnectionPool:
             endpoint = self.rpc_endpoints[i]
             url = endpoint["url"]
             
-            # Skip endpoints with too many failures (more than 3 consecutive failures)
-            if url in self.endpoint_stats and self.endpoint_stats[url]["failure_count"] > 3:
-                # But don't skip if it's been more than 5 minutes since the last failure
-                import time
-                if self.endpoint_stats[url].get("last_success") is None or \
-                   time.time() - self.endpoint_stats[url].get("last_success", 0) > 300:
-                    # Reset failure count to give it another chance
-                    self.endpoint_stats[url]["failure_count"] = 0
-                else:
-                    logger.debug(f"Skipping endpoint {endpoint['name']} due to too many failures")
-                    continue
+            # Skip endpoints cooling down after repeated failures or rate limiting, in any pool
+            if not self._transport.is_available(url):
+                logger.debug(f"Skipping endpoint {endpoint['name']} due to too many failures")
+                continue
             
             # Use existing client if available
             if url in self.clients:
@@ -276,37 +269,16 @@ class SolanaConnectionPool:
             # Try to create a new client if not available
             try:
                 logger.debug(f"Creating new client for {endpoint['name']}")
-                client = AsyncClient(url)
+                client = self._transport.async_client(url)
                 
                 # Test connection and measure latency
-                import time
                 start_time = time.time()
                 await client.get_version()
                 latency = time.time() - start_time
                 
                 # Store client and update stats
                 self.clients[url] = client
-                
-                # Update stats
-                if url not in self.endpoint_stats:
-                    self.endpoint_stats[url] = {
-                        "success_count": 0,
-                        "failure_count": 0,
-                        "avg_latency": 0,
-                        "last_latency": 0,
-                        "last_success": None
-                    }
-                
-                stats = self.endpoint_stats[url]
-                stats["success_count"] += 1
-                stats["last_success"] = time.time()
-                stats["last_latency"] = latency
-                
-                # Update average latency with exponential moving average
-                if stats["avg_latency"] == 0:
-                    stats["avg_latency"] = latency
-                else:
-                    stats["avg_latency"] = 0.7 * stats["avg_latency"] + 0.3 * latency
+                self._transport.record(url, True, latency)
                 
                 self.current_endpoint = i
                 return client
@@ -314,20 +286,13 @@ class SolanaConnectionPool:
                 logger.warning(f"Failed to connect to {endpoint['name']}: {str(e)}")
                 
                 # Update failure stats
-                if url in self.endpoint_stats:
-                    self.endpoint_stats[url]["failure_count"] += 1
+                self._transport.record(url, False)
                 
         # If we get here, all endpoints failed
         raise ConnectionError("Failed to connect to any RPC endpoint")
         
     async def close(self):
-        """Close all connections"""
-        for client in self.clients.values():
-            try:
-                await client.close()
-            except Exception as e:
-                logger.error(f"Error closing client: {str(e)}")
-                
+        """Release this pool's clients; the shared transport keeps their connections for other pools"""
         self.clients = {}
         self._initialized = False
         
@@ -340,28 +305,14 @@ class SolanaConnectionPool:
                 endpoint_url = url
                 break
                 
-        if not endpoint_url or endpoint_url not in self.endpoint_stats:
+        if not endpoint_url:
             return
             
-        stats = self.endpoint_stats[endpoint_url]
-        
-        if success:
-            stats["success_count"] += 1
-            import time
-            stats["last_success"] = time.time()
-            
-            if latency is not None:
-                stats["last_latency"] = latency
-                # Update average latency with exponential moving average
-                if stats["avg_latency"] == 0:
-                    stats["avg_latency"] = latency
-                else:
-                    stats["avg_latency"] = 0.7 * stats["avg_latency"] + 0.3 * latency
-        else:
-            stats["failure_count"] += 1
+        state = self._transport.endpoint(endpoint_url)
+        state.record(success, latency if success else None)
             
         # Re-sort endpoints periodically based on performance
-        if (stats["success_count"] + stats["failure_count"]) % 10 == 0:
+        if state.total_requests % 10 == 0:
             self._sort_endpoints_by_performance()
             
     class ClientContextManager:
@@ -426,7 +377,7 @@ class SolanaConnectionPool:
             
             # If we don't have a client for this endpoint, create one
             logger.info(f"Creating new client for specific endpoint {target_endpoint}")
-            client = AsyncClient(target_endpoint)
+            client = self._transport.async_client(target_endpoint)
             self.clients[target_endpoint] = client
             return client
             
@@ -86,6 +86,10 @@ class NoClientsAvailableError(RPCError):
     """Raised when no clients are available in the connection pool."""
     pass
 
+class ResponseTooLargeError(RPCError):
+    """Raised when an RPC response exceeds the configured maximum size."""
+    pass
+
 # Public exports
 __all__ = [
     'SolanaError',
@@ -108,5 +112,6 @@ __all__ = [
     'MethodNotSupportedError',
     'SimulationError',
     'BlockNotAvailableError',
-    'NoClientsAvailableError'
+    'NoClientsAvailableError',
+    'ResponseTooLargeError',
 ]
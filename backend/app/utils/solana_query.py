@@ -3,9 +3,10 @@ Solana query module for handling blockchain data queries.
 This module provides query handlers and utilities for fetching and processing Solana blockchain data.
 """
 
-from typing import Optional, Dict, Any, List, Union, TYPE_CHECKING
+from typing import Optional, Dict, Any, Iterable, List, Union, TYPE_CHECKING
 import asyncio
 import logging
+import time
 from dataclasses import dataclass
 import datetime
 import pytz
@@ -32,6 +33,14 @@ import httpx
 
 from ..utils.cache import DatabaseCache
 from .solana_rpc import SolanaConnectionPool, get_connection_pool, SolanaClient
+from .metrics import record_rpc_retry
+from .block_requirements import normalize_block, plan_block_request, required_fields
+from .block_workers import BlockWorkerPool, block_request_for, get_block_workers
+from .block_prefetch import BlockPrefetcher
+from .address_index import get_address_index
+from .slot_map import get_slot_map
+from .handlers.address_extractor import AddressExtractor
+from app.config import BLOCK_WORKER_CONFIG
 from .solana_helpers import (
     transform_transaction_data,
     get_block_options,
@@ -66,7 +75,7 @@ logger = logging.getLogger(__name__)
 class SolanaQueryHandler:
     """Handles Solana blockchain queries with connection pooling and error handling."""
     
-    def __init__(self, cache: DatabaseCache):
+    def __init__(self, cache: Optional[DatabaseCache] = None):
         """
         Initialize the query handler.
         
@@ -154,11 +163,13 @@ class SolanaQueryHandler:
             except RateLimitError as e:
                 delay = base_delay * (2 ** attempt)  # Exponential backoff
                 logger.warning(f"Rate limit hit, backing off for {delay}s...")
+                record_rpc_retry(getattr(func, "__name__", "unknown"))
                 await asyncio.sleep(delay)
                 last_error = e
             except RetryableError as e:
                 delay = base_delay * (2 ** attempt)
                 logger.warning(f"Retryable error: {str(e)}, backing off for {delay}s...")
+                record_rpc_retry(getattr(func, "__name__", "unknown"))
                 await asyncio.sleep(delay)
                 last_error = e
             except Exception as e:
@@ -168,12 +179,23 @@ class SolanaQueryHandler:
 
         raise last_error or Exception("Max retries exceeded")
 
-    async def get_block(self, slot: int, **kwargs) -> Optional[Dict[str, Any]]:
+    async def get_block(
+        self,
+        slot: int,
+        fields: Optional[Iterable[str]] = None,
+        step_over_skipped: bool = True,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
         """
         Get block information with retries and error handling.
         
         Args:
             slot: Block slot number
+            fields: Block fields the caller reads; when given, the cheapest
+                encoding and transactionDetails level covering them is requested
+                and the block is normalized to the json full-details layout
+            step_over_skipped: Return the next block when the slot was skipped;
+                if False, SlotSkippedError is raised instead
             **kwargs: Additional parameters for getBlock
             
         Returns:
@@ -181,6 +203,7 @@ class SolanaQueryHandler:
             
         Raises:
             MissingBlocksError: If too many consecutive slots are skipped
+            SlotSkippedError: If the slot was skipped and step_over_skipped is False
             RPCError: For other RPC errors
         """
         # Import here to avoid circular imports
@@ -194,17 +217,33 @@ class SolanaQueryHandler:
         # Track skipped slots
         skipped_slots = 0
         max_skipped_slots = 10
+        slot_map = get_slot_map()
         
         # Try to get the block with retries
         while True:
+            if skipped_slots >= max_skipped_slots:
+                logger.error(f"Too many consecutive skipped slots starting from {slot-skipped_slots}")
+                raise MissingBlocksError(f"Too many consecutive skipped slots starting from {slot-skipped_slots}")
+            
+            # Step over slots already known to be skipped without a request
+            if slot_map is not None and slot_map.is_skipped(slot):
+                if not step_over_skipped:
+                    raise SlotSkippedError(f"Slot skipped: {slot}")
+                slot += 1
+                skipped_slots += 1
+                continue
+            
             try:
                 # Prepare options
-                options = {
-                    "encoding": "jsonParsed",
-                    "transactionDetails": "full",
-                    "rewards": False,
-                    "maxSupportedTransactionVersion": 0
-                }
+                if fields is not None:
+                    options = plan_block_request(fields).rpc_options()
+                else:
+                    options = {
+                        "encoding": "jsonParsed",
+                        "transactionDetails": "full",
+                        "rewards": False,
+                        "maxSupportedTransactionVersion": 0
+                    }
                 
                 # Update with any provided kwargs
                 if kwargs:
@@ -239,14 +278,28 @@ class SolanaQueryHandler:
                 if not block_data or not isinstance(block_data, dict):
                     logger.warning(f"Invalid block data format for block {slot}")
                     return None
+                if fields is not None:
+                    block_data = normalize_block(block_data)
                     
                 num_txns = len(block_data.get("transactions", []))
                 logger.info(f"Got block {slot} with {num_txns} transactions")
                 
+                # Record the block in the local address index when it carries what the index needs;
+                # the extractor walks every transaction, so it runs off the event loop
+                address_index = get_address_index()
+                if (
+                    address_index is not None
+                    and options.get("transactionDetails") in ("full", "accounts")
+                    and (fields is None or AddressExtractor.REQUIRED_FIELDS <= set(fields))
+                ):
+                    await asyncio.to_thread(address_index.index_block, {**block_data, "slot": slot})
+                
                 return block_data
                 
             except RetryableError as e:
                 if "Slot skipped" in str(e):
+                    if not step_over_skipped:
+                        raise
                     # Try next slot if current one is skipped
                     slot += 1
                     skipped_slots += 1
@@ -256,6 +309,7 @@ class SolanaQueryHandler:
                 retries += 1
                 if retries < max_retries:
                     logger.warning(f"Retryable error for block {slot}, attempt {retries}/{max_retries}: {str(e)}")
+                    record_rpc_retry("getBlock")
                     await asyncio.sleep(backoff_time)
                     backoff_time = min(backoff_time * 2, 60)  # Cap backoff at 60 seconds
                     continue
@@ -266,17 +320,16 @@ class SolanaQueryHandler:
             except Exception as e:
                 logger.error(f"Non-retryable error getting block {slot}: {str(e)}")
                 raise
-        
-        if skipped_slots >= max_skipped_slots:
-            logger.error(f"Too many consecutive skipped slots starting from {slot-skipped_slots}")
-            raise MissingBlocksError(f"Too many consecutive skipped slots starting from {slot-skipped_slots}")
-            
-        return None
 
-    async def process_block(self, slot: int) -> Optional[Dict[str, Any]]:
+    async def process_block(
+        self,
+        slot: int,
+        fields: Optional[Iterable[str]] = None,
+        step_over_skipped: bool = True
+    ) -> Optional[Dict[str, Any]]:
         """Process a single block with error handling."""
         try:
-            block = await self.get_block(slot)
+            block = await self.get_block(slot, fields=fields, step_over_skipped=step_over_skipped)
             if not block or not isinstance(block, dict):
                 logger.warning(f"No valid block data for slot {slot}")
                 return None
@@ -297,13 +350,120 @@ class SolanaQueryHandler:
             logger.error(f"Error processing block {slot}: {str(e)}")
             raise
 
+    @staticmethod
+    def _handler_fields(handlers: Optional[List[Any]]) -> Optional[set]:
+        """Block fields read by the handlers, or None (the full block) unless every handler declares them."""
+        if not handlers or any(getattr(handler, "REQUIRED_FIELDS", None) is None for handler in handlers):
+            return None
+        fields = set()
+        for handler in handlers:
+            fields |= required_fields(handler)
+        return fields
+
+    @staticmethod
+    def _add_block_result(stats: Dict[str, Any], results: List[Dict[str, Any]], slot: int, result: Any) -> None:
+        """
+        Count a fetched block, or the error fetching it, into batch statistics.
+        
+        Args:
+            stats: Statistics to update
+            results: Blocks collected so far; the block is appended if there is one
+            slot: Slot of the block
+            result: Block from process_block, None, or the exception it raised
+        """
+        if isinstance(result, Exception):
+            logger.error(f"Error processing block {slot}: {str(result)}")
+            stats["error_blocks"] += 1
+            stats["errors"].append(str(result))
+            return
+        
+        if not result:
+            logger.debug(f"No result for slot {slot}")
+            stats["empty_blocks"] += 1
+            return
+            
+        # Update statistics
+        stats["processed_blocks"] += 1
+        if result.get("empty", True):
+            stats["empty_blocks"] += 1
+            logger.debug(f"Empty block at slot {slot}")
+        if not result.get("success", False):
+            stats["error_blocks"] += 1
+            if result.get("error"):
+                stats["errors"].append(result["error"])
+                logger.warning(f"Error in block {slot}: {result['error']}")
+                
+        # Track transactions and instructions
+        num_txns = len(result.get("transactions", []))
+        num_instructions = sum(len(tx.get("message", {}).get("instructions", [])) 
+                            for tx in result.get("transactions", []))
+        
+        stats["total_transactions"] += num_txns
+        stats["total_instructions"] += num_instructions
+        logger.debug(f"Processed block {slot}: {num_txns} txns, {num_instructions} instructions")
+        
+        results.append(result)
+
+    async def get_confirmed_slots(self, start_slot: int, end_slot: int, commitment: str = DEFAULT_COMMITMENT) -> List[int]:
+        """
+        Get the slots of a range that hold a block, leaving out skipped slots.
+        
+        Args:
+            start_slot: Lowest slot (inclusive)
+            end_slot: Highest slot (inclusive)
+            commitment: Commitment level
+            
+        Returns:
+            Slots with a block, ascending
+        """
+        async with await self.connection_pool.acquire() as client:
+            return await client.get_blocks(start_slot, end_slot, commitment)
+
+    def prefetch_blocks(
+        self,
+        start_slot: int,
+        end_slot: int,
+        commitment: str = DEFAULT_COMMITMENT,
+        fields: Optional[Iterable[str]] = None,
+        descending: bool = False,
+        read_ahead: Optional[int] = None
+    ) -> BlockPrefetcher:
+        """
+        Iterate over the blocks of a slot range with read-ahead.
+        
+        Only slots listed by getBlocks are fetched (every slot when listing
+        fails), and the next blocks are fetched while the caller processes
+        the current one (see block_prefetch). Each block is fetched for its
+        own slot only, so a skipped slot is dropped rather than answered
+        with the block after it.
+        
+        Args:
+            start_slot: Lowest slot (inclusive)
+            end_slot: Highest slot (inclusive)
+            commitment: Commitment level for listing the slots
+            fields: Block fields the caller reads (see get_block)
+            descending: Yield the newest block first
+            read_ahead: Blocks fetched ahead, defaults to BLOCK_PREFETCH_CONFIG
+            
+        Returns:
+            Async iterable of (slot, block or exception) pairs
+        """
+        return BlockPrefetcher(
+            lambda low, high: self.get_confirmed_slots(low, high, commitment),
+            lambda slot: self.process_block(slot, fields, step_over_skipped=False),
+            start_slot,
+            end_slot,
+            descending=descending,
+            read_ahead=read_ahead
+        )
+
     async def process_blocks_batch(
         self,
         slots: List[int],
         commitment: str = DEFAULT_COMMITMENT,
         handlers: Optional[List[Any]] = None
     ) -> Dict[str, Any]:
-        """Process a batch of blocks with enhanced error handling and rate limiting."""
+        """Process a batch of blocks concurrently with enhanced error handling."""
         results = []
         stats = {
             "total_blocks": len(slots),
@@ -319,47 +479,20 @@ class SolanaQueryHandler:
         start_time = datetime.datetime.now(pytz.utc)
         logger.info(f"Starting batch processing for {len(slots)} slots")
         
+        fields = self._handler_fields(handlers)
+        
         try:
-            # Process blocks with delay between each to respect rate limits
-            for slot in slots:
-                try:
-                    logger.debug(f"Processing slot {slot}")
-                    # Process block
-                    result = await self.process_block(slot)
-                    if not result:
-                        logger.debug(f"No result for slot {slot}")
-                        stats["empty_blocks"] += 1
-                        continue
-                        
-                    # Update statistics
-                    stats["processed_blocks"] += 1
-                    if result.get("empty", True):
-                        stats["empty_blocks"] += 1
-                        logger.debug(f"Empty block at slot {slot}")
-                    if not result.get("success", False):
-                        stats["error_blocks"] += 1
-                        if result.get("error"):
-                            stats["errors"].append(result["error"])
-                            logger.warning(f"Error in block {slot}: {result['error']}")
-                            
-                    # Track transactions and instructions
-                    num_txns = len(result.get("transactions", []))
-                    num_instructions = sum(len(tx.get("message", {}).get("instructions", [])) 
-                                        for tx in result.get("transactions", []))
-                    
-                    stats["total_transactions"] += num_txns
-                    stats["total_instructions"] += num_instructions
-                    logger.debug(f"Processed block {slot}: {num_txns} txns, {num_instructions} instructions")
-                    
-                    results.append(result)
-                    
-                    # Add delay between blocks
-                    await asyncio.sleep(0.2)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing block {slot}: {str(e)}")
-                    stats["error_blocks"] += 1
-                    stats["errors"].append(str(e))
+            # The semaphore bounds the blocks fetched and decoded at once; within it,
+            # each endpoint's adaptive concurrency window paces the requests
+            fetch_semaphore = asyncio.Semaphore(BLOCK_WORKER_CONFIG['fetch_concurrency'])
+            
+            async def fetch(slot: int) -> Optional[Dict[str, Any]]:
+                async with fetch_semaphore:
+                    return await self.process_block(slot, fields)
+            
+            outcomes = await asyncio.gather(*(fetch(slot) for slot in slots), return_exceptions=True)
+            for slot, result in zip(slots, outcomes):
+                self._add_block_result(stats, results, slot, result)
                     
             # Calculate total processing time
             stats["processing_time_ms"] = int((datetime.datetime.now(pytz.utc) - start_time).total_seconds() * 1000)
@@ -390,10 +523,25 @@ class SolanaQueryHandler:
         start_slot: Optional[int] = None,
         end_slot: Optional[int] = None,
         commitment: str = DEFAULT_COMMITMENT,
-        batch_size: int = 10,
-        handlers: Optional[List[Any]] = None
+        batch_size: Optional[int] = None,
+        handlers: Optional[List[Any]] = None,
+        extractors: Optional[List[str]] = None
     ) -> Dict[str, Any]:
-        """Process multiple blocks in parallel with batching."""
+        """
+        Process multiple blocks, newest first, with read-ahead.
+        
+        Skipped slots are left out using getBlocks, and up to ``batch_size``
+        blocks (default: BLOCK_PREFETCH_CONFIG['read_ahead']) are fetched ahead
+        of the one being processed; see ``prefetch_blocks``.
+        
+        When ``extractors`` is given the blocks are handed to the block worker
+        tier instead (see ``extract_blocks``) and compact extractor results are
+        returned in place of full blocks.
+        """
+        if extractors:
+            return await self.extract_blocks(
+                extractors, num_blocks=num_blocks, start_slot=start_slot, end_slot=end_slot, commitment=commitment
+            )
         try:
             # Ensure initialized
             await self.ensure_initialized()
@@ -434,36 +582,16 @@ class SolanaQueryHandler:
             
             start_time = datetime.datetime.now(pytz.utc)
             
-            # Process slots in batches
-            current_slot = start_slot
-            while current_slot >= end_slot:
-                batch_end = max(end_slot, current_slot - batch_size + 1)
-                batch_slots = list(range(current_slot, batch_end - 1, -1))
-                logger.info(f"Processing batch of {len(batch_slots)} slots from {current_slot} to {batch_end}")
-                
-                # Process batch
-                batch_result = await self.process_blocks_batch(
-                    slots=batch_slots,
-                    commitment=commitment,
-                    handlers=handlers
-                )
-                
-                if batch_result.get("success"):
-                    blocks.extend(batch_result["results"])
-                    stats["processed_blocks"] += batch_result["statistics"]["processed_blocks"]
-                    stats["empty_blocks"] += batch_result["statistics"]["empty_blocks"]
-                    stats["error_blocks"] += batch_result["statistics"]["error_blocks"]
-                    stats["total_transactions"] += batch_result["statistics"]["total_transactions"]
-                    stats["total_instructions"] += batch_result["statistics"]["total_instructions"]
-                    stats["errors"].extend(batch_result["statistics"]["errors"])
-                    logger.info(f"Successfully processed batch. Total blocks: {len(blocks)}")
-                else:
-                    stats["error_blocks"] += len(batch_slots)
-                    if batch_result.get("error"):
-                        stats["errors"].append(batch_result["error"])
-                        logger.error(f"Error processing batch: {batch_result['error']}")
-                
-                current_slot = batch_end - 1
+            fields = self._handler_fields(handlers)
+            
+            # Newest first; skipped slots are never requested and the next blocks are fetched ahead
+            prefetcher = self.prefetch_blocks(
+                end_slot, start_slot, commitment=commitment, fields=fields, descending=True, read_ahead=batch_size
+            )
+            async for slot, result in prefetcher:
+                self._add_block_result(stats, blocks, slot, result)
+            stats["prefetch"] = prefetcher.get_stats()
+            stats["skipped_slots"] = stats["prefetch"]["skipped_slots"]
                 
             # Calculate total processing time
             stats["processing_time_ms"] = int((datetime.datetime.now(pytz.utc) - start_time).total_seconds() * 1000)
@@ -483,6 +611,121 @@ class SolanaQueryHandler:
                 "error": str(e)
             }
 
+    async def extract_blocks(
+        self,
+        extractors: List[str],
+        num_blocks: int = 10,
+        start_slot: Optional[int] = None,
+        end_slot: Optional[int] = None,
+        commitment: str = DEFAULT_COMMITMENT,
+        workers: Optional[BlockWorkerPool] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch blocks as raw bytes and run extractors on them in the block worker processes.
+        
+        Fetches run concurrently up to the configured limit and each block is
+        handed to the workers as soon as it arrives; the worker pool's bounded
+        queue slows fetching down when extraction falls behind.
+        
+        Args:
+            extractors: Names of extractors from block_workers.EXTRACTORS
+            num_blocks: Number of blocks to process when end_slot is not given
+            start_slot: Highest slot to process, defaults to the current slot
+            end_slot: Lowest slot to process
+            commitment: Commitment level
+            workers: Worker pool, defaults to the shared pool (inline if disabled)
+            
+        Returns:
+            Dict with success flag, per-block extraction results (newest first) and statistics
+        """
+        try:
+            await self.ensure_initialized()
+            workers = workers or get_block_workers() or BlockWorkerPool(max_workers=0)
+            
+            if start_slot is None:
+                client = await self.connection_pool.get_client()
+                start_slot = await client.get_slot(commitment=commitment)
+                if not isinstance(start_slot, int):
+                    raise RPCError("Failed to get current slot")
+            if end_slot is None:
+                end_slot = max(0, start_slot - num_blocks + 1)
+            if start_slot < 0 or end_slot < 0 or start_slot < end_slot:
+                raise ValueError("Invalid slot range")
+            
+            stats = {
+                "total_blocks": start_slot - end_slot + 1,
+                "processed_blocks": 0,
+                "empty_blocks": 0,
+                "error_blocks": 0,
+                "total_transactions": 0,
+                "processing_time_ms": 0,
+                "errors": []
+            }
+            started = time.perf_counter()
+            fetch_semaphore = asyncio.Semaphore(BLOCK_WORKER_CONFIG['fetch_concurrency'])
+            request = block_request_for(extractors)
+            options = request.rpc_options(commitment)
+            # Blocks fetched with account keys also feed the local address index, at no extra request cost
+            address_index = get_address_index()
+            if address_index is None or "addresses" in extractors or request.transaction_details not in ("full", "accounts"):
+                address_index = None
+            names = tuple(extractors) + (("addresses",) if address_index is not None else ())
+            
+            async def fetch_and_extract(slot: int) -> Dict[str, Any]:
+                async with fetch_semaphore:
+                    for attempt in range(3):
+                        try:
+                            async with await self.connection_pool.acquire() as client:
+                                raw = await client.get_block(slot, dict(options), raw=True)
+                            break
+                        except SlotSkippedError:
+                            raise
+                        except RetryableError:
+                            if attempt == 2:
+                                raise
+                            record_rpc_retry("getBlock")
+                            await asyncio.sleep(0.5 * 2 ** attempt)
+                extracted = await workers.extract(raw, names, slot)
+                if address_index is not None:
+                    address_index.add_extracted(extracted.get("results", {}).pop("addresses", None))
+                return extracted
+            
+            slots = list(range(start_slot, end_slot - 1, -1))
+            results = await asyncio.gather(*(fetch_and_extract(slot) for slot in slots), return_exceptions=True)
+            
+            blocks = []
+            for slot, result in zip(slots, results):
+                if isinstance(result, SlotSkippedError):
+                    stats["empty_blocks"] += 1
+                elif isinstance(result, Exception):
+                    stats["error_blocks"] += 1
+                    stats["errors"].append(f"Block {slot}: {str(result)}")
+                elif result.get("error"):
+                    stats["error_blocks"] += 1
+                    stats["errors"].append(f"Block {slot}: {result['error']}")
+                else:
+                    stats["processed_blocks"] += 1
+                    stats["total_transactions"] += result["transactions"]
+                    blocks.append(result)
+            
+            stats["processing_time_ms"] = int((time.perf_counter() - started) * 1000)
+            logger.info(
+                f"Extracted {stats['processed_blocks']}/{stats['total_blocks']} blocks "
+                f"with {extractors} in {stats['processing_time_ms']}ms"
+            )
+            return {
+                "success": True,
+                "blocks": blocks,
+                "statistics": stats
+            }
+            
+        except Exception as e:
+            logger.error(f"Error in extract_blocks: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+
     async def analyze_blocks(
         self,
         start_slot: int,
@@ -491,7 +734,7 @@ class SolanaQueryHandler:
         batch_size: int = 10,
         handlers: Optional[List[Any]] = None
     ) -> List[Dict[str, Any]]:
-        """Analyze multiple blocks in parallel with batching."""
+        """Analyze the blocks of a slot range in slot order, fetching up to batch_size blocks ahead."""
         try:
             logger.info(f"Analyzing blocks from {start_slot} to {end_slot}")
             
@@ -499,17 +742,17 @@ class SolanaQueryHandler:
             if start_slot > end_slot:
                 raise ValueError("Start slot must be less than or equal to end slot")
             
-            # Create batches
-            batches = [list(range(start_slot, end_slot + 1)[i:i + batch_size]) for i in range(0, end_slot - start_slot + 1, batch_size)]
+            fields = self._handler_fields(handlers)
             
+            # Request pacing is left to the endpoints' adaptive concurrency windows
             results = []
-            for batch in batches:
-                # Add delay between batches to help with rate limiting
-                if results:  # Don't delay before first batch
-                    await asyncio.sleep(2.0)  # 2 second delay between batches
-                
-                batch_results = await self.process_blocks_batch(batch, commitment, handlers)
-                results.extend(batch_results)
+            async for slot, result in self.prefetch_blocks(
+                start_slot, end_slot, commitment=commitment, fields=fields, read_ahead=batch_size
+            ):
+                if isinstance(result, Exception):
+                    logger.error(f"Error processing block {slot}: {str(result)}")
+                elif result:
+                    results.append(result)
             
             return results
             
@@ -583,12 +826,8 @@ class SolanaQueryHandler:
             if isinstance(address, Pubkey):
                 address = str(address)
                 
-            # Build params
+            # Build params (getSignaturesForAddress has no slot bounds; they are applied below)
             params = {"limit": limit}
-            if start_slot is not None:
-                params["minSlot"] = start_slot
-            if end_slot is not None:
-                params["maxSlot"] = end_slot
             if before:
                 params["before"] = before
             if until:
@@ -601,6 +840,12 @@ class SolanaQueryHandler:
             if not response:
                 logger.info(f"No signatures found for address {address}")
                 return []
+            if start_slot is not None or end_slot is not None:
+                response = [
+                    sig for sig in response
+                    if (start_slot is None or sig.get("slot", 0) >= start_slot)
+                    and (end_slot is None or sig.get("slot", 0) <= end_slot)
+                ]
                 
             logger.debug(f"Found {len(response)} signatures for address {address}")
             return response
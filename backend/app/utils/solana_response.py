@@ -39,6 +39,7 @@ from .handlers.token_handler import TokenHandler
 from .handlers.program_handler import ProgramHandler
 from .handlers.mint_response_handler import MintResponseHandler
 from .response_base import ResponseHandler, SolanaResponseManager
+from .block_prefetch import BlockPrefetcher
 
 logger = logging.getLogger(__name__)
 
@@ -643,64 +644,6 @@ class SolanaQueryHandler:
             self.stats.record_error(type(e).__name__)
             return None
 
-    async def get_multiple_blocks(
-        self,
-        start_slot: int,
-        end_slot: int,
-        commitment: str = "finalized",
-        max_supported_transaction_version: int = 0,
-        batch_size: int = 10
-    ) -> List[Dict[str, Any]]:
-        """Get multiple blocks in parallel with batching."""
-        try:
-            logger.info(f"Getting blocks from {start_slot} to {end_slot}")
-            
-            # Validate slot range
-            if start_slot > end_slot:
-                raise ValueError("Start slot must be less than or equal to end slot")
-            
-            # Create batches
-            slots = range(start_slot, end_slot + 1)
-            batches = [slots[i:i + batch_size] for i in range(0, len(slots), batch_size)]
-            
-            results = []
-            for batch in batches:
-                # Process batch in parallel
-                tasks = [
-                    self.get_block_data(
-                        slot,
-                        commitment=commitment,
-                        max_supported_transaction_version=max_supported_transaction_version
-                    )
-                    for slot in batch
-                ]
-                
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Handle results
-                for slot, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Failed to get block {slot}: {str(result)}")
-                        results.append({
-                            "slot": slot,
-                            "success": False,
-                            "error": str(result)
-                        })
-                    else:
-                        results.append({
-                            "slot": slot,
-                            "success": True,
-                            "result": result
-                        })
-                
-            return results
-            
-        except Exception as e:
-            logger.error(f"Error getting multiple blocks: {str(e)}")
-            self.stats.increment_failure()
-            self.stats.record_error(type(e).__name__)
-            raise
-
     async def _execute_with_retry(
         self,
         request: Dict[str, Any],
@@ -780,49 +723,38 @@ class SolanaQueryHandler:
         end_slot: int,
         commitment: str = "finalized",
         max_supported_transaction_version: int = 0,
-        batch_size: int = 10
+        batch_size: Optional[int] = None
     ) -> List[Dict[str, Any]]:
-        """Get multiple blocks in parallel with batching."""
+        """
+        Get the blocks of a slot range in slot order.
+        
+        Skipped slots are left out using getBlocks, and up to ``batch_size``
+        blocks are fetched ahead of the one being collected (see block_prefetch).
+        """
         try:
             logger.info(f"Getting blocks from {start_slot} to {end_slot}")
             
-            # Validate slot range
-            if start_slot > end_slot:
-                raise ValueError("Start slot must be less than or equal to end slot")
-            
-            # Create batches
-            slots = range(start_slot, end_slot + 1)
-            batches = [slots[i:i + batch_size] for i in range(0, len(slots), batch_size)]
+            async def get_slots(low: int, high: int) -> List[int]:
+                client = await self.connection_pool.get_client()
+                return await client.get_blocks(low, high, commitment)
             
             results = []
-            for batch in batches:
-                # Process batch in parallel
-                tasks = [
-                    self.get_block_data(
-                        slot,
-                        commitment=commitment,
-                        max_supported_transaction_version=max_supported_transaction_version
-                    )
-                    for slot in batch
-                ]
-                
-                batch_results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                # Handle results
-                for slot, result in zip(batch, batch_results):
-                    if isinstance(result, Exception):
-                        logger.error(f"Failed to get block {slot}: {str(result)}")
-                        results.append({
-                            "slot": slot,
-                            "success": False,
-                            "error": str(result)
-                        })
-                    else:
-                        results.append({
-                            "slot": slot,
-                            "success": True,
-                            "result": result
-                        })
+            async for slot, result in BlockPrefetcher(
+                get_slots, self.get_block_data, start_slot, end_slot, read_ahead=batch_size
+            ):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to get block {slot}: {str(result)}")
+                    results.append({
+                        "slot": slot,
+                        "success": False,
+                        "error": str(result)
+                    })
+                else:
+                    results.append({
+                        "slot": slot,
+                        "success": True,
+                        "result": result
+                    })
                 
             return results
             
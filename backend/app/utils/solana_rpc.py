@@ -2,12 +2,15 @@
 Solana RPC client for interacting with the Solana blockchain.
 """
 import asyncio
+import inspect
 import json
 import logging
 import random
+import re
 import time
-from typing import Any, Dict, List, Optional, Set, Tuple, Union
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
 import uuid
+from collections import deque
 
 import aiohttp
 from solders.pubkey import Pubkey
@@ -15,9 +18,15 @@ from solders.pubkey import Pubkey
 from .solana_rate_limiter import SolanaRateLimiter
 from .solana_types import EndpointConfig
 from .solana_rpc_constants import DEFAULT_RPC_ENDPOINTS
-from .solana_error import RetryableError, MethodNotSupportedError, RateLimitError, SlotSkippedError, NodeBehindError, NodeUnhealthyError, RPCError, NoClientsAvailableError
+from .solana_error import RetryableError, MethodNotSupportedError, RateLimitError, SlotSkippedError, NodeBehindError, NodeUnhealthyError, RPCError, NoClientsAvailableError, ResponseTooLargeError, TimeoutError as RPCTimeoutError
 from .solana_ssl_config import should_bypass_ssl_verification
-from app.config import HELIUS_API_KEY
+from .metrics import observe_rpc, record_rpc_error, record_rpc_retry
+from .json_stream import ArrayStreamDecoder
+from .rpc_transport import get_rpc_transport
+from .endpoint_scores import get_endpoint_score_store
+from .slot_map import get_slot_map
+from .serialization import loads
+from app.config import HELIUS_API_KEY, RPC_STREAM_CONFIG, RPC_TRANSPORT_CONFIG, RPC_WARM_START_CONFIG
 
 logger = logging.getLogger(__name__)
 
@@ -127,15 +136,24 @@ class SolanaClient:
         self.retry_delay = retry_delay
         self.ssl_verify = ssl_verify
         self._client = None
-        self._connector = None
         self._closed = True  # Initialize as closed
-        self._latencies: List[float] = []
         self._max_latencies = 100
+        self._latencies: deque = deque(maxlen=self._max_latencies)
         self._connector_args = connector_args or {}
         
         # Check if endpoint is in SSL bypass list
         self._ssl_bypass = should_bypass_ssl_verification(endpoint)
         
+        # Requests go through the shared session and report to the shared endpoint registry
+        self._transport = get_rpc_transport()
+        self._request_kwargs = self._transport.request_kwargs(endpoint, ssl_verify and not self._ssl_bypass)
+        self._request_timeout = aiohttp.ClientTimeout(
+            total=timeout,
+            connect=min(5.0, timeout / 2),  # Shorter connect timeout
+            sock_connect=min(5.0, timeout / 2),  # Shorter socket connect timeout
+            sock_read=timeout  # Keep the full timeout for reading
+        )
+        
         # Create a default endpoint config if none provided
         if not rate_config:
             rate_config = {
@@ -149,29 +167,18 @@ class SolanaClient:
         
         logger.debug(f"Initialized SolanaClient for endpoint: {endpoint}")
     
-    async def connect(self):
-        """Connect to the Solana node"""
+    async def connect(self, check_health: bool = True):
+        """
+        Attach to the shared transport session and check the node's health.
+        
+        Args:
+            check_health: Probe the node with getHealth before returning
+        """
         if self._closed:
-            # Set up connector with appropriate SSL settings
-            connector_args = self._connector_args or {}
-            
-            # Handle SSL verification
-            if not self.ssl_verify and self.endpoint.startswith("https"):
-                connector_args["ssl"] = False
-            
-            # Create connector with appropriate settings
-            self._connector = aiohttp.TCPConnector(**connector_args)
-            
-            # Create new client session with appropriate timeouts
-            self._client = aiohttp.ClientSession(
-                timeout=aiohttp.ClientTimeout(
-                    total=self.timeout,
-                    connect=min(5.0, self.timeout / 2),  # Shorter connect timeout
-                    sock_connect=min(5.0, self.timeout / 2),  # Shorter socket connect timeout
-                    sock_read=self.timeout  # Keep the full timeout for reading
-                ),
-                connector=self._connector
-            )
+            self._client = self._transport.session()
+            if not check_health:
+                self._closed = False
+                return True
             
             # Test connection with a light request
             try:
@@ -182,6 +189,7 @@ class SolanaClient:
                 return True
             except asyncio.TimeoutError:
                 logger.warning(f"Connection timed out for {self.endpoint}")
+                self._transport.record(self.endpoint, False)
                 await self.close()
                 raise ConnectionError(f"Connection timed out for {self.endpoint}")
             except Exception as e:
@@ -192,60 +200,25 @@ class SolanaClient:
         return True
     
     async def close(self):
-        """Close the client connection"""
-        if self._client is not None:
-            try:
-                logger.debug(f"Closing client for {self.endpoint}")
-                await self._client.close()
-                logger.debug(f"Successfully closed client for {self.endpoint}")
-            except Exception as e:
-                logger.warning(f"Error closing client for {self.endpoint}: {str(e)}")
-            finally:
-                self._client = None
-                self._closed = True
-                
-        if self._connector is not None:
-            try:
-                if not self._connector.closed:
-                    await self._connector.close()
-                    logger.debug(f"Successfully closed connector for {self.endpoint}")
-            except Exception as e:
-                logger.warning(f"Error closing connector for {self.endpoint}: {str(e)}")
-            finally:
-                self._connector = None
-                
-    def __del__(self):
-        """Destructor to ensure client is closed when object is garbage collected"""
-        if hasattr(self, '_closed') and not self._closed:
-            # Try to close the client if it exists
-            if hasattr(self, '_client') and self._client is not None:
-                try:
-                    # First try to get the event loop
-                    try:
-                        loop = asyncio.get_event_loop()
-                        if loop.is_running():
-                            # If loop is running, schedule the close coroutine
-                            asyncio.run_coroutine_threadsafe(self.close(), loop)
-                            logger.debug(f"Scheduled client closure for {self.endpoint} in event loop")
-                            return  # Exit early as we've scheduled proper cleanup
-                    except (RuntimeError, AttributeError) as e:
-                        # Expected error when no event loop is available
-                        pass
-                        
-                    # Fallback to synchronous close
-                    logger.debug(f"No running event loop found, closing client for {self.endpoint} synchronously")
-                    if hasattr(self, '_client') and self._client is not None:
-                        self._client._session.close()
-                        self._client = None
-                        self._closed = True
-                except Exception as e:
-                    logger.warning(f"Error in __del__ for {self.endpoint}: {str(e)}")
+        """Detach from the shared transport session; its connections stay open for other clients"""
+        self._client = None
+        self._closed = True
     
     def _record_latency(self, latency: float):
         """Record latency for this endpoint"""
         self._latencies.append(latency)
-        if len(self._latencies) > self._max_latencies:
-            self._latencies.pop(0)
+    
+    def _update_health(self, success: bool, latency: Optional[float] = None, rate_limited: bool = False) -> None:
+        """
+        Report the outcome of a call to the rate limiter and the shared endpoint registry.
+        
+        Args:
+            success: Whether the call succeeded
+            latency: Latency of the call in seconds, if known
+            rate_limited: Whether the endpoint rate limited the call
+        """
+        self._rate_limiter.update_rate(success)
+        self._transport.record(self.endpoint, success, latency, rate_limited)
     
     def get_avg_latency(self) -> float:
         """Get average latency for this endpoint"""
@@ -253,22 +226,179 @@ class SolanaClient:
             return 0.0
         return sum(self._latencies) / len(self._latencies)
     
-    async def _make_rpc_call(self, method: str, params: Optional[List[Any]] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    def _raise_for_rpc_error(self, method: str, result: Dict[str, Any]) -> None:
+        """
+        Raise the matching exception if a JSON-RPC response carries an error.
+        
+        Args:
+            method: The RPC method that was called
+            result: Decoded JSON-RPC response
+        """
+        if "error" in result:
+            error = result["error"]
+            error_msg = error.get("message", str(error))
+            error_code = error.get("code", 0)
+
+            # Check for rate limiting
+            if error_code == -32005 or "rate limit" in error_msg.lower():
+                logger.warning(f"Rate limited on {method}: {error_msg}")
+                self._update_health(False, rate_limited=True)
+                record_rpc_error(method, self.endpoint, "rate_limited")
+                raise RateLimitError(f"Rate limited: {error_msg}")
+
+            # Check for skipped slots (-32007: ledger jump, -32009: missing in long-term storage)
+            if error_code in (-32007, -32009) or "was skipped" in error_msg.lower():
+                raise SlotSkippedError(f"Slot skipped: {error_msg}")
+
+            # Check for API key errors
+            if "api key" in error_msg.lower():
+                logger.error(f"API key error for {method}: {error_msg}")
+                raise RPCError(f"RPC error: {error_msg}")
+
+            # Check for method not supported
+            if error_code == -32601 or "method not found" in error_msg.lower():
+                logger.warning(f"Method {method} not supported: {error_msg}")
+                raise MethodNotSupportedError(f"Method not supported: {error_msg}")
+
+            # Check for other retryable errors
+            if error_code in [-32603, -32002] or "internal error" in error_msg.lower():
+                logger.warning(f"Retryable RPC error for {method}: {error_msg}")
+                self._update_health(False)
+                record_rpc_error(method, self.endpoint, "retryable")
+                raise RetryableError(f"Retryable RPC error: {error_msg}")
+
+            # Other RPC errors
+            logger.error(f"RPC error in {method}: {error_msg}")
+            record_rpc_error(method, self.endpoint, "rpc_error")
+            raise RPCError(f"RPC error: {error_msg}")
+
+    def _too_large(self, method: str, size: int) -> ResponseTooLargeError:
+        """Build the error for a response over the size limit."""
+        limit = RPC_STREAM_CONFIG['max_response_bytes']
+        logger.warning(f"Response for {method} from {self.endpoint} exceeds {limit} bytes ({size} bytes)")
+        record_rpc_error(method, self.endpoint, "too_large")
+        return ResponseTooLargeError(f"Response for {method} exceeds {limit} bytes")
+
+    async def _read_body(self, method: str, response: aiohttp.ClientResponse) -> bytes:
+        """
+        Read a response body, enforcing the maximum response size.
+        
+        Args:
+            method: The RPC method that was called
+            response: Response to read
+            
+        Returns:
+            The body bytes
+            
+        Raises:
+            ResponseTooLargeError: If the body exceeds the size limit
+        """
+        limit = RPC_STREAM_CONFIG['max_response_bytes']
+        if response.content_length is not None:
+            if response.content_length > limit:
+                raise self._too_large(method, response.content_length)
+            return await response.read()
+        
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(RPC_STREAM_CONFIG['chunk_size']):
+            body += chunk
+            if len(body) > limit:
+                raise self._too_large(method, len(body))
+        return bytes(body)
+
+    async def _stream_body(
+        self,
+        method: str,
+        response: aiohttp.ClientResponse,
+        on_item: Callable[[Any], Any]
+    ) -> Dict[str, Any]:
+        """
+        Decode a response incrementally, handing each element of the method's
+        result array to on_item as soon as it has been read.
+        
+        Args:
+            method: The RPC method that was called; its array is looked up in
+                RPC_STREAM_CONFIG['array_paths']
+            response: Response to read
+            on_item: Called (and awaited, if it returns an awaitable) with each element
+            
+        Returns:
+            The decoded response with the streamed array emptied
+            
+        Raises:
+            ResponseTooLargeError: If the body exceeds the size limit
+            RetryableError: If the body is not valid JSON
+        """
+        limit = RPC_STREAM_CONFIG['max_response_bytes']
+        if response.content_length is not None and response.content_length > limit:
+            raise self._too_large(method, response.content_length)
+        
+        decoder = ArrayStreamDecoder(RPC_STREAM_CONFIG['array_paths'][method])
+        try:
+            async for chunk in response.content.iter_chunked(RPC_STREAM_CONFIG['chunk_size']):
+                if decoder.bytes_received + len(chunk) > limit:
+                    raise self._too_large(method, decoder.bytes_received + len(chunk))
+                for item in decoder.feed(chunk):
+                    outcome = on_item(item)
+                    if inspect.isawaitable(outcome):
+                        await outcome
+            return decoder.close()
+        except ValueError as e:
+            self._update_health(False)
+            raise RetryableError(f"Failed to parse JSON response: {str(e)}")
+
+    async def _make_rpc_call(
+        self,
+        method: str,
+        params: Optional[List[Any]] = None,
+        timeout: Optional[float] = None,
+        raw: bool = False,
+        on_item: Optional[Callable[[Any], Any]] = None
+    ) -> Union[Dict[str, Any], bytes]:
         """
         Make an RPC call to the Solana node.
         
+        Requests to the endpoint are bounded by its adaptive concurrency
+        window (see adaptive_concurrency); time spent waiting for a slot does
+        not count towards the timeout.
+        
         Args:
             method: The RPC method to call
             params: The parameters to pass to the method
             timeout: Optional timeout override for this specific call
+            raw: Return the undecoded response body; only error envelopes are decoded
+            on_item: Stream the method's result array (see RPC_STREAM_CONFIG)
+                into this callback while the body is read; the timeout covers
+                the callbacks as well
             
         Returns:
-            The response from the RPC call
+            The response from the RPC call (with the streamed array emptied
+            when on_item is set), or its body bytes when raw is set
             
         Raises:
             RPCError: If the RPC call fails
             RetryableError: If the RPC call fails but can be retried
+            ResponseTooLargeError: If the response exceeds the size limit
         """
+        # Connect (and health check) before taking a slot, as the check is itself an RPC call
+        if not self._client:
+            await self.connect()
+        
+        limit = self._transport.concurrency(self.endpoint)
+        if limit is None:
+            return await self._send_rpc_call(method, params, timeout, raw, on_item)
+        async with limit.request():
+            return await self._send_rpc_call(method, params, timeout, raw, on_item)
+    
+    async def _send_rpc_call(
+        self,
+        method: str,
+        params: Optional[List[Any]] = None,
+        timeout: Optional[float] = None,
+        raw: bool = False,
+        on_item: Optional[Callable[[Any], Any]] = None
+    ) -> Union[Dict[str, Any], bytes]:
+        """Send an RPC call to the node; see _make_rpc_call."""
         params = params or []
         payload = {
             "jsonrpc": "2.0",
@@ -285,6 +415,8 @@ class SolanaClient:
             if not self._client:
                 await self.connect()
                 client_created = True
+            # The shared session is replaced when the event loop changes
+            self._client = self._transport.session()
             
             # Use the provided timeout or default to the client timeout
             call_timeout = timeout or self.timeout
@@ -293,72 +425,70 @@ class SolanaClient:
             async with asyncio.timeout(call_timeout):
                 async with self._client.post(
                     self.endpoint, 
-                    json=payload
+                    json=payload,
+                    timeout=self._request_timeout,
+                    **self._request_kwargs
                 ) as response:
                     latency = time.time() - start_time
                     self._record_latency(latency)
+                    observe_rpc(method, self.endpoint, latency)
                     
                     # Check for HTTP errors
                     if response.status >= 400:
                         logger.warning(f"HTTP error {response.status} for {method}")
-                        self._rate_limiter.update_rate(False)
+                        self._update_health(False, rate_limited=response.status == 429)
+                        record_rpc_error(method, self.endpoint, "rate_limited" if response.status == 429 else "http")
+                        if response.status == 429:
+                            raise RateLimitError(f"HTTP error {response.status}")
                         raise RetryableError(f"HTTP error {response.status}")
                     
+                    if raw:
+                        body = await self._read_body(method, response)
+                        # A successful envelope starts with its result; anything else is decoded for errors
+                        if b'"result"' not in body[:64]:
+                            try:
+                                envelope = json.loads(body)
+                            except ValueError as e:
+                                self._update_health(False)
+                                raise RetryableError(f"Failed to parse JSON response: {str(e)}")
+                            self._raise_for_rpc_error(method, envelope)
+                        self._update_health(True, latency)
+                        return body
+                    
+                    if on_item is not None:
+                        result = await self._stream_body(method, response, on_item)
+                        self._raise_for_rpc_error(method, result)
+                        self._update_health(True, latency)
+                        return result
+                    
                     # Parse the response
+                    body = await self._read_body(method, response)
                     try:
-                        result = await response.json()
+                        result = loads(body)
                     except Exception as e:
                         logger.warning(f"Failed to parse JSON response for {method}: {str(e)}")
                         content_type = response.headers.get('Content-Type', 'unknown')
-                        self._rate_limiter.update_rate(False)
+                        self._update_health(False)
                         raise RetryableError(f"Failed to parse JSON response. Content-Type: {content_type}")
                     
-                    # Handle RPC errors
-                    if "error" in result:
-                        error = result["error"]
-                        error_msg = error.get("message", str(error))
-                        error_code = error.get("code", 0)
-                        
-                        # Check for rate limiting
-                        if error_code == -32005 or "rate limit" in error_msg.lower():
-                            logger.warning(f"Rate limited on {method}: {error_msg}")
-                            self._rate_limiter.update_rate(False)
-                            raise RateLimitError(f"Rate limited: {error_msg}")
-                        
-                        # Check for API key errors
-                        if "api key" in error_msg.lower():
-                            logger.error(f"API key error for {method}: {error_msg}")
-                            raise RPCError(f"RPC error: {error_msg}")
-                        
-                        # Check for method not supported
-                        if error_code == -32601 or "method not found" in error_msg.lower():
-                            logger.warning(f"Method {method} not supported: {error_msg}")
-                            raise MethodNotSupportedError(f"Method not supported: {error_msg}")
-                        
-                        # Check for other retryable errors
-                        if error_code in [-32603, -32002] or "internal error" in error_msg.lower():
-                            logger.warning(f"Retryable RPC error for {method}: {error_msg}")
-                            self._rate_limiter.update_rate(False)
-                            raise RetryableError(f"Retryable RPC error: {error_msg}")
-                        
-                        # Other RPC errors
-                        logger.error(f"RPC error in {method}: {error_msg}")
-                        raise RPCError(f"RPC error: {error_msg}")
+                    self._raise_for_rpc_error(method, result)
                     
                     # Update rate limiter on success
-                    self._rate_limiter.update_rate(True)
+                    self._update_health(True, latency)
                     
                     return result
         
         except asyncio.TimeoutError:
             elapsed = time.time() - start_time
             logger.warning(f"Timeout after {elapsed:.2f}s for {method} on {self.endpoint}")
-            self._rate_limiter.update_rate(False)
-            raise RetryableError(f"Timeout after {elapsed:.2f}s")
+            self._update_health(False)
+            record_rpc_error(method, self.endpoint, "timeout")
+            raise RPCTimeoutError(f"Timeout after {elapsed:.2f}s")
         
         except (aiohttp.ClientError, ConnectionError) as e:
             logger.warning(f"Client error in {method}: {str(e)}")
-            self._rate_limiter.update_rate(False)
+            self._update_health(False)
+            record_rpc_error(method, self.endpoint, "connection")
             raise RetryableError(f"Connection error: {str(e)}")
         
         except (RetryableError, RateLimitError):
@@ -407,22 +537,43 @@ class SolanaClient:
             logger.error(f"Error getting transaction {signature}: {str(e)}")
             raise
 
-    async def get_block(self, slot: int, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    @staticmethod
+    def _has_block(response: Union[Dict[str, Any], bytes]) -> bool:
+        """Whether a getBlock response, decoded or raw, carries a block rather than a null result."""
+        if isinstance(response, (bytes, bytearray)):
+            return re.search(rb'"result"\s*:\s*null', response[:64]) is None
+        return isinstance(response, dict) and response.get("result") is not None
+
+    async def get_block(
+        self,
+        slot: int,
+        options: Optional[Dict[str, Any]] = None,
+        raw: bool = False,
+        on_transaction: Optional[Callable[[Dict[str, Any]], Any]] = None
+    ) -> Union[Dict[str, Any], bytes]:
         """
         Get block information for the given slot.
         
         Args:
             slot: Block slot number
             options: Additional parameters for getBlock
+            raw: Return the undecoded JSON-RPC response body, e.g. for the block workers
+            on_transaction: Receive each transaction as soon as it is decoded
+                instead of in the returned block, whose transactions list is then empty
             
         Returns:
-            Dict: Block information
+            Dict: Block information, or the response body bytes when raw is set
             
         Raises:
             RPCError: If the RPC call fails
-            SlotSkippedError: If the slot was skipped
+            SlotSkippedError: If the slot was skipped; slots the slot map
+                knows to be skipped raise it without a request
             MethodNotSupportedError: If the endpoint doesn't support getBlock
         """
+        slot_map = get_slot_map()
+        if slot_map is not None and slot_map.is_skipped(slot):
+            raise SlotSkippedError(f"Slot skipped: {slot} (known from the slot map)")
+        
         try:
             # Prepare parameters
             params = [slot]
@@ -448,12 +599,23 @@ class SolanaClient:
             
             # Make RPC call
             try:
-                return await self._make_rpc_call("getBlock", params)
+                block = await self._make_rpc_call("getBlock", params, raw=raw, on_item=on_transaction)
             except RPCError as e:
                 if "Method not found" in str(e):
                     raise MethodNotSupportedError(f"Method getBlock not supported by endpoint {self.endpoint}")
                 raise
+            
+            if slot_map is not None and self._has_block(block):
+                slot_map.record_confirmed(slot)
+            return block
                 
+        except SlotSkippedError:
+            # Not recorded in the shared map: -32007 and -32009 can also mean
+            # that only this node lacks the slot (snapshot start, no long-term
+            # storage); skips are recorded from getBlocks answers alone
+            logger.warning(f"Slot {slot} was skipped")
+            raise
+            
         except Exception as e:
             # Check for specific error messages
             error_str = str(e).lower()
@@ -479,7 +641,13 @@ class SolanaClient:
         limit: Optional[int] = None,
         commitment: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Get signatures for address"""
+        """
+        Get signatures for address.
+        
+        Raises:
+            RetryableError: On rate limits, timeouts and other transient failures,
+                so callers can retry instead of reading them as "no signatures"
+        """
         params = [address]
         
         config = {}
@@ -497,10 +665,12 @@ class SolanaClient:
             
         try:
             result = await self._make_rpc_call("getSignaturesForAddress", params)
+            if isinstance(result, dict):
+                result = result.get("result")
             return result or []
-        except BaseException as e:
+        except Exception as e:
             logger.error(f"Error getting signatures for address {address}: {e}")
-            return []
+            raise
 
     async def get_latest_blockhash(self, commitment: Optional[str] = None) -> Dict[str, Any]:
         """Get the latest blockhash"""
@@ -700,6 +870,46 @@ class SolanaClient:
             logger.error(f"Error getting block height: {str(e)}")
             raise
 
+    async def get_blocks(self, start_slot: int, end_slot: Optional[int] = None, commitment: Optional[str] = None) -> List[int]:
+        """
+        Get the slots of confirmed blocks between two slots.
+        
+        Skipped slots are not included, so callers can fetch each produced
+        block without probing empty slots. The part of the range already in
+        the slot map is answered from it; only the rest is requested, and the
+        answer is recorded.
+        
+        Args:
+            start_slot: First slot of the range (inclusive)
+            end_slot: Last slot of the range (inclusive), defaults to the latest slot
+            commitment: Optional commitment level
+            
+        Returns:
+            List[int]: Slots that contain a block
+        """
+        try:
+            slot_map = get_slot_map()
+            known: List[int] = []
+            if slot_map is not None and end_slot is not None:
+                known, start_slot = slot_map.known_blocks(start_slot, end_slot)
+                if start_slot > end_slot:
+                    return known
+            
+            params: List[Any] = [start_slot]
+            if end_slot is not None:
+                params.append(end_slot)
+            if commitment:
+                params.append({"commitment": commitment})
+                
+            result = await self._make_rpc_call("getBlocks", params)
+            slots = result.get("result") or []
+            if slot_map is not None and slots:
+                slot_map.record_blocks(start_slot, end_slot if end_slot is not None else max(slots), slots)
+            return known + slots
+        except Exception as e:
+            logger.error(f"Error getting blocks {start_slot}-{end_slot}: {str(e)}")
+            raise
+
     async def simulate_transaction(self, transaction, *args, **kwargs):
         """
         Simulate a transaction.
@@ -735,21 +945,33 @@ class SolanaClient:
             # Use a shorter timeout for health checks
             timeout = min(3.0, self.timeout / 2)
             async with asyncio.timeout(timeout):
-                async with self._client.post(
+                async with self._transport.session().post(
                     self.endpoint, 
-                    json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"}
+                    json={"jsonrpc": "2.0", "id": 1, "method": "getHealth"},
+                    timeout=self._request_timeout,
+                    **self._request_kwargs
                 ) as response:
+                    if response.status == 429:
+                        self._update_health(False, rate_limited=True)
+                        raise RateLimitError(f"Health check rate limited for {self.endpoint}")
                     result = await response.json()
                     if "result" in result and result["result"] != "ok":
+                        self._transport.record(self.endpoint, False)
                         raise NodeUnhealthyError(f"Node health check failed: {result}")
                     
             latency = time.time() - start
             self._record_latency(latency)
+            self._transport.record(self.endpoint, True, latency)
             
             return "ok"
         except asyncio.TimeoutError:
             logger.warning(f"Health check timed out for {self.endpoint} after {time.time() - start:.2f}s")
+            self._transport.record(self.endpoint, False)
             raise NodeUnhealthyError(f"Health check timed out for {self.endpoint}")
+        except (aiohttp.ClientError, ConnectionError, ValueError) as e:
+            logger.warning(f"Health check failed for {self.endpoint}: {str(e)}")
+            self._transport.record(self.endpoint, False)
+            raise
         except Exception as e:
             logger.warning(f"Health check failed for {self.endpoint}: {str(e)}")
             raise
@@ -831,19 +1053,30 @@ class SolanaConnectionPool:
         self.ssl_verify = ssl_verify
         self.connector_args = connector_args or {}
         self._pool = []
-        self._stats = {}
         self._lock = asyncio.Lock()
         self._initialized = False
         self._current_index = -1
         self.endpoints = endpoints or []
         self.pool_size = 10  # Default maximum pool size
-        self._rate_limited_until = {}
         self._max_consecutive_failures = 5
+        self._verify_task: Optional[asyncio.Task] = None
+        # Endpoint health and rate-limit state is shared with every other pool
+        self._transport = get_rpc_transport()
         
         # Initialize with provided endpoints if any
         if endpoints:
             asyncio.create_task(self.initialize(endpoints))
     
+    @property
+    def _stats(self) -> Dict[str, Dict[str, Any]]:
+        """Statistics of every endpoint in the shared registry, by URL."""
+        return {url: state.to_dict() for url, state in self._transport.endpoints.items()}
+    
+    @property
+    def _rate_limited_until(self) -> Dict[str, float]:
+        """End of the cooldown of every endpoint that has had one, by URL."""
+        return {url: state.cooldown_until for url, state in self._transport.endpoints.items() if state.cooldown_until}
+    
     class ClientContextManager:
         """Context manager for acquiring and releasing clients from the pool."""
         
@@ -883,11 +1116,16 @@ class SolanaConnectionPool:
         Initialize the connection pool with the given endpoints.
         
         Args:
-            endpoints: List of endpoint URLs to connect to
+            endpoints: List of endpoint URLs to connect to; when omitted, the pool
+                warm-starts from the previous run's endpoints if there are any
+                (see warm_start), and connects to the defaults otherwise
         
         Raises:
             ConnectionError: If no connections could be established
         """
+        if endpoints is None and not self._initialized and await self.warm_start():
+            return
+        
         async with self._lock:
             # Close any existing connections
             if self._initialized:
@@ -910,9 +1148,8 @@ class SolanaConnectionPool:
                 logger.error(error_msg)
                 raise ValueError(error_msg)
                 
-            # Reset pool and stats
+            # Reset pool; endpoint stats live in the shared registry and are kept
             self._pool = []
-            self._stats = {}
             
             logger.info(f"Initializing connection pool with endpoints: {valid_endpoints}")
             
@@ -952,6 +1189,82 @@ class SolanaConnectionPool:
         """Initialize the pool with default endpoints"""
         await self.initialize(self.DEFAULT_RPC_ENDPOINTS)
     
+    async def warm_start(self) -> bool:
+        """
+        Fill the pool from the endpoint list and scores saved by the previous run,
+        without probing the endpoints; their health is checked in the background.
+        
+        Returns:
+            True if the pool was filled, False if there was nothing recent to start from
+        """
+        store = get_endpoint_score_store()
+        if store is None:
+            return False
+        try:
+            saved = await asyncio.to_thread(store.load)
+        except Exception as e:
+            logger.error(f"Error loading RPC endpoint scores: {str(e)}")
+            return False
+        if not saved:
+            return False
+        
+        async with self._lock:
+            if self._initialized:
+                return True
+            # Configured endpoints (e.g. ones with API keys, which are never saved) come first
+            endpoints = list(dict.fromkeys([*DEFAULT_RPC_ENDPOINTS, *saved]))[:self.pool_size]
+            self._pool = []
+            for endpoint in endpoints:
+                client = SolanaClient(
+                    endpoint=endpoint,
+                    timeout=self.timeout,
+                    max_retries=self.max_retries,
+                    ssl_verify=self.ssl_verify,
+                    connector_args=self.connector_args
+                )
+                await client.connect(check_health=False)
+                self._pool.append((client, 0))
+            self.endpoints = endpoints
+            self._initialized = True
+        
+        logger.info(f"Connection pool warm-started with {len(self._pool)} saved endpoints")
+        self._verify_task = asyncio.create_task(self.verify_endpoints(), name="rpc_pool_verify")
+        return True
+    
+    async def verify_endpoints(self) -> int:
+        """
+        Check the health of every endpoint in the pool and update its failure count.
+        
+        Falls back to a full initialization with the default endpoints if none is healthy.
+        
+        Returns:
+            Number of healthy endpoints
+        """
+        semaphore = asyncio.Semaphore(RPC_WARM_START_CONFIG['verify_concurrency'])
+        
+        async def check(endpoint: str) -> bool:
+            async with semaphore:
+                return await self.check_endpoint_health(endpoint)
+        
+        endpoints = [client.endpoint for client, _ in self._pool]
+        results = await asyncio.gather(*(check(endpoint) for endpoint in endpoints), return_exceptions=True)
+        healthy = {endpoint for endpoint, result in zip(endpoints, results) if result is True}
+        
+        async with self._lock:
+            self._pool = [
+                (client, 0 if client.endpoint in healthy else failures + 1)
+                for client, failures in self._pool
+            ]
+        logger.info(f"Verified warm-started pool: {len(healthy)}/{len(endpoints)} endpoints healthy")
+        
+        if not healthy:
+            logger.warning("No saved endpoint is healthy, initializing with default endpoints")
+            try:
+                await self.initialize(DEFAULT_RPC_ENDPOINTS)
+            except Exception as e:
+                logger.error(f"Error initializing connection pool: {str(e)}")
+        return len(healthy)
+    
     async def close(self):
         """Close all clients and cleanup resources"""
         async with self._lock:
@@ -1015,27 +1328,19 @@ class SolanaConnectionPool:
             available_clients = []
             
             for i, (client, failure_count) in enumerate(self._pool):
-                endpoint = client.endpoint
+                state = self._transport.get(client.endpoint)
                 
-                # Skip rate-limited endpoints
-                if endpoint in self._rate_limited_until and current_time < self._rate_limited_until[endpoint]:
+                # Skip rate-limited and cooling-down endpoints, whichever pool saw the errors
+                if state is not None and not state.is_available(current_time):
                     continue
                 
                 # Skip endpoints with too many consecutive failures
                 if failure_count >= self._max_consecutive_failures:
                     continue
                 
-                # Skip endpoints with poor performance metrics
-                if endpoint in self._stats:
-                    stats = self._stats[endpoint]
-                    
-                    # Skip if success rate is too low (less than 50%)
-                    success_count = stats.get("success_count", 0)
-                    failure_count = stats.get("failure_count", 0)
-                    total_count = success_count + failure_count
-                    
-                    if total_count > 10 and success_count / total_count < 0.5:
-                        continue
+                # Skip if success rate is too low (less than 50%)
+                if state is not None and state.total_requests > 10 and state.success_rate < 0.5:
+                    continue
                 
                 available_clients.append((i, client, failure_count))
             
@@ -1044,8 +1349,8 @@ class SolanaConnectionPool:
                 logger.warning("No healthy clients available, using any available client")
                 available_clients = [(i, client, failure_count) for i, (client, failure_count) in enumerate(self._pool)]
             
-            # Sort by failure count (ascending)
-            available_clients.sort(key=lambda x: x[2])
+            # Sort by failure count (ascending), then by how full the endpoint's concurrency window is
+            available_clients.sort(key=lambda x: (x[2], self._transport.load(x[1].endpoint)))
             
             # Choose from the top 3 clients with lowest failure counts
             top_clients = available_clients[:min(3, len(available_clients))]
@@ -1125,9 +1430,8 @@ class SolanaConnectionPool:
             # Handle rate limited endpoints
             if rate_limited:
                 # Mark endpoint as rate limited for a cooling period
-                cooling_period = random.uniform(30, 60)  # 30-60 seconds cooling period
-                self._rate_limited_until[client.endpoint] = time.time() + cooling_period
-                logger.warning(f"Marking endpoint {client.endpoint} as rate limited for {cooling_period:.1f}s")
+                cooling_period = random.uniform(*RPC_TRANSPORT_CONFIG['rate_limit_cooldown'])
+                self._transport.endpoint(client.endpoint).cool_down(cooling_period)
                 
             # Find the client in the pool
             for i, (pool_client, failure_count) in enumerate(self._pool):
@@ -1140,15 +1444,10 @@ class SolanaConnectionPool:
                         if new_failure_count >= self._max_consecutive_failures:
                             logger.warning(f"Client for {client.endpoint} has {new_failure_count} consecutive failures")
                     
-                    # Update the client in the pool
+                    # Update the client in the pool; the client has already reported
+                    # each of its calls to the shared endpoint registry
                     self._pool[i] = (pool_client, new_failure_count)
                     
-                    # Update endpoint stats
-                    if latency is not None:
-                        await self.update_endpoint_stats(client.endpoint, success, latency, rate_limited)
-                    else:
-                        await self.update_endpoint_stats(client.endpoint, success, rate_limited=rate_limited)
-                    
                     return
             
             # If client not found in pool (unusual), close it
@@ -1174,7 +1473,8 @@ class SolanaConnectionPool:
             logger.warning(f"Invalid endpoint format: {endpoint}")
             return False
             
-        # Create a temporary client to test the endpoint
+        # Create a temporary client to test the endpoint; it sends through the shared
+        # session and reports its calls to the shared endpoint registry itself
         client = None
         try:
             client = SolanaClient(
@@ -1195,37 +1495,23 @@ class SolanaConnectionPool:
             try:
                 await client.get_version()
                 latency = time.time() - start_time
-                await self.update_endpoint_stats(endpoint, True, latency)
                 logger.debug(f"Endpoint {endpoint} is healthy (latency: {latency:.2f}s)")
                 return True
             except RateLimitError:
                 # If rate limited, mark as unhealthy but not a complete failure
                 logger.warning(f"Endpoint {endpoint} is rate limited")
-                await self.update_endpoint_stats(endpoint, False)
-                
-                # Add to rate limited endpoints tracking
-                cooling_period = random.uniform(30, 60)  # 30-60 seconds cooling period
-                self._rate_limited_until[endpoint] = time.time() + cooling_period
-                logger.warning(f"Marking endpoint {endpoint} as rate limited for {cooling_period:.1f}s")
                 return False
             except Exception as e:
                 # Any other error means the endpoint is unhealthy
                 logger.warning(f"Endpoint {endpoint} is unhealthy: {str(e)}")
-                await self.update_endpoint_stats(endpoint, False)
                 return False
         except Exception as e:
             # Connection error
             logger.warning(f"Failed to connect to endpoint {endpoint}: {str(e)}")
-            await self.update_endpoint_stats(endpoint, False)
             return False
         finally:
-            # Always close the client
             if client:
-                try:
-                    await client.close()
-                    logger.debug(f"Successfully closed temporary client for {endpoint}")
-                except Exception as e:
-                    logger.warning(f"Error closing temporary client for {endpoint}: {str(e)}")
+                await client.close()
     
     async def get_endpoint_stats(self) -> Dict[str, Any]:
         """
@@ -1255,6 +1541,7 @@ class SolanaConnectionPool:
                     "success_count": stats.get("success_count", 0),
                     "failure_count": stats.get("failure_count", 0),
                     "current_failures": stats.get("current_failures", 0),
+                    "concurrency": stats.get("concurrency"),
                     "in_pool": endpoint in [client.endpoint for client, _ in self._pool]
                 })
             
@@ -1276,7 +1563,7 @@ class SolanaConnectionPool:
 
     async def update_endpoint_stats(self, endpoint: str, success: bool, latency: float = None, rate_limited: bool = False) -> None:
         """
-        Update statistics for a specific RPC endpoint.
+        Update statistics for a specific RPC endpoint in the shared registry.
         
         Args:
             endpoint: The endpoint URL
@@ -1284,36 +1571,7 @@ class SolanaConnectionPool:
             latency: The latency of the operation (if successful)
             rate_limited: Whether the endpoint was rate limited
         """
-        if endpoint in self._stats:
-            if success:
-                self._stats[endpoint]["success_count"] = self._stats[endpoint].get("success_count", 0) + 1
-                # Update latency using exponential moving average if latency is provided
-                if latency is not None:
-                    alpha = 0.3  # Weight for new value
-                    current_avg = self._stats[endpoint].get("avg_latency")
-                    if current_avg is not None:
-                        self._stats[endpoint]["avg_latency"] = alpha * latency + (1 - alpha) * current_avg
-                    else:
-                        self._stats[endpoint]["avg_latency"] = latency
-                # Reset current failures
-                self._stats[endpoint]["current_failures"] = 0
-            else:
-                self._stats[endpoint]["failure_count"] = self._stats[endpoint].get("failure_count", 0) + 1
-                self._stats[endpoint]["current_failures"] = self._stats[endpoint].get("current_failures", 0) + 1
-            
-            # Track rate limiting
-            if rate_limited:
-                self._stats[endpoint]["rate_limited_count"] = self._stats[endpoint].get("rate_limited_count", 0) + 1
-                self._stats[endpoint]["last_rate_limited"] = time.time()
-        else:
-            self._stats[endpoint] = {
-                "success_count": 1 if success else 0,
-                "failure_count": 0 if success else 1,
-                "avg_latency": latency if success and latency is not None else 0,
-                "current_failures": 0 if success else 1,
-                "rate_limited_count": 1 if rate_limited else 0,
-                "last_rate_limited": time.time() if rate_limited else None
-            }
+        self._transport.record(endpoint, success, latency, rate_limited)
     
     async def sort_endpoints_by_performance(self) -> List[str]:
         """
@@ -1677,48 +1935,6 @@ class SolanaConnectionPool:
             "top_performers": filtered_performers
         }
 
-    def __del__(self):
-        """Destructor to ensure proper cleanup of resources during garbage collection."""
-        if hasattr(self, '_pool') and self._pool:
-            logger.debug(f"SolanaConnectionPool.__del__: Cleaning up {len(self._pool)} clients")
-            
-            # Try to get an event loop
-            try:
-                loop = asyncio.get_event_loop()
-                
-                # If we have a running loop, use it to close clients
-                if loop.is_running():
-                    # Create a task to close all clients
-                    asyncio.create_task(self.close())
-                    logger.debug("Created async task to close connection pool")
-                else:
-                    # If loop is not running, we can't use it to close clients
-                    logger.debug("Event loop not running, closing clients synchronously")
-                    for client, _ in self._pool:
-                        if client:
-                            # Try to close the client synchronously
-                            if hasattr(client, '_client') and client._client and not client._client.closed:
-                                client._client.close()
-                            if hasattr(client, '_connector') and client._connector and not client._connector.closed:
-                                client._connector.close()
-                    
-                    # Clear the pool
-                    self._pool.clear()
-            except Exception as e:
-                logger.warning(f"Error in SolanaConnectionPool.__del__: {str(e)}")
-                
-                # Last resort: try to close clients directly
-                try:
-                    for client, _ in self._pool:
-                        if client:
-                            # Try to close the client synchronously
-                            if hasattr(client, '_client') and client._client and not client._client.closed:
-                                client._client.close()
-                            if hasattr(client, '_connector') and client._connector and not client._connector.closed:
-                                client._connector.close()
-                except Exception as e2:
-                    logger.warning(f"Failed to close clients in SolanaConnectionPool.__del__: {str(e2)}")
-
 async def get_connection_pool() -> SolanaConnectionPool:
     """Get or create a shared connection pool."""
     global _connection_pool
@@ -1732,7 +1948,8 @@ async def get_connection_pool() -> SolanaConnectionPool:
                 ssl_verify=True,
                 connector_args=None
             )
-            await _connection_pool.initialize(DEFAULT_RPC_ENDPOINTS)  # Initialize the pool
+            # Starts from the previous run's ranked endpoints if there are any, else probes the defaults
+            await _connection_pool.initialize()  # Initialize the pool
             logger.info("Created new connection pool")
         except Exception as e:
             logger.error(f"Error creating connection pool: {str(e)}")
@@ -1801,6 +2018,9 @@ async def safe_rpc_call_async(method, client=None, params=None, max_retries=3, r
     # Retry loop
     for retry in range(max_retries):
         try:
+            if retry:
+                record_rpc_retry(method)
+            
             # Adjust timeout for subsequent retries (make them shorter)
             current_timeout = timeout * (0.8 ** retry)  # Reduce timeout by 20% each retry
             
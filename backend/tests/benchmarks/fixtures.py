@@ -0,0 +1,393 @@
+"""
+Compressed RPC response fixtures for the benchmark suite.
+
+Fixtures are stored as gzipped JSON-RPC envelopes in ``data/``:
+
+- ``getBlock.jsonParsed.json.gz``  block with ``encoding: jsonParsed``
+- ``getBlock.json.json.gz``        the same block with ``encoding: json``
+- ``getVoteAccounts.json.gz``
+- ``getClusterNodes.json.gz``
+
+Record real mainnet responses (replaces the files in ``data/``):
+
+    python -m tests.benchmarks.fixtures record --rpc https://api.mainnet-beta.solana.com
+
+Regenerate the deterministic synthetic fixtures:
+
+    python -m tests.benchmarks.fixtures synthetic
+"""
+
+import argparse
+import gzip
+import json
+import random
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import base58
+
+DATA_DIR = Path(__file__).parent / "data"
+
+BLOCK_PARSED = "getBlock.jsonParsed"
+BLOCK_JSON = "getBlock.json"
+VOTE_ACCOUNTS = "getVoteAccounts"
+CLUSTER_NODES = "getClusterNodes"
+FIXTURES = (BLOCK_PARSED, BLOCK_JSON, VOTE_ACCOUNTS, CLUSTER_NODES)
+
+SYSTEM_PROGRAM = "11111111111111111111111111111111"
+VOTE_PROGRAM = "Vote111111111111111111111111111111111111111"
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+COMPUTE_BUDGET_PROGRAM = "ComputeBudget111111111111111111111111111111"
+PUMP_PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M5uBEwF6P"
+RAYDIUM_AMM_PROGRAM = "675kPX9MHTjS2zt1qfr1NYHuzeLXfQM9H24wFSUt1Mp8"
+WSOL_MINT = "So11111111111111111111111111111111111111112"
+USDC_MINT = "EPjFWdd5AufqSSqeM2qN1xzybapC8G4wEGGkZwyTDt1v"
+
+
+def fixture_path(name: str) -> Path:
+    return DATA_DIR / f"{name}.json.gz"
+
+
+def load_fixture_bytes(name: str) -> bytes:
+    """Load the raw JSON-RPC envelope bytes of a fixture."""
+    with gzip.open(fixture_path(name), "rb") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=None)
+def _load_result_text(name: str) -> str:
+    return json.dumps(json.loads(load_fixture_bytes(name))["result"])
+
+
+def load_result(name: str) -> Any:
+    """Load a fresh copy of a fixture's ``result`` value."""
+    return json.loads(_load_result_text(name))
+
+
+def _write_fixture(name: str, result: Any) -> Path:
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    path = fixture_path(name)
+    envelope = {"jsonrpc": "2.0", "result": result, "id": 1}
+    with gzip.open(path, "wb", compresslevel=9) as f:
+        f.write(json.dumps(envelope, separators=(",", ":")).encode("utf-8"))
+    return path
+
+
+class _SyntheticChain:
+    """Deterministic generator of mainnet-shaped RPC responses."""
+
+    def __init__(self, seed: int = 7):
+        self.rng = random.Random(seed)
+        self.validators = [self.address() for _ in range(400)]
+        self.wallets = [self.address() for _ in range(3000)]
+        self.token_mints = [USDC_MINT, WSOL_MINT] + [self.address() for _ in range(200)]
+
+    def address(self, suffix: str = "") -> str:
+        while True:
+            raw = base58.b58encode(self.rng.randbytes(32)).decode()
+            candidate = raw[:44 - len(suffix)] + suffix if suffix else raw
+            if len(base58.b58decode(candidate)) == 32:
+                return candidate
+
+    def signature(self) -> str:
+        return base58.b58encode(self.rng.randbytes(64)).decode()
+
+    def data(self, size: int) -> str:
+        return base58.b58encode(self.rng.randbytes(size)).decode()
+
+    def token_balance(self, index: int, mint: str, owner: str, amount: int, decimals: int = 6) -> Dict[str, Any]:
+        return {
+            "accountIndex": index,
+            "mint": mint,
+            "owner": owner,
+            "programId": TOKEN_PROGRAM,
+            "uiTokenAmount": {
+                "amount": str(amount),
+                "decimals": decimals,
+                "uiAmount": amount / 10 ** decimals,
+                "uiAmountString": str(amount / 10 ** decimals),
+            },
+        }
+
+    def transaction(self, kind: str) -> Dict[str, Any]:
+        """
+        Build one transaction in an encoding-neutral form.
+
+        Instructions reference accounts by index and carry the parsed form
+        used by ``jsonParsed`` alongside the raw data used by ``json``.
+        """
+        rng = self.rng
+        payer = rng.choice(self.validators if kind == "vote" else self.wallets)
+        keys = [payer]
+        instructions = []
+        logs = []
+        pre_tokens, post_tokens = [], []
+
+        def key(address: str) -> int:
+            keys.append(address)
+            return len(keys) - 1
+
+        if kind == "vote":
+            vote_account = key(self.address())
+            program = key(VOTE_PROGRAM)
+            instructions.append({
+                "program": program, "accounts": [vote_account, 0], "data": self.data(120),
+                "parsed": {"info": {"voteAccount": keys[vote_account], "voteAuthority": payer}, "type": "towersync"},
+                "programName": "vote",
+            })
+            logs = [f"Program {VOTE_PROGRAM} invoke [1]", f"Program {VOTE_PROGRAM} success"]
+        else:
+            budget = key(COMPUTE_BUDGET_PROGRAM)
+            instructions.append({"program": budget, "accounts": [], "data": self.data(5), "parsed": None})
+            instructions.append({"program": budget, "accounts": [], "data": self.data(9), "parsed": None})
+
+        if kind == "transfer":
+            mint = rng.choice(self.token_mints)
+            source, destination = key(self.address()), key(self.address())
+            owner = rng.choice(self.wallets)
+            program = key(TOKEN_PROGRAM)
+            amount = rng.randint(1, 10 ** 9)
+            instructions.append({
+                "program": program, "accounts": [source, destination, 0], "data": self.data(10),
+                "parsed": {"info": {"source": keys[source], "destination": keys[destination], "authority": payer,
+                                    "mint": mint, "tokenAmount": {"amount": str(amount), "decimals": 6}},
+                           "type": "transferChecked"},
+                "programName": "spl-token",
+            })
+            pre_tokens = [self.token_balance(source, mint, payer, amount * 2), self.token_balance(destination, mint, owner, 0)]
+            post_tokens = [self.token_balance(source, mint, payer, amount), self.token_balance(destination, mint, owner, amount)]
+            logs = [f"Program {TOKEN_PROGRAM} invoke [1]", "Program log: Instruction: TransferChecked",
+                    f"Program {TOKEN_PROGRAM} success"]
+
+        elif kind in ("pump", "mint"):
+            mint_address = self.address("pump" if kind == "pump" or rng.random() < 0.5 else "")
+            mint = key(mint_address)
+            token_account = key(self.address())
+            token_program = key(TOKEN_PROGRAM)
+            if kind == "mint":
+                system = key(SYSTEM_PROGRAM)
+                instructions.append({
+                    "program": system, "accounts": [0, mint], "data": self.data(52),
+                    "parsed": {"info": {"source": payer, "newAccount": mint_address, "lamports": 1461600,
+                                        "space": 82, "owner": TOKEN_PROGRAM}, "type": "createAccount"},
+                    "programName": "system",
+                })
+                instructions.append({
+                    "program": token_program, "accounts": [mint], "data": "8" + self.data(66)[1:],
+                    "parsed": {"info": {"mint": mint_address, "decimals": 6, "mintAuthority": payer},
+                               "type": "initializeMint2"},
+                    "programName": "spl-token",
+                })
+                logs = [f"Program {TOKEN_PROGRAM} invoke [1]", "Program log: Instruction: InitializeMint2",
+                        f"Program {TOKEN_PROGRAM} success"]
+            pump = key(PUMP_PROGRAM)
+            amount = rng.randint(10 ** 6, 10 ** 12)
+            instructions.append({
+                "program": pump, "accounts": [mint, token_account, 0, token_program], "data": self.data(24),
+                "parsed": None,
+            })
+            pre_tokens = [self.token_balance(token_account, mint_address, payer, 0)]
+            post_tokens = [self.token_balance(token_account, mint_address, payer, amount)]
+            logs += [f"Program {PUMP_PROGRAM} invoke [1]", "Program log: Instruction: Buy",
+                     f"Program {PUMP_PROGRAM} consumed 34121 of 199700 compute units", f"Program {PUMP_PROGRAM} success"]
+
+        elif kind == "swap":
+            pool_accounts = [key(self.address()) for _ in range(16)]
+            program = key(RAYDIUM_AMM_PROGRAM)
+            instructions.append({"program": program, "accounts": pool_accounts + [0], "data": self.data(17), "parsed": None})
+            mint = rng.choice(self.token_mints)
+            pre_tokens = [self.token_balance(pool_accounts[4], mint, payer, 5 * 10 ** 9),
+                          self.token_balance(pool_accounts[5], WSOL_MINT, payer, 10 ** 9, 9)]
+            post_tokens = [self.token_balance(pool_accounts[4], mint, payer, 4 * 10 ** 9),
+                           self.token_balance(pool_accounts[5], WSOL_MINT, payer, 2 * 10 ** 9, 9)]
+            logs = [f"Program {RAYDIUM_AMM_PROGRAM} invoke [1]", "Program log: ray_log: " + self.data(40),
+                    f"Program {RAYDIUM_AMM_PROGRAM} success"]
+
+        balances = [rng.randint(10 ** 6, 10 ** 12) for _ in keys]
+        return {
+            "signature": self.signature(),
+            "keys": keys,
+            "instructions": instructions,
+            "meta": {
+                "err": None,
+                "status": {"Ok": None},
+                "fee": 5000,
+                "preBalances": balances,
+                "postBalances": [b - 5000 if i == 0 else b for i, b in enumerate(balances)],
+                "innerInstructions": [],
+                "logMessages": logs,
+                "preTokenBalances": pre_tokens,
+                "postTokenBalances": post_tokens,
+                "rewards": [],
+                "loadedAddresses": {"writable": [], "readonly": []},
+                "computeUnitsConsumed": rng.randint(2000, 200000),
+            },
+        }
+
+    def block(self, slot: int, num_transactions: int) -> List[Dict[str, Any]]:
+        kinds = ["vote"] * 65 + ["transfer"] * 15 + ["pump"] * 12 + ["swap"] * 5 + ["mint"] * 3
+        return [self.transaction(self.rng.choice(kinds)) for _ in range(num_transactions)]
+
+
+def _render_block(slot: int, transactions: List[Dict[str, Any]], encoding: str) -> Dict[str, Any]:
+    rendered = []
+    for tx in transactions:
+        keys = tx["keys"]
+        if encoding == "jsonParsed":
+            account_keys = [
+                {"pubkey": k, "signer": i == 0, "source": "transaction", "writable": i == 0 or i % 3 == 1}
+                for i, k in enumerate(keys)
+            ]
+            instructions = []
+            for ix in tx["instructions"]:
+                program_id = keys[ix["program"]]
+                if ix["parsed"] is not None:
+                    instructions.append({"parsed": ix["parsed"], "program": ix["programName"],
+                                         "programId": program_id, "stackHeight": None})
+                else:
+                    instructions.append({"accounts": [keys[a] for a in ix["accounts"]], "data": ix["data"],
+                                         "programId": program_id, "stackHeight": None})
+        else:
+            account_keys = list(keys)
+            instructions = [
+                {"accounts": ix["accounts"], "data": ix["data"], "programIdIndex": ix["program"], "stackHeight": None}
+                for ix in tx["instructions"]
+            ]
+
+        rendered.append({
+            "meta": tx["meta"],
+            "transaction": {
+                "message": {
+                    "accountKeys": account_keys,
+                    "header": {"numReadonlySignedAccounts": 0, "numReadonlyUnsignedAccounts": 1,
+                               "numRequiredSignatures": 1},
+                    "instructions": instructions,
+                    "recentBlockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+                },
+                "signatures": [tx["signature"]],
+            },
+            "version": "legacy",
+        })
+
+    return {
+        "blockHeight": slot - 20_000_000,
+        "blockTime": 1_700_000_000,
+        "blockhash": "4sGjMW1sUnHzSxGspuhpqLDx6wiyjNtZAMdL4VZHirAn",
+        "parentSlot": slot - 1,
+        "previousBlockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+        "rewards": [],
+        "transactions": rendered,
+    }
+
+
+def generate_synthetic(seed: int = 7, slot: int = 300_000_000, num_transactions: int = 1000) -> List[Path]:
+    """
+    Write deterministic mainnet-shaped fixtures.
+
+    Args:
+        seed: Random seed
+        slot: Slot number of the generated block
+        num_transactions: Transactions in the generated block
+
+    Returns:
+        Paths of the written fixtures
+    """
+    chain = _SyntheticChain(seed)
+    transactions = chain.block(slot, num_transactions)
+    rng = chain.rng
+
+    vote_accounts = {
+        "current": [
+            {
+                "votePubkey": chain.address(),
+                "nodePubkey": node,
+                "activatedStake": rng.randint(10 ** 12, 10 ** 16),
+                "epochVoteAccount": True,
+                "commission": rng.choice([0, 5, 7, 10, 100]),
+                "lastVote": slot - rng.randint(0, 40),
+                "rootSlot": slot - rng.randint(32, 80),
+                "epochCredits": [[700 + e, 10 ** 6 * (e + 1), 10 ** 6 * e] for e in range(5)],
+            }
+            for node in chain.validators
+        ],
+        "delinquent": [],
+    }
+    cluster_nodes = [
+        {
+            "pubkey": node,
+            "gossip": f"10.{i // 250}.{i % 250}.1:8001",
+            "tpu": f"10.{i // 250}.{i % 250}.1:8004",
+            "tpuQuic": f"10.{i // 250}.{i % 250}.1:8010",
+            "rpc": f"10.{i // 250}.{i % 250}.1:8899" if i % 4 == 0 else None,
+            "version": rng.choice(["2.1.21", "2.2.14", "0.505.20216"]),
+            "featureSet": rng.choice([3294202862, 1420694968]),
+            "shredVersion": 50093,
+        }
+        for i, node in enumerate(chain.validators + [chain.address() for _ in range(3600)])
+    ]
+
+    return [
+        _write_fixture(BLOCK_PARSED, _render_block(slot, transactions, "jsonParsed")),
+        _write_fixture(BLOCK_JSON, _render_block(slot, transactions, "json")),
+        _write_fixture(VOTE_ACCOUNTS, vote_accounts),
+        _write_fixture(CLUSTER_NODES, cluster_nodes),
+    ]
+
+
+def record(rpc_url: str, slot: Optional[int] = None) -> List[Path]:
+    """
+    Record fixtures from a live RPC endpoint.
+
+    Args:
+        rpc_url: RPC endpoint URL
+        slot: Block slot to record, defaults to a recent confirmed block
+
+    Returns:
+        Paths of the written fixtures
+    """
+    import requests
+
+    def call(method: str, params: Optional[list] = None) -> Any:
+        response = requests.post(rpc_url, json={"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []},
+                                 timeout=120)
+        response.raise_for_status()
+        body = response.json()
+        if "error" in body:
+            raise RuntimeError(f"{method} failed: {body['error']}")
+        return body["result"]
+
+    if slot is None:
+        slot = call("getBlocks", [call("getSlot", [{"commitment": "confirmed"}]) - 100])[0]
+
+    options = {"transactionDetails": "full", "rewards": False, "maxSupportedTransactionVersion": 0}
+    return [
+        _write_fixture(BLOCK_PARSED, call("getBlock", [slot, {**options, "encoding": "jsonParsed"}])),
+        _write_fixture(BLOCK_JSON, call("getBlock", [slot, {**options, "encoding": "json"}])),
+        _write_fixture(VOTE_ACCOUNTS, call("getVoteAccounts")),
+        _write_fixture(CLUSTER_NODES, call("getClusterNodes")),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record or generate benchmark fixtures")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record", help="Record fixtures from a live RPC endpoint")
+    rec.add_argument("--rpc", required=True, help="RPC endpoint URL")
+    rec.add_argument("--slot", type=int, help="Block slot to record")
+    syn = sub.add_parser("synthetic", help="Generate deterministic synthetic fixtures")
+    syn.add_argument("--seed", type=int, default=7)
+    syn.add_argument("--transactions", type=int, default=1000)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        paths = record(args.rpc, args.slot)
+    else:
+        paths = generate_synthetic(args.seed, num_transactions=args.transactions)
+
+    for path in paths:
+        print(f"{path} ({path.stat().st_size / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,280 @@
+"""
+Load-test harness driving the FastAPI app against local mock RPC endpoints.
+
+Starts N ``MockRPCServer`` instances, each with its own fault profile, points
+the shared ``SolanaConnectionPool`` at them and fires API requests at the app
+in-process through ``httpx.ASGITransport`` from a fixed number of concurrent
+clients. The report has throughput, latency percentiles, status codes per
+path and the requests and injected faults each mock endpoint saw.
+
+Run from ``backend/``:
+
+    python -m tests.benchmarks.load_test --endpoints 3 --concurrency 32 --requests 2000
+    python -m tests.benchmarks.load_test --profile "latency=40,jitter=0.6,429=0.02" \\
+        --profile "latency=120,32005=0.05,timeout=0.01,hang=5" --duration 30
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import logging
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+from .mock_rpc import FaultProfile, MockRPCServer
+from .run_benchmarks import RESULTS_DIR, environment, summarize
+
+# Endpoints that reach the RPC pool (getSlot + getBlock) on every call rather than a response cache
+DEFAULT_PATHS = (
+    "/soleco/mints/extract?limit=1",
+    "/soleco/mints/extract?limit=3",
+)
+
+DEFAULT_PROFILE = "latency=25,jitter=0.5,429=0.01,32005=0.01,skip=0.05"
+
+
+class MockCluster:
+    """
+    A set of mock RPC endpoints installed as the app's RPC pool.
+    """
+
+    def __init__(self, profiles: Sequence[FaultProfile], head_slot: int = 300_000_000):
+        """
+        Initialize the cluster.
+
+        Args:
+            profiles: One fault profile per endpoint
+            head_slot: Head slot of every endpoint
+        """
+        self.servers = [
+            MockRPCServer(head_slot=head_slot, faults=profile)
+            for profile in profiles
+        ]
+        self.pool = None
+        self._saved: Dict[str, Any] = {}
+
+    @property
+    def urls(self) -> List[str]:
+        return [server.url for server in self.servers]
+
+    async def __aenter__(self) -> "MockCluster":
+        from app.utils import solana_rpc
+        from app.utils.solana_rpc_constants import DEFAULT_RPC_ENDPOINTS
+
+        for server in self.servers:
+            await server.start()
+
+        # Anything that falls back to the default endpoint list lands on the mocks too
+        self._saved = {
+            "defaults": list(DEFAULT_RPC_ENDPOINTS),
+            "class_defaults": list(solana_rpc.SolanaConnectionPool.DEFAULT_RPC_ENDPOINTS),
+            "pool": solana_rpc._connection_pool,
+        }
+        DEFAULT_RPC_ENDPOINTS[:] = self.urls
+        solana_rpc.SolanaConnectionPool.DEFAULT_RPC_ENDPOINTS[:] = self.urls
+
+        self.pool = solana_rpc.SolanaConnectionPool(timeout=30.0, max_retries=3)
+        await self.pool.initialize(self.urls)
+        solana_rpc._connection_pool = self.pool
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        from app.utils import solana_rpc
+        from app.utils.solana_rpc_constants import DEFAULT_RPC_ENDPOINTS
+
+        try:
+            if self.pool is not None:
+                await self.pool.close()
+        finally:
+            DEFAULT_RPC_ENDPOINTS[:] = self._saved["defaults"]
+            solana_rpc.SolanaConnectionPool.DEFAULT_RPC_ENDPOINTS[:] = self._saved["class_defaults"]
+            solana_rpc._connection_pool = self._saved["pool"]
+            for server in self.servers:
+                await server.stop()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        return [server.get_stats() for server in self.servers]
+
+
+def _latency_summary(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    summary = summarize(samples, unit="request")
+    return {key: summary[key] for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms", "max_ms")}
+
+
+async def drive(
+    app: Any,
+    paths: Sequence[str],
+    concurrency: int = 16,
+    requests: Optional[int] = 200,
+    duration: Optional[float] = None,
+    request_timeout: float = 60.0,
+) -> Dict[str, Any]:
+    """
+    Fire requests at an ASGI app from concurrent clients.
+
+    Args:
+        app: ASGI application
+        paths: Request paths, used round-robin
+        concurrency: Number of concurrent clients
+        requests: Total requests to send (None to run for ``duration``)
+        duration: Seconds to keep sending (None to stop after ``requests``)
+        request_timeout: Seconds before a request counts as timed out
+
+    Returns:
+        Throughput, overall and per-path latency and status code counts
+    """
+    import httpx
+
+    if requests is None and duration is None:
+        raise ValueError("Either requests or duration is required")
+
+    counter = itertools.count()
+    latencies: Dict[str, List[float]] = {path: [] for path in paths}
+    statuses: Dict[str, Counter] = {path: Counter() for path in paths}
+    transport = httpx.ASGITransport(app=app)
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://load") as client:
+        async def worker():
+            while True:
+                index = next(counter)
+                if requests is not None and index >= requests:
+                    return
+                if deadline is not None and time.perf_counter() >= deadline:
+                    return
+                path = paths[index % len(paths)]
+                start = time.perf_counter()
+                try:
+                    response = await asyncio.wait_for(client.get(path), request_timeout)
+                    status = str(response.status_code)
+                except asyncio.TimeoutError:
+                    status = "timeout"
+                except Exception as e:
+                    status = type(e).__name__
+                latencies[path].append(time.perf_counter() - start)
+                statuses[path][status] += 1
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    elapsed = time.perf_counter() - started
+    all_latencies = [sample for samples in latencies.values() for sample in samples]
+    all_statuses = sum(statuses.values(), Counter())
+    return {
+        "requests": len(all_latencies),
+        "elapsed_s": elapsed,
+        "throughput_per_s": len(all_latencies) / elapsed if elapsed else 0.0,
+        "success_rate": all_statuses.get("200", 0) / len(all_latencies) if all_latencies else 0.0,
+        "latency": _latency_summary(all_latencies),
+        "status_codes": dict(all_statuses),
+        "paths": {
+            path: {
+                "requests": len(latencies[path]),
+                "latency": _latency_summary(latencies[path]),
+                "status_codes": dict(statuses[path]),
+            }
+            for path in paths
+        },
+    }
+
+
+async def run_load(
+    endpoints: int = 3,
+    profiles: Optional[Sequence[str]] = None,
+    paths: Sequence[str] = DEFAULT_PATHS,
+    concurrency: int = 16,
+    requests: Optional[int] = 200,
+    duration: Optional[float] = None,
+    request_timeout: float = 60.0,
+    app: Any = None,
+) -> Dict[str, Any]:
+    """
+    Run a load test against mock RPC endpoints.
+
+    Args:
+        endpoints: Number of mock endpoints
+        profiles: Fault profile specs, assigned to endpoints round-robin
+        paths: Request paths, used round-robin
+        concurrency: Number of concurrent clients
+        requests: Total requests to send (None to run for ``duration``)
+        duration: Seconds to keep sending
+        request_timeout: Seconds before a request counts as timed out
+        app: ASGI application (defaults to ``app.main.app``)
+
+    Returns:
+        Report with settings, environment, load results and per-endpoint stats
+    """
+    specs = list(profiles or [DEFAULT_PROFILE])
+    fault_profiles = [FaultProfile.parse(specs[i % len(specs)]) for i in range(endpoints)]
+    for i, profile in enumerate(fault_profiles):
+        # Same settings, independent fault sequences
+        profile.seed += i
+
+    if app is None:
+        from app.main import app
+
+    async with MockCluster(fault_profiles) as cluster:
+        results = await drive(app, paths, concurrency, requests, duration, request_timeout)
+        endpoint_stats = cluster.get_stats()
+
+    return {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "environment": environment(),
+        "settings": {
+            "endpoints": endpoints,
+            "concurrency": concurrency,
+            "requests": requests,
+            "duration": duration,
+            "request_timeout": request_timeout,
+            "paths": list(paths),
+        },
+        "load": results,
+        "mock_endpoints": endpoint_stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Soleco API against local mock RPC endpoints")
+    parser.add_argument("--endpoints", type=int, default=3, help="Number of mock RPC endpoints")
+    parser.add_argument("--profile", action="append", help=f'Fault profile per endpoint, round-robin (default "{DEFAULT_PROFILE}")')
+    parser.add_argument("--path", action="append", help="API path to request, round-robin (repeatable)")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--duration", type=float, help="Run for this many seconds instead of a request count")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Per-request timeout in seconds")
+    parser.add_argument("--output", help="Report path (default: results/load-<timestamp>.json)")
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run_load(
+        endpoints=args.endpoints,
+        profiles=args.profile,
+        paths=args.path or DEFAULT_PATHS,
+        concurrency=args.concurrency,
+        requests=None if args.duration else args.requests,
+        duration=args.duration,
+        request_timeout=args.timeout,
+    ))
+    output = Path(args.output) if args.output else RESULTS_DIR / f"load-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+
+    load = report["load"]
+    latency = load["latency"]
+    print(f"{load['requests']} requests in {load['elapsed_s']:.2f}s: {load['throughput_per_s']:.1f} req/s, "
+          f"p50 {latency.get('p50_ms', 0):.1f}ms, p99 {latency.get('p99_ms', 0):.1f}ms, "
+          f"success {load['success_rate'] * 100:.1f}%")
+    for path, result in load["paths"].items():
+        print(f"  {path:<64} {json.dumps(result['status_codes'])}  p99 {result['latency'].get('p99_ms', 0):.1f}ms")
+    for stats in report["mock_endpoints"]:
+        print(f"  {stats['url']:<24} {stats['total_requests']:>6} rpc calls  injected {json.dumps(stats['injected'])}")
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
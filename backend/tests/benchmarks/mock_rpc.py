@@ -0,0 +1,343 @@
+"""
+Local mock Solana JSON-RPC server serving benchmark fixtures.
+
+Each server can carry a ``FaultProfile`` that injects the failure modes real
+RPC providers show under load: a latency distribution, HTTP 429s, JSON-RPC
+``-32005`` rate-limit errors, requests that hang past the client timeout and
+skipped slots. Faults are drawn from a seeded generator, so a given profile
+and request sequence reproduces the same run.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, FrozenSet, Optional
+
+from aiohttp import web
+
+from .fixtures import BLOCK_JSON, BLOCK_PARSED, CLUSTER_NODES, VOTE_ACCOUNTS, load_fixture_bytes
+
+SLOTS_PER_EPOCH = 432_000
+
+# JSON-RPC error codes returned by Solana RPC nodes
+RATE_LIMITED = -32005
+SLOT_SKIPPED = -32007
+METHOD_NOT_FOUND = -32601
+
+
+@dataclass
+class FaultProfile:
+    """
+    Latency and fault injection settings for one mock endpoint.
+
+    Latency is log-normal around ``latency_ms`` with shape ``latency_jitter``
+    (0 gives a fixed latency), which produces the long tail of a busy node.
+    Rates are probabilities per request; ``skipped_slot_rate`` is the share
+    of slots that were never produced.
+    """
+
+    latency_ms: float = 0.0
+    latency_jitter: float = 0.0
+    http_429_rate: float = 0.0
+    rpc_rate_limit_rate: float = 0.0
+    timeout_rate: float = 0.0
+    timeout_seconds: float = 60.0
+    skipped_slot_rate: float = 0.0
+    skipped_slots: FrozenSet[int] = field(default_factory=frozenset)
+    methods: Optional[FrozenSet[str]] = None
+    seed: int = 7
+
+    # Short names accepted by ``parse``
+    ALIASES = {
+        "latency": "latency_ms",
+        "jitter": "latency_jitter",
+        "429": "http_429_rate",
+        "32005": "rpc_rate_limit_rate",
+        "timeout": "timeout_rate",
+        "hang": "timeout_seconds",
+        "skip": "skipped_slot_rate",
+        "seed": "seed",
+    }
+
+    @classmethod
+    def parse(cls, spec: str) -> "FaultProfile":
+        """
+        Build a profile from a compact ``key=value`` list.
+
+        Args:
+            spec: e.g. ``"latency=40,jitter=0.5,429=0.02,32005=0.01,timeout=0.005,skip=0.05"``
+
+        Returns:
+            The profile
+        """
+        values: Dict[str, Any] = {}
+        for item in filter(None, (part.strip() for part in spec.split(","))):
+            key, _, value = item.partition("=")
+            name = cls.ALIASES.get(key.strip(), key.strip())
+            if name not in cls.__dataclass_fields__:
+                raise ValueError(f"Unknown fault setting: {key}")
+            values[name] = int(value) if name == "seed" else float(value)
+        return cls(**values)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["skipped_slots"] = sorted(self.skipped_slots)
+        data["methods"] = sorted(self.methods) if self.methods is not None else None
+        return data
+
+    def is_skipped(self, slot: int) -> bool:
+        """Whether a slot was skipped; stable for a given seed."""
+        if slot in self.skipped_slots:
+            return True
+        if not self.skipped_slot_rate:
+            return False
+        return ((slot * 2654435761 + self.seed) & 0xFFFFFFFF) / 0x100000000 < self.skipped_slot_rate
+
+    def applies_to(self, method: str) -> bool:
+        return self.methods is None or method in self.methods
+
+
+class MockRPCServer:
+    """
+    Minimal JSON-RPC server answering the methods the query pipeline uses.
+
+    ``getBlock`` returns the recorded block for every slot, re-encoded only
+    in its ``id``; the fixture body is spliced in as raw bytes so the server
+    itself costs as little as possible.
+    """
+
+    def __init__(
+        self,
+        head_slot: int = 300_000_000,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        faults: Optional[FaultProfile] = None,
+        slot_interval: Optional[float] = None,
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            head_slot: Slot reported by ``getSlot`` at start
+            host: Interface to bind
+            port: Port to bind, 0 for any free port
+            faults: Latency and fault injection settings
+            slot_interval: If set, seconds per slot by which the head advances while running
+        """
+        self._start_slot = head_slot
+        self.host = host
+        self.port = port
+        self.faults = faults or FaultProfile()
+        self.slot_interval = slot_interval
+        self.requests: Dict[str, int] = {}
+        self.injected: Counter = Counter()
+        self._random = random.Random(self.faults.seed)
+        self._started = time.monotonic()
+        self._closing = asyncio.Event()
+        self._results: Dict[str, bytes] = {}
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def head_slot(self) -> int:
+        if not self.slot_interval:
+            return self._start_slot
+        return self._start_slot + int((time.monotonic() - self._started) / self.slot_interval)
+
+    @head_slot.setter
+    def head_slot(self, slot: int) -> None:
+        self._start_slot = slot
+        self._started = time.monotonic()
+
+    def _result_bytes(self, name: str) -> bytes:
+        if name not in self._results:
+            envelope = load_fixture_bytes(name)
+            start = envelope.index(b'"result":') + len(b'"result":')
+            end = envelope.rindex(b',"id"')
+            self._results[name] = envelope[start:end]
+        return self._results[name]
+
+    def _dispatch(self, method: str, params: list) -> bytes:
+        head = self.head_slot
+        if method == "getSlot":
+            return str(head).encode()
+        if method in ("getBlockHeight",):
+            return str(head - 20_000_000).encode()
+        if method == "getBlocks":
+            start = params[0]
+            end = params[1] if len(params) > 1 and isinstance(params[1], int) else head
+            slots = range(start, min(end, head) + 1)
+            return json.dumps([slot for slot in slots if not self.faults.is_skipped(slot)]).encode()
+        if method == "getBlock":
+            options = params[1] if len(params) > 1 and isinstance(params[1], dict) else {}
+            name = BLOCK_PARSED if options.get("encoding") == "jsonParsed" else BLOCK_JSON
+            return self._result_bytes(name)
+        if method == "getBlockTime":
+            return str(1_700_000_000 + params[0] * 2 // 5).encode()
+        if method == "getFirstAvailableBlock":
+            return str(max(0, head - 1_000_000)).encode()
+        if method == "getEpochInfo":
+            return json.dumps({
+                "absoluteSlot": head,
+                "blockHeight": head - 20_000_000,
+                "epoch": head // SLOTS_PER_EPOCH,
+                "slotIndex": head % SLOTS_PER_EPOCH,
+                "slotsInEpoch": SLOTS_PER_EPOCH,
+                "transactionCount": head * 1000,
+            }).encode()
+        if method == "getRecentPerformanceSamples":
+            limit = params[0] if params and isinstance(params[0], int) else 720
+            return json.dumps([
+                {"slot": head - i * 150, "numSlots": 150, "numTransactions": 240_000,
+                 "numNonVoteTransactions": 60_000, "samplePeriodSecs": 60}
+                for i in range(min(limit, 720))
+            ]).encode()
+        if method in ("getLatestBlockhash", "getRecentBlockhash"):
+            return json.dumps({
+                "context": {"slot": head},
+                "value": {"blockhash": "EkSnNWid2cvwEVnVx9aBqawnmiCNiDgp3gUdkDPTKN1N",
+                          "lastValidBlockHeight": head - 20_000_000 + 150,
+                          "feeCalculator": {"lamportsPerSignature": 5000}},
+            }).encode()
+        if method == "getBlockProduction":
+            return json.dumps({
+                "context": {"slot": head},
+                "value": {"byIdentity": {}, "range": {"firstSlot": head - SLOTS_PER_EPOCH // 4, "lastSlot": head}},
+            }).encode()
+        if method == "getSignaturesForAddress":
+            return b"[]"
+        if method in ("getTransaction", "getValidatorInfo"):
+            return b"null"
+        if method == "getAccountInfo":
+            return json.dumps({"context": {"slot": head}, "value": None}).encode()
+        if method == "getVoteAccounts":
+            return self._result_bytes(VOTE_ACCOUNTS)
+        if method == "getClusterNodes":
+            return self._result_bytes(CLUSTER_NODES)
+        if method == "getVersion":
+            return b'{"solana-core":"2.2.14","feature-set":3294202862}'
+        if method == "getHealth":
+            return b'"ok"'
+        raise KeyError(method)
+
+    def _latency(self) -> float:
+        faults = self.faults
+        if not faults.latency_ms:
+            return 0.0
+        if not faults.latency_jitter:
+            return faults.latency_ms / 1000
+        return faults.latency_ms * math.exp(self._random.gauss(0.0, faults.latency_jitter)) / 1000
+
+    @staticmethod
+    def _error(request_id: Any, code: int, message: str) -> bytes:
+        return json.dumps({"jsonrpc": "2.0", "id": request_id,
+                           "error": {"code": code, "message": message}}).encode()
+
+    def _answer(self, payload: Dict[str, Any]) -> bytes:
+        method = payload.get("method")
+        params = payload.get("params") or []
+        request_id = payload.get("id")
+        self.requests[method] = self.requests.get(method, 0) + 1
+
+        faults = self.faults
+        if faults.applies_to(method) and faults.rpc_rate_limit_rate and self._random.random() < faults.rpc_rate_limit_rate:
+            self.injected["rpc_rate_limited"] += 1
+            return self._error(request_id, RATE_LIMITED, "Server responded with 429 Too Many Requests")
+        if method == "getBlock" and params and isinstance(params[0], int) and faults.is_skipped(params[0]):
+            self.injected["skipped_slot"] += 1
+            return self._error(
+                request_id, SLOT_SKIPPED,
+                f"Slot {params[0]} was skipped, or missing due to ledger jump to recent snapshot"
+            )
+
+        try:
+            result = self._dispatch(method, params)
+        except KeyError:
+            return self._error(request_id, METHOD_NOT_FOUND, "Method not found")
+        return b'{"jsonrpc":"2.0","result":' + result + b',"id":' + json.dumps(request_id).encode() + b"}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        payload = await request.json()
+        calls = payload if isinstance(payload, list) else [payload]
+        methods = [call.get("method") for call in calls]
+        faults = self.faults
+
+        delay = self._latency()
+        if delay:
+            await asyncio.sleep(delay)
+
+        if any(faults.applies_to(method) for method in methods):
+            if faults.timeout_rate and self._random.random() < faults.timeout_rate:
+                self.injected["timeout"] += 1
+                try:
+                    await asyncio.wait_for(self._closing.wait(), faults.timeout_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                return web.Response(status=504, text="Gateway Timeout")
+            if faults.http_429_rate and self._random.random() < faults.http_429_rate:
+                self.injected["http_429"] += 1
+                return web.Response(status=429, text="Too Many Requests", headers={"Retry-After": "1"})
+
+        answers = [self._answer(call) for call in calls]
+        body = b"[" + b",".join(answers) + b"]" if isinstance(payload, list) else answers[0]
+        return web.Response(body=body, content_type="application/json")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Requests served per method and faults injected, by kind."""
+        return {
+            "url": self.url,
+            "requests": dict(self.requests),
+            "total_requests": sum(self.requests.values()),
+            "injected": dict(self.injected),
+            "faults": self.faults.to_dict(),
+        }
+
+    async def start(self) -> "MockRPCServer":
+        self._closing = asyncio.Event()
+        app = web.Application(client_max_size=1024 ** 2)
+        app.router.add_post("/", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, self.host, self.port)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        self._started = time.monotonic()
+        return self
+
+    async def stop(self) -> None:
+        # Release requests held open by timeout injection so shutdown does not wait on them
+        self._closing.set()
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def __aenter__(self) -> "MockRPCServer":
+        return await self.start()
+
+    async def __aexit__(self, *args: Any) -> None:
+        await self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixtures as a Solana JSON-RPC endpoint")
+    parser.add_argument("--port", type=int, default=8899)
+    parser.add_argument("--faults", default="", help='Fault profile, e.g. "latency=40,jitter=0.5,429=0.02,skip=0.05"')
+    parser.add_argument("--slot-interval", type=float, default=None, help="Seconds per slot to advance the head")
+    args = parser.parse_args()
+
+    async def _serve():
+        server = MockRPCServer(port=args.port, faults=FaultProfile.parse(args.faults), slot_interval=args.slot_interval)
+        async with server:
+            print(f"Mock RPC listening on {server.url}")
+            await asyncio.Event().wait()
+
+    asyncio.run(_serve())
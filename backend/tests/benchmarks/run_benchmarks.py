@@ -0,0 +1,469 @@
+"""
+Benchmark suite for the block-processing and caching hot paths.
+
+Runs every benchmark against the recorded fixtures in ``data/`` and writes a
+JSON report with throughput, latency percentiles and environment details so
+runs on different commits can be compared.
+
+Usage (from ``backend/``)::
+
+    python -m tests.benchmarks.run_benchmarks
+    python -m tests.benchmarks.run_benchmarks --only extractor.mint --iterations 50
+    python -m tests.benchmarks.run_benchmarks --compare results/old.json results/new.json
+"""
+
+import argparse
+import asyncio
+import datetime
+import gc
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .fixtures import BLOCK_JSON, BLOCK_PARSED, CLUSTER_NODES, VOTE_ACCOUNTS, load_fixture_bytes, load_result
+from .mock_rpc import MockRPCServer
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+BENCHMARKS: Dict[str, Callable[..., Awaitable[Dict[str, Any]]]] = {}
+
+
+def benchmark(name: str):
+    """Register a benchmark coroutine under ``name``."""
+    def decorator(func):
+        BENCHMARKS[name] = func
+        return func
+    return decorator
+
+
+def summarize(samples: List[float], units: int = 1, unit: str = "tx") -> Dict[str, Any]:
+    """
+    Summarize per-iteration timings.
+
+    Args:
+        samples: Seconds taken by each iteration
+        units: Work items (transactions, requests, ...) processed per iteration
+        unit: Name of the work item
+
+    Returns:
+        Dictionary with iteration count, latency percentiles in ms and throughput
+    """
+    ordered = sorted(samples)
+
+    def percentile(p: float) -> float:
+        index = min(len(ordered) - 1, int(round(p * (len(ordered) - 1))))
+        return ordered[index] * 1000
+
+    total = sum(samples)
+    return {
+        "iterations": len(samples),
+        "unit": unit,
+        "units_per_iteration": units,
+        "mean_ms": statistics.fmean(samples) * 1000,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+        "min_ms": ordered[0] * 1000,
+        "max_ms": ordered[-1] * 1000,
+        "throughput_per_s": (units * len(samples)) / total if total else 0.0,
+    }
+
+
+def _time_sync(func: Callable[[], Any], iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        func()
+    samples = []
+    gc.collect()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def _peak_bytes(func: Callable[[], Any]) -> int:
+    """Peak memory allocated while func runs, as traced by tracemalloc."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def _time_async(func: Callable[[], Awaitable[Any]], iterations: int, warmup: int) -> List[float]:
+    for _ in range(warmup):
+        await func()
+    samples = []
+    gc.collect()
+    for _ in range(iterations):
+        start = time.perf_counter()
+        await func()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+@benchmark("decode.block")
+async def bench_decode_block(iterations: int, warmup: int) -> Dict[str, Any]:
+    """Decode a full getBlock response body."""
+    from app.utils.serialization import loads
+
+    body = load_fixture_bytes(BLOCK_JSON)
+    samples = _time_sync(lambda: loads(body), iterations, warmup)
+    return summarize(samples, units=len(body), unit="byte")
+
+
+@benchmark("decode.stream_block")
+async def bench_decode_block_stream(iterations: int, warmup: int) -> Dict[str, Any]:
+    """Stream-decode a getBlock body in socket-sized chunks, dropping each transaction once seen."""
+    from app.config import RPC_STREAM_CONFIG
+    from app.utils.json_stream import ArrayStreamDecoder
+    from app.utils.serialization import loads
+
+    body = load_fixture_bytes(BLOCK_JSON)
+    chunk_size = RPC_STREAM_CONFIG['chunk_size']
+
+    def stream():
+        decoder = ArrayStreamDecoder(RPC_STREAM_CONFIG['array_paths']['getBlock'])
+        for offset in range(0, len(body), chunk_size):
+            decoder.feed(body[offset:offset + chunk_size])
+        decoder.close()
+
+    samples = _time_sync(stream, iterations, warmup)
+    result = summarize(samples, units=len(body), unit="byte")
+    result["peak_bytes"] = _peak_bytes(stream)
+    result["peak_bytes_full_decode"] = _peak_bytes(lambda: loads(body))
+    return result
+
+
+@benchmark("decode.vote_accounts")
+async def bench_decode_vote_accounts(iterations: int, warmup: int) -> Dict[str, Any]:
+    """Decode getVoteAccounts and getClusterNodes bodies."""
+    from app.utils.serialization import loads
+
+    bodies = [load_fixture_bytes(VOTE_ACCOUNTS), load_fixture_bytes(CLUSTER_NODES)]
+    samples = _time_sync(lambda: [loads(body) for body in bodies], iterations, warmup)
+    return summarize(samples, units=len(bodies), unit="response")
+
+
+@benchmark("extractor.mint")
+async def bench_mint_extractor(iterations: int, warmup: int) -> Dict[str, Any]:
+    """MintExtractor.process_block over the json-encoded block."""
+    from app.utils.handlers.mint_extractor import MintExtractor
+
+    block = load_result(BLOCK_JSON)
+    samples = _time_sync(lambda: MintExtractor().process_block(block), iterations, warmup)
+    return summarize(samples, units=len(block["transactions"]))
+
+
+@benchmark("compact.mint")
+async def bench_compact_mint_extractor(iterations: int, warmup: int) -> Dict[str, Any]:
+    """Build a CompactBlock from the json-encoded block and run MintExtractor on it."""
+    from app.utils.block_model import CompactBlock
+    from app.utils.handlers.mint_extractor import MintExtractor
+
+    block = load_result(BLOCK_JSON)
+    samples = _time_sync(lambda: MintExtractor().process_block(CompactBlock.from_block(block)), iterations, warmup)
+    result = summarize(samples, units=len(block["transactions"]))
+    result["peak_bytes"] = _peak_bytes(lambda: CompactBlock.from_block(block))
+    return result
+
+
+@benchmark("extractor.pump")
+async def bench_pump_extractor(iterations: int, warmup: int) -> Dict[str, Any]:
+    """PumpExtractor.process_block over the jsonParsed block."""
+    from app.utils.handlers.pump_extractor import PumpExtractor
+
+    block = load_result(BLOCK_PARSED)
+    samples = _time_sync(lambda: PumpExtractor().process_block(block), iterations, warmup)
+    return summarize(samples, units=len(block["transactions"]))
+
+
+@benchmark("handler.base")
+async def bench_base_handler(iterations: int, warmup: int) -> Dict[str, Any]:
+    """BaseHandler.process_block over the jsonParsed block."""
+    from app.utils.handlers.base_handler import BaseHandler
+
+    block = load_result(BLOCK_PARSED)
+    samples = await _time_async(lambda: BaseHandler().process_block(block), iterations, warmup)
+    return summarize(samples, units=len(block["transactions"]))
+
+
+@benchmark("pool.get_client")
+async def bench_pool_get_client(iterations: int, warmup: int) -> Dict[str, Any]:
+    """Client selection from an initialized SolanaConnectionPool."""
+    from app.utils.solana_rpc import SolanaConnectionPool
+
+    selections = 1000
+    async with MockRPCServer() as server:
+        pool = SolanaConnectionPool()
+        await pool.initialize([server.url, f"http://localhost:{server.port}"])
+        try:
+            async def select():
+                for _ in range(selections):
+                    await pool.get_client()
+
+            samples = await _time_async(select, iterations, warmup)
+        finally:
+            await pool.close()
+    return summarize(samples, units=selections, unit="selection")
+
+
+@benchmark("query.process_blocks")
+async def bench_query_pipeline(iterations: int, warmup: int, num_blocks: int = 5) -> Dict[str, Any]:
+    """
+    End-to-end SolanaQueryHandler.process_blocks against the mock RPC server.
+
+    Includes HTTP round trips, response decoding and the pipeline's own
+    per-block pacing, so it reflects what an API request actually waits for.
+    """
+    from app.utils.solana_query import SolanaQueryHandler
+    from app.utils.solana_rpc import SolanaConnectionPool
+
+    async with MockRPCServer() as server:
+        handler = SolanaQueryHandler(None)
+        handler.connection_pool = SolanaConnectionPool()
+        await handler.connection_pool.initialize([server.url])
+        handler.initialized = True
+        await handler.initialize()
+        try:
+            transactions = 0
+
+            async def run():
+                nonlocal transactions
+                result = await handler.process_blocks(num_blocks=num_blocks)
+                transactions = result["statistics"]["total_transactions"]
+
+            samples = await _time_async(run, max(1, iterations // 10), min(warmup, 1))
+        finally:
+            await handler.connection_pool.close()
+    summary = summarize(samples, units=transactions)
+    summary["blocks_per_iteration"] = num_blocks
+    return summary
+
+
+@benchmark("query.extract_blocks")
+async def bench_extract_blocks(iterations: int, warmup: int, num_blocks: int = 20) -> Dict[str, Any]:
+    """
+    SolanaQueryHandler.extract_blocks with the mint extractor on the block worker processes.
+
+    Also samples event loop lag while extraction runs, which is what the
+    worker tier is meant to keep low.
+    """
+    from app.utils.block_workers import BlockWorkerPool
+    from app.utils.solana_query import SolanaQueryHandler
+    from app.utils.solana_rpc import SolanaConnectionPool
+
+    workers = BlockWorkerPool(max_workers=os.cpu_count() or 1)
+    async with MockRPCServer() as server:
+        handler = SolanaQueryHandler(None)
+        handler.connection_pool = SolanaConnectionPool()
+        await handler.connection_pool.initialize([server.url])
+        handler.initialized = True
+        lags: List[float] = []
+
+        async def sample_lag():
+            loop = asyncio.get_running_loop()
+            while True:
+                start = loop.time()
+                await asyncio.sleep(0.005)
+                lags.append(loop.time() - start - 0.005)
+
+        try:
+            transactions = 0
+
+            async def run():
+                nonlocal transactions
+                result = await handler.extract_blocks(["mints"], num_blocks=num_blocks, workers=workers)
+                transactions = result["statistics"]["total_transactions"]
+
+            await _time_async(run, 0, max(1, warmup))
+            sampler = asyncio.create_task(sample_lag())
+            samples = await _time_async(run, max(1, iterations // 5), 0)
+            sampler.cancel()
+        finally:
+            workers.shutdown()
+            await handler.connection_pool.close()
+    summary = summarize(samples, units=transactions)
+    summary["blocks_per_iteration"] = num_blocks
+    summary["workers"] = workers.max_workers
+    summary["max_event_loop_lag_ms"] = max(lags, default=0.0) * 1000
+    return summary
+
+
+@benchmark("middleware.cache")
+async def bench_cache_middleware(iterations: int, warmup: int, requests: int = 50) -> Dict[str, Any]:
+    """CacheMiddleware request throughput for cache hits and misses."""
+    import httpx
+    from fastapi import FastAPI
+
+    from app.database import middleware, sqlite
+    from app.utils.serialization import SolecoJSONResponse
+
+    payload = load_result(CLUSTER_NODES)
+    app = FastAPI(default_response_class=SolecoJSONResponse)
+    app.add_middleware(middleware.CacheMiddleware)
+
+    @app.get("/soleco/network/rpc-nodes")
+    async def rpc_nodes(page: int = 0):
+        return SolecoJSONResponse({"rpc_nodes": payload, "page": page})
+
+    original_file, original_cache = sqlite.DB_FILE, middleware.db_cache
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite.DB_FILE = os.path.join(tmp, "bench.db")
+        middleware.db_cache = sqlite.DatabaseCache()
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+                page = 0
+
+                async def misses():
+                    nonlocal page
+                    for _ in range(requests):
+                        page += 1
+                        response = await client.get("/soleco/network/rpc-nodes", params={"page": page})
+                        response.raise_for_status()
+
+                async def hits():
+                    for _ in range(requests):
+                        response = await client.get("/soleco/network/rpc-nodes", params={"page": 1})
+                        response.raise_for_status()
+
+                miss_samples = await _time_async(misses, max(1, iterations // 10), 0)
+                hit_samples = await _time_async(hits, max(1, iterations // 10), 1)
+        finally:
+            middleware.db_cache._close()
+            sqlite.DB_FILE, middleware.db_cache = original_file, original_cache
+    return {
+        "miss": summarize(miss_samples, units=requests, unit="request"),
+        "hit": summarize(hit_samples, units=requests, unit="request"),
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and commit a report was produced on."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=Path(__file__).parent, timeout=10
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": commit,
+    }
+
+
+async def run(names: Optional[List[str]] = None, iterations: int = 20, warmup: int = 2) -> Dict[str, Any]:
+    """
+    Run the selected benchmarks.
+
+    Args:
+        names: Benchmark names or name prefixes; all benchmarks when empty
+        iterations: Timed iterations for the per-block benchmarks
+        warmup: Untimed iterations before measuring
+
+    Returns:
+        Report with environment details and one entry per benchmark
+    """
+    selected = [
+        name for name in BENCHMARKS
+        if not names or any(name.startswith(n) for n in names)
+    ]
+    report = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": environment(),
+        "settings": {"iterations": iterations, "warmup": warmup},
+        "benchmarks": {},
+    }
+    for name in selected:
+        started = time.perf_counter()
+        try:
+            report["benchmarks"][name] = await BENCHMARKS[name](iterations, warmup)
+        except Exception as e:
+            report["benchmarks"][name] = {"error": str(e)}
+        print(f"{name:<24} done in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return report
+
+
+def _throughputs(report: Dict[str, Any]) -> Dict[str, float]:
+    values = {}
+    for name, result in report.get("benchmarks", {}).items():
+        if "throughput_per_s" in result:
+            values[name] = result["throughput_per_s"]
+        else:
+            for sub, sub_result in result.items():
+                if isinstance(sub_result, dict) and "throughput_per_s" in sub_result:
+                    values[f"{name}.{sub}"] = sub_result["throughput_per_s"]
+    return values
+
+
+def compare(baseline_path: str, candidate_path: str) -> str:
+    """
+    Render a throughput comparison between two reports.
+
+    Args:
+        baseline_path: Report to compare against
+        candidate_path: Report being evaluated
+
+    Returns:
+        Table with per-benchmark throughput and relative change
+    """
+    baseline = _throughputs(json.loads(Path(baseline_path).read_text()))
+    candidate = _throughputs(json.loads(Path(candidate_path).read_text()))
+    lines = [f"{'benchmark':<28}{'baseline/s':>14}{'candidate/s':>14}{'change':>10}"]
+    for name in sorted(set(baseline) | set(candidate)):
+        old, new = baseline.get(name), candidate.get(name)
+        change = f"{(new - old) / old * 100:+.1f}%" if old and new is not None else "n/a"
+        lines.append(f"{name:<28}{old or 0:>14.1f}{new or 0:>14.1f}{change:>10}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Soleco hot-path benchmarks")
+    parser.add_argument("--only", nargs="*", help="Benchmark names or prefixes to run")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--output", help="Report path (default: results/<timestamp>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two reports")
+    parser.add_argument("--list", action="store_true", help="List available benchmarks")
+    args = parser.parse_args()
+
+    if args.list:
+        for name, func in BENCHMARKS.items():
+            print(f"{name:<24} {(func.__doc__ or '').strip().splitlines()[0]}")
+        return
+    if args.compare:
+        print(compare(*args.compare))
+        return
+
+    logging.disable(logging.WARNING)
+    report = asyncio.run(run(args.only, args.iterations, args.warmup))
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{time.strftime('%Y%m%d-%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    for name, result in report["benchmarks"].items():
+        if "throughput_per_s" in result:
+            print(f"{name:<24} {result['throughput_per_s']:>12.1f} {result['unit']}/s  p95 {result['p95_ms']:.2f}ms")
+        else:
+            print(f"{name:<24} {json.dumps(result)[:100]}")
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""
+Smoke test that keeps the benchmark suite runnable.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from .fixtures import BLOCK_JSON, BLOCK_PARSED, load_result
+from .load_test import drive
+from .mock_rpc import RATE_LIMITED, SLOT_SKIPPED, FaultProfile, MockRPCServer
+from .run_benchmarks import compare, run
+
+
+def test_fixtures_are_blocks_with_transactions():
+    for name in (BLOCK_JSON, BLOCK_PARSED):
+        block = load_result(name)
+        assert len(block["transactions"]) > 100
+        assert block["blockTime"]
+
+
+@pytest.mark.asyncio
+async def test_mock_rpc_serves_fixture_block():
+    import aiohttp
+
+    async with MockRPCServer(head_slot=1000) as server:
+        async with aiohttp.ClientSession() as session:
+            payload = {"jsonrpc": "2.0", "id": 7, "method": "getBlock",
+                       "params": [999, {"encoding": "json"}]}
+            async with session.post(server.url, json=payload) as response:
+                body = await response.json()
+
+    assert body["id"] == 7
+    assert len(body["result"]["transactions"]) == len(load_result(BLOCK_JSON)["transactions"])
+
+
+@pytest.mark.asyncio
+async def test_quick_run_reports_every_selected_benchmark(tmp_path):
+    report = await run(["decode.block", "extractor.mint"], iterations=2, warmup=0)
+
+    assert set(report["benchmarks"]) == {"decode.block", "extractor.mint"}
+    assert report["benchmarks"]["extractor.mint"]["throughput_per_s"] > 0
+    assert report["environment"]["python"]
+
+    path = tmp_path / "report.json"
+    path.write_text(json.dumps(report))
+    assert "extractor.mint" in compare(str(path), str(path))
+
+
+async def _rpc(session, url, method, params=None):
+    payload = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or []}
+    async with session.post(url, json=payload) as response:
+        return response.status, (await response.json() if response.status == 200 else None)
+
+
+@pytest.mark.asyncio
+async def test_mock_rpc_injects_faults():
+    import aiohttp
+
+    profile = FaultProfile.parse("429=1")
+    assert profile.http_429_rate == 1.0
+    with pytest.raises(ValueError):
+        FaultProfile.parse("bogus=1")
+
+    async with aiohttp.ClientSession() as session:
+        async with MockRPCServer(faults=profile) as server:
+            assert (await _rpc(session, server.url, "getSlot"))[0] == 429
+
+        async with MockRPCServer(faults=FaultProfile(rpc_rate_limit_rate=1.0, methods=frozenset({"getBlock"}))) as server:
+            assert (await _rpc(session, server.url, "getBlock", [5]))[1]["error"]["code"] == RATE_LIMITED
+            assert (await _rpc(session, server.url, "getSlot"))[1]["result"] == server.head_slot
+
+        async with MockRPCServer(faults=FaultProfile(timeout_rate=1.0, timeout_seconds=30)) as server:
+            with pytest.raises(asyncio.TimeoutError):
+                await asyncio.wait_for(_rpc(session, server.url, "getSlot"), 0.2)
+            assert server.injected["timeout"] == 1
+
+
+@pytest.mark.asyncio
+async def test_mock_rpc_skipped_slots_are_consistent():
+    import aiohttp
+
+    profile = FaultProfile(skipped_slot_rate=0.3, skipped_slots=frozenset({101}))
+    async with MockRPCServer(head_slot=200, faults=profile) as server:
+        async with aiohttp.ClientSession() as session:
+            _, blocks = await _rpc(session, server.url, "getBlocks", [100, 199])
+            _, skipped = await _rpc(session, server.url, "getBlock", [101, {"encoding": "json"}])
+
+    produced = set(blocks["result"])
+    assert 101 not in produced and 50 < len(produced) < 100
+    assert produced == {slot for slot in range(100, 200) if not profile.is_skipped(slot)}
+    assert skipped["error"]["code"] == SLOT_SKIPPED
+
+
+@pytest.mark.asyncio
+async def test_load_driver_reports_latency_and_statuses():
+    from fastapi import FastAPI, HTTPException
+
+    app = FastAPI()
+
+    @app.get("/ok")
+    async def ok():
+        await asyncio.sleep(0.001)
+        return {"ok": True}
+
+    @app.get("/fail")
+    async def fail():
+        raise HTTPException(status_code=503)
+
+    result = await drive(app, ["/ok", "/fail"], concurrency=4, requests=20)
+
+    assert result["requests"] == 20
+    assert result["status_codes"] == {"200": 10, "503": 10}
+    assert result["success_rate"] == 0.5
+    assert result["paths"]["/ok"]["latency"]["p99_ms"] >= 1.0
+    assert result["throughput_per_s"] > 0
@@ -0,0 +1,119 @@
+"""
+Tests for the adaptive (AIMD) per-endpoint concurrency limit.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.config import BLOCK_WORKER_CONFIG
+from backend.app.utils import rpc_transport
+from backend.app.utils.adaptive_concurrency import AdaptiveLimit
+from backend.app.utils.rpc_transport import get_rpc_transport
+from backend.app.utils.solana_error import RateLimitError
+from backend.app.utils.solana_query import SolanaQueryHandler
+from backend.app.utils.solana_rpc import SolanaClient
+
+from .benchmarks.mock_rpc import FaultProfile, MockRPCServer
+
+CONFIG = {
+    "initial_limit": 2,
+    "min_limit": 1,
+    "max_limit": 8,
+    "increase": 1.0,
+    "decrease_factor": 0.5,
+    "latency_tolerance": 3.0,
+    "baseline_alpha": 0.01,
+    "error_rate_alpha": 0.1,
+    "max_error_rate": 0.2,
+}
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(rpc_transport, "_rpc_transport", None)
+    return get_rpc_transport()
+
+
+@pytest.mark.asyncio
+async def test_window_bounds_requests_in_flight_and_grows_when_healthy():
+    limit = AdaptiveLimit("https://rpc.example", CONFIG)
+    in_flight, peak = 0, 0
+
+    async def request():
+        nonlocal in_flight, peak
+        async with limit.request():
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.001)
+            in_flight -= 1
+
+    await asyncio.gather(*(request() for _ in range(4)))
+    assert peak == 2
+
+    # Saturated windows of healthy responses grow the limit by about one per window
+    await asyncio.gather(*(request() for _ in range(40)))
+    assert limit.window > 2
+    assert limit.in_flight == 0 and limit.load == 0
+
+
+@pytest.mark.asyncio
+async def test_overload_halves_the_window_once_per_window():
+    limit = AdaptiveLimit("https://rpc.example", {**CONFIG, "initial_limit": 8})
+    requests = [await limit.acquire() for _ in range(4)]
+
+    # Every request of the window is rate limited, but only the first one cuts
+    for request in requests:
+        limit.release(request, overloaded=True)
+    assert limit.window == 4
+    assert limit.stats["decreases"] == 1 and limit.stats["overloads"] == 4
+
+    limit.release(await limit.acquire(), overloaded=True)
+    assert limit.window == 2
+
+    # Slow responses hold the window instead of growing it
+    for _ in range(10):
+        limit.release(await limit.acquire(), latency=0.01)
+    request = await limit.acquire()
+    await limit.acquire()
+    limit.release(request, latency=1.0)
+    assert limit.window == 2
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_client_shrinks_the_endpoint_window(transport):
+    limited = MockRPCServer(faults=FaultProfile(http_429_rate=1.0, methods=frozenset({"getSlot"})))
+    async with limited:
+        client = SolanaClient(limited.url)
+        await client.connect()
+        window = transport.concurrency(limited.url).window
+
+        with pytest.raises(RateLimitError):
+            await client.get_slot()
+
+        stats = transport.get_stats()["endpoints"][limited.url]["concurrency"]
+        await client.close()
+        await transport.close()
+
+    assert stats["window"] == max(1, window // 2)
+    assert stats["in_flight"] == 0
+
+
+@pytest.mark.asyncio
+async def test_block_batch_bounds_blocks_in_flight(monkeypatch):
+    handler = SolanaQueryHandler(None)
+    in_flight, peak = 0, 0
+
+    async def process_block(slot, fields=None):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return {"transactions": [], "success": True}
+
+    monkeypatch.setattr(handler, "process_block", process_block)
+    result = await handler.process_blocks_batch(list(range(50)))
+
+    assert result["statistics"]["processed_blocks"] == 50
+    assert peak == BLOCK_WORKER_CONFIG["fetch_concurrency"]
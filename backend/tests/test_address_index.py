@@ -0,0 +1,172 @@
+"""
+Tests for the local address -> slots/signatures index.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.database import sqlite
+from backend.app.utils import address_index
+from backend.app.utils.address_index import AddressIndex, SlotCoverage, decode_postings, encode_postings
+from backend.app.utils.address_query import AddressQueryPlanner
+from backend.app.utils.block_workers import extract_block
+from backend.app.utils.handlers.address_extractor import AddressExtractor
+
+from .benchmarks.fixtures import BLOCK_JSON, load_fixture_bytes, load_result
+
+MINT = "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU"
+PROGRAM = "6EF8rrecthR5Dkzon8Nwu78hRvfCKubJ14M3uBZ6P"
+VOTE = "Vote111111111111111111111111111111111111111"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    yield cache
+    cache._close()
+
+
+def _tx(signature, keys, mints=()):
+    return {
+        "transaction": {"signatures": [signature], "message": {"accountKeys": list(keys), "instructions": []}},
+        "meta": {"err": None, "postTokenBalances": [{"accountIndex": 0, "mint": mint} for mint in mints]},
+    }
+
+
+def _block(slot, parent_slot, block_time, transactions):
+    return {"slot": slot, "parentSlot": parent_slot, "blockTime": block_time, "transactions": transactions}
+
+
+def test_postings_round_trip_with_delta_encoded_slots():
+    entries = [(300_000_002, 7), (300_000_000, 0), (300_000_000, 3), (300_000_150, 1200)]
+
+    data = encode_postings(entries)
+
+    assert decode_postings(data) == sorted(entries)
+    # 5 bytes for the first slot, 1-2 bytes for each later delta and position
+    assert len(data) <= 14
+
+
+def test_slot_coverage_merges_adjacent_ranges():
+    coverage = SlotCoverage()
+    coverage.add(10, 12)
+    coverage.add(20, 25)
+    assert coverage.covered_until(11) == 12
+    assert coverage.covered_until(15) is None
+
+    coverage.add(13, 19)
+    assert coverage.ranges == [(10, 25)]
+    assert coverage.covers(10, 25) and not coverage.covers(9, 25)
+
+
+def test_extractor_builds_the_same_postings_from_dicts_and_compact_blocks():
+    block = load_result(BLOCK_JSON)
+    block["slot"] = 300_000_000
+    extractor = AddressExtractor()
+    extractor.process_block(block)
+    expected = extractor.get_results()
+
+    extracted = extract_block(load_fixture_bytes(BLOCK_JSON), ("addresses",), slot=300_000_000)
+    results = extracted["results"]["addresses"]
+
+    assert results["signatures"] == expected["signatures"]
+    assert {address: sorted(positions) for address, positions in results["postings"].items()} == \
+        {address: sorted(positions) for address, positions in expected["postings"].items()}
+    # Vote transactions are left out
+    assert VOTE not in results["postings"]
+    assert results["stats"]["indexed_transactions"] + results["stats"]["skipped_transactions"] <= extracted["transactions"]
+
+
+def test_index_answers_lookups_before_and_after_flush(db):
+    index = AddressIndex(db=db, retention_seconds=3600)
+    index.index_block(_block(100, 99, 1_700_000_000, [
+        _tx("sig-a", ["payer", PROGRAM], mints=[MINT]),
+        _tx("vote", ["validator", VOTE]),
+        _tx("sig-b", ["payer2", "other"]),
+    ]))
+    # Slots 101-102 were skipped
+    index.index_block(_block(103, 100, 1_700_000_002, [_tx("sig-c", [PROGRAM, "payer"])]))
+
+    assert index.covers(100, 103)
+    pending = index.lookup(PROGRAM)
+    assert [(info["signature"], info["slot"]) for info in pending] == [("sig-c", 103), ("sig-a", 100)]
+
+    assert index.flush()
+    assert index.lookup(MINT) == [{"signature": "sig-a", "slot": 100, "blockTime": 1_700_000_000}]
+    assert index.lookup(PROGRAM, limit=1)[0]["signature"] == "sig-c"
+    assert index.lookup(PROGRAM, since=1_700_000_001) == [{"signature": "sig-c", "slot": 103, "blockTime": 1_700_000_002}]
+    assert index.slots("payer") == [100, 103]
+    assert index.lookup("validator") == []
+
+    reloaded = AddressIndex(db=db)
+    assert reloaded.load() == 2
+    assert reloaded.coverage.ranges == [(100, 103)]
+
+
+def test_prune_drops_blocks_past_retention(db):
+    index = AddressIndex(db=db, retention_seconds=60)
+    index.index_block(_block(100, 99, 1_000, [_tx("old", [PROGRAM])]))
+    index.index_block(_block(101, 100, 2_000, [_tx("new", [PROGRAM])]))
+    index.flush()
+
+    assert index.prune(now=2_030) == 1
+
+    assert [info["signature"] for info in index.lookup(PROGRAM)] == ["new"]
+    assert index.coverage.ranges == [(101, 101)]
+
+
+@pytest.mark.asyncio
+async def test_full_batches_wake_the_background_writer(db, monkeypatch):
+    monkeypatch.setitem(address_index.ADDRESS_INDEX_CONFIG, "max_pending_blocks", 2)
+    monkeypatch.setitem(address_index.ADDRESS_INDEX_CONFIG, "flush_interval", 60.0)
+    index = AddressIndex(db=db)
+    # Without a writer, blocks stay pending instead of being written by the caller
+    for slot in (100, 101, 102):
+        index.index_block(_block(slot, slot - 1, 1_700_000_000, [_tx(f"sig-{slot}", [PROGRAM])]))
+    assert index.get_stats()["pending_blocks"] == 3
+    assert index.stats["flushes"] == 0
+
+    writer = asyncio.create_task(index.run())
+    await asyncio.sleep(0)
+    await asyncio.to_thread(index.index_block, _block(103, 102, 1_700_000_000, [_tx("sig-103", [PROGRAM])]))
+    for _ in range(100):
+        if index.stats["flushes"]:
+            break
+        await asyncio.sleep(0.01)
+    writer.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await writer
+
+    assert index.stats["flushes"] >= 1
+    assert index.get_stats()["pending_blocks"] == 0
+    assert len(db.get_address_index_slots()) == 4
+
+
+@pytest.mark.asyncio
+async def test_planner_reads_indexed_slots_locally(db):
+    index = AddressIndex(db=db)
+    for slot in range(990, 998):
+        index.index_block(_block(slot, slot - 1, 1_700_000_000 + slot, [_tx(f"{MINT}-{slot}", [MINT])]))
+
+    class Client:
+        pages = []
+
+        async def get_signatures_for_address(self, address, before=None, limit=None):
+            self.pages.append(before)
+            return [{"signature": f"{address}-{slot}", "slot": slot} for slot in (999, 998, 997, 996)]
+
+    client = Client()
+
+    async def get_client():
+        return client
+
+    handler = SimpleNamespace(connection_pool=SimpleNamespace(get_client=get_client))
+    infos = await AddressQueryPlanner(handler, address_index=index).signatures(MINT, start_slot=992, end_slot=999)
+
+    assert [info["slot"] for info in infos] == list(range(999, 991, -1))
+    # Only one RPC page, for the slots after the indexed range
+    assert client.pages == [None]
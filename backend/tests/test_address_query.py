@@ -0,0 +1,163 @@
+"""
+Tests for the address-centric query planner.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from backend.app.utils import address_query, rpc_transport
+from backend.app.utils.address_query import ADDRESS_PLAN, BLOCK_SCAN_PLAN, AddressQueryPlanner, plan_query
+from backend.app.utils.solana_rpc import SolanaClient
+
+from .benchmarks.mock_rpc import FaultProfile, MockRPCServer
+
+
+class FakeClient:
+    """Chain of signatures per address, newest first, one transaction per signature."""
+
+    def __init__(self, history, head_slot=1000, failures=0):
+        self.history = history
+        self.head_slot = head_slot
+        self.failures = failures
+        self.pages = []
+        self.fetched = []
+
+    async def get_slot(self):
+        return self.head_slot
+
+    async def get_signatures_for_address(self, address, before=None, limit=None):
+        if self.failures:
+            self.failures -= 1
+            raise address_query.RetryableError("HTTP error 429")
+        infos = self.history.get(address, [])
+        start = 0
+        if before:
+            start = next(i for i, info in enumerate(infos) if info["signature"] == before) + 1
+        self.pages.append((address, before))
+        return infos[start:start + limit]
+
+    async def get_transaction(self, signature, encoding="json"):
+        self.fetched.append(signature)
+        slot = int(signature.split("-")[1])
+        return {
+            "slot": slot,
+            "blockTime": 1_700_000_000 + slot,
+            "transaction": {"signatures": [signature]},
+            "meta": {"err": None},
+            "version": 0,
+        }
+
+
+def _history(address, slots):
+    return [{"signature": f"{address}-{slot}", "slot": slot} for slot in sorted(slots, reverse=True)]
+
+
+def _planner(client):
+    async def get_client():
+        return client
+
+    async def ensure_initialized():
+        return None
+
+    handler = SimpleNamespace(
+        connection_pool=SimpleNamespace(get_client=get_client),
+        ensure_initialized=ensure_initialized,
+    )
+    return AddressQueryPlanner(handler)
+
+
+@pytest.fixture(autouse=True)
+def config(monkeypatch):
+    monkeypatch.setitem(address_query.ADDRESS_QUERY_CONFIG, "page_size", 10)
+    monkeypatch.setitem(address_query.ADDRESS_QUERY_CONFIG, "max_transactions", 100)
+    monkeypatch.setitem(address_query.ADDRESS_QUERY_CONFIG, "max_addresses", 2)
+
+
+def test_plan_uses_address_index_only_for_few_known_addresses():
+    assert plan_query(["mint"]) == ADDRESS_PLAN
+    assert plan_query(["a", "b"]) == ADDRESS_PLAN
+    assert plan_query(["a", "b", "c"]) == BLOCK_SCAN_PLAN
+    assert plan_query(None) == BLOCK_SCAN_PLAN
+    assert plan_query([""]) == BLOCK_SCAN_PLAN
+
+
+@pytest.mark.asyncio
+async def test_signatures_page_back_to_window_start():
+    client = FakeClient({"mint": _history("mint", range(900, 1000, 2))})
+    planner = _planner(client)
+
+    infos = await planner.signatures("mint", start_slot=950, end_slot=990)
+
+    assert [info["slot"] for info in infos] == list(range(990, 949, -2))
+    # 50 signatures in pages of 10; paging stops once the window start is passed
+    assert len(client.pages) == 3
+
+
+@pytest.mark.asyncio
+async def test_fetch_groups_transactions_into_blocks(monkeypatch):
+    client = FakeClient({
+        "mint": _history("mint", [995, 990, 980, 800]),
+        "pool": _history("pool", [990]) + [{"signature": "mint-990", "slot": 990}],
+    })
+
+    result = await _planner(client).fetch(["mint", "pool"], blocks=50)
+
+    assert (result.start_slot, result.end_slot) == (951, 1000)
+    assert [block["slot"] for block in result.blocks] == [980, 990, 995]
+    assert [len(block["transactions"]) for block in result.blocks] == [1, 2, 1]
+    # The signature shared by both addresses is fetched once
+    assert sorted(client.fetched) == ["mint-980", "mint-990", "mint-995", "pool-990"]
+    assert result.blocks[0]["transactions"][0]["meta"] == {"err": None}
+    assert not result.truncated
+
+
+@pytest.mark.asyncio
+async def test_per_address_limit_marks_result_truncated(monkeypatch):
+    monkeypatch.setitem(address_query.ADDRESS_QUERY_CONFIG, "max_transactions", 5)
+    client = FakeClient({"mint": _history("mint", range(900, 1000))})
+
+    result = await _planner(client).fetch(["mint"], start_slot=0, end_slot=1000)
+
+    assert result.transactions == 5 and result.truncated
+    assert [block["slot"] for block in result.blocks] == [995, 996, 997, 998, 999]
+
+
+@pytest.mark.asyncio
+async def test_blocks_data_retries_and_falls_back(monkeypatch):
+    monkeypatch.setattr(address_query.asyncio, "sleep", _no_sleep)
+    client = FakeClient({"mint": _history("mint", [999])}, failures=1)
+    planner = _planner(client)
+
+    data = await planner.blocks_data(["mint"], blocks=10)
+    assert data["success"] and data["query_plan"]["plan"] == ADDRESS_PLAN
+    assert data["query_plan"]["transactions_fetched"] == 1
+
+    assert await planner.blocks_data(["a", "b", "c"], blocks=10) is None
+
+    client.failures = 10
+    assert await planner.blocks_data(["mint"], blocks=10) is None
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_signature_pages_fall_back_to_block_scan(monkeypatch):
+    monkeypatch.setattr(address_query.asyncio, "sleep", _no_sleep)
+    monkeypatch.setattr(rpc_transport, "_rpc_transport", None)
+    faults = FaultProfile(rpc_rate_limit_rate=1.0, methods=frozenset({"getSignaturesForAddress"}))
+    async with MockRPCServer(faults=faults) as server:
+        client = SolanaClient(server.url)
+        await client.connect()
+        try:
+            with pytest.raises(address_query.RetryableError):
+                await client.get_signatures_for_address("mint", limit=10)
+            # A rate limit is not an empty history: the caller gets None and scans blocks
+            assert await _planner(client).blocks_data(["mint"], blocks=10) is None
+        finally:
+            await client.close()
+            await rpc_transport.get_rpc_transport().close()
+
+    assert server.requests["getSignaturesForAddress"] == 1 + address_query.ADDRESS_QUERY_CONFIG["max_retries"]
+
+
+async def _no_sleep(_):
+    return None
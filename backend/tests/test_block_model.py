@@ -0,0 +1,97 @@
+"""
+Tests for the compact per-block transaction model.
+"""
+
+import pytest
+
+from backend.app.utils.block_model import CompactBlock
+from backend.app.utils.handlers.block_extractor import BlockExtractor
+from backend.app.utils.handlers.mint_extractor import MintExtractor
+
+from .benchmarks.fixtures import BLOCK_JSON, load_result
+
+TOKEN_PROGRAM = "TokenkegQfeZyiNwAJbNbGKPFXCWuBvf9Ss623VQ5DA"
+
+
+@pytest.fixture(scope="module")
+def block():
+    return load_result(BLOCK_JSON)
+
+
+def test_keys_are_interned_once_per_block(block):
+    compact = CompactBlock.from_block(block, slot=42)
+
+    assert compact.slot == 42 and compact.block_time == block["blockTime"]
+    assert len(compact) == len(block["transactions"])
+    all_keys = {key for tx in block["transactions"] for key in tx["transaction"]["message"]["accountKeys"]}
+    assert set(compact.keys.keys) >= all_keys
+    assert len(compact.keys) == len(set(compact.keys.keys))
+
+
+def test_instructions_refer_to_block_key_ids(block):
+    compact = CompactBlock.from_block(block)
+
+    for tx_wrapper, tx in zip(block["transactions"], compact.transactions):
+        message = tx_wrapper["transaction"]["message"]
+        keys = message["accountKeys"]
+        assert [compact.keys[key_id] for key_id in tx.accounts[:len(keys)]] == keys
+        for ix, compact_ix in zip(message["instructions"], tx.instructions):
+            assert compact.keys[compact_ix.program] == keys[ix["programIdIndex"]]
+            assert [compact.keys[key_id] for key_id in compact_ix.accounts] == [keys[i] for i in ix["accounts"]]
+            assert compact_ix.data == ix["data"]
+
+
+def test_loaded_addresses_and_token_balances():
+    compact = CompactBlock.from_block({"slot": 1, "transactions": [{
+        "transaction": {"signatures": ["sig"], "message": {
+            "accountKeys": ["payer", TOKEN_PROGRAM],
+            "instructions": [{"programIdIndex": 1, "accounts": [2, 0], "data": "8"}],
+        }},
+        "meta": {
+            "loadedAddresses": {"writable": ["mint"], "readonly": []},
+            "innerInstructions": [{"index": 0, "instructions": [{"programIdIndex": 1, "accounts": [2], "data": "3"}]}],
+            "preTokenBalances": [],
+            "postTokenBalances": [{"accountIndex": 2, "mint": "mint", "uiTokenAmount": {"amount": "18446744073709551615", "decimals": 6}}],
+        },
+    }]})
+
+    tx = compact.transactions[0]
+    mint_id = compact.keys.id_of("mint")
+    assert tx.signature == "sig"
+    assert list(tx.instructions[0].accounts) == [mint_id, compact.keys.id_of("payer")]
+    assert [ix.data for ix in tx.all_instructions()] == ["8", "3"]
+    assert compact.keys.ids({TOKEN_PROGRAM, "unknown"}) == {tx.instructions[0].program}
+    balances = tx.post_token_balances
+    assert list(balances.mints) == [mint_id] and list(balances.accounts) == [mint_id]
+    assert balances.amounts[0] == 2 ** 64 - 1 and balances.decimals[0] == 6
+
+
+def test_extractors_consume_compact_blocks(block):
+    block = dict(block, slot=7)
+    compact = CompactBlock.from_block(block)
+
+    from_dict, from_compact = MintExtractor(), MintExtractor()
+    from_dict.process_block(block)
+    from_compact.process_block(compact)
+    assert sorted(from_compact.get_results()["all_mints"]) == sorted(from_dict.get_results()["all_mints"])
+    assert sorted(from_compact.get_results()["new_mints"]) == sorted(from_dict.get_results()["new_mints"])
+
+    counter = BlockExtractor()
+    counter.process_block(compact)
+    assert counter.get_results()["stats"]["total_transactions"] == len(block["transactions"])
+    assert counter.get_results()["stats"]["slots"] == [7]
+
+
+def test_metadata_instructions_match_by_program_index():
+    mint = "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU"
+    transaction = {
+        "message": {
+            "accountKeys": ["9wFFyRfZBsuAha4YcuxcXLKwMxJR43S7fPfQLusDBzvT", MintExtractor.METADATA_PROGRAM_ID],
+            "instructions": [{"programIdIndex": 1, "accounts": [0], "data": ""}],
+        }
+    }
+    meta = {"logMessages": [f"Program log: createMetadata_v3 {mint}"]}
+
+    extractor = MintExtractor()
+    extractor.process_transaction(transaction, meta)
+    assert extractor.get_results()["new_mints"] == [mint]
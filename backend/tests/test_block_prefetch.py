@@ -0,0 +1,134 @@
+"""
+Tests for read-ahead over the blocks of a slot range.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.utils import slot_map
+from backend.app.utils.block_prefetch import BlockPrefetcher
+from backend.app.utils.solana_error import MethodNotSupportedError, SlotSkippedError
+from backend.app.utils.solana_query import SolanaQueryHandler
+from backend.app.utils.solana_rpc import SolanaConnectionPool
+
+from .benchmarks.mock_rpc import FaultProfile, MockRPCServer
+
+SKIPPED = {12, 13, 17}
+
+
+async def list_slots(low, high):
+    return [slot for slot in range(low, high + 1) if slot not in SKIPPED]
+
+
+@pytest.mark.asyncio
+async def test_fetches_only_confirmed_slots_within_the_read_ahead_bound():
+    fetched, in_flight, peak = [], 0, 0
+
+    async def fetch(slot):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        fetched.append(slot)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        if slot == 15:
+            raise ValueError("bad block")
+        return {"slot": slot}
+
+    prefetcher = BlockPrefetcher(list_slots, fetch, 10, 19, descending=True, read_ahead=3, slots_per_request=4)
+    results = [(slot, block) async for slot, block in prefetcher]
+
+    assert [slot for slot, _ in results] == [19, 18, 16, 15, 14, 11, 10]
+    assert sorted(fetched) == sorted(slot for slot, _ in results)
+    assert isinstance(dict(results)[15], ValueError)
+    assert dict(results)[19] == {"slot": 19}
+    assert peak <= 3
+
+    stats = prefetcher.get_stats()
+    assert stats["skipped_slots"] == 3
+    assert stats["slot_list_requests"] == 3
+
+
+@pytest.mark.asyncio
+async def test_next_blocks_are_fetched_while_the_current_one_is_processed():
+    started = []
+
+    async def fetch(slot):
+        started.append(slot)
+        await asyncio.sleep(0.01)
+        return slot
+
+    async for slot, _ in BlockPrefetcher(list_slots, fetch, 10, 11, read_ahead=2):
+        if slot == 10:
+            # Slot 11 is requested before the consumer is done with slot 10
+            assert started == [10, 11]
+            await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_query_handler_skips_skipped_slots(monkeypatch):
+    monkeypatch.setattr(slot_map, "_slot_map", None)
+    faults = FaultProfile(skipped_slots=frozenset({299_999_997, 299_999_998}))
+    async with MockRPCServer(faults=faults) as server:
+        handler = SolanaQueryHandler(None)
+        handler.connection_pool = SolanaConnectionPool()
+        await handler.connection_pool.initialize([server.url])
+        handler.initialized = True
+        await handler.initialize()
+        try:
+            result = await handler.process_blocks(num_blocks=5)
+        finally:
+            await handler.connection_pool.close()
+
+    assert result["success"]
+    assert result["statistics"]["processed_blocks"] == 3
+    assert result["statistics"]["skipped_slots"] == 2
+    assert server.requests["getBlock"] == 3
+
+
+@pytest.mark.asyncio
+async def test_listing_failure_falls_back_to_every_slot():
+    async def unsupported(low, high):
+        raise MethodNotSupportedError("Method not supported: getBlocks")
+
+    async def fetch(slot):
+        if slot in SKIPPED:
+            raise SlotSkippedError(f"Slot skipped: {slot}")
+        return slot
+
+    prefetcher = BlockPrefetcher(unsupported, fetch, 10, 14, read_ahead=2)
+    results = [(slot, block) async for slot, block in prefetcher]
+
+    # Slots found skipped when fetched are dropped
+    assert results == [(10, 10), (11, 11), (14, 14)]
+    stats = prefetcher.get_stats()
+    assert stats["slot_list_failures"] == 1
+    assert stats["skipped_on_fetch"] == 2 and stats["skipped_slots"] == 2
+
+
+@pytest.mark.asyncio
+async def test_query_handler_fallback_never_counts_a_block_twice(monkeypatch):
+    monkeypatch.setattr(slot_map, "_slot_map", None)
+    faults = FaultProfile(
+        skipped_slots=frozenset({299_999_997, 299_999_998}),
+        rpc_rate_limit_rate=1.0,
+        methods=frozenset({"getBlocks"}),
+    )
+    async with MockRPCServer(faults=faults) as server:
+        handler = SolanaQueryHandler(None)
+        handler.connection_pool = SolanaConnectionPool()
+        await handler.connection_pool.initialize([server.url])
+        handler.initialized = True
+        await handler.initialize()
+        try:
+            blocks = [
+                (slot, block)
+                async for slot, block in handler.prefetch_blocks(299_999_996, 299_999_999)
+            ]
+        finally:
+            await handler.connection_pool.close()
+
+    # getBlocks failed, so every slot was requested, but a skipped slot is not answered with the next block
+    assert [slot for slot, _ in blocks] == [299_999_996, 299_999_999]
+    assert server.requests["getBlock"] == 4
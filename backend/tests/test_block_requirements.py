@@ -0,0 +1,108 @@
+"""
+Tests for getBlock request planning from extractor field requirements.
+"""
+
+import base64
+
+import base58
+import pytest
+from solders.hash import Hash
+from solders.instruction import CompiledInstruction
+from solders.message import Message
+from solders.pubkey import Pubkey
+from solders.signature import Signature
+from solders.transaction import VersionedTransaction
+
+from backend.app.utils import block_requirements as br
+from backend.app.utils.block_workers import extract_block
+from backend.app.utils.handlers.block_extractor import BlockExtractor
+from backend.app.utils.handlers.mint_extractor import MintExtractor
+from backend.app.utils.handlers.pump_extractor import PumpExtractor
+
+from .benchmarks.fixtures import BLOCK_JSON, load_result
+
+
+def _encode_base64(tx_wrapper):
+    """Re-encode a json-encoded fixture transaction as base64."""
+    transaction = tx_wrapper["transaction"]
+    message = transaction["message"]
+    header = message["header"]
+    instructions = [
+        CompiledInstruction(ix["programIdIndex"], base58.b58decode(ix["data"]), bytes(ix["accounts"]))
+        for ix in message["instructions"]
+    ]
+    compiled = Message.new_with_compiled_instructions(
+        header["numRequiredSignatures"], header["numReadonlySignedAccounts"], header["numReadonlyUnsignedAccounts"],
+        [Pubkey.from_string(key) for key in message["accountKeys"]],
+        Hash.from_string(message["recentBlockhash"]), instructions,
+    )
+    tx = VersionedTransaction.populate(compiled, [Signature.from_string(sig) for sig in transaction["signatures"]])
+    return {"transaction": [base64.b64encode(bytes(tx)).decode(), "base64"], "meta": tx_wrapper["meta"]}
+
+
+@pytest.mark.parametrize("fields,expected", [
+    ({br.BLOCK_TIME}, br.BlockRequest("none", "json", False)),
+    ({br.TRANSACTION_COUNT, br.REWARDS}, br.BlockRequest("signatures", "json", True)),
+    ({br.ACCOUNT_KEYS, br.TOKEN_BALANCES}, br.BlockRequest("accounts", "json", False)),
+    ({br.INSTRUCTIONS}, br.BlockRequest("full", "json", False)),
+    ({br.PARSED_INSTRUCTIONS}, br.BlockRequest("full", "jsonParsed", False)),
+])
+def test_plan_picks_cheapest_request(fields, expected):
+    assert br.plan_block_request(fields, local_decode=False) == expected
+
+
+def test_local_decode_only_applies_to_full_unparsed_blocks():
+    assert br.plan_block_request({br.INSTRUCTIONS}, local_decode=True).encoding == "base64"
+    assert br.plan_block_request({br.SIGNATURES}, local_decode=True).encoding == "json"
+    assert br.plan_block_request({br.PARSED_INSTRUCTIONS}, local_decode=True).encoding == "jsonParsed"
+
+
+def test_extractor_declarations_are_combined():
+    assert br.plan_for_extractors([BlockExtractor], local_decode=False).transaction_details == "signatures"
+    assert br.plan_for_extractors([MintExtractor], local_decode=False).encoding == "json"
+    assert br.plan_for_extractors([MintExtractor, PumpExtractor], local_decode=False).encoding == "jsonParsed"
+    # Undeclared extractors keep getting the full jsonParsed block
+    assert br.plan_for_extractors([object()], local_decode=False) == br.BlockRequest()
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(ValueError):
+        br.plan_block_request({"nope"})
+
+
+def test_normalize_signatures_block():
+    block = br.normalize_block({"blockTime": 1, "signatures": ["a", "b"]})
+
+    assert [tx["transaction"]["signatures"] for tx in block["transactions"]] == [["a"], ["b"]]
+    results = extract_block(b'{"blockTime": 1, "signatures": ["a", "b"]}', ("blocks",), slot=5)
+    assert results["results"]["blocks"]["stats"]["total_transactions"] == 2
+
+
+def test_normalize_accounts_block_moves_lookup_keys_to_meta():
+    block = br.normalize_block({"transactions": [{
+        "transaction": {
+            "signatures": ["sig"],
+            "accountKeys": [
+                {"pubkey": "payer", "signer": True, "writable": True, "source": "transaction"},
+                {"pubkey": "loaded", "signer": False, "writable": True, "source": "lookupTable"},
+            ],
+        },
+        "meta": {"preTokenBalances": []},
+    }]})
+
+    tx = block["transactions"][0]
+    assert tx["transaction"]["message"]["accountKeys"] == ["payer"]
+    assert tx["meta"]["loadedAddresses"] == {"writable": ["loaded"], "readonly": []}
+
+
+def test_base64_block_decodes_to_json_layout():
+    block = load_result(BLOCK_JSON)
+    expected = [tx["transaction"]["message"]["instructions"] for tx in block["transactions"][:20]]
+    encoded = {"blockTime": block["blockTime"], "transactions": [_encode_base64(tx) for tx in block["transactions"][:20]]}
+
+    decoded = br.normalize_block(encoded)
+
+    for tx, instructions in zip(decoded["transactions"], expected):
+        got = tx["transaction"]["message"]["instructions"]
+        assert [(ix["programIdIndex"], ix["accounts"], ix["data"]) for ix in got] == \
+            [(ix["programIdIndex"], ix["accounts"], ix["data"]) for ix in instructions]
@@ -0,0 +1,137 @@
+"""
+Tests for the live block tail ingestion service.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.tasks.block_tail import BlockSummary, BlockTailIngestor, RollingWindow
+from backend.app.utils.solana_error import SlotSkippedError
+
+
+class FakeClient:
+    """Client serving blocks from a dict of slot -> block."""
+
+    def __init__(self, blocks, head):
+        self.blocks = blocks
+        self.head = head
+        self.block_calls = []
+
+    async def get_slot(self, commitment=None):
+        return self.head
+
+    async def get_blocks(self, start_slot, end_slot=None, commitment=None):
+        return [slot for slot in sorted(self.blocks) if start_slot <= slot <= end_slot]
+
+    async def get_block(self, slot, options=None):
+        self.block_calls.append(slot)
+        if self.blocks[slot] is None:
+            raise SlotSkippedError(f"Slot {slot} was skipped")
+        return {"jsonrpc": "2.0", "result": self.blocks[slot], "id": 1}
+
+
+class FakePool:
+    def __init__(self, client):
+        self.client = client
+
+    async def acquire(self):
+        pool = self
+
+        class _Context:
+            async def __aenter__(self):
+                return pool.client
+
+            async def __aexit__(self, *args):
+                return False
+
+        return _Context()
+
+
+class FakeExtractor:
+    """Reports the block's 'mints' field as new mints."""
+
+    def __init__(self):
+        self.mints = []
+
+    def process_block(self, block):
+        self.mints = block.get("mints", [])
+
+    def get_results(self):
+        return {"new_mints": self.mints, "stats": {"mint_operations": len(self.mints)}}
+
+
+def make_ingestor(client, **kwargs):
+    ingestor = BlockTailIngestor(
+        connection_pool=FakePool(client),
+        window_sizes=(1, 3),
+        max_range=2,
+        backfill_blocks=kwargs.pop("backfill_blocks", 5),
+        **kwargs
+    )
+    ingestor.register_extractor("mints", FakeExtractor)
+    return ingestor
+
+
+def test_rolling_window_evicts_oldest_block():
+    window = RollingWindow(2)
+    window.add(BlockSummary(slot=1, items={"mints.new_mints": ["a", "b"]}, totals={"mints.mint_operations": 2}))
+    window.add(BlockSummary(slot=2, items={"mints.new_mints": ["b"]}, totals={"mints.mint_operations": 1}))
+    window.add(BlockSummary(slot=3, items={"mints.new_mints": ["c"]}, totals={"mints.mint_operations": 1}))
+
+    snapshot = window.snapshot()
+    assert snapshot["start_slot"] == 2
+    assert snapshot["end_slot"] == 3
+    assert snapshot["items"]["mints.new_mints"] == ["b", "c"]
+    assert snapshot["totals"]["mints.mint_operations"] == 2
+
+
+@pytest.mark.asyncio
+async def test_ingests_each_block_once_and_skips_missing_slots():
+    blocks = {10: {"mints": ["a"]}, 11: {"mints": ["b"]}, 13: {"mints": ["c"]}}
+    client = FakeClient(blocks, head=13)
+    ingestor = make_ingestor(client)
+
+    await ingestor._ingest_until(13)
+    client.blocks[14] = {"mints": ["d"]}
+    await ingestor._ingest_until(14)
+
+    assert client.block_calls == [10, 11, 13, 14]
+    assert ingestor.get_window(1)["items"]["mints.new_mints"] == ["d"]
+    assert ingestor.get_window(3)["items"]["mints.new_mints"] == ["b", "c", "d"]
+    assert ingestor.get_window(2)["items"]["mints.new_mints"] == ["c", "d"]
+    assert ingestor.get_stats()["last_slot"] == 14
+
+
+@pytest.mark.asyncio
+async def test_window_unavailable_until_enough_blocks():
+    client = FakeClient({5: {"mints": ["a"]}, 6: None}, head=6)
+    ingestor = make_ingestor(client)
+
+    await ingestor._ingest_until(6)
+
+    assert ingestor.get_window(1) is not None
+    assert ingestor.get_window(3) is None
+    assert ingestor.get_window(10) is None
+    assert ingestor.get_stats()["blocks_missed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_followers_get_only_blocks_after_their_slot():
+    client = FakeClient({10: {"mints": ["a"]}, 11: {"mints": ["b"]}, 13: {"mints": ["c"]}}, head=13)
+    ingestor = make_ingestor(client)
+    await ingestor._ingest_until(13)
+
+    assert [summary.slot for summary in ingestor.get_blocks_since(None, 2)] == [11, 13]
+    assert [summary.slot for summary in ingestor.get_blocks_since(10, 1)] == [11]
+    assert ingestor.get_blocks_since(13, 5) == []
+    assert await ingestor.wait_for_block(13, timeout=0.01) is False
+
+    waiter = asyncio.create_task(ingestor.wait_for_block(13, timeout=5))
+    await asyncio.sleep(0)
+    client.blocks[14] = {"mints": ["d"]}
+    await ingestor._ingest_until(14)
+
+    assert await waiter is True
+    [summary] = ingestor.get_blocks_since(13, 5)
+    assert summary.items["mints.new_mints"] == ["d"]
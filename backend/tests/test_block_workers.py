@@ -0,0 +1,110 @@
+"""
+Tests for the process-pool block extraction tier.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from backend.app.database import sqlite
+from backend.app.tasks.block_tail import BlockTailIngestor
+from backend.app.utils.block_workers import BlockWorkerPool, extract_block, merge_mint_results
+from backend.app.utils.handlers.mint_extractor import MintExtractor
+from backend.app.utils.mint_index import MintIndex
+
+from .benchmarks.fixtures import BLOCK_JSON, load_fixture_bytes, load_result
+from .test_block_tail import FakeClient, FakePool
+
+
+@pytest.fixture(scope="module")
+def raw_block():
+    return load_fixture_bytes(BLOCK_JSON)
+
+
+@pytest.fixture
+def mint_index(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    db = sqlite.DatabaseCache()
+    db._close()
+    index = MintIndex(db=db, capacity=1000, flush_size=1)
+    index.load()
+    yield index
+    db._close()
+
+
+def test_extract_block_matches_in_process_extractor(raw_block):
+    extracted = extract_block(raw_block, ("mints", "blocks"), slot=300_000_000)
+
+    block = load_result(BLOCK_JSON)
+    block["slot"] = 300_000_000
+    extractor = MintExtractor()
+    extractor.process_block(block)
+
+    assert extracted["slot"] == 300_000_000
+    assert extracted["transactions"] == len(block["transactions"])
+    assert sorted(extracted["results"]["mints"]["all_mints"]) == sorted(extractor.get_results()["all_mints"])
+    # Full blocks never come back from the workers
+    assert "blocks" not in extracted["results"]["blocks"]
+    assert extracted["results"]["blocks"]["stats"]["total_transactions"] == len(block["transactions"])
+
+
+@pytest.mark.asyncio
+async def test_worker_processes_return_compact_results(raw_block):
+    pool = BlockWorkerPool(max_workers=2, max_pending=2)
+    try:
+        results = await asyncio.gather(*(pool.extract(raw_block, ["mints"], slot) for slot in range(4)))
+    finally:
+        pool.shutdown()
+
+    assert [result["slot"] for result in results] == [0, 1, 2, 3]
+    assert all(result["results"]["mints"]["all_mints"] for result in results)
+    stats = pool.get_stats()
+    assert stats["completed"] == 4
+    assert stats["pending"] == 0
+    # Two blocks had to wait for a free slot
+    assert stats["max_queue_wait_seconds"] > 0
+
+
+@pytest.mark.asyncio
+async def test_unknown_extractor_is_rejected(raw_block):
+    pool = BlockWorkerPool(max_workers=0)
+    with pytest.raises(ValueError):
+        await pool.extract(raw_block, ["nope"])
+
+
+def test_merge_claims_candidates_against_index(mint_index):
+    first = {"slot": 10, "block_time": 1, "results": {"mints": {"all_mints": ["a", "b"], "new_mints": ["a", "b"], "pump_tokens": []}}}
+    second = {"slot": 11, "block_time": 2, "results": {"mints": {"all_mints": ["b", "c"], "new_mints": ["b", "c"], "pump_tokens": ["c"]}}}
+    mint_index.add("a", 5, 0)
+
+    merged = merge_mint_results([second, first], mint_index)
+
+    assert sorted(merged["new_mints"]) == ["b", "c"]
+    assert sorted(merged["all_mints"]) == ["a", "b", "c"]
+    assert merged["pump_tokens"] == ["c"]
+    assert mint_index.first_seen(["b"])["b"]["first_seen_slot"] == 10
+
+
+class RawClient(FakeClient):
+    async def get_block(self, slot, options=None, raw=False):
+        response = await super().get_block(slot, options)
+        return json.dumps(response).encode() if raw else response
+
+
+@pytest.mark.asyncio
+async def test_block_tail_runs_worker_extractors(raw_block):
+    block = load_result(BLOCK_JSON)
+    client = RawClient({20: block, 21: block}, head=21)
+    ingestor = BlockTailIngestor(
+        connection_pool=FakePool(client), window_sizes=(1, 2), backfill_blocks=2,
+        workers=BlockWorkerPool(max_workers=0)
+    )
+    ingestor.register_worker_extractor("mints", "mints")
+
+    await ingestor._ingest_until(21)
+
+    window = ingestor.get_window(2)
+    assert window["start_slot"] == 20 and window["end_slot"] == 21
+    assert window["items"]["mints.all_mints"]
+    assert ingestor.get_stats()["blocks_ingested"] == 2
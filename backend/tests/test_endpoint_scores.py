@@ -0,0 +1,68 @@
+"""
+Tests for persisted RPC endpoint scores and the warm-started connection pool.
+"""
+
+import pytest
+
+from backend.app.database import sqlite
+from backend.app.utils import endpoint_scores, rpc_transport, solana_rpc
+from backend.app.utils.endpoint_scores import EndpointScoreStore
+from backend.app.utils.rpc_transport import RpcTransport, get_rpc_transport
+from backend.app.utils.solana_rpc import SolanaConnectionPool
+
+from .benchmarks.mock_rpc import MockRPCServer
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    yield cache
+    cache._close()
+
+
+def test_scores_round_trip(db):
+    transport = RpcTransport()
+    transport.record("https://slow.example", True, 0.8)
+    transport.record("https://fast.example", True, 0.1)
+    transport.record("https://flaky.example", False)
+    transport.record("https://rpc.example/?api-key=secret", True, 0.05)
+    EndpointScoreStore(db, transport).save([
+        "https://slow.example", "https://fast.example", "https://rpc.example/?api-key=secret",
+    ])
+
+    restored = RpcTransport()
+    restored.record("https://slow.example", True, 0.3)  # Live statistics win over saved ones
+    store = EndpointScoreStore(db, restored)
+
+    assert store.load() == ["https://fast.example", "https://slow.example"]
+    assert restored.get("https://fast.example").avg_latency == pytest.approx(0.1)
+    assert restored.get("https://slow.example").avg_latency == pytest.approx(0.3)
+    assert restored.get("https://flaky.example").failure_count == 1
+    assert restored.get("https://rpc.example/?api-key=secret") is None
+    assert store.stats["restored_endpoints"] == 2
+
+
+@pytest.mark.asyncio
+async def test_pool_warm_starts_and_verifies_in_background(db, monkeypatch):
+    monkeypatch.setattr(rpc_transport, "_rpc_transport", None)
+    monkeypatch.setattr(solana_rpc, "DEFAULT_RPC_ENDPOINTS", [])
+    store = EndpointScoreStore(db)
+    monkeypatch.setattr(endpoint_scores, "_endpoint_score_store", store)
+
+    async with MockRPCServer() as server:
+        store.save([server.url])
+        store.transport.endpoints.clear()
+
+        pool = SolanaConnectionPool()
+        await pool.initialize()
+        assert pool._initialized and pool.endpoints == [server.url]
+        assert server.get_stats()["requests"].get("getHealth", 0) == 0
+
+        assert await pool._verify_task == 1
+        assert server.get_stats()["requests"]["getHealth"] >= 1
+        client = await pool.get_client()
+        assert await client.get_slot() == server.head_slot
+        await pool.close()
+        await get_rpc_transport().close()
@@ -0,0 +1,95 @@
+"""
+Tests for the fast-path JSON serialization used by API responses and the response cache.
+"""
+
+import json
+from unittest.mock import ANY, MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from solders.pubkey import Pubkey
+from solders.rpc.responses import GetSlotResp
+from solders.signature import Signature
+
+from backend.app.utils import serialization
+from backend.app.utils.serialization import SolecoJSONResponse, dumps, get_converter, loads, to_jsonable
+from backend.app.database.history import HistoryRecorder
+from backend.app.database.middleware import CacheMiddleware
+
+
+def test_dumps_solders_types():
+    pubkey = Pubkey.from_string("11111111111111111111111111111111")
+    signature = Signature.default()
+
+    result = loads(dumps({"pubkey": pubkey, "signatures": [signature], 7: "int key"}))
+
+    assert result == {"pubkey": str(pubkey), "signatures": [str(signature)], "7": "int key"}
+
+
+def test_rpc_response_uses_native_json():
+    assert to_jsonable(GetSlotResp(42))["result"] == 42
+
+
+def test_converter_is_resolved_once_per_type():
+    class Custom:
+        def to_dict(self):
+            return {"value": 1}
+
+    first = get_converter(Custom)
+    assert first is get_converter(Custom)
+    assert loads(dumps([Custom()])) == [{"value": 1}]
+
+
+def test_to_jsonable_collections():
+    assert to_jsonable({"a": (1, 2), "b": {3}}) == {"a": [1, 2], "b": [3]}
+
+
+def test_response_class_renders_bytes():
+    response = SolecoJSONResponse({"pubkey": Pubkey.default()})
+    assert json.loads(response.body) == {"pubkey": str(Pubkey.default())}
+
+
+def test_stdlib_fallback_without_orjson():
+    with patch.object(serialization, "orjson", None):
+        body = dumps({"pubkey": Pubkey.default(), "items": (1, 2)})
+        assert loads(body) == {"pubkey": str(Pubkey.default()), "items": [1, 2]}
+
+
+@pytest.fixture
+def cached_app():
+    app = FastAPI(default_response_class=SolecoJSONResponse)
+    history = HistoryRecorder(db=MagicMock())
+    app.add_middleware(CacheMiddleware, history=history)
+    calls = {"count": 0}
+
+    @app.get("/soleco/network/rpc-nodes")
+    async def rpc_nodes():
+        calls["count"] += 1
+        return SolecoJSONResponse({"status": "success", "total_nodes": 3, "owner": Pubkey.default()})
+
+    return app, calls, history
+
+
+def test_cache_middleware_stores_and_serves_raw_bytes(cached_app):
+    app, calls, history = cached_app
+    store = {}
+    fake_cache = MagicMock()
+    fake_cache.get_cached_body.side_effect = lambda endpoint, params, ttl: store.get(endpoint)
+    fake_cache.cache_body.side_effect = lambda endpoint, body, params, ttl: store.__setitem__(endpoint, body)
+
+    with patch("backend.app.database.middleware.db_cache", fake_cache):
+        client = TestClient(app)
+        miss = client.get("/soleco/network/rpc-nodes")
+        hit = client.get("/soleco/network/rpc-nodes")
+
+    assert miss.headers["X-Cache"] == "MISS"
+    assert hit.headers["X-Cache"] == "HIT"
+    assert calls["count"] == 1
+    assert hit.content == miss.content
+    assert isinstance(store["/soleco/network/rpc-nodes"], bytes)
+    # One history point for both requests, written by the recorder's flush
+    assert history.flush()
+    history.db.store_history_rows.assert_called_once_with(
+        {"rpc_nodes_history": [(3, ANY, store["/soleco/network/rpc-nodes"].decode())]}
+    )
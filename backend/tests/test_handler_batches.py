@@ -0,0 +1,109 @@
+"""
+Tests for batch-mode transaction loops in BaseHandler subclasses.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.utils.handlers import base_handler
+from backend.app.utils.handlers.base_handler import BaseHandler
+from backend.app.utils.handlers.block_handler import BlockHandler
+
+from .benchmarks.fixtures import BLOCK_JSON, load_result
+
+
+@pytest.fixture(scope="module")
+def block():
+    return load_result(BLOCK_JSON)
+
+
+@pytest.fixture
+def batch_config(monkeypatch):
+    def configure(max_transactions, max_batch_ms=1000.0):
+        monkeypatch.setitem(base_handler.HANDLER_BATCH_CONFIG, "max_transactions", max_transactions)
+        monkeypatch.setitem(base_handler.HANDLER_BATCH_CONFIG, "max_batch_ms", max_batch_ms)
+    return configure
+
+
+@pytest.mark.asyncio
+async def test_process_block_matches_per_transaction_results(block, batch_config):
+    batch_config(50)
+    transactions = block["transactions"][:120]
+
+    expected = []
+    for tx in transactions:
+        result = await BaseHandler().process(tx)
+        if result:
+            expected.append(result)
+    handler = BaseHandler()
+    response = await handler.process_block({"transactions": transactions})
+
+    assert response["results"] == expected
+    assert response["batches"]["batches"] == 3
+    assert response["batches"]["transactions"] == 120
+    assert response["batches"]["last_batch_size"] == 20
+    assert handler.stats.total_transactions == 120
+
+
+@pytest.mark.asyncio
+async def test_event_loop_runs_between_batches(batch_config):
+    batch_config(2)
+    ticks = []
+
+    def process(tx):
+        ticks.append(("tx", tx))
+        return tx
+
+    async def ticker():
+        while True:
+            ticks.append(("tick", None))
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    try:
+        results = await BaseHandler().process_batched(range(6), process)
+    finally:
+        task.cancel()
+
+    assert results == list(range(6))
+    # Two transactions per batch, with the other task getting a turn in between
+    kinds = [kind for kind, _ in ticks]
+    assert kinds[kinds.index("tx"):][:7] == ["tx", "tx", "tick", "tx", "tx", "tick", "tx"]
+
+
+@pytest.mark.asyncio
+async def test_batches_end_on_time_budget(batch_config):
+    batch_config(1000, max_batch_ms=0.0)
+    handler = BaseHandler()
+
+    await handler.process_batched(range(5), lambda tx: tx)
+
+    assert handler.batch_stats.batches == 5
+
+
+@pytest.mark.asyncio
+async def test_failures_are_isolated(batch_config):
+    batch_config(10)
+    handler = BaseHandler()
+
+    async def process(tx):
+        if tx == 1:
+            raise KeyError("boom")
+        return tx
+
+    assert await handler.process_batched([0, 1, 2], process) == [0, None, 2]
+    assert handler.stats.error_counts == {"KeyError": 1}
+
+
+@pytest.mark.asyncio
+async def test_block_handler_uses_batches(block, batch_config):
+    batch_config(100)
+    handler = BlockHandler()
+
+    result = await handler.process_result(block, block_num=1)
+
+    successful = [tx for tx in block["transactions"] if tx["meta"]["err"] is None]
+    assert len(result["transactions"]) == len(successful)
+    assert handler.batch_stats.transactions == len(block["transactions"])
@@ -0,0 +1,101 @@
+"""
+Tests for the sampled, batched history writer.
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from backend.app.database import history as history_module
+from backend.app.database import sqlite
+from backend.app.database.history import HistoryRecorder
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    yield cache
+    cache._close()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = SimpleNamespace(now=1000.0)
+    monkeypatch.setattr(history_module, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    monkeypatch.setitem(history_module.HISTORY_CONFIG, "sample_interval", 60.0)
+    return clock
+
+
+def test_series_are_sampled_once_per_interval(clock):
+    recorder = HistoryRecorder(db=MagicMock())
+
+    assert recorder.record("rpc_nodes_history", (), (3,), b'{"total_nodes": 3}')
+    clock.now += 30
+    assert not recorder.due("rpc_nodes_history")
+    assert not recorder.record("rpc_nodes_history", (), (4,), b'{"total_nodes": 4}')
+    # Other series keep their own cadence
+    assert recorder.record("pump_tokens_history", ("1h", "volume"), ("1h", "volume", 0), {"tokens": []})
+    clock.now += 30
+    assert recorder.record("rpc_nodes_history", (), (4,), b'{"total_nodes": 4}')
+
+    assert recorder.get_stats()["pending"] == 3
+    assert recorder.stats["throttled"] == 1
+
+
+def test_unchanged_snapshots_are_skipped(clock):
+    recorder = HistoryRecorder(db=MagicMock())
+
+    assert recorder.record("network_status_history", (), ("healthy",), b'{"status": "healthy"}')
+    clock.now += 60
+    assert not recorder.record("network_status_history", (), ("healthy",), b'{"status": "healthy"}')
+    clock.now += 60
+    assert recorder.record("network_status_history", (), ("degraded",), b'{"status": "degraded"}')
+
+    assert recorder.stats["unchanged"] == 1
+
+
+def test_flush_writes_all_tables_in_one_transaction(db, clock):
+    recorder = HistoryRecorder(db=db)
+    recorder.record("rpc_nodes_history", (), (3,), b'{"total_nodes": 3}')
+    recorder.record("mint_analytics_history", (2,), (2, 5, 1), {"new_mints": ["a"] * 5})
+
+    assert recorder.flush()
+
+    assert recorder.get_stats()["pending"] == 0
+    assert [row["total_nodes"] for row in db.get_rpc_nodes_history()] == [3]
+    assert [row["new_mints_count"] for row in db.get_mint_analytics_history(blocks=2)] == [5]
+
+
+def test_failed_flush_keeps_points(clock):
+    db = MagicMock()
+    db.store_history_rows.return_value = False
+    recorder = HistoryRecorder(db=db)
+    recorder.record("rpc_nodes_history", (), (3,), b"{}")
+
+    assert not recorder.flush()
+    assert recorder.get_stats()["pending"] == 1
+
+    db.store_history_rows.return_value = True
+    assert recorder.flush()
+    assert recorder.stats["rows_written"] == 1
+
+
+@pytest.mark.asyncio
+async def test_background_writer_flushes_on_cancel(clock, monkeypatch):
+    monkeypatch.setitem(history_module.HISTORY_CONFIG, "flush_interval", 3600)
+    db = MagicMock()
+    db.store_history_rows.return_value = True
+    recorder = HistoryRecorder(db=db)
+    task = asyncio.create_task(recorder.run())
+    await asyncio.sleep(0)
+
+    recorder.record("rpc_nodes_history", (), (3,), b"{}")
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    db.store_history_rows.assert_called_once()
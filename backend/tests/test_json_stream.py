@@ -0,0 +1,133 @@
+"""
+Tests for incremental decoding of large RPC responses.
+"""
+
+import json
+import random
+
+import orjson
+import pytest
+
+from backend.app.tasks.block_tail import BlockTailIngestor
+from backend.app.utils.handlers.mint_extractor import MintExtractor
+from backend.app.utils.json_stream import ArrayStreamDecoder
+from backend.app.utils.solana_error import ResponseTooLargeError
+from backend.app.utils import solana_rpc
+from backend.app.utils.solana_rpc import SolanaClient
+
+from .benchmarks.fixtures import BLOCK_JSON, load_fixture_bytes, load_result
+from .benchmarks.mock_rpc import MockRPCServer
+from .test_block_tail import FakeClient, FakePool
+
+
+def _feed_randomly(body, path, seed=1):
+    rnd = random.Random(seed)
+    decoder = ArrayStreamDecoder(path)
+    items, offset = [], 0
+    while offset < len(body):
+        size = rnd.randint(1, 5000)
+        items += decoder.feed(body[offset:offset + size])
+        offset += size
+    return items, decoder.close(), decoder
+
+
+@pytest.fixture(scope="module")
+def block_body():
+    return load_fixture_bytes(BLOCK_JSON)
+
+
+@pytest.mark.parametrize("pretty", [False, True])
+def test_streamed_items_match_full_decode(block_body, pretty):
+    full = orjson.loads(block_body)
+    body = json.dumps(full, indent=1).encode() if pretty else block_body
+
+    items, rest, decoder = _feed_randomly(body, ("result", "transactions"))
+
+    assert decoder.found
+    assert items == full["result"]["transactions"]
+    assert rest["result"].pop("transactions") == []
+    full["result"].pop("transactions")
+    assert rest == full
+
+
+def test_brackets_and_quotes_inside_strings():
+    body = orjson.dumps({"result": [{"data": ["x]},{\"", "base64"]}, {"pubkey": "b"}, "s\\\"]"], "id": 1})
+
+    items, rest, _ = _feed_randomly(body, ("result",), seed=3)
+
+    assert items == [{"data": ["x]},{\"", "base64"]}, {"pubkey": "b"}, "s\\\"]"]
+    assert rest == {"result": [], "id": 1}
+
+
+def test_missing_array_leaves_document_intact():
+    body = b'{"jsonrpc":"2.0","error":{"code":-32009,"message":"Slot 5 was skipped"},"id":1}'
+
+    items, rest, decoder = _feed_randomly(body, ("result", "transactions"))
+
+    assert items == [] and not decoder.found
+    assert rest["error"]["code"] == -32009
+
+
+def test_truncated_document_is_rejected(block_body):
+    decoder = ArrayStreamDecoder(("result", "transactions"))
+    decoder.feed(block_body[:len(block_body) // 2])
+    with pytest.raises(ValueError):
+        decoder.close()
+
+
+@pytest.mark.asyncio
+async def test_client_streams_block_transactions():
+    seen = []
+    async with MockRPCServer() as server:
+        client = SolanaClient(server.url)
+        await client.connect()
+        try:
+            block = await client.get_block(10, {"encoding": "json"}, on_transaction=seen.append)
+        finally:
+            await client.close()
+
+    assert len(seen) == len(load_result(BLOCK_JSON)["transactions"])
+    assert block["result"]["transactions"] == []
+    assert block["result"]["blockTime"]
+
+
+@pytest.mark.asyncio
+async def test_client_rejects_oversized_responses(monkeypatch):
+    monkeypatch.setitem(solana_rpc.RPC_STREAM_CONFIG, "max_response_bytes", 1024)
+    async with MockRPCServer() as server:
+        client = SolanaClient(server.url)
+        await client.connect()
+        try:
+            with pytest.raises(ResponseTooLargeError):
+                await client.get_block(10, {"encoding": "json"}, on_transaction=lambda tx: None)
+            with pytest.raises(ResponseTooLargeError):
+                await client.get_block(10, {"encoding": "json"})
+        finally:
+            await client.close()
+
+
+class StreamingClient(FakeClient):
+    async def get_block(self, slot, options=None, on_transaction=None):
+        response = await super().get_block(slot, options)
+        block = dict(response["result"])
+        for tx in block.pop("transactions"):
+            on_transaction(tx)
+        return {"jsonrpc": "2.0", "result": dict(block, transactions=[]), "id": 1}
+
+
+@pytest.mark.asyncio
+async def test_block_tail_streams_into_mint_extractor():
+    block = load_result(BLOCK_JSON)
+    expected = MintExtractor()
+    expected.process_block(dict(block, slot=20))
+
+    ingestor = BlockTailIngestor(connection_pool=FakePool(StreamingClient({20: block}, head=20)),
+                                 window_sizes=(1,), backfill_blocks=1)
+    ingestor.register_extractor("mints", MintExtractor)
+    assert ingestor._can_stream()
+
+    await ingestor._ingest_until(20)
+
+    window = ingestor.get_window(1)
+    assert sorted(window["items"]["mints.all_mints"]) == sorted(expected.get_results()["all_mints"])
+    assert ingestor.get_stats()["blocks_ingested"] == 1
@@ -0,0 +1,62 @@
+"""
+Tests for the Prometheus hot-path metrics.
+"""
+
+import asyncio
+
+import pytest
+from prometheus_client import REGISTRY, generate_latest
+
+from backend.app.utils import metrics
+from backend.app.utils.solana_connection_pool import SimpleCache
+
+
+def sample(name, labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_endpoint_label_drops_credentials():
+    assert metrics.endpoint_label("https://mainnet.helius-rpc.com/?api-key=secret") == "mainnet.helius-rpc.com"
+
+
+def test_rpc_latency_and_errors_are_labelled_by_method_and_endpoint():
+    labels = {"method": "getSlot", "endpoint": "rpc.example.com"}
+    before = sample("soleco_rpc_request_duration_seconds_count", labels)
+
+    metrics.observe_rpc("getSlot", "https://rpc.example.com/?api-key=secret", 0.12)
+    metrics.record_rpc_error("getSlot", "https://rpc.example.com", "rate_limited")
+
+    assert sample("soleco_rpc_request_duration_seconds_count", labels) == before + 1
+    assert sample("soleco_rpc_errors_total", {**labels, "kind": "rate_limited"}) >= 1
+
+
+def test_simple_cache_records_hits_and_misses():
+    cache = SimpleCache(ttl_seconds=60, name="test_cache")
+    hit = {"cache": "memory", "endpoint": "test_cache", "result": "hit"}
+    miss = {"cache": "memory", "endpoint": "test_cache", "result": "miss"}
+    hits, misses = sample("soleco_cache_requests_total", hit), sample("soleco_cache_requests_total", miss)
+
+    cache.get("key")
+    cache.set("key", 1)
+    cache.get("key")
+
+    assert sample("soleco_cache_requests_total", hit) == hits + 1
+    assert sample("soleco_cache_requests_total", miss) == misses + 1
+
+
+def test_extractor_timings_per_block_and_transaction():
+    metrics.observe_extractor("test_extractor", 0.02, transactions=100)
+
+    assert sample("soleco_extractor_block_seconds_count", {"extractor": "test_extractor"}) >= 1
+    assert sample("soleco_extractor_transactions_total", {"extractor": "test_extractor"}) >= 100
+    assert b"soleco_extractor_transaction_seconds" in generate_latest(REGISTRY)
+
+
+@pytest.mark.asyncio
+async def test_event_loop_lag_monitor_samples():
+    before = sample("soleco_event_loop_lag_seconds_count", {})
+    task = asyncio.create_task(metrics.monitor_event_loop_lag(interval=0.01))
+    await asyncio.sleep(0.05)
+    task.cancel()
+
+    assert sample("soleco_event_loop_lag_seconds_count", {}) > before
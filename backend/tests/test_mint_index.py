@@ -0,0 +1,101 @@
+"""
+Tests for the persistent first-seen mint index.
+"""
+
+import asyncio
+
+import pytest
+
+from backend.app.database import sqlite
+from backend.app.utils.handlers.mint_extractor import MintExtractor
+from backend.app.utils.mint_index import BloomFilter, MintIndex
+
+MINT_A = "7xKXtg2CW87d97TXJSDpbD5jBkheTqA83TZRuJosgAsU"
+MINT_B = "9wFFyRfZBsuAha4YcuxcXLKwMxJR43S7fPfQLusDBzvT"
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    yield cache
+    cache._close()
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(capacity=10000, error_rate=0.01)
+    items = [f"mint{i}" for i in range(10000)]
+    for item in items:
+        bloom.add(item)
+
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other{i}" in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_sightings_are_batched_and_persisted(db):
+    index = MintIndex(db=db, capacity=1000, flush_size=2, flush_interval=3600)
+
+    assert index.is_new(MINT_A, 100)
+    index.add(MINT_A, 100, 1700000000)
+    assert db.count_indexed_mints() == 0
+    assert not index.is_new(MINT_A, 101)
+
+    index.add(MINT_B, 101, 1700000001)
+    assert db.count_indexed_mints() == 2
+
+    reloaded = MintIndex(db=db, capacity=1000)
+    assert reloaded.load() == 2
+    assert not reloaded.is_new(MINT_A, 150)
+    # Reprocessing the block a mint was first seen in still reports it as new
+    assert reloaded.is_new(MINT_B, 101)
+    assert reloaded.first_seen([MINT_A])[MINT_A] == {"first_seen_slot": 100, "first_seen_time": 1700000000}
+
+
+def test_earliest_sighting_wins(db):
+    index = MintIndex(db=db, capacity=1000, flush_size=1)
+    index.add(MINT_A, 200, 2)
+    index.add(MINT_A, 150, 1)
+    index.add(MINT_A, 300, 3)
+
+    assert db.get_first_seen_mints([MINT_A])[MINT_A]["first_seen_slot"] == 150
+
+
+def test_extractor_uses_global_index(db):
+    index = MintIndex(db=db, capacity=1000, flush_size=1)
+    index.load()
+    first = MintExtractor(mint_index=index)
+    first._block_slot = 10
+    first._register_mint(MINT_A)
+
+    second = MintExtractor(mint_index=index)
+    second._block_slot = 20
+    second._register_mint(MINT_A)
+
+    assert first.get_results()["new_mints"] == [MINT_A]
+    assert second.get_results()["new_mints"] == []
+    assert second.get_results()["all_mints"] == [MINT_A]
+
+
+@pytest.mark.asyncio
+async def test_positives_are_confirmed_in_memory_and_writes_leave_the_loop(db, monkeypatch):
+    db.store_first_seen_mints([(MINT_A, 100, 1)])
+    index = MintIndex(db=db, capacity=2, flush_size=1, flush_interval=3600)
+    index.load()
+    monkeypatch.setattr(db, "get_first_seen_mints", lambda mints: pytest.fail("positive confirmed in SQLite"))
+
+    assert not index.is_new(MINT_A, 150)
+    assert index.is_new(MINT_A, 100)
+
+    # Going over capacity and the batch write both run in worker threads
+    for i in range(3):
+        index.add(f"mint{i}", 200 + i, 2)
+    assert not index.is_new("mint0", 250)
+    while index._background:
+        await asyncio.gather(*index._background)
+
+    assert index.get_stats()["resizes"] == 1 and index.capacity > 2
+    assert all(f"mint{i}" in index._bloom for i in range(3))
+    assert index.flush()
+    assert db.count_indexed_mints() == 4
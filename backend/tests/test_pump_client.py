@@ -0,0 +1,122 @@
+"""
+Tests for the shared, deduplicating and caching Pump.fun upstream client.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import HTTPException
+
+from backend.app.utils import pump_client as pump_client_module
+from backend.app.utils.pump_client import PumpClient, RequestThrottler
+
+
+def _client(handler, delay=0.0):
+    calls = []
+
+    async def respond(request):
+        calls.append(str(request.url))
+        await asyncio.sleep(delay)
+        return handler(request)
+
+    client = PumpClient(
+        throttler=RequestThrottler(max_concurrent=10, rate_limit=100, time_window=60),
+        max_retries=1,
+    )
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+    return client, calls
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_calls_share_one_request():
+    client, calls = _client(lambda request: httpx.Response(200, json={"price": 150}), delay=0.05)
+
+    results = await asyncio.gather(*(client.get("/sol-price") for _ in range(5)))
+
+    assert results == [{"price": 150}] * 5
+    assert len(calls) == 1
+    assert client.stats["deduplicated"] == 4
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_responses_are_cached_per_path_ttl(monkeypatch):
+    monkeypatch.setitem(pump_client_module.PUMP_UPSTREAM_CACHE_TTLS, "/sol-price", 30)
+    client, calls = _client(lambda request: httpx.Response(200, json={"ok": True}))
+
+    await client.get("/sol-price")
+    await client.get("/sol-price")
+    # Latest coins/trades are never cached
+    await client.get("/coins/latest")
+    await client.get("/coins/latest")
+
+    assert calls == [
+        "https://frontend-api.pump.fun/sol-price",
+        "https://frontend-api.pump.fun/coins/latest",
+        "https://frontend-api.pump.fun/coins/latest",
+    ]
+    assert client.stats["cache_hits"] == 1
+    assert client.cache_ttl("https://frontend-api.pump.fun/coins/latest?qty=1") == 0
+    assert client.cache_ttl("https://frontend-api.pump.fun/coins/abc") == 30
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_refresh_skips_the_cached_response():
+    prices = iter([100, 150, 200])
+    client, calls = _client(lambda request: httpx.Response(200, json={"price": next(prices)}))
+
+    assert await client.get("/sol-price") == {"price": 100}
+    assert await client.get("/sol-price", use_cache=False) == {"price": 150}
+    # The refreshed response replaces the cached one
+    assert await client.get("/sol-price") == {"price": 150}
+    assert len(calls) == 2
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_cached_and_respect_required():
+    status = {"code": 404}
+    client, calls = _client(lambda request: httpx.Response(status["code"], json={"mint": "abc"}))
+
+    assert await client.get("/coins/abc", required=False) is None
+    with pytest.raises(HTTPException) as excinfo:
+        await client.get("/coins/abc")
+    assert excinfo.value.status_code == 404
+
+    status["code"] = 200
+    assert await client.get("/coins/abc") == {"mint": "abc"}
+    assert len(calls) == 3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_distinct_calls_run_concurrently():
+    client, calls = _client(lambda request: httpx.Response(200, json=[]), delay=0.1)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client.get(f"/candlesticks/mint{i}") for i in range(4)))
+    elapsed = time.perf_counter() - start
+
+    assert len(calls) == 4
+    assert elapsed < 0.3
+    await client.close()
+
+
+@pytest.mark.asyncio
+async def test_latest_coins_is_one_paged_request():
+    coins = [{"mint": f"mint{i}"} for i in range(3)] + [{"name": "no mint"}]
+    client, calls = _client(lambda request: httpx.Response(200, json=coins))
+
+    latest = await client.get_latest_coins(limit=2, offset=5)
+
+    assert [coin["mint"] for coin in latest] == ["mint0", "mint1"]
+    assert len(calls) == 1
+    params = httpx.URL(calls[0]).params
+    assert (params["offset"], params["limit"], params["order"]) == ("5", "2", "DESC")
+    # The page of newest coins is never served from the cache
+    await client.get_latest_coins(limit=2, offset=5)
+    assert len(calls) == 2
+    await client.close()
@@ -0,0 +1,114 @@
+"""
+Tests for bulk, delta-aware Pump.fun token ingestion.
+"""
+
+import sqlite3
+
+import pytest
+
+from backend.app.database import sqlite
+from backend.app.tasks.pump_data_collector import PumpDataCollector
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite, "DB_FILE", str(tmp_path / "cache.db"))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    yield cache
+    cache._close()
+
+
+def _token(i, volume=1.0, **extra):
+    return {
+        "mint": f"mint{i}",
+        "name": f"Token {i}",
+        "symbol": f"T{i}",
+        "virtual_sol_reserves": 30_000_000_000 + i,
+        "virtual_token_reserves": 1_000_000_000_000_000,
+        "volume_24h": volume,
+        "market_cap": i,
+        **extra,
+    }
+
+
+def _count(db, table):
+    conn, cursor = db._get_connection()
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    return cursor.fetchone()[0]
+
+
+def test_history_only_grows_on_metric_changes(db):
+    tokens = [_token(i) for i in range(2000)]
+
+    assert db.store_token_performances(tokens) == 2000
+    assert db.store_token_performances(tokens) == 2000
+    assert _count(db, "pump_token_performance") == 2000
+
+    # Metadata-only changes refresh the latest state without a history row
+    tokens[0] = _token(0, name="Renamed")
+    tokens[1] = _token(1, volume=5.0)
+    assert db.store_token_performances(tokens) == 2000
+
+    assert _count(db, "pump_token_performance") == 2001
+    assert _count(db, "pump_token_latest") == 2000
+
+
+def test_top_tokens_come_from_latest_state(db):
+    db.store_token_performances([_token(i, volume=float(i)) for i in range(50)])
+    db.store_token_performances([_token(3, volume=1000.0)])
+
+    top = db.get_top_performing_tokens("volume_24h", limit=3)
+
+    assert [token["mint"] for token in top] == ["mint3", "mint49", "mint48"]
+    assert top[0]["data"]["volume_24h"] == 1000.0
+
+
+def test_single_token_path_and_missing_mint(db):
+    assert db.store_token_performance(_token(1))
+    assert not db.store_token_performance({"name": "no mint"})
+    assert db.store_token_performances([{"name": "no mint"}, _token(2), _token(2, volume=9.0)]) == 1
+    assert [token["volume_24h"] for token in db.get_top_performing_tokens(limit=5)] == [9.0, 1.0]
+
+
+def test_latest_state_is_backfilled_from_existing_history(tmp_path, monkeypatch):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE pump_token_performance (id INTEGER PRIMARY KEY AUTOINCREMENT, mint TEXT, name TEXT, "
+        "symbol TEXT, price REAL, price_change_1h REAL, price_change_24h REAL, price_change_7d REAL, "
+        "volume_24h REAL, market_cap REAL, virtual_sol_reserves REAL, virtual_token_reserves REAL, "
+        "timestamp TIMESTAMP, data TEXT)"
+    )
+    conn.executemany(
+        "INSERT INTO pump_token_performance (mint, volume_24h, timestamp, data) VALUES (?, ?, ?, ?)",
+        [("a", 1.0, "2099-01-01T00:00:00", "{}"), ("a", 2.0, "2099-01-02T00:00:00", "{}"), ("b", 3.0, "2099-01-01T00:00:00", "{}")],
+    )
+    conn.commit()
+    conn.close()
+
+    monkeypatch.setattr(sqlite, "DB_FILE", str(path))
+    cache = sqlite.DatabaseCache()
+    cache._close()
+    try:
+        assert [(t["mint"], t["volume_24h"]) for t in cache.get_top_performing_tokens()] == [("b", 3.0), ("a", 2.0)]
+        _, cursor = cache._get_connection()
+        cursor.execute("PRAGMA index_list(pump_token_performance)")
+        assert "idx_pump_token_performance_mint_timestamp" in [row["name"] for row in cursor.fetchall()]
+    finally:
+        cache._close()
+
+
+@pytest.mark.asyncio
+async def test_collector_stores_in_one_batch(db, monkeypatch):
+    collector = PumpDataCollector()
+    collector.db = db
+    calls = []
+    store = db.store_token_performances
+    monkeypatch.setattr(db, "store_token_performances", lambda tokens: calls.append(len(tokens)) or store(tokens))
+    try:
+        assert await collector.store_token_data([_token(i) for i in range(10)]) == 10
+    finally:
+        await collector.close()
+
+    assert calls == [10]
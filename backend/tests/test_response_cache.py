@@ -0,0 +1,110 @@
+"""
+Tests for conditional GET and precompressed bodies in the response cache middleware.
+"""
+
+import asyncio
+import gzip
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.database import middleware
+from backend.app.database.history import HistoryRecorder
+from backend.app.database.middleware import CacheMiddleware, CachedResponse, _accepted_encodings
+from backend.app.utils.serialization import SolecoJSONResponse, loads
+
+ENDPOINT = "/soleco/network/rpc-nodes"
+
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=SolecoJSONResponse)
+    app.add_middleware(CacheMiddleware, history=HistoryRecorder(db=MagicMock()))
+    state = {"calls": 0, "nodes": [{"pubkey": f"node-{i}", "version": "1.18.0"} for i in range(100)]}
+
+    @app.get(ENDPOINT)
+    async def rpc_nodes():
+        state["calls"] += 1
+        return SolecoJSONResponse({"status": "success", "total_nodes": len(state["nodes"]), "nodes": state["nodes"]})
+
+    store = {}
+    fake_cache = MagicMock()
+    fake_cache.get_cached_body.side_effect = lambda endpoint, params, ttl: store.get(endpoint)
+    fake_cache.cache_body.side_effect = lambda endpoint, body, params, ttl: store.__setitem__(endpoint, body)
+
+    with patch("backend.app.database.middleware.db_cache", fake_cache):
+        yield TestClient(app), state, store
+
+
+def test_matching_etag_gets_304(client):
+    client, state, _ = client
+
+    miss = client.get(ENDPOINT)
+    etag = miss.headers["ETag"]
+    not_modified = client.get(ENDPOINT, headers={"If-None-Match": etag})
+    stale = client.get(ENDPOINT, headers={"If-None-Match": 'W/"other"'})
+
+    assert miss.status_code == 200 and miss.headers["X-Cache"] == "MISS"
+    assert not_modified.status_code == 304 and not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag and not_modified.headers["X-Cache"] == "HIT"
+    assert stale.status_code == 200 and stale.content == miss.content
+    assert state["calls"] == 1
+
+
+def test_gzip_variant_is_compressed_once_per_body(client, monkeypatch):
+    client, _, store = client
+    compressions, on_event_loop = [], []
+
+    def compress(body, **kwargs):
+        compressions.append(body)
+        try:
+            asyncio.get_running_loop()
+            on_event_loop.append(body)
+        except RuntimeError:
+            pass
+        return gzip.compress(body, **kwargs)
+
+    monkeypatch.setattr(middleware, "gzip", SimpleNamespace(compress=compress))
+    monkeypatch.setattr(middleware, "brotli", None)
+
+    responses = [client.get(ENDPOINT, headers={"Accept-Encoding": "gzip"}) for _ in range(3)]
+
+    assert [r.headers["Content-Encoding"] for r in responses] == ["gzip"] * 3
+    assert all(r.headers["Vary"] == "Accept-Encoding" for r in responses)
+    assert loads(responses[-1].content)["total_nodes"] == 100
+    assert len(compressions) == 1
+    assert on_event_loop == []
+
+    # A new body behind the same key gets a new tag and is compressed again
+    store[ENDPOINT] = store[ENDPOINT].replace(b"1.18.0", b"1.18.1")
+    changed = client.get(ENDPOINT, headers={"Accept-Encoding": "gzip"})
+    assert changed.headers["ETag"] != responses[0].headers["ETag"]
+    assert len(compressions) == 2
+
+
+def test_identity_when_gzip_is_refused(client):
+    client, _, _ = client
+
+    response = client.get(ENDPOINT, headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+    assert "Content-Encoding" not in response.headers
+    assert int(response.headers["Content-Length"]) == len(response.content)
+
+
+def test_brotli_is_preferred_when_available():
+    brotli = pytest.importorskip("brotli")
+    body = b'{"nodes": [' + b",".join(b'{"pubkey": "node"}' for _ in range(200)) + b"]}"
+
+    content, encoding = CachedResponse(body).variant("gzip, deflate, br")
+
+    assert encoding == "br" and brotli.decompress(content) == body
+
+
+def test_accept_encoding_parsing():
+    assert _accepted_encodings("gzip, br;q=0.5, *;q=0") == {"gzip": 1.0, "br": 0.5, "*": 0.0}
+    small = CachedResponse(b"{}")
+    assert small.variant("gzip") == (b"{}", None)
+    assert small.matches("*") and small.matches(f"W/{small.etag[2:]}, x") and not small.matches(None)
@@ -0,0 +1,92 @@
+"""
+Tests for on-demand router loading and import-time diagnostics.
+"""
+
+import asyncio
+
+import pytest
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+from backend.app.routers import loader
+from backend.app.utils.import_profile import parse_importtime, profile_imports
+
+
+def _router(started, stopped):
+    router = APIRouter()
+
+    @router.on_event("startup")
+    async def startup():
+        started.append(True)
+
+    @router.on_event("shutdown")
+    async def shutdown():
+        stopped.append(True)
+
+    @router.get("/ping")
+    async def ping():
+        return {"pong": True}
+
+    return router
+
+
+def test_optional_router_is_imported_on_first_request(monkeypatch):
+    loads, started, stopped = [], [], []
+
+    def load_router(name, lazy=False):
+        loads.append((name, lazy))
+        return _router(started, stopped)
+
+    monkeypatch.setattr(loader, "load_router", load_router)
+    monkeypatch.setattr(loader, "_modes", {})
+    monkeypatch.setattr(loader, "_lazy_apps", {})
+    monkeypatch.setitem(loader.ROUTER_CONFIG, "optional", ("extra",))
+    monkeypatch.setitem(loader.ROUTER_CONFIG, "disabled", frozenset({"unused"}))
+
+    app = FastAPI()
+    loader.include_router(app, "extra", prefix="/extra")
+    loader.include_router(app, "extra", prefix="/also/extra")
+    loader.include_router(app, "unused", prefix="/unused")
+    assert loads == []
+
+    client = TestClient(app)
+    assert client.get("/extra/ping").json() == {"pong": True}
+    assert client.get("/also/extra/ping").json() == {"pong": True}
+    assert client.get("/unused/ping").status_code == 404
+    assert loads == [("extra", True)]  # One import serves both prefixes
+    assert started == [True]
+    assert loader.get_router_status()["unused"]["mode"] == "disabled"
+
+    # The mounted app gets no lifespan events; the main app's shutdown runs the handlers
+    assert stopped == []
+    asyncio.run(loader.shutdown_lazy_routers())
+    asyncio.run(loader.shutdown_lazy_routers())
+    assert stopped == [True]
+
+
+def test_parse_importtime():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     app.config",
+        "import time:      3000 |       3120 |   app.routers.soleco",
+        "import time:        50 |       3170 | app.main",
+        "import time:      9000 |       9000 | site",
+    ])
+
+    entries = parse_importtime(output, top=2)
+    assert [entry["module"] for entry in entries] == ["site", "app.main"]
+
+    entries = parse_importtime(output, top=2, root="app.main")
+    assert [entry["module"] for entry in entries] == ["app.main", "app.routers.soleco"]
+    assert entries[1] == {"module": "app.routers.soleco", "self_us": 3000, "cumulative_us": 3120, "depth": 1}
+
+
+@pytest.mark.asyncio
+async def test_profile_imports_rejects_modules_outside_the_app():
+    with pytest.raises(ValueError):
+        await profile_imports("os; print('x')")
+
+    report = await profile_imports("app.config", top=5)
+    assert report["returncode"] == 0
+    assert report["total_seconds"] > 0
+    assert report["top"][0]["module"] == "app.config"
@@ -0,0 +1,81 @@
+"""
+Tests for the shared RPC transport and endpoint registry.
+"""
+
+import pytest
+
+from backend.app.utils import rpc_transport
+from backend.app.utils.rpc_transport import EndpointState, get_rpc_transport
+from backend.app.utils.solana_connection import SolanaConnectionPool as RoundRobinPool
+from backend.app.utils.solana_error import RetryableError
+from backend.app.utils.solana_rpc import SolanaClient, SolanaConnectionPool
+
+from .benchmarks.mock_rpc import FaultProfile, MockRPCServer
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(rpc_transport, "_rpc_transport", None)
+    return get_rpc_transport()
+
+
+def test_endpoint_cools_down_after_consecutive_failures(monkeypatch):
+    monkeypatch.setitem(rpc_transport.RPC_TRANSPORT_CONFIG, "max_consecutive_failures", 3)
+    state = EndpointState("https://rpc.example")
+
+    state.record(False)
+    state.record(False)
+    state.record(True, 0.2)
+    state.record(False)
+    state.record(False)
+    assert state.is_available()
+
+    state.record(False)
+    assert not state.is_available()
+    assert (state.success_count, state.failure_count, state.current_failures) == (1, 5, 3)
+    assert state.to_dict()["avg_latency"] == 0.2
+
+
+def test_rate_limit_cools_down_immediately():
+    transport = rpc_transport.RpcTransport()
+    transport.record("https://rpc.example/", False, rate_limited=True)
+
+    assert not transport.is_available("https://rpc.example")
+    assert transport.available(["https://rpc.example", "https://other.example"]) == ["https://other.example"]
+    assert transport.get_stats()["cooling_down"] == ["https://rpc.example"]
+
+
+@pytest.mark.asyncio
+async def test_clients_share_one_session(transport):
+    async with MockRPCServer() as server:
+        first, second = SolanaClient(server.url), SolanaClient(server.url)
+        await first.connect()
+        await second.connect()
+        assert await first.get_slot() == server.head_slot
+        await first.close()
+        # Closing a client leaves the shared connections open for the others
+        assert await second.get_slot() == server.head_slot
+        await second.close()
+        stats = transport.get_stats()
+        await transport.close()
+
+    assert stats["sessions_created"] == 1
+    assert stats["endpoints"][server.url]["success_count"] == 4  # Two health checks and two calls
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_seen_by_one_pool_applies_to_all(transport):
+    limited = MockRPCServer(faults=FaultProfile(http_429_rate=1.0, methods=frozenset({"getSlot"})))
+    async with limited, MockRPCServer() as healthy:
+        pool = RoundRobinPool(endpoints=[limited.url, healthy.url])
+        await pool.initialize()
+        assert (await pool.get_client()).endpoint == limited.url
+
+        client = SolanaClient(limited.url)
+        with pytest.raises(RetryableError):
+            await client.get_slot()
+
+        assert (await pool.get_client()).endpoint == healthy.url
+        assert limited.url in SolanaConnectionPool()._rate_limited_until
+        await pool.close()
+        await transport.close()
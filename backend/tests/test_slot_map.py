@@ -0,0 +1,72 @@
+"""
+Tests for the shared skipped/confirmed slot map.
+"""
+
+import pytest
+
+from backend.app.utils import rpc_transport, slot_map
+from backend.app.utils.slot_map import SlotMap, get_slot_map
+from backend.app.utils.solana_error import SlotSkippedError
+from backend.app.utils.solana_rpc import SolanaClient
+
+from .benchmarks.mock_rpc import FaultProfile, MockRPCServer
+
+
+@pytest.fixture
+def shared_map(monkeypatch):
+    monkeypatch.setattr(slot_map, "_slot_map", None)
+    monkeypatch.setattr(rpc_transport, "_rpc_transport", None)
+    return get_slot_map()
+
+
+def test_ranges_are_recorded_up_to_the_last_listed_block():
+    slots = SlotMap(slots_per_epoch=16, max_epochs=2)
+    # 10-20 spans two epochs; 19 and 20 come after the last listed block
+    slots.record_blocks(10, 20, [10, 13, 17, 18])
+
+    assert slots.get(10) is True and slots.get(17) is True
+    assert slots.get(11) is False and slots.get(16) is False
+    assert slots.get(19) is None and slots.get(9) is None
+    assert slots.known_until(10, 20) == 18
+    assert slots.known_blocks(12, 18) == ([13, 17, 18], 19)
+    assert slots.get_stats()["ranges_answered"] == 1
+
+    slots.record_confirmed(40)
+    assert slots.get(10) is None
+    assert slots.get_stats()["evicted_epochs"] == 1
+
+
+@pytest.mark.asyncio
+async def test_client_never_requests_slots_known_to_be_empty(shared_map):
+    faults = FaultProfile(skipped_slots=frozenset({105, 106, 150}))
+    async with MockRPCServer(faults=faults) as server:
+        client = SolanaClient(server.url)
+        await client.connect()
+        try:
+            # A skip reported by one node's getBlock may be that node's gap, so it is not remembered
+            for _ in range(2):
+                with pytest.raises(SlotSkippedError):
+                    await client.get_block(150)
+            assert shared_map.get(150) is None
+            assert await client.get_blocks(100, 110) == [100, 101, 102, 103, 104, 107, 108, 109, 110]
+
+            # Every slot of a listed range is, for both getBlock and getBlocks
+            with pytest.raises(SlotSkippedError):
+                await client.get_block(105)
+            assert await client.get_blocks(103, 108) == [103, 104, 107, 108]
+            assert await client.get_blocks(108, 112) == [108, 109, 110, 111, 112]
+        finally:
+            await client.close()
+            await rpc_transport.get_rpc_transport().close()
+
+    assert server.requests["getBlock"] == 2
+    assert server.requests["getBlocks"] == 2
+    assert shared_map.get_stats()["requests_avoided"] == 1
+    assert shared_map.get(112) is True
+
+
+def test_only_responses_with_a_block_count_as_confirmed():
+    assert SolanaClient._has_block({"result": {"blockhash": "x"}})
+    assert not SolanaClient._has_block({"result": None})
+    assert SolanaClient._has_block(b'{"jsonrpc":"2.0","result":{"blockhash":"x"},"id":1}')
+    assert not SolanaClient._has_block(b'{"jsonrpc":"2.0","result": null,"id":1}')
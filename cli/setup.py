@@ -17,6 +17,7 @@ setup(
     install_requires=[
         "click>=8.0.0",
         "requests>=2.25.0",
+        "httpx>=0.24.0",
         "rich>=10.0.0",
         "pyyaml>=6.0",
         "python-dateutil>=2.8.2",
@@ -5,23 +5,95 @@ API client for interacting with the Soleco backend
 import requests
 import logging
 import time
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, TYPE_CHECKING
 from requests.exceptions import RequestException, Timeout, ConnectionError
 
+if TYPE_CHECKING:
+    from soleco_cli.cache import ResponseCache
+
 logger = logging.getLogger("soleco")
 
 class APIError(Exception):
     """Exception raised for API errors"""
     pass
 
-class SolecoAPI:
+class SolecoEndpoints:
+    """
+    Soleco API endpoints, shared by the sync and async clients.
+    
+    Each method returns whatever the client's get() returns: the response for
+    SolecoAPI, an awaitable of it for AsyncSolecoAPI.
+    """
+    
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        raise NotImplementedError
+    
+    # Network endpoints
+    def get_network_status(self, summary_only: bool = False) -> Dict[str, Any]:
+        """Get Solana network status"""
+        return self.get("solana/network/status", params={"summary_only": summary_only})
+    
+    def get_performance_metrics(self) -> Dict[str, Any]:
+        """Get Solana network performance metrics"""
+        return self.get("solana/network/performance")
+    
+    # RPC node endpoints
+    def get_rpc_nodes(self, include_details: bool = False, health_check: bool = False) -> Dict[str, Any]:
+        """Get Solana RPC nodes"""
+        params = {
+            "include_details": include_details,
+            "health_check": health_check
+        }
+        return self.get("solana/network/rpc-nodes", params=params)
+    
+    def get_rpc_stats(self) -> Dict[str, Any]:
+        """Get RPC endpoint performance statistics"""
+        return self.get("solana/network/rpc/stats")
+    
+    def get_filtered_rpc_stats(self) -> Dict[str, Any]:
+        """Get filtered RPC endpoint performance statistics (excluding private endpoints)"""
+        return self.get("solana/network/rpc/filtered-stats")
+    
+    # Mint analytics endpoints
+    def get_recent_mints(self, blocks: int = 5) -> Dict[str, Any]:
+        """Get recently created mint addresses"""
+        return self.get("analytics/mints/recent", params={"blocks": blocks})
+    
+    def get_new_mints_since(self, slot: Optional[int] = None, wait: float = 0, limit: int = 20) -> Dict[str, Any]:
+        """Get new mints per block after a slot, waiting up to `wait` seconds for a new block"""
+        params = {"wait": wait, "limit": limit}
+        if slot is not None:
+            params["slot"] = slot
+        return self.get("mints/new/since", params=params)
+    
+    def analyze_mint(self, mint_address: str, include_history: bool = False) -> Dict[str, Any]:
+        """Analyze a specific mint address"""
+        params = {"include_history": include_history}
+        return self.get(f"analytics/mints/analyze/{mint_address}", params=params)
+    
+    def get_mint_statistics(self, timeframe: str = "24h") -> Dict[str, Any]:
+        """Get mint creation statistics for a specific timeframe"""
+        return self.get("analytics/mints/statistics", params={"timeframe": timeframe})
+    
+    def extract_mints_from_block(self, limit: int = 1) -> Dict[str, Any]:
+        """Extract mint addresses from recent blocks"""
+        return self.get("mints/extract", params={"limit": limit})
+    
+    # Diagnostics endpoints
+    def get_diagnostics(self) -> Dict[str, Any]:
+        """Get system diagnostic information"""
+        return self.get("diagnostics")
+
+class SolecoAPI(SolecoEndpoints):
     """Client for interacting with the Soleco API"""
     
-    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3):
-        """Initialize the API client"""
+    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3,
+                 cache: Optional["ResponseCache"] = None):
+        """Initialize the API client; GET responses are cached if a cache is given"""
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.max_retries = max_retries
+        self.cache = cache
         self.session = requests.Session()
         
         logger.debug(f"Initialized API client for {base_url}")
@@ -96,61 +168,19 @@ class SolecoAPI:
     
     def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a GET request to the API"""
-        return self._make_request("GET", endpoint, params=params)
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        result = self._make_request("GET", endpoint, params=params)
+        if self.cache is not None:
+            self.cache.set(endpoint, params, result)
+        return result
     
     def post(self, endpoint: str, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Make a POST request to the API"""
         return self._make_request("POST", endpoint, params=params, data=data)
     
-    # Network endpoints
-    def get_network_status(self, summary_only: bool = False) -> Dict[str, Any]:
-        """Get Solana network status"""
-        return self.get("solana/network/status", params={"summary_only": summary_only})
-    
-    def get_performance_metrics(self) -> Dict[str, Any]:
-        """Get Solana network performance metrics"""
-        return self.get("solana/network/performance")
-    
-    # RPC node endpoints
-    def get_rpc_nodes(self, include_details: bool = False, health_check: bool = False) -> Dict[str, Any]:
-        """Get Solana RPC nodes"""
-        params = {
-            "include_details": include_details,
-            "health_check": health_check
-        }
-        return self.get("solana/network/rpc-nodes", params=params)
-    
-    def get_rpc_stats(self) -> Dict[str, Any]:
-        """Get RPC endpoint performance statistics"""
-        return self.get("solana/network/rpc/stats")
-    
-    def get_filtered_rpc_stats(self) -> Dict[str, Any]:
-        """Get filtered RPC endpoint performance statistics (excluding private endpoints)"""
-        return self.get("solana/network/rpc/filtered-stats")
-    
-    # Mint analytics endpoints
-    def get_recent_mints(self, blocks: int = 5) -> Dict[str, Any]:
-        """Get recently created mint addresses"""
-        return self.get("analytics/mints/recent", params={"blocks": blocks})
-    
-    def analyze_mint(self, mint_address: str, include_history: bool = False) -> Dict[str, Any]:
-        """Analyze a specific mint address"""
-        params = {"include_history": include_history}
-        return self.get(f"analytics/mints/analyze/{mint_address}", params=params)
-    
-    def get_mint_statistics(self, timeframe: str = "24h") -> Dict[str, Any]:
-        """Get mint creation statistics for a specific timeframe"""
-        return self.get("analytics/mints/statistics", params={"timeframe": timeframe})
-    
-    def extract_mints_from_block(self, limit: int = 1) -> Dict[str, Any]:
-        """Extract mint addresses from recent blocks"""
-        return self.get("mints/extract", params={"limit": limit})
-    
-    # Diagnostics endpoints
-    def get_diagnostics(self) -> Dict[str, Any]:
-        """Get system diagnostic information"""
-        return self.get("diagnostics")
-    
     def close(self) -> None:
         """Close the API client session"""
         self.session.close()
@@ -0,0 +1,188 @@
+"""
+Async API client for running many Soleco requests concurrently
+"""
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import httpx
+
+from soleco_cli.api import APIError, SolecoEndpoints
+from soleco_cli.cache import ResponseCache
+
+logger = logging.getLogger("soleco")
+
+class AsyncSolecoAPI(SolecoEndpoints):
+    """Async client for the Soleco API with bounded concurrency"""
+
+    def __init__(self, base_url: str, timeout: int = 30, max_retries: int = 3, concurrency: int = 8,
+                 cache: Optional[ResponseCache] = None):
+        """Initialize the API client; GET responses are cached if a cache is given"""
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.concurrency = max(1, concurrency)
+        self.cache = cache
+        self.client = httpx.AsyncClient(
+            base_url=self.base_url,
+            timeout=timeout,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency),
+        )
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        # Last ETag and response per polled request, see get_if_changed
+        self._etags: Dict[str, Tuple[Optional[str], Any]] = {}
+        self.poll_stats = {"requests": 0, "not_modified": 0, "bytes": 0}
+
+        logger.debug(f"Initialized async API client for {base_url} (concurrency {self.concurrency})")
+
+    async def __aenter__(self) -> "AsyncSolecoAPI":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def _send(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                    data: Optional[Dict[str, Any]] = None,
+                    headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+        """Send an HTTP request with retry logic; a 304 Not Modified is returned as is"""
+        url = f"/{endpoint.lstrip('/')}"
+
+        for attempt in range(self.max_retries):
+            try:
+                async with self._semaphore:
+                    start_time = time.time()
+                    response = await self.client.request(method, url, params=params, json=data, headers=headers)
+                    elapsed = time.time() - start_time
+
+                logger.debug(f"{method} {url} completed in {elapsed:.2f}s (status: {response.status_code})")
+                if response.status_code != 304:
+                    response.raise_for_status()
+                return response
+
+            except httpx.TimeoutException:
+                logger.warning(f"Request timed out (attempt {attempt+1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise APIError(f"Request timed out after {self.max_retries} attempts")
+                await asyncio.sleep(1)
+
+            except httpx.TransportError as e:
+                logger.warning(f"Connection error: {str(e)} (attempt {attempt+1}/{self.max_retries})")
+                if attempt == self.max_retries - 1:
+                    raise APIError(f"Connection failed after {self.max_retries} attempts: {str(e)}")
+                await asyncio.sleep(1)
+
+            except httpx.HTTPStatusError as e:
+                status_code = e.response.status_code
+                logger.error(f"Request failed with status {status_code}: {str(e)}")
+
+                # Don't retry 4xx errors (except 429)
+                if 400 <= status_code < 500 and status_code != 429:
+                    try:
+                        error_message = e.response.json().get('detail', str(e))
+                    except ValueError:
+                        error_message = e.response.text or str(e)
+                    raise APIError(f"API error ({status_code}): {error_message}")
+
+                if attempt == self.max_retries - 1:
+                    raise APIError(f"Request failed after {self.max_retries} attempts: {str(e)}")
+
+                # Exponential backoff
+                sleep_time = 2 ** attempt
+                logger.debug(f"Retrying in {sleep_time} seconds...")
+                await asyncio.sleep(sleep_time)
+
+    @staticmethod
+    def _json(response: httpx.Response) -> Any:
+        try:
+            return response.json()
+        except ValueError:
+            logger.warning(f"Response is not valid JSON: {response.text[:100]}...")
+            return {"status": "success", "data": response.text}
+
+    async def _make_request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                            data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make an HTTP request to the API with retry logic"""
+        return self._json(await self._send(method, endpoint, params=params, data=data))
+
+    async def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a GET request to the API"""
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+        result = await self._make_request("GET", endpoint, params=params)
+        if self.cache is not None:
+            self.cache.set(endpoint, params, result)
+        return result
+
+    async def get_if_changed(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Tuple[Any, bool]:
+        """
+        Make a conditional GET for polling, bypassing the response cache.
+
+        The ETag of the previous response is sent as If-None-Match, so an
+        unchanged resource costs a bodiless 304. Returns the current response
+        and whether it differs from the one returned by the previous call.
+        """
+        key = json.dumps([endpoint.strip('/'), params or {}], sort_keys=True, default=str)
+        etag, previous = self._etags.get(key, (None, None))
+        response = await self._send("GET", endpoint, params=params,
+                                    headers={"If-None-Match": etag} if etag else None)
+        self.poll_stats["requests"] += 1
+
+        if response.status_code == 304 and previous is not None:
+            self.poll_stats["not_modified"] += 1
+            return previous, False
+
+        data = self._json(response)
+        self.poll_stats["bytes"] += len(response.content)
+        self._etags[key] = (response.headers.get("etag"), data)
+        return data, data != previous
+
+    async def post(self, endpoint: str, data: Dict[str, Any], params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Make a POST request to the API"""
+        return await self._make_request("POST", endpoint, params=params, data=data)
+
+    async def map_unordered(self, func: Callable[[str], Awaitable[Any]],
+                            items: Iterable[str]) -> AsyncIterator[Tuple[str, Any, Optional[Exception]]]:
+        """
+        Call func on every item with at most `concurrency` calls in flight.
+
+        Items are read from the iterable as workers free up, so a long file or
+        stdin is never loaded at once. Yields (item, result, error) tuples in
+        completion order; error is None on success.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        iterator = iter(items)
+
+        async def worker():
+            for item in iterator:
+                try:
+                    result, error = await func(item), None
+                except Exception as e:
+                    result, error = None, e
+                await queue.put((item, result, error))
+
+        async def run_workers():
+            # Workers catch their errors, so gather only ends early when cancelled
+            await asyncio.gather(*(worker() for _ in range(self.concurrency)))
+            await queue.put(None)
+
+        runner = asyncio.create_task(run_workers())
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is None:
+                    break
+                yield entry
+            await runner
+        finally:
+            if not runner.done():
+                runner.cancel()
+
+    async def close(self) -> None:
+        """Close the API client session"""
+        await self.client.aclose()
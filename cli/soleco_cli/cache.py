@@ -0,0 +1,95 @@
+"""
+On-disk response cache for the Soleco CLI
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger("soleco")
+
+# Seconds a response stays fresh, by endpoint prefix; other endpoints use the configured cache_ttl
+ENDPOINT_TTLS = {
+    "solana/network/status": 15,
+    "solana/network/performance": 15,
+    "analytics/mints/recent": 15,
+    "mints/new/since": 0,  # Follow mode must always see the newest blocks
+    "analytics/mints/analyze": 300,
+    "analytics/mints/statistics": 300,
+    "solana/network/rpc-nodes": 300,
+}
+
+class ResponseCache:
+    """Cache of API responses keyed by endpoint and params, one JSON file per entry"""
+
+    def __init__(self, directory: Optional[Path] = None, default_ttl: float = 60):
+        """Initialize the cache, defaulting to ~/.soleco/cache"""
+        self.directory = Path(directory) if directory else Path.home() / ".soleco" / "cache"
+        self.default_ttl = default_ttl
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def ttl_for(self, endpoint: str) -> float:
+        """Get the time-to-live of an endpoint's responses"""
+        endpoint = endpoint.strip('/')
+        for prefix, ttl in ENDPOINT_TTLS.items():
+            if endpoint.startswith(prefix):
+                return ttl
+        return self.default_ttl
+
+    def _path(self, endpoint: str, params: Optional[Dict[str, Any]]) -> Path:
+        key = json.dumps([endpoint.strip('/'), params or {}], sort_keys=True, default=str)
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def get(self, endpoint: str, params: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Get a cached response, or None if there is no fresh one"""
+        path = self._path(endpoint, params)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {e}")
+            return None
+
+        if entry.get("expires_at", 0) < time.time():
+            return None
+        logger.debug(f"Cache hit for {endpoint}")
+        return entry.get("data")
+
+    def set(self, endpoint: str, params: Optional[Dict[str, Any]], data: Any, ttl: Optional[float] = None) -> None:
+        """Store a response"""
+        ttl = self.ttl_for(endpoint) if ttl is None else ttl
+        if ttl <= 0:
+            return
+        path = self._path(endpoint, params)
+        entry = {"endpoint": endpoint, "params": params, "expires_at": time.time() + ttl, "data": data}
+        # Write to a temporary file first so concurrent readers never see a partial entry
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(entry, f, default=str)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Error writing cache entry for {endpoint}: {e}")
+            tmp_path.unlink(missing_ok=True)
+
+    def clear(self, expired_only: bool = False) -> int:
+        """Remove cached responses and return how many were removed"""
+        removed = 0
+        now = time.time()
+        for path in self.directory.glob("*.json"):
+            try:
+                if expired_only:
+                    with open(path, 'r') as f:
+                        if json.load(f).get("expires_at", 0) >= now:
+                            continue
+                path.unlink()
+                removed += 1
+            except Exception as e:
+                logger.debug(f"Error removing cache entry {path}: {e}")
+        return removed
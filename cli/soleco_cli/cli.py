@@ -4,6 +4,7 @@ Soleco CLI - Command-line interface for the Soleco project
 
 import os
 import sys
+import importlib
 import click
 import logging
 from rich.console import Console
@@ -15,25 +16,47 @@ from typing import Dict, Any, Optional, List
 from pathlib import Path
 
 from .config import Config
-from .api import SolecoAPI, APIError
-from .utils import setup_logging, handle_api_error
-from .commands.network import network
-from .commands.rpc import rpc
-from .commands.mint import mint
-from .commands.diagnostics import diagnostics
+from .utils import setup_logging
 
 # Set up logger
 logger = logging.getLogger("soleco")
 
 CONTEXT_SETTINGS = dict(help_option_names=['-h', '--help'])
 
-@click.group(context_settings=CONTEXT_SETTINGS)
+class LazyGroup(click.Group):
+    """Command group whose subcommand modules are imported only when a subcommand is used or listed"""
+    
+    def __init__(self, *args, lazy_subcommands: Optional[Dict[str, str]] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Command name -> "module.attribute" of the command object
+        self.lazy_subcommands = lazy_subcommands or {}
+    
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+    
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, attribute = self.lazy_subcommands[cmd_name].rsplit('.', 1)
+            self.add_command(getattr(importlib.import_module(module_name), attribute), cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+@click.group(
+    cls=LazyGroup,
+    context_settings=CONTEXT_SETTINGS,
+    lazy_subcommands={
+        'network': 'soleco_cli.commands.network.network',
+        'rpc': 'soleco_cli.commands.rpc.rpc',
+        'mint': 'soleco_cli.commands.mint.mint',
+        'diagnostics': 'soleco_cli.commands.diagnostics.diagnostics',
+    },
+)
 @click.option('--debug', is_flag=True, help='Enable debug logging')
 @click.option('--config', type=click.Path(), help='Path to config file')
 @click.option('--no-color', is_flag=True, help='Disable colored output')
+@click.option('--no-cache', is_flag=True, help='Bypass the local response cache')
 @click.version_option(version='0.1.0')
 @click.pass_context
-def cli(ctx, debug, config, no_color):
+def cli(ctx, debug, config, no_color, no_cache):
     """Soleco CLI - Command-line interface for the Soleco project"""
     # Set up logging
     setup_logging(debug)
@@ -49,14 +72,11 @@ def cli(ctx, debug, config, no_color):
     ctx.obj['console'] = console
     ctx.obj['config'] = config_obj
     ctx.obj['debug'] = debug
+    ctx.obj['no_cache'] = no_cache
     
     logger.debug("CLI initialized")
 
-# Add command groups
-cli.add_command(network)
-cli.add_command(rpc)
-cli.add_command(mint)
-cli.add_command(diagnostics)
+# Command groups (network, rpc, mint, diagnostics) are added by LazyGroup on first use
 
 @cli.command()
 @click.option('--key', help='Configuration key to get')
@@ -124,6 +144,17 @@ def reset_config(ctx):
     else:
         console.print("[yellow]Reset cancelled[/yellow]")
 
+@cli.command()
+@click.option('--expired', is_flag=True, help='Only remove expired responses')
+@click.pass_context
+def clear_cache(ctx, expired):
+    """Remove cached API responses"""
+    from .cache import ResponseCache
+    
+    console = ctx.obj['console']
+    removed = ResponseCache().clear(expired_only=expired)
+    console.print(f"[green]Removed {removed} cached responses[/green]")
+
 @cli.command()
 @click.pass_context
 def shell(ctx):
@@ -154,16 +185,16 @@ def shell(ctx):
                     console.print("[yellow]Invalid set command. Usage: set <key> <value>[/yellow]")
             elif command.lower() == 'status':
                 # Get network status
-                ctx.invoke(network.commands['status'], summary=True, format=None, output=None)
+                ctx.invoke(cli.get_command(ctx, 'network').commands['status'], summary=True, format=None, output=None)
             elif command.lower() == 'rpc':
                 # List RPC nodes
-                ctx.invoke(rpc.commands['list'], details=False, health_check=False, format=None, output=None, version=None, status='all', sort=None)
+                ctx.invoke(cli.get_command(ctx, 'rpc').commands['list'], details=False, health_check=False, format=None, output=None, version=None, status='all', sort=None)
             elif command.lower() == 'mints':
                 # Get recent mints
-                ctx.invoke(mint.commands['recent'], blocks=5, format=None, output=None, pump_only=False, new_only=False)
+                ctx.invoke(cli.get_command(ctx, 'mint').commands['recent'], blocks=5, format=None, output=None, pump_only=False, new_only=False)
             elif command.lower() == 'diagnostics':
                 # Get diagnostics
-                ctx.invoke(diagnostics.commands['info'], format=None, output=None)
+                ctx.invoke(cli.get_command(ctx, 'diagnostics').commands['info'], format=None, output=None)
             else:
                 # Try to run as a CLI command
                 try:
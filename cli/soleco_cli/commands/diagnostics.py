@@ -15,8 +15,8 @@ from rich.progress import Progress
 from typing import Dict, Any, Optional
 from pathlib import Path
 
-from soleco_cli.api import SolecoAPI, APIError
-from soleco_cli.utils import format_output, handle_api_error
+from soleco_cli.api import APIError
+from soleco_cli.utils import format_output, handle_api_error, create_api
 
 logger = logging.getLogger("soleco")
 
@@ -35,7 +35,7 @@ def info(ctx, format, output):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching system diagnostics..."):
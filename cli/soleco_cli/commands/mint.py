@@ -2,19 +2,23 @@
 Mint commands for the Soleco CLI
 """
 
+import asyncio
 import click
 import logging
 import json
 import sys
+import time
+from collections import deque
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
-from soleco_cli.api import SolecoAPI, APIError
-from soleco_cli.utils import format_output, handle_api_error
+from soleco_cli.api import APIError
+from soleco_cli.utils import format_output, handle_api_error, create_api, create_async_api, truncate_string
 
 logger = logging.getLogger("soleco")
 
@@ -29,14 +33,27 @@ def mint():
 @click.option('--output', type=click.Path(), help='Save output to file')
 @click.option('--pump-only', is_flag=True, help='Show only pump tokens')
 @click.option('--new-only', is_flag=True, help='Show only new mint addresses')
+@click.option('--follow', is_flag=True, help='Keep following new blocks and add their mints to a live view')
+@click.option('--wait', type=click.FloatRange(min=0, max=30), default=10, show_default=True,
+              help='Seconds the server may hold each --follow request open waiting for a new block')
+@click.option('--polls', type=click.IntRange(min=1), help='Stop --follow after this many requests')
 @click.pass_context
-def recent_mints(ctx, blocks, format, output, pump_only, new_only):
+def recent_mints(ctx, blocks, format, output, pump_only, new_only, follow, wait, polls):
     """Get recently created mint addresses"""
     console = ctx.obj['console']
     config = ctx.obj['config']
     
+    if follow:
+        try:
+            asyncio.run(_follow_new_mints(ctx, blocks, wait, polls, pump_only))
+        except APIError as e:
+            handle_api_error(e, console)
+        except KeyboardInterrupt:
+            console.print("[dim]Stopped following new mints[/dim]")
+        return
+    
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching recent mints..."):
@@ -56,6 +73,67 @@ def recent_mints(ctx, blocks, format, output, pump_only, new_only):
     finally:
         api.close()
 
+async def _follow_new_mints(ctx, blocks: int, wait: float, max_polls: Optional[int], pump_only: bool):
+    """Long-poll the server for blocks after the last seen slot and append them to a live table"""
+    console = ctx.obj['console']
+    rows = deque(maxlen=max(blocks, 20))
+    totals = {"blocks": 0, "new_mints": 0, "pump_tokens": 0}
+    slot = None
+    polls = 0
+    
+    async with create_async_api(ctx, concurrency=1) as api:
+        # A long poll may legitimately take `wait` seconds before the server answers
+        api.client.timeout = max(api.timeout, wait + 10)
+        with Live(console=console, auto_refresh=False) as live:
+            while max_polls is None or polls < max_polls:
+                # The first request returns the latest blocks right away
+                result = await api.get_new_mints_since(slot, wait=wait if slot is not None else 0, limit=min(blocks, 100))
+                polls += 1
+                if not result.get('success'):
+                    raise APIError(result.get('error', 'Unknown error'))
+                
+                for block in result.get('blocks', []):
+                    rows.append(block)
+                    totals["blocks"] += 1
+                    totals["new_mints"] += len(block.get('new_mints', []))
+                    totals["pump_tokens"] += len(block.get('pump_tokens', []))
+                slot = result.get('last_slot', slot)
+                live.update(_render_new_mint_blocks(rows, totals, slot, result.get('head_slot'), pump_only), refresh=True)
+                
+                # Without long polling, don't ask again right away when there was nothing new
+                if not result.get('blocks') and not wait:
+                    await asyncio.sleep(1)
+
+def _render_new_mint_blocks(rows, totals: Dict[str, int], slot: Optional[int], head_slot: Optional[int],
+                            pump_only: bool) -> Table:
+    """Build the follow-mode table of the most recent blocks"""
+    lag = f", {head_slot - slot} slots behind head" if slot is not None and head_slot is not None else ""
+    table = Table(
+        title="New Mints (following)",
+        caption=(f"Slot {slot}{lag} · {totals['blocks']} blocks, {totals['new_mints']} new mints, "
+                 f"{totals['pump_tokens']} pump tokens since start · {time.strftime('%H:%M:%S')}"),
+    )
+    table.add_column("Slot", style="cyan")
+    table.add_column("Time", style="dim")
+    table.add_column("New", justify="right", style="green")
+    table.add_column("Pump", justify="right", style="magenta")
+    table.add_column("Pump Tokens" if pump_only else "New Mints")
+    
+    for block in rows:
+        addresses = block.get('pump_tokens' if pump_only else 'new_mints', [])
+        shown = ", ".join(truncate_string(address, 16) for address in addresses[:3])
+        if len(addresses) > 3:
+            shown += f" (+{len(addresses) - 3})"
+        block_time = block.get('block_time')
+        table.add_row(
+            str(block.get('slot')),
+            time.strftime('%H:%M:%S', time.localtime(block_time)) if block_time else "-",
+            str(len(block.get('new_mints', []))),
+            str(len(block.get('pump_tokens', []))),
+            shown,
+        )
+    return table
+
 def _display_recent_mints_table(console: Console, data: Dict[str, Any], pump_only: bool, new_only: bool):
     """Display recent mints as a table"""
     # Display summary
@@ -139,7 +217,7 @@ def analyze_mint(ctx, mint_address, history, format, output):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status(f"[bold green]Analyzing mint address {mint_address}..."):
@@ -238,6 +316,49 @@ def _display_mint_analysis_table(console: Console, data: Dict[str, Any], mint_ad
         if len(history) > 10:
             console.print(f"[dim]Note: Only showing 10 of {len(history)} transactions. Use --format json for complete data.[/dim]")
 
+@mint.command('analyze-batch')
+@click.argument('source', type=click.File('r'), default='-')
+@click.option('--history', is_flag=True, help='Include transaction history')
+@click.option('--concurrency', type=click.IntRange(min=1), help='Concurrent requests (default: concurrency setting)')
+@click.option('--output', type=click.Path(), help='Write results to file instead of stdout')
+@click.pass_context
+def analyze_batch(ctx, source, history, concurrency, output):
+    """Analyze mint addresses read from SOURCE (a file, or - for stdin), one per line
+    
+    Results are written as JSON lines as they complete, e.g.
+    {"mint": "...", "result": {...}} or {"mint": "...", "error": "..."}.
+    """
+    addresses = (line.strip() for line in source)
+    addresses = (address for address in addresses if address and not address.startswith('#'))
+    
+    sink = open(output, 'w') if output else None
+    try:
+        counts = asyncio.run(_analyze_batch(ctx, addresses, history, concurrency, sink))
+    finally:
+        if sink:
+            sink.close()
+    
+    click.echo(f"Analyzed {counts['ok']} mints, {counts['failed']} failed", err=True)
+    if counts['failed']:
+        ctx.exit(1)
+
+async def _analyze_batch(ctx, addresses, history: bool, concurrency: Optional[int], sink) -> Dict[str, int]:
+    """Run analyze_mint over the addresses and write one JSON line per result"""
+    counts = {"ok": 0, "failed": 0}
+    async with create_async_api(ctx, concurrency) as api:
+        async def analyze(address):
+            return await api.analyze_mint(address, include_history=history)
+        
+        async for address, result, error in api.map_unordered(analyze, addresses):
+            if error is None:
+                line = {"mint": address, "result": result}
+                counts["ok"] += 1
+            else:
+                line = {"mint": address, "error": str(error)}
+                counts["failed"] += 1
+            click.echo(json.dumps(line, default=str), file=sink)
+    return counts
+
 @mint.command('stats')
 @click.option('--timeframe', type=click.Choice(['1h', '6h', '12h', '24h', '7d', '30d']), default='24h', 
               help='Timeframe for statistics')
@@ -250,7 +371,7 @@ def statistics(ctx, timeframe, format, output):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status(f"[bold green]Fetching mint statistics for {timeframe}..."):
@@ -349,7 +470,7 @@ def extract(ctx, limit, format, output):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status(f"[bold green]Extracting mint addresses from {limit} recent blocks..."):
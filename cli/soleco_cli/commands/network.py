@@ -2,19 +2,23 @@
 Network commands for the Soleco CLI
 """
 
+import asyncio
 import click
 import logging
+import time
 import json
 import sys
 from rich.console import Console
+from rich.live import Live
 from rich.table import Table
 from rich.panel import Panel
 from rich.progress import Progress
 from typing import Dict, Any, Optional
 from pathlib import Path
 
-from soleco_cli.api import SolecoAPI, APIError
-from soleco_cli.utils import format_output, handle_api_error
+from soleco_cli.api import APIError
+from soleco_cli.utils import (format_output, handle_api_error, create_api, create_async_api,
+                              flatten_dict, diff_values, format_bytes, truncate_string)
 
 logger = logging.getLogger("soleco")
 
@@ -27,14 +31,27 @@ def network():
 @click.option('--summary', is_flag=True, help='Show only summary information')
 @click.option('--format', type=click.Choice(['table', 'json', 'csv']), help='Output format')
 @click.option('--output', type=click.Path(), help='Save output to file')
+@click.option('--follow', is_flag=True, help='Keep polling and update a live view with what changed')
+@click.option('--interval', type=click.FloatRange(min=1), default=10, show_default=True,
+              help='Seconds between polls in --follow mode')
+@click.option('--polls', type=click.IntRange(min=1), help='Stop --follow after this many polls')
 @click.pass_context
-def status(ctx, summary, format, output):
+def status(ctx, summary, format, output, follow, interval, polls):
     """Get Solana network status"""
     console = ctx.obj['console']
     config = ctx.obj['config']
     
+    if follow:
+        try:
+            asyncio.run(_follow_network_status(ctx, summary, interval, polls))
+        except APIError as e:
+            handle_api_error(e, console)
+        except KeyboardInterrupt:
+            console.print("[dim]Stopped following network status[/dim]")
+        return
+    
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching network status..."):
@@ -54,6 +71,55 @@ def status(ctx, summary, format, output):
     finally:
         api.close()
 
+async def _follow_network_status(ctx, summary_only: bool, interval: float, max_polls: Optional[int] = None):
+    """Poll the network status with conditional requests and redraw only when it changed"""
+    console = ctx.obj['console']
+    previous: Dict[str, Any] = {}
+    changes: Dict[str, Any] = {}
+    polls = 0
+    
+    async with create_async_api(ctx, concurrency=1) as api:
+        with Live(console=console, auto_refresh=False) as live:
+            while True:
+                data, changed = await api.get_if_changed("solana/network/status", params={"summary_only": summary_only})
+                polls += 1
+                if changed:
+                    current = _status_values(data)
+                    changes = diff_values(previous, current) if previous else {}
+                    previous = current
+                live.update(_render_status_changes(previous, changes, api.poll_stats), refresh=True)
+                
+                if max_polls is not None and polls >= max_polls:
+                    break
+                await asyncio.sleep(interval)
+
+def _status_values(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten a status response, replacing lists such as node lists by their length"""
+    return {
+        key: len(value) if isinstance(value, list) else value
+        for key, value in flatten_dict(data).items()
+    }
+
+def _render_status_changes(values: Dict[str, Any], changes: Dict[str, Any], poll_stats: Dict[str, int]) -> Table:
+    """Build the follow-mode table, highlighting the values changed by the last update"""
+    table = Table(
+        title="Solana Network Status (following)",
+        caption=(f"Checked {time.strftime('%H:%M:%S')} · {poll_stats['requests']} polls, "
+                 f"{poll_stats['not_modified']} unchanged · {format_bytes(poll_stats['bytes'])} received"),
+    )
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value")
+    table.add_column("Change", justify="right")
+    
+    for key, value in values.items():
+        if key in changes:
+            delta = changes[key]
+            change = "changed" if delta is None else f"{delta:+g}"
+            table.add_row(key, f"[bold yellow]{truncate_string(str(value))}[/bold yellow]", f"[yellow]{change}[/yellow]")
+        else:
+            table.add_row(key, truncate_string(str(value)), "")
+    return table
+
 def _display_network_status_table(console: Console, data: Dict[str, Any], summary_only: bool = False):
     """Display network status as a table"""
     # Display overall status
@@ -142,7 +208,7 @@ def performance(ctx, format, output):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching performance metrics..."):
@@ -13,8 +13,8 @@ from rich.progress import Progress
 from typing import Dict, Any, Optional, List
 from pathlib import Path
 
-from soleco_cli.api import SolecoAPI, APIError
-from soleco_cli.utils import format_output, handle_api_error
+from soleco_cli.api import APIError
+from soleco_cli.utils import format_output, handle_api_error, create_api
 
 logger = logging.getLogger("soleco")
 
@@ -38,7 +38,7 @@ def list_rpc_nodes(ctx, details, health_check, format, output, version, status,
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching RPC nodes..."):
@@ -173,7 +173,7 @@ def stats(ctx, format, output, filtered):
     config = ctx.obj['config']
     
     # Create API client
-    api = SolecoAPI(config.api_url, timeout=config.get('timeout', 30))
+    api = create_api(ctx)
     
     try:
         with console.status("[bold green]Fetching RPC statistics..."):
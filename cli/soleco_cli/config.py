@@ -16,6 +16,9 @@ DEFAULT_CONFIG = {
     "timeout": 30,
     "max_retries": 3,
     "color": True,
+    "concurrency": 8,      # Concurrent requests in batch commands
+    "cache": True,         # Cache GET responses on disk (~/.soleco/cache)
+    "cache_ttl": 60,       # Seconds a cached response stays fresh, unless the endpoint has its own TTL
 }
 
 class Config:
@@ -6,11 +6,14 @@ import json
 import csv
 import logging
 import sys
-from typing import Dict, Any, Optional, List, TextIO
+from typing import Dict, Any, Optional, List, TextIO, TYPE_CHECKING
 from rich.console import Console
 from rich.panel import Panel
 from pathlib import Path
-from soleco_cli.api import APIError
+
+if TYPE_CHECKING:
+    # Only used in annotations; importing the API client pulls in requests
+    from soleco_cli.api import APIError
 
 logger = logging.getLogger("soleco")
 
@@ -53,6 +56,44 @@ def setup_logging(debug: bool = False):
     
     logger.debug("Logging initialized")
 
+def create_api(ctx):
+    """Create a SolecoAPI client from the CLI context's configuration"""
+    from soleco_cli.api import SolecoAPI
+    
+    config = ctx.obj['config']
+    return SolecoAPI(
+        config.api_url,
+        timeout=config.get('timeout', 30),
+        max_retries=config.get('max_retries', 3),
+        cache=create_cache(ctx),
+    )
+
+def create_async_api(ctx, concurrency: Optional[int] = None):
+    """Create an AsyncSolecoAPI client from the CLI context's configuration"""
+    from soleco_cli.async_api import AsyncSolecoAPI
+    
+    config = ctx.obj['config']
+    return AsyncSolecoAPI(
+        config.api_url,
+        timeout=config.get('timeout', 30),
+        max_retries=config.get('max_retries', 3),
+        concurrency=concurrency or config.get('concurrency', 8),
+        cache=create_cache(ctx),
+    )
+
+def create_cache(ctx):
+    """Create the response cache, or None if caching is turned off"""
+    from soleco_cli.cache import ResponseCache
+    
+    config = ctx.obj['config']
+    if ctx.obj.get('no_cache') or not config.get('cache', True):
+        return None
+    try:
+        return ResponseCache(default_ttl=config.get('cache_ttl', 60))
+    except Exception as e:
+        logger.warning(f"Response cache unavailable: {e}")
+        return None
+
 def format_output(data: Dict[str, Any], format_type: str, output_path: Optional[str], console: Console):
     """Format and output data"""
     if format_type == 'json':
@@ -96,7 +137,7 @@ def _dict_to_csv(data: Dict[str, Any]) -> str:
     
     return output.getvalue()
 
-def handle_api_error(error: APIError, console: Console):
+def handle_api_error(error: "APIError", console: Console):
     """Handle API errors"""
     console.print(Panel(f"[bold red]Error: {str(error)}[/bold red]", title="API Error", expand=False))
     logger.error(f"API error: {str(error)}")
@@ -112,6 +153,17 @@ def flatten_dict(d: Dict[str, Any], parent_key: str = '', sep: str = '_') -> Dic
             items.append((new_key, v))
     return dict(items)
 
+def diff_values(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Any]:
+    """Map each key of current whose value differs from previous to its numeric delta, or None if not numeric"""
+    changes = {}
+    for key, value in current.items():
+        if key not in previous or previous[key] == value:
+            continue
+        old = previous[key]
+        numeric = all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in (old, value))
+        changes[key] = value - old if numeric else None
+    return changes
+
 def truncate_string(s: str, max_length: int = 50) -> str:
     """Truncate a string to a maximum length"""
     if len(s) <= max_length:
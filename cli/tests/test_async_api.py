@@ -0,0 +1,141 @@
+"""
+Tests for the async API client, response cache and batch mode
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+from unittest.mock import patch
+
+from soleco_cli.api import APIError, SolecoAPI
+from soleco_cli.async_api import AsyncSolecoAPI
+from soleco_cli.cache import ResponseCache
+from soleco_cli.cli import cli
+
+def _mock_client(handler):
+    return httpx.AsyncClient(base_url="http://test.com", transport=httpx.MockTransport(handler))
+
+def test_cache_expires_entries(tmp_path):
+    """Test that cached responses are keyed by endpoint and params and expire"""
+    cache = ResponseCache(tmp_path, default_ttl=60)
+    cache.set("test/endpoint", {"a": 1, "b": 2}, {"value": 1})
+
+    assert cache.get("/test/endpoint", {"b": 2, "a": 1}) == {"value": 1}
+    assert cache.get("test/endpoint", {"a": 2}) is None
+    assert cache.ttl_for("analytics/mints/analyze/mint123") == 300
+
+    with patch("soleco_cli.cache.time.time", return_value=time.time() + 61):
+        assert cache.get("test/endpoint", {"a": 1, "b": 2}) is None
+        assert cache.clear(expired_only=True) == 1
+
+def test_sync_client_uses_cache(tmp_path):
+    """Test that a repeated GET is answered from the cache"""
+    api = SolecoAPI(base_url="http://test.com", cache=ResponseCache(tmp_path))
+    with patch.object(api, '_make_request', return_value={"status": "ok"}) as mock_request:
+        assert api.get_network_status() == {"status": "ok"}
+        assert api.get_network_status() == {"status": "ok"}
+        mock_request.assert_called_once()
+
+def test_async_client_limits_concurrency():
+    """Test that map_unordered keeps at most `concurrency` requests in flight"""
+    in_flight, peak = 0, 0
+
+    async def handler(request):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        mint = request.url.path.rsplit('/', 1)[-1]
+        if mint == "bad":
+            return httpx.Response(404, json={"detail": "Mint not found"})
+        return httpx.Response(200, json={"mint": mint})
+
+    async def run():
+        api = AsyncSolecoAPI("http://test.com", concurrency=3)
+        api.client = _mock_client(handler)
+        async with api:
+            return [entry async for entry in api.map_unordered(api.analyze_mint, [f"m{i}" for i in range(10)] + ["bad"])]
+
+    results = asyncio.run(run())
+
+    assert peak == 3
+    assert sorted(mint for mint, result, error in results if error is None) == sorted(f"m{i}" for i in range(10))
+    [(mint, result, error)] = [entry for entry in results if entry[2] is not None]
+    assert mint == "bad" and isinstance(error, APIError) and "Mint not found" in str(error)
+
+def test_analyze_batch_streams_jsonl(runner, tmp_path):
+    """Test the batch command reading addresses from stdin"""
+    async def handler(request):
+        return httpx.Response(200, json={"mint_info": {"supply": 1}})
+
+    original_init = AsyncSolecoAPI.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.client = _mock_client(handler)
+
+    with patch.object(AsyncSolecoAPI, '__init__', init):
+        result = runner.invoke(
+            cli,
+            ['--config', str(tmp_path / "config.json"), '--no-cache', 'mint', 'analyze-batch', '-'],
+            input="mint1\n\n# comment\nmint2\n",
+        )
+
+    assert result.exit_code == 0
+    lines = [json.loads(line) for line in result.stdout.splitlines() if line.startswith('{')]
+    assert sorted(line["mint"] for line in lines) == ["mint1", "mint2"]
+    assert all(line["result"] == {"mint_info": {"supply": 1}} for line in lines)
+
+def test_get_if_changed_uses_etags():
+    """Test that polling sends the last ETag and reports unchanged 304 responses"""
+    seen_etags = []
+
+    async def handler(request):
+        seen_etags.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"total_nodes": 10}, headers={"ETag": '"v1"'})
+
+    async def run():
+        async with AsyncSolecoAPI("http://test.com") as api:
+            api.client = _mock_client(handler)
+            first = await api.get_if_changed("solana/network/status")
+            second = await api.get_if_changed("solana/network/status")
+            return first, second, api.poll_stats
+
+    first, second, stats = asyncio.run(run())
+
+    assert first == ({"total_nodes": 10}, True)
+    assert second == ({"total_nodes": 10}, False)
+    assert seen_etags == [None, '"v1"']
+    assert stats["requests"] == 2 and stats["not_modified"] == 1
+
+def test_mint_follow_requests_only_new_blocks(runner, tmp_path):
+    """Test that follow mode asks for the blocks after the last slot it received"""
+    requests = []
+
+    async def handler(request):
+        requests.append(dict(request.url.params))
+        slot = int(request.url.params.get("slot", 99))
+        block = {"slot": slot + 1, "block_time": None, "new_mints": [f"mint{slot + 1}"], "pump_tokens": []}
+        return httpx.Response(200, json={"success": True, "blocks": [block], "last_slot": slot + 1, "head_slot": 105})
+
+    original_init = AsyncSolecoAPI.__init__
+
+    def init(self, *args, **kwargs):
+        original_init(self, *args, **kwargs)
+        self.client = _mock_client(handler)
+
+    with patch.object(AsyncSolecoAPI, '__init__', init):
+        result = runner.invoke(
+            cli,
+            ['--config', str(tmp_path / "config.json"), 'mint', 'recent', '--follow', '--wait', '5', '--polls', '3'],
+        )
+
+    assert result.exit_code == 0
+    assert "slot" not in requests[0] and requests[0]["wait"] == "0"
+    assert [(params["slot"], params["wait"]) for params in requests[1:]] == [("100", "5.0"), ("101", "5.0")]
+    assert "mint102" in result.stdout
@@ -13,6 +13,7 @@ from soleco_cli.utils import (
     _dict_to_csv,
     handle_api_error,
     flatten_dict,
+    diff_values,
     truncate_string,
     format_duration,
     format_bytes
@@ -139,6 +140,13 @@ def test_flatten_dict():
     assert flattened["key2_nested1"] == "nested_value1"
     assert flattened["key2_nested2_deep"] == "deep_value"
 
+def test_diff_values():
+    """Test that only changed values are reported, with numeric deltas"""
+    previous = {"nodes": 10, "version": "1.17", "healthy": True, "same": 1}
+    current = {"nodes": 12, "version": "1.18", "healthy": False, "same": 1, "new": 3}
+    
+    assert diff_values(previous, current) == {"nodes": 2, "version": None, "healthy": None}
+
 def test_truncate_string():
     """Test string truncation"""
     long_string = "a" * 100